@@ -0,0 +1,30 @@
+import { test, expect } from '@playwright/test';
+
+/**
+ * E2E tests for Recompute
+ * Source: services/engineering-analytics/microservices/kpi-engine/app/jobs/recompute.py
+ * Service: Kpi Engine (engineering-analytics)
+ */
+
+test.describe('Recompute', () => {
+  test.describe('Health Check', () => {
+    test('should return healthy status', async ({ request }) => {
+      const response = await request.get('/health');
+      expect(response.ok()).toBeTruthy();
+    });
+  });
+
+  test.describe('API Endpoints', () => {
+    test.skip('TODO: Implement endpoint tests for recompute', async ({ request }) => {
+      // TODO: Add tests for services/engineering-analytics/microservices/kpi-engine/app/jobs/recompute.py
+      expect(true).toBe(true);
+    });
+  });
+
+  test.describe('Error Handling', () => {
+    test.skip('TODO: Implement error handling tests', async ({ request }) => {
+      // TODO: Add error handling tests
+      expect(true).toBe(true);
+    });
+  });
+});
@@ -131,6 +131,32 @@ test.describe('Metrics Collector', () => {
       const body = await response.json();
       expect(Array.isArray(body) || typeof body === 'object').toBe(true);
     });
+
+    test('should import uptime and latency series from Prometheus', async ({ request }) => {
+      const response = await request.post('/api/v1/analytics/metrics/prometheus/import', {
+        data: {
+          start: '2024-01-01T00:00:00Z',
+          end: '2024-01-01T06:00:00Z',
+          resolution: 'hour'
+        }
+      });
+      // 400 when prometheus_url is not configured, 502 when Prometheus is unreachable
+      expect([200, 400, 502]).toContain(response.status());
+
+      if (response.ok()) {
+        const body = await response.json();
+        expect(body.resolution).toBe('hour');
+        expect(body.metrics_written).toBeGreaterThanOrEqual(0);
+      }
+    });
+
+    test('should get latency series for a service', async ({ request }) => {
+      const response = await request.get('/api/v1/analytics/metrics/services/api/latency?period_type=hour');
+      expect(response.ok()).toBeTruthy();
+
+      const body = await response.json();
+      expect(Array.isArray(body)).toBe(true);
+    });
   });
 
   test.describe('Automation Rules', () => {
@@ -198,6 +224,62 @@ test.describe('Metrics Collector', () => {
       const updatedRule = await updateResponse.json();
       expect(updatedRule.status).toBe('inactive');
     });
+
+    test('should get trigger suppression state for a rule', async ({ request }) => {
+      const createResponse = await request.post('/api/v1/analytics/automation/rules', {
+        data: {
+          name: 'Cooldown Test Rule',
+          scope_type: 'employee',
+          metric_type: 'incident_frequency',
+          operator: '>',
+          threshold_value: 5,
+          cooldown_minutes: 60,
+          hysteresis: 1,
+          action_type: 'send_notification'
+        }
+      });
+      const rule = await createResponse.json();
+      expect(rule.cooldown_minutes).toBe(60);
+
+      const response = await request.get(`/api/v1/analytics/automation/rules/${rule.rule_id}/suppressions`);
+      expect(response.ok()).toBeTruthy();
+
+      const body = await response.json();
+      expect(Array.isArray(body)).toBe(true);
+    });
+
+    test('should evaluate rules with team threshold inheritance', async ({ request }) => {
+      const configResponse = await request.post('/api/v1/analytics/automation/thresholds', {
+        data: {
+          entity_type: 'team',
+          entity_id: 'team-test-001',
+          metric_type: 'incident_frequency',
+          custom_threshold: 8
+        }
+      });
+      expect(configResponse.ok()).toBeTruthy();
+
+      const response = await request.post('/api/v1/analytics/automation/evaluate?entity_type=employee&entity_id=emp-test-001&metric_type=incident_frequency&current_value=9&team_id=team-test-001');
+      expect(response.ok()).toBeTruthy();
+
+      const body = await response.json();
+      expect(Array.isArray(body)).toBe(true);
+      body.forEach((execution: any) => {
+        expect(execution.threshold_value).toBe(8);
+      });
+    });
+
+    test('should generate effectiveness report from daily rollups', async ({ request }) => {
+      const refresh = await request.post('/api/v1/analytics/automation/report/rollups/refresh?day_start=2024-01-01&day_end=2024-01-31');
+      expect(refresh.ok()).toBeTruthy();
+
+      const response = await request.get('/api/v1/analytics/automation/report/effectiveness?period_start=2024-01-01T00:00:00&period_end=2024-01-31T23:59:59&use_rollups=true');
+      expect(response.ok()).toBeTruthy();
+
+      const body = await response.json();
+      expect(Array.isArray(body.rules_summary)).toBe(true);
+      expect(Array.isArray(body.improvements_detected)).toBe(true);
+    });
   });
 
   test.describe('Webhooks', () => {
@@ -256,6 +338,49 @@ test.describe('Metrics Collector', () => {
       expect(Array.isArray(body) || typeof body === 'object').toBe(true);
     });
 
+    test('should run a manual sync and record its status', async ({ request }) => {
+      const createResponse = await request.post('/api/v1/analytics/integrations/', {
+        data: {
+          name: 'Manual Sync Test',
+          integration_type: 'prometheus',
+          api_endpoint: 'http://localhost:9090',
+          auth_method: 'none',
+          sync_frequency: 'manual'
+        }
+      });
+      const integration = await createResponse.json();
+
+      const response = await request.post(`/api/v1/analytics/integrations/${integration.integration_id}/sync`);
+      expect(response.ok()).toBeTruthy();
+
+      const body = await response.json();
+      expect(body.last_sync_at).toBeDefined();
+      expect(['active', 'error']).toContain(body.status);
+    });
+
+    test('should report sync stats for recent runs', async ({ request }) => {
+      const createResponse = await request.post('/api/v1/analytics/integrations/', {
+        data: {
+          name: 'Sync Stats Test',
+          integration_type: 'prometheus',
+          api_endpoint: 'http://localhost:9090',
+          auth_method: 'none',
+          sync_frequency: 'manual'
+        }
+      });
+      const integration = await createResponse.json();
+      await request.post(`/api/v1/analytics/integrations/${integration.integration_id}/sync`);
+
+      const response = await request.get(`/api/v1/analytics/integrations/${integration.integration_id}/sync-stats`);
+      expect(response.ok()).toBeTruthy();
+
+      const body = await response.json();
+      expect(body.runs).toBeGreaterThanOrEqual(1);
+      expect(body.error_rate).toBeGreaterThanOrEqual(0);
+      expect(Array.isArray(body.recent_runs)).toBe(true);
+      expect(body.staleness_seconds).toBeDefined();
+    });
+
     test('should get specific integration status', async ({ request }) => {
       const response = await request.get('/api/v1/analytics/integrations/gitlab');
       expect([200, 404]).toContain(response.status());
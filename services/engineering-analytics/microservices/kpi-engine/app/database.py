@@ -1,11 +1,35 @@
-from sqlalchemy import create_engine
+"""
+Database engine, sessions and the upsert helper
+
+The engine's pool is sized from settings (DB_POOL_SIZE defaults to one
+connection per gRPC worker thread plus the rolling DORA poller, so no RPC
+waits for a connection), and Postgres sessions get DB_STATEMENT_TIMEOUT_MS.
+instrument_engine (ea_shared.database, shared with the MetricsCollector)
+exports how long checkouts wait for a connection, how many connections are in
+use and how long statements take as Prometheus metrics (served on
+METRICS_PORT), to size the pool against the gRPC concurrency.
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from ea_shared import database as shared_database
+from ea_shared.database import dialect_insert, instrument_engine
 from app.config import get_settings
 
-settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def create_db_engine(database_url: Optional[str] = None, **overrides) -> Engine:
+    """An engine configured from the DB_* settings; `overrides` replace individual create_engine options"""
+    settings = get_settings()
+    return shared_database.create_db_engine(
+        settings, database_url, pool_size=settings.db_pool_size or settings.grpc_max_workers + 1, **overrides
+    )
+
+
+engine = create_db_engine()
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -17,3 +41,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upsert(db: Session, model, rows: List[dict], key: Sequence[str], update: Sequence[str]) -> None:
+    """
+    Insert rows (keyed by ORM attribute name) in one executemany, overwriting the
+    `update` attributes of rows that already exist for the unique `key`
+    (ON CONFLICT ... DO UPDATE). Within `rows`, the last row per key wins.
+    """
+    columns = {attribute.key: attribute.columns[0] for attribute in inspect(model).column_attrs}
+    # One statement cannot update the same row twice
+    rows = list({tuple(row[name] for name in key): row for row in rows}.values())
+    statement = dialect_insert(db)(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=[columns[name] for name in key],
+        set_={columns[name].name: statement.excluded[columns[name].name] for name in update},
+    )
+    db.execute(statement, rows)
@@ -0,0 +1,532 @@
+"""
+gRPC server and servicer for the KPI Engine
+
+Stubs are generated from protos/kpi.proto (`make proto`). The server runs on
+grpc.aio; KPI computations use blocking SQLAlchemy sessions, so each one is
+handed to a bounded thread pool (`grpc_max_workers`) and the event loop keeps
+accepting calls. Batch RPCs compute all entities in one vectorized call (and one
+bulk insert where they store results), then stream one response per entity.
+DORA RPCs read through the stored results (KPICache): repositories whose
+events have not changed since their last calculation are neither recomputed
+nor written again. Quality scores are computed from the SonarQube snapshots
+the collector stores, reliability scores from its Prometheus import. Quality
+and reliability scores follow the versioned scoring models of
+app/services/scoring.py; RescoreKPIs re-scores a stored period.
+
+Associated Frontend Files:
+  - web/app/src/lib/api.ts (analyticsApi.kpi - lines 98-100)
+  - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
+"""
+from concurrent import futures
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import logging
+
+import grpc
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.kpi_result import KPIResult, KPIType
+from app.services.dora_service import DORAMetrics, DORAService
+from app.services.employee_kpi_service import EmployeeKPIs, EmployeeKPIService
+from app.services.quality_service import QualityMetrics, QualityService
+from app.services.reliability_service import ReliabilityMetrics, ReliabilityService
+from app.services.rolling_dora_service import RollingDORAPoint, RollingDORAService
+from app.services.rollup_service import MembershipInput, RollupService
+from app.services.scoring import SCORED_INPUTS, get_scoring_model
+from app.services.sketch_service import DurationPercentiles, SketchService
+
+logger = logging.getLogger(__name__)
+
+try:
+    from protos import kpi_pb2, kpi_pb2_grpc
+except ImportError:
+    logger.warning("gRPC proto files not generated yet (run `make proto`)")
+    kpi_pb2 = None
+    kpi_pb2_grpc = None
+
+T = TypeVar("T")
+
+_ServicerBase = kpi_pb2_grpc.KPIServiceServicer if kpi_pb2_grpc else object
+
+
+def _parse_time(value: str, field: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError(f"Invalid {field}: {value!r}")
+
+
+def _optional_time(request, field: str) -> Optional[datetime]:
+    return _parse_time(getattr(request, field), field) if request.HasField(field) else None
+
+
+def _dora_response(metrics: DORAMetrics):
+    # Lead time and MTTR are proto3 optionals, left unset when there were no samples
+    durations = {
+        "lead_time_for_changes": metrics.lead_time_for_changes,
+        "mean_time_to_recovery": metrics.mean_time_to_recovery,
+        "lead_time_median": metrics.lead_time_median,
+        "lead_time_p90": metrics.lead_time_p90,
+    }
+    return kpi_pb2.DORAMetricsResponse(
+        repository_id=metrics.repository_id,
+        deployment_frequency=metrics.deployment_frequency,
+        change_failure_rate=metrics.change_failure_rate,
+        period_start=metrics.period_start.isoformat(),
+        period_end=metrics.period_end.isoformat(),
+        calculated_at=metrics.calculated_at.isoformat(),
+        **{field: value for field, value in durations.items() if value is not None},
+    )
+
+
+def _trend_point(point: RollingDORAPoint):
+    durations = {
+        "lead_time_for_changes": point.lead_time_for_changes,
+        "mean_time_to_recovery": point.mean_time_to_recovery,
+    }
+    return kpi_pb2.DORATrendPoint(
+        day=point.day.isoformat(),
+        deployment_frequency=point.deployment_frequency,
+        change_failure_rate=point.change_failure_rate,
+        **{field: value for field, value in durations.items() if value is not None},
+    )
+
+
+def _quality_response(metrics: QualityMetrics):
+    return kpi_pb2.QualityScoreResponse(
+        repository_id=metrics.repository_id,
+        overall_score=metrics.overall_score,
+        code_coverage=metrics.code_coverage,
+        technical_debt_ratio=metrics.technical_debt_ratio,
+        bug_density=metrics.bug_density,
+        code_complexity=metrics.code_complexity,
+        calculated_at=metrics.calculated_at.isoformat(),
+        scoring_model_version=metrics.scoring_model_version,
+    )
+
+
+def _reliability_response(metrics: ReliabilityMetrics):
+    # Inputs are proto3 optionals, left unset when unmeasured rather than sent as the model default
+    inputs = {
+        field: getattr(metrics, field)
+        for field in SCORED_INPUTS["reliability"]
+        if field not in metrics.unmeasured
+    }
+    return kpi_pb2.ReliabilityScoreResponse(
+        service_id=metrics.service_id,
+        overall_score=metrics.overall_score,
+        calculated_at=metrics.calculated_at.isoformat(),
+        scoring_model_version=metrics.scoring_model_version,
+        **inputs,
+    )
+
+
+def _employee_kpi_response(kpis: EmployeeKPIs):
+    return kpi_pb2.EmployeeKPIResponse(
+        employee_id=kpis.employee_id,
+        period=kpis.period,
+        period_start=kpis.period_start.isoformat(),
+        period_end=kpis.period_end.isoformat(),
+        commits=kpis.commits,
+        pull_requests_opened=kpis.pull_requests_opened,
+        pull_requests_closed=kpis.pull_requests_closed,
+        code_reviews=kpis.code_reviews,
+        issues_completed=kpis.issues_completed,
+        average_lead_time=kpis.average_lead_time,
+        average_cycle_time=kpis.average_cycle_time,
+        quality_score=kpis.quality_score,
+        productivity_score=kpis.productivity_score,
+    )
+
+
+def _percentiles_response(percentiles: DurationPercentiles):
+    values = {
+        "mean": percentiles.mean,
+        "p50": percentiles.p50,
+        "p90": percentiles.p90,
+        "p99": percentiles.p99,
+    }
+    return kpi_pb2.DurationPercentilesResponse(
+        metric=percentiles.metric,
+        count=percentiles.count,
+        **{field: value for field, value in values.items() if value is not None},
+    )
+
+
+def _team_kpi_response(team_id: str, rollup: Dict[KPIType, KPIResult]):
+    productivity, quality = rollup.get(KPIType.PRODUCTIVITY_SCORE), rollup.get(KPIType.QUALITY_SCORE)
+    period = next(iter(rollup.values()))
+    stats = (productivity or quality).metadata_ or {}
+    totals = (productivity.metadata_ or {}).get("totals", {}) if productivity else {}
+    members = stats.get("members", 0)
+    # member_kpis stays empty: the rollup is read without touching member rows
+    return kpi_pb2.TeamKPIResponse(
+        team_id=team_id,
+        period=period.period_type,
+        period_start=period.period_start.isoformat(),
+        period_end=period.period_end.isoformat(),
+        total_commits=totals.get("commits", 0),
+        total_pull_requests=totals.get("pull_requests_opened", 0),
+        total_issues_completed=totals.get("issues_completed", 0),
+        average_velocity=round(totals.get("issues_completed", 0) / members, 2) if members else 0.0,
+        team_quality_score=quality.value if quality else 0.0,
+        team_productivity_score=productivity.value if productivity else 0.0,
+        member_count=members,
+        productivity_median=(productivity.metadata_ or {}).get("median", 0.0) if productivity else 0.0,
+        productivity_p90=(productivity.metadata_ or {}).get("p90", 0.0) if productivity else 0.0,
+        quality_median=(quality.metadata_ or {}).get("median", 0.0) if quality else 0.0,
+        quality_p90=(quality.metadata_ or {}).get("p90", 0.0) if quality else 0.0,
+    )
+
+
+class KPIServicer(_ServicerBase):
+    """gRPC servicer for KPI calculation; RPCs missing here answer UNIMPLEMENTED"""
+
+    def __init__(self, executor: futures.ThreadPoolExecutor):
+        self.executor = executor
+        self.settings = get_settings()
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def _fail(self, context, rpc: str, error: Exception) -> None:
+        if isinstance(error, ValueError):
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(error))
+        logger.error(f"Error in gRPC {rpc}: {error}")
+        await context.abort(grpc.StatusCode.INTERNAL, str(error))
+
+    def _check_batch_size(self, count: int) -> None:
+        if count > self.settings.grpc_batch_max_entities:
+            raise ValueError(
+                f"Batch of {count} entities exceeds the limit of {self.settings.grpc_batch_max_entities}"
+            )
+
+    async def CalculateDORAMetrics(self, request, context):
+        try:
+            period_start = _parse_time(request.period_start, "period_start")
+            period_end = _parse_time(request.period_end, "period_end")
+            metrics = await self._run(self._calculate_dora, request.repository_id, period_start, period_end)
+            return _dora_response(metrics)
+        except Exception as e:
+            await self._fail(context, "CalculateDORAMetrics", e)
+
+    async def BatchCalculateDORAMetrics(self, request, context) -> AsyncIterator:
+        try:
+            self._check_batch_size(len(request.repository_ids))
+            period_start = _parse_time(request.period_start, "period_start")
+            period_end = _parse_time(request.period_end, "period_end")
+        except ValueError as e:
+            await self._fail(context, "BatchCalculateDORAMetrics", e)
+
+        # One statement covers the whole batch; responses stream in request order
+        try:
+            results = await self._run(self._calculate_dora_batch, list(request.repository_ids), period_start, period_end)
+        except Exception as e:
+            await self._fail(context, "BatchCalculateDORAMetrics", e)
+        for metrics in results:
+            yield _dora_response(metrics)
+
+    def _calculate_dora(self, repository_id: str, period_start: datetime, period_end: datetime) -> DORAMetrics:
+        with SessionLocal() as db:
+            return DORAService(db).get_dora_metrics(
+                period_start=period_start,
+                period_end=period_end,
+                repository_ids=[repository_id],
+            )[repository_id]
+
+    def _calculate_dora_batch(
+        self, repository_ids: List[str], period_start: datetime, period_end: datetime
+    ) -> List[DORAMetrics]:
+        if not repository_ids:
+            return []
+        with SessionLocal() as db:
+            metrics = DORAService(db).get_dora_metrics(
+                period_start=period_start,
+                period_end=period_end,
+                repository_ids=repository_ids,
+                vectorized=True,
+            )
+            return [metrics[repository_id] for repository_id in repository_ids]
+
+    async def GetDORATrend(self, request, context):
+        try:
+            start = _parse_time(request.period_start, "period_start").date()
+            end = _parse_time(request.period_end, "period_end").date()
+            points = await self._run(self._dora_trend, request.repository_id, request.window_days, start, end)
+            return kpi_pb2.DORATrendResponse(
+                repository_id=request.repository_id,
+                window_days=request.window_days,
+                points=[_trend_point(point) for point in points],
+            )
+        except Exception as e:
+            await self._fail(context, "GetDORATrend", e)
+
+    def _dora_trend(self, repository_id: str, window_days: int, start: date, end: date) -> List[RollingDORAPoint]:
+        with SessionLocal() as db:
+            return RollingDORAService(db).get_trend(repository_id, window_days, start, end)
+
+    async def CalculateQualityScore(self, request, context):
+        try:
+            metrics = await self._run(self._calculate_quality, request.repository_id)
+            return _quality_response(metrics)
+        except Exception as e:
+            await self._fail(context, "CalculateQualityScore", e)
+
+    async def BatchCalculateQualityScores(self, request, context) -> AsyncIterator:
+        try:
+            self._check_batch_size(len(request.repository_ids))
+            period_start = _parse_time(request.period_start, "period_start")
+            period_end = _parse_time(request.period_end, "period_end")
+            results = await self._run(
+                self._calculate_quality_batch, list(request.repository_ids), period_start, period_end
+            )
+        except Exception as e:
+            await self._fail(context, "BatchCalculateQualityScores", e)
+        for metrics in results:
+            yield _quality_response(metrics)
+
+    def _calculate_quality(self, repository_id: str):
+        with SessionLocal() as db:
+            return QualityService(db).calculate_quality_score(repository_id=repository_id)
+
+    def _calculate_quality_batch(
+        self, repository_ids: List[str], period_start: datetime, period_end: datetime
+    ) -> List[QualityMetrics]:
+        with SessionLocal() as db:
+            service = QualityService(db)
+            # No repository ids: every project with a quality snapshot
+            metrics = service.calculate_quality_scores_from_snapshots(repository_ids or None)
+            service.save_quality_metrics_batch(metrics, period_start, period_end)
+            return metrics
+
+    async def CalculateReliabilityScore(self, request, context):
+        try:
+            # Without a period, the last reliability_window_days are scored
+            period_start = _parse_time(request.period_start, "period_start") if request.period_start else None
+            period_end = _parse_time(request.period_end, "period_end") if request.period_end else None
+            metrics = await self._run(self._calculate_reliability, request.service_id, period_start, period_end)
+            return _reliability_response(metrics)
+        except Exception as e:
+            await self._fail(context, "CalculateReliabilityScore", e)
+
+    async def BatchCalculateReliabilityScores(self, request, context) -> AsyncIterator:
+        try:
+            self._check_batch_size(len(request.service_ids))
+            period_start = _parse_time(request.period_start, "period_start")
+            period_end = _parse_time(request.period_end, "period_end")
+            results = await self._run(
+                self._calculate_reliability_batch, list(request.service_ids), period_start, period_end
+            )
+        except Exception as e:
+            await self._fail(context, "BatchCalculateReliabilityScores", e)
+        for metrics in results:
+            yield _reliability_response(metrics)
+
+    def _calculate_reliability(
+        self, service_id: str, period_start: Optional[datetime], period_end: Optional[datetime]
+    ) -> ReliabilityMetrics:
+        period_end = period_end or datetime.utcnow()
+        period_start = period_start or period_end - timedelta(days=self.settings.reliability_window_days)
+        with SessionLocal() as db:
+            return ReliabilityService(db).calculate_reliability_score(
+                service_id=service_id, period_start=period_start, period_end=period_end
+            )
+
+    def _calculate_reliability_batch(
+        self, service_ids: List[str], period_start: datetime, period_end: datetime
+    ) -> List[ReliabilityMetrics]:
+        with SessionLocal() as db:
+            service = ReliabilityService(db)
+            # No service ids: every service with imported Prometheus data
+            metrics = service.calculate_reliability_scores_from_metrics(
+                service_ids or None, period_start, period_end
+            )
+            service.save_reliability_metrics_batch(metrics, period_start, period_end)
+            return metrics
+
+    async def GetEmployeeKPIs(self, request, context):
+        try:
+            period_start = _optional_time(request, "period_start")
+            period_end = _optional_time(request, "period_end")
+            kpis = await self._run(
+                self._calculate_employee_kpis, request.employee_id, request.period, period_start, period_end
+            )
+            return _employee_kpi_response(kpis)
+        except Exception as e:
+            await self._fail(context, "GetEmployeeKPIs", e)
+
+    async def BatchGetEmployeeKPIs(self, request, context) -> AsyncIterator:
+        try:
+            self._check_batch_size(len(request.employee_ids))
+            period_start = _optional_time(request, "period_start")
+            period_end = _optional_time(request, "period_end")
+            results = await self._run(
+                self._calculate_employee_kpis_batch,
+                list(request.employee_ids),
+                request.period,
+                period_start,
+                period_end,
+            )
+        except Exception as e:
+            await self._fail(context, "BatchGetEmployeeKPIs", e)
+        for kpis in results:
+            yield _employee_kpi_response(kpis)
+
+    def _calculate_employee_kpis(
+        self,
+        employee_id: str,
+        period: str,
+        period_start: Optional[datetime],
+        period_end: Optional[datetime],
+    ) -> EmployeeKPIs:
+        return self._calculate_employee_kpis_batch([employee_id], period, period_start, period_end)[0]
+
+    def _calculate_employee_kpis_batch(
+        self,
+        employee_ids: List[str],
+        period: str,
+        period_start: Optional[datetime],
+        period_end: Optional[datetime],
+    ) -> List[EmployeeKPIs]:
+        with SessionLocal() as db:
+            return EmployeeKPIService(db).calculate_employee_kpis_from_activity(
+                employee_ids,
+                period=period,
+                period_start=period_start,
+                period_end=period_end,
+            )
+
+    async def GetTeamKPIs(self, request, context):
+        try:
+            period_start = _optional_time(request, "period_start")
+            period_end = _optional_time(request, "period_end")
+            rollup = await self._run(self._team_rollup, request.team_id, request.period, period_start, period_end)
+        except Exception as e:
+            await self._fail(context, "GetTeamKPIs", e)
+        if not rollup:
+            await context.abort(
+                grpc.StatusCode.NOT_FOUND, f"No {request.period} KPI rollup stored for team {request.team_id}"
+            )
+        return _team_kpi_response(request.team_id, rollup)
+
+    def _team_rollup(
+        self,
+        team_id: str,
+        period: str,
+        period_start: Optional[datetime],
+        period_end: Optional[datetime],
+    ) -> Dict[KPIType, KPIResult]:
+        with SessionLocal() as db:
+            return RollupService(db).get_rollup("team", team_id, period, period_start, period_end)
+
+    async def SyncTeamMemberships(self, request, context):
+        try:
+            memberships = [
+                MembershipInput(
+                    employee_id=membership.employee_id,
+                    team_id=membership.team_id if membership.HasField("team_id") else None,
+                    org_id=membership.org_id if membership.HasField("org_id") else None,
+                )
+                for membership in request.memberships
+            ]
+            synced = await self._run(self._sync_memberships, memberships, request.replace)
+            return kpi_pb2.TeamMembershipSyncResponse(synced=synced)
+        except Exception as e:
+            await self._fail(context, "SyncTeamMemberships", e)
+
+    def _sync_memberships(self, memberships: List[MembershipInput], replace: bool) -> int:
+        with SessionLocal() as db:
+            return RollupService(db).sync_memberships(memberships, replace=replace)
+
+    async def GetDurationPercentiles(self, request, context):
+        try:
+            self._check_batch_size(len(request.entity_ids))
+            period_start = _parse_time(request.period_start, "period_start")
+            period_end = _parse_time(request.period_end, "period_end")
+            percentiles = await self._run(
+                self._duration_percentiles,
+                request.entity_type,
+                list(request.entity_ids),
+                request.metric,
+                period_start,
+                period_end,
+                request.period_type if request.HasField("period_type") else "day",
+            )
+            return _percentiles_response(percentiles)
+        except Exception as e:
+            await self._fail(context, "GetDurationPercentiles", e)
+
+    def _duration_percentiles(
+        self,
+        entity_type: str,
+        entity_ids: List[str],
+        metric: str,
+        period_start: datetime,
+        period_end: datetime,
+        period_type: str,
+    ) -> DurationPercentiles:
+        with SessionLocal() as db:
+            return SketchService(db).percentiles(entity_type, entity_ids, metric, period_start, period_end, period_type)
+
+    async def RescoreKPIs(self, request, context):
+        try:
+            period_start = _parse_time(request.period_start, "period_start")
+            period_end = _parse_time(request.period_end, "period_end")
+            model_version = request.model_version if request.HasField("model_version") else None
+            rescored, version = await self._run(self._rescore, request.kpi, period_start, period_end, model_version)
+            return kpi_pb2.RescoreResponse(kpi=request.kpi, model_version=version, rescored=rescored)
+        except Exception as e:
+            await self._fail(context, "RescoreKPIs", e)
+
+    def _rescore(
+        self, kpi: str, period_start: datetime, period_end: datetime, model_version: Optional[int]
+    ) -> Tuple[int, int]:
+        with SessionLocal() as db:
+            if kpi == "quality":
+                metrics = QualityService(db).rescore_quality_scores(period_start, period_end, model_version)
+            elif kpi == "reliability":
+                metrics = ReliabilityService(db).rescore_reliability_scores(period_start, period_end, model_version)
+            else:
+                raise ValueError(f"Unsupported kpi {kpi!r}; expected quality or reliability")
+            return len(metrics), get_scoring_model(kpi, model_version).version
+
+
+def create_server(executor: futures.ThreadPoolExecutor) -> "grpc.aio.Server":
+    """Build the aio server with the servicer registered; the caller binds ports and starts it"""
+    settings = get_settings()
+    server = grpc.aio.server(
+        maximum_concurrent_rpcs=settings.grpc_max_concurrent_rpcs,
+        options=[
+            ("grpc.max_send_message_length", settings.grpc_max_message_bytes),
+            ("grpc.max_receive_message_length", settings.grpc_max_message_bytes),
+        ],
+    )
+    kpi_pb2_grpc.add_KPIServiceServicer_to_server(KPIServicer(executor), server)
+    return server
+
+
+async def serve_grpc(stop: Optional[asyncio.Event] = None) -> None:
+    """Run the gRPC server until `stop` is set (or forever)"""
+    if not kpi_pb2_grpc:
+        logger.warning("gRPC server not started - proto files not generated")
+        return
+
+    settings = get_settings()
+    with futures.ThreadPoolExecutor(max_workers=settings.grpc_max_workers, thread_name_prefix="kpi-rpc") as executor:
+        server = create_server(executor)
+        server.add_insecure_port(f"{settings.grpc_host}:{settings.grpc_port}")
+        await server.start()
+        logger.info(
+            f"KPI Engine gRPC server started on {settings.grpc_host}:{settings.grpc_port} "
+            f"(max {settings.grpc_max_concurrent_rpcs} concurrent RPCs, {settings.grpc_max_workers} workers)"
+        )
+        try:
+            if stop is None:
+                await server.wait_for_termination()
+            else:
+                await stop.wait()
+        finally:
+            logger.info("Stopping gRPC server...")
+            await server.stop(grace=settings.grpc_shutdown_grace_seconds)
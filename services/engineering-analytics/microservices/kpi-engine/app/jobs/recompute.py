@@ -0,0 +1,298 @@
+"""
+Parallel KPI recomputation job
+
+Recomputes and stores the KPIs of every active entity of one kind (or the
+given ones) for a period, outside the gRPC server: entities are split into
+chunks of recompute_chunk_size, and each chunk is one batch calculation in a
+pool of worker processes (the vectorized calculations are CPU-bound, so
+threads would serialize on the GIL). Each worker opens its own database
+engine. Completed entities are checkpointed to a JSON file, so an interrupted
+run resumes where it stopped; without explicit bounds the checkpoint also keeps
+the trailing window the run started with, and the resumed run reuses it. Run it
+by hand or from a scheduler (cron, Kubernetes CronJob); it prints a JSON report
+when done.
+
+    python -m app.jobs.recompute dora --period-start 2026-09-01 --period-end 2026-10-01
+    python -m app.jobs.recompute employee --period month --workers 8 --checkpoint /tmp/employee.json
+    python -m app.jobs.recompute quality --period-start 2026-09-01 --period-end 2026-10-01
+    python -m app.jobs.recompute reliability --period month
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.database import SessionLocal, create_db_engine
+from app.services.dora_service import DORAService
+from app.services.employee_kpi_service import EmployeeKPIService, resolve_period
+from app.services.quality_service import QualityService
+from app.services.reliability_service import ReliabilityService
+from app.services.rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RecomputeJob:
+    kind: str  # dora, employee, quality, reliability
+    period_start: datetime
+    period_end: datetime
+    period: str = "custom"  # period_type of employee KPIs (week, sprint, month)
+    force: bool = False  # dora: recompute repositories whose cached results are still fresh
+    window: Optional[str] = None  # trailing period the bounds were resolved from, None when given
+
+    def signature(self) -> dict:
+        """What a checkpoint must match to be resumed"""
+        if self.window:
+            # Resolved from the current time, so only the window identifies the run
+            return {"kind": self.kind, "period": self.period, "window": self.window}
+        return {
+            "kind": self.kind,
+            "period": self.period,
+            "period_start": self.period_start.isoformat(),
+            "period_end": self.period_end.isoformat(),
+        }
+
+
+def _discover_dora(db: Session, job: RecomputeJob) -> List[str]:
+    return DORAService(db).active_repositories(job.period_start, job.period_end)
+
+
+def _compute_dora(db: Session, job: RecomputeJob, entity_ids: List[str]) -> int:
+    service = DORAService(db)
+    if job.force:
+        metrics = service.calculate_dora_metrics_batch(job.period_start, job.period_end, entity_ids)
+        service.save_dora_metrics_batch(metrics.values())
+        return len(metrics)
+    # Read-through: repositories with unchanged events keep their stored results
+    started = datetime.utcnow()
+    metrics = service.get_dora_metrics(job.period_start, job.period_end, entity_ids, vectorized=True)
+    return sum(1 for repository_metrics in metrics.values() if repository_metrics.calculated_at >= started)
+
+
+def _discover_employees(db: Session, job: RecomputeJob) -> List[str]:
+    return EmployeeKPIService(db).active_employees(job.period_start, job.period_end)
+
+
+def _compute_employees(db: Session, job: RecomputeJob, entity_ids: List[str]) -> int:
+    service = EmployeeKPIService(db)
+    kpis = service.calculate_employee_kpis_from_activity(entity_ids, job.period, job.period_start, job.period_end)
+    # Rolled up once after every chunk is stored; per chunk, teams split across workers would race
+    service.save_employee_kpis_batch(kpis, rollup=False)
+    return len(kpis)
+
+
+def _finish_employees(db: Session, job: RecomputeJob, entity_ids: List[str]) -> None:
+    RollupService(db).rollup_employees(entity_ids, [(job.period, job.period_start, job.period_end)])
+    db.commit()
+
+
+def _discover_quality(db: Session, job: RecomputeJob) -> List[str]:
+    return [entity.repository_id for entity in QualityService(db).load_quality_inputs()]
+
+
+def _compute_quality(db: Session, job: RecomputeJob, entity_ids: List[str]) -> int:
+    service = QualityService(db)
+    metrics = service.calculate_quality_scores_from_snapshots(entity_ids)
+    return service.save_quality_metrics_batch(metrics, job.period_start, job.period_end)
+
+
+def _discover_reliability(db: Session, job: RecomputeJob) -> List[str]:
+    inputs = ReliabilityService(db).load_reliability_inputs(None, job.period_start, job.period_end)
+    return [entity.service_id for entity in inputs]
+
+
+def _compute_reliability(db: Session, job: RecomputeJob, entity_ids: List[str]) -> int:
+    service = ReliabilityService(db)
+    metrics = service.calculate_reliability_scores_from_metrics(entity_ids, job.period_start, job.period_end)
+    return service.save_reliability_metrics_batch(metrics, job.period_start, job.period_end)
+
+
+# kind -> (discover entities, compute and store one chunk returning how many entities were
+# recalculated, optional step after all chunks)
+JOB_KINDS: Dict[str, tuple] = {
+    "dora": (_discover_dora, _compute_dora, None),
+    "employee": (_discover_employees, _compute_employees, _finish_employees),
+    "quality": (_discover_quality, _compute_quality, None),
+    "reliability": (_discover_reliability, _compute_reliability, None),
+}
+
+# Set per worker process by _init_worker
+_worker_sessions: Optional[Callable[[], Session]] = None
+
+
+def _init_worker() -> None:
+    """Give the worker its own engine; connections must not be shared across processes"""
+    global _worker_sessions
+    logging.basicConfig(level=logging.INFO)
+    engine = create_db_engine(pool_size=1, max_overflow=0)
+    _worker_sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _run_chunk(job: RecomputeJob, entity_ids: List[str]) -> tuple:
+    started = time.perf_counter()
+    with _worker_sessions() as db:
+        recalculated = JOB_KINDS[job.kind][1](db, job, entity_ids)
+    return entity_ids, recalculated, time.perf_counter() - started
+
+
+class Checkpoint:
+    """
+    Entities already recomputed by an earlier, interrupted run of the same job.
+    `job` is the job to run: for a trailing window, the resumed run's bounds.
+    """
+
+    def __init__(self, path: Optional[str], job: RecomputeJob):
+        self.path = path
+        self.job = job
+        self.signature = job.signature()
+        self.done: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get("job") == self.signature:
+                self.done = set(saved.get("done", []))
+                if job.window:
+                    self.job = replace(
+                        job,
+                        period_start=datetime.fromisoformat(saved["period_start"]),
+                        period_end=datetime.fromisoformat(saved["period_end"]),
+                    )
+            else:
+                logger.warning(f"Ignoring checkpoint {path}: it belongs to another job ({saved.get('job')})")
+
+    def add(self, entity_ids: List[str]) -> None:
+        self.done.update(entity_ids)
+        if not self.path:
+            return
+        # Write-then-rename, so a crash never leaves a truncated checkpoint behind
+        partial = f"{self.path}.tmp"
+        with open(partial, "w") as f:
+            json.dump(
+                {
+                    "job": self.signature,
+                    "period_start": self.job.period_start.isoformat(),
+                    "period_end": self.job.period_end.isoformat(),
+                    "done": sorted(self.done),
+                },
+                f,
+            )
+        os.replace(partial, self.path)
+
+    def clear(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def run_job(
+    job: RecomputeJob,
+    entity_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+) -> dict:
+    """Recompute `job` for `entity_ids` (default: every active entity) and return the run report"""
+    if job.kind not in JOB_KINDS:
+        raise ValueError(f"Unsupported job kind {job.kind!r}; expected one of {list(JOB_KINDS)}")
+    settings = get_settings()
+    workers = workers or settings.recompute_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or settings.recompute_chunk_size
+    discover, _, finish = JOB_KINDS[job.kind]
+
+    started = time.perf_counter()
+    checkpoint = Checkpoint(checkpoint_path, job)
+    job = checkpoint.job
+    if entity_ids is None:
+        with SessionLocal() as db:
+            entity_ids = discover(db, job)
+    pending = [entity_id for entity_id in dict.fromkeys(entity_ids) if entity_id not in checkpoint.done]
+    chunks = [pending[offset:offset + chunk_size] for offset in range(0, len(pending), chunk_size)]
+    workers = max(1, min(workers, len(chunks)))
+    logger.info(
+        f"Recomputing {job.kind} KPIs of {len(pending)} entities in {len(chunks)} chunks on {workers} workers "
+        f"({len(entity_ids) - len(pending)} already done)"
+    )
+
+    computed = recalculated = 0
+    # spawn: workers start clean instead of inheriting this process's engine and connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        running = {pool.submit(_run_chunk, job, chunk) for chunk in chunks}
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_ids, chunk_recalculated, seconds = future.result()
+                checkpoint.add(chunk_ids)
+                computed += len(chunk_ids)
+                recalculated += chunk_recalculated
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"{computed}/{len(pending)} entities ({computed / elapsed:.1f}/s), "
+                    f"last chunk of {len(chunk_ids)} in {seconds:.2f}s"
+                )
+
+    if finish is not None:
+        with SessionLocal() as db:
+            finish(db, job, list(dict.fromkeys(entity_ids)))
+    checkpoint.clear()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "kind": job.kind,
+        "period": job.period,
+        "period_start": job.period_start.isoformat(),
+        "period_end": job.period_end.isoformat(),
+        "entities": len(entity_ids),
+        "processed": computed,
+        "recalculated": recalculated,  # the rest were served from fresh cached results
+        "resumed_from_checkpoint": len(entity_ids) - len(pending),
+        "chunks": len(chunks),
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "entities_per_second": round(computed / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=list(JOB_KINDS))
+    parser.add_argument("--period-start", type=datetime.fromisoformat)
+    parser.add_argument("--period-end", type=datetime.fromisoformat)
+    parser.add_argument(
+        "--period",
+        default="month",
+        choices=["week", "sprint", "month"],
+        help="employee KPI period; also the trailing window used when no bounds are given",
+    )
+    parser.add_argument("--entity", dest="entity_ids", action="append", help="only these entities (repeatable)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: RECOMPUTE_WORKERS or one per CPU)")
+    parser.add_argument("--chunk-size", type=int, help="entities per task (default: RECOMPUTE_CHUNK_SIZE)")
+    parser.add_argument("--checkpoint", help="JSON file recording completed entities, to resume an interrupted run")
+    parser.add_argument("--force", action="store_true", help="dora: also recompute repositories with fresh results")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    period_start, period_end = resolve_period(args.period, args.period_start, args.period_end)
+    job = RecomputeJob(
+        kind=args.kind,
+        period_start=period_start,
+        period_end=period_end,
+        period=args.period if args.kind == "employee" else "custom",
+        force=args.force,
+        window=None if args.period_start and args.period_end else args.period,
+    )
+    report = run_job(job, args.entity_ids, args.workers, args.chunk_size, args.checkpoint)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
 from app.models.kpi_result import KPIResult, KPIType
+from app.models.dora_daily import DORADailyBucket, EngineWatermark
+from app.models.team_membership import TeamMembership
+from app.models.kpi_sketch import KPISketch
 
-__all__ = ["KPIResult", "KPIType"]
+__all__ = ["KPIResult", "KPIType", "DORADailyBucket", "EngineWatermark", "TeamMembership", "KPISketch"]
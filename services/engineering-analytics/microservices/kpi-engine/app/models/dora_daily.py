@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Date, DateTime, Float, Integer
+
+from app.database import Base
+
+
+class DORADailyBucket(Base):
+    """
+    Additive DORA sums per repository and day. Rolling windows are sums of
+    consecutive buckets, so an arriving event only rebuilds the buckets of the
+    days it touches.
+    """
+    __tablename__ = "ea_dora_daily"
+
+    repository_id = Column(String(128), primary_key=True)
+    day = Column(Date, primary_key=True)
+    deployments = Column(Integer, nullable=False, default=0)
+    failed_deployments = Column(Integer, nullable=False, default=0)
+    lead_time_seconds = Column(Float, nullable=False, default=0.0)  # sum over lead_time_samples
+    lead_time_samples = Column(Integer, nullable=False, default=0)  # deployments traceable to a commit
+    incidents = Column(Integer, nullable=False, default=0)
+    recovery_seconds = Column(Float, nullable=False, default=0.0)  # sum over recovered_incidents
+    recovered_incidents = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class EngineWatermark(Base):
+    """Progress markers of the engine's background consumers, keyed by consumer name"""
+    __tablename__ = "ea_kpi_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,10 +1,13 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Float, Enum as SQLEnum, JSON
+from typing import List
+from sqlalchemy import Column, String, DateTime, Float, Enum as SQLEnum, Index, JSON, UniqueConstraint, inspect, text
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 
-from app.database import Base
+from app.database import Base, upsert
 
 
 class KPIType(str, Enum):
@@ -18,17 +21,82 @@ class KPIType(str, Enum):
     VELOCITY = "velocity"
 
 
+# One stored result per entity, KPI and period; recalculations overwrite it
+KPI_RESULT_KEY = ("entity_type", "entity_id", "kpi_type", "period_type", "period_start", "period_end")
+
+
 class KPIResult(Base):
     __tablename__ = "ea_kpi_results"
+    __table_args__ = (
+        UniqueConstraint(*KPI_RESULT_KEY, name="uq_ea_kpi_results_key"),
+        # History and trend reads: one entity's KPI ordered by period_end; the included
+        # columns let rolling trend reads run index-only on PostgreSQL
+        Index(
+            "ix_ea_kpi_results_history",
+            "entity_type",
+            "entity_id",
+            "kpi_type",
+            "period_end",
+            postgresql_include=["period_type", "value"],
+        ),
+    )
 
     result_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     entity_type = Column(String(50), nullable=False)  # employee, team, repository, service
-    entity_id = Column(String(128), nullable=False, index=True)
+    entity_id = Column(String(128), nullable=False)
     kpi_type = Column(SQLEnum(KPIType), nullable=False)
     value = Column(Float, nullable=False)
     unit = Column(String(50), nullable=True)
     period_start = Column(DateTime, nullable=False)
     period_end = Column(DateTime, nullable=False)
     period_type = Column(String(20), nullable=False)
-    metadata = Column(JSON, nullable=True)
+    # `metadata` is reserved on declarative models, so the attribute is suffixed
+    metadata_ = Column("metadata", JSON, nullable=True)
     calculated_at = Column(DateTime, default=datetime.utcnow)
+
+
+def upsert_kpi_results(db: Session, rows: List[dict]) -> None:
+    """Store KPI rows, replacing the value, unit, metadata and calculated_at of existing results"""
+    if rows:
+        upsert(db, KPIResult, rows, key=KPI_RESULT_KEY, update=("value", "unit", "metadata_", "calculated_at"))
+
+
+def ensure_result_key(engine: Engine) -> bool:
+    """
+    Add uq_ea_kpi_results_key to an ea_kpi_results table created before it
+    existed (create_all does not alter existing tables), deleting duplicate
+    results first; the most recently calculated one of each key is kept.
+    Run before create_all; returns True when the key was added.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(KPIResult.__tablename__):
+        return False
+    existing = {c["name"] for c in inspector.get_unique_constraints(KPIResult.__tablename__)}
+    existing.update(i["name"] for i in inspector.get_indexes(KPIResult.__tablename__) if i["unique"])
+    if "uq_ea_kpi_results_key" in existing:
+        return False
+
+    key = ", ".join(KPI_RESULT_KEY)
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            # Replicas starting together: the first one adds the key, the others find it
+            connection.execute(text("LOCK TABLE ea_kpi_results IN SHARE ROW EXCLUSIVE MODE"))
+            added = connection.execute(
+                text("SELECT 1 FROM pg_constraint WHERE conname = 'uq_ea_kpi_results_key'")
+            ).first()
+            if added:
+                return False
+        connection.execute(text(
+            "DELETE FROM ea_kpi_results WHERE result_id IN ("
+            " SELECT result_id FROM ("
+            f"  SELECT result_id, row_number() OVER (PARTITION BY {key} ORDER BY calculated_at DESC, result_id DESC)"
+            "   AS position FROM ea_kpi_results"
+            " ) ranked WHERE position > 1"
+            ")"
+        ))
+        if engine.dialect.name == "postgresql":
+            connection.execute(text(f"ALTER TABLE ea_kpi_results ADD CONSTRAINT uq_ea_kpi_results_key UNIQUE ({key})"))
+        else:
+            # SQLite cannot add constraints to a table; a unique index serves ON CONFLICT the same way
+            connection.execute(text(f"CREATE UNIQUE INDEX uq_ea_kpi_results_key ON ea_kpi_results ({key})"))
+    return True
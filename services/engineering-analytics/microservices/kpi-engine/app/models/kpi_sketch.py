@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime
+from typing import List
+from sqlalchemy import Column, String, DateTime, Integer, JSON, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.database import Base, upsert
+
+# ea_kpi_sketches.metric, all durations in hours
+SKETCH_LEAD_TIME = "lead_time"
+SKETCH_CYCLE_TIME = "cycle_time"
+SKETCH_RECOVERY_TIME = "recovery_time"
+
+# One sketch per entity, metric and period; recalculations overwrite it
+KPI_SKETCH_KEY = ("entity_type", "entity_id", "metric", "period_type", "period_start", "period_end")
+
+
+class KPISketch(Base):
+    """
+    Quantile sketch (app.services.sketch.DDSketch) of a duration KPI's samples
+    for one entity and period. Repositories get one per day, employees one per
+    saved KPI period and teams/orgs the merge of their members'.
+    """
+    __tablename__ = "ea_kpi_sketches"
+    __table_args__ = (
+        UniqueConstraint(*KPI_SKETCH_KEY, name="uq_ea_kpi_sketches_key"),
+    )
+
+    sketch_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity_type = Column(String(50), nullable=False)  # employee, team, org, repository
+    entity_id = Column(String(128), nullable=False)
+    metric = Column(String(50), nullable=False)
+    period_type = Column(String(20), nullable=False)  # day, week, sprint, month, custom
+    period_start = Column(DateTime, nullable=False)
+    period_end = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False)
+    sketch = Column(JSON, nullable=False)  # DDSketch.to_dict()
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def upsert_kpi_sketches(db: Session, rows: List[dict]) -> None:
+    """Store sketch rows, replacing the sketch of existing ones"""
+    if rows:
+        upsert(db, KPISketch, rows, key=KPI_SKETCH_KEY, update=("count", "sketch", "updated_at"))
@@ -0,0 +1,114 @@
+"""
+Read-only mappings of the metrics-collector tables the KPI engine computes from.
+
+Both services share engineering_analytics_db, but the collector owns these
+tables and their migrations, so they live on their own MetaData and are never
+passed to create_all. Only the columns the engine reads are declared.
+Enum columns are stored by member name (SQLEnum), hence the upper-case
+constants below.
+"""
+from sqlalchemy import Column, DateTime, Float, Integer, JSON, MetaData, String, Table
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+source_metadata = MetaData()
+
+ea_metrics = Table(
+    "ea_metrics",
+    source_metadata,
+    Column("metric_id", UUID(as_uuid=True), primary_key=True),
+    Column("employee_id", UUID(as_uuid=True)),
+    Column("repository_id", String(128)),
+    Column("metric_type", String(50)),
+    Column("value", Float),
+    Column("period_start", DateTime),
+    Column("period_end", DateTime),
+    Column("period_type", String(20)),
+    Column("source", String(50)),
+    Column("metadata", JSON),
+    Column("updated_at", DateTime),
+)
+
+ea_activities = Table(
+    "ea_activities",
+    source_metadata,
+    Column("activity_id", UUID(as_uuid=True), primary_key=True),
+    Column("employee_id", UUID(as_uuid=True)),
+    Column("source", String(50)),
+    Column("activity_type", String(50)),
+    Column("external_id", String(256)),
+    Column("repository_id", String(128)),
+    Column("occurred_at", DateTime),
+    Column("raw_data", JSON),
+    # When the collector stored the row; commits often arrive after the deployment that shipped them
+    Column("created_at", DateTime),
+)
+
+# Latest SonarQube measures per project, keyed by the project key (= repository_id)
+ea_quality_snapshots = Table(
+    "ea_quality_snapshots",
+    source_metadata,
+    Column("repository_id", String(128), primary_key=True),
+    Column("code_coverage", Float),
+    Column("technical_debt_ratio", Float),
+    Column("bug_density", Float),
+    Column("code_complexity", Float),
+    Column("lines_of_code", Integer),
+    Column("analysed_at", DateTime),
+)
+
+# Latency and error rate per service and hour or day, imported from Prometheus
+ea_service_latency = Table(
+    "ea_service_latency",
+    source_metadata,
+    Column("latency_id", UUID(as_uuid=True), primary_key=True),
+    Column("service_id", String(128)),
+    Column("period_start", DateTime),
+    Column("period_type", String(20)),
+    Column("latency_p99_ms", Float),
+    Column("error_rate", Float),
+    Column("sample_count", Integer),
+)
+
+# ea_metrics.metric_type
+METRIC_DEPLOYMENT = "DEPLOYMENT_FREQUENCY"
+METRIC_INCIDENT = "INCIDENT_FREQUENCY"
+METRIC_UPTIME = "SYSTEM_UPTIME"
+METRIC_LEAD_TIME = "LEAD_TIME"
+METRIC_CYCLE_TIME = "CYCLE_TIME"
+
+# ea_activities.activity_type
+ACTIVITY_COMMIT = "COMMIT"
+ACTIVITY_PULL_REQUEST = "PULL_REQUEST"
+ACTIVITY_CODE_REVIEW = "CODE_REVIEW"
+ACTIVITY_ISSUE_COMPLETED = "ISSUE_COMPLETED"
+
+# ea_activities.raw_data["state"] of pull/merge requests that are no longer open
+CLOSED_PULL_REQUEST_STATES = ("closed", "merged")
+
+# ea_metrics.period_type of single-event rows written by the collector's webhooks
+EVENT_PERIOD_TYPE = "event"
+
+# ea_metrics / ea_service_latency.period_type of the Prometheus import, finest first
+IMPORT_PERIOD_TYPES = ("hour", "day")
+
+
+class seconds_between(FunctionElement):
+    """seconds_between(start, end): end - start in seconds, as a float"""
+
+    type = Float()
+    name = "seconds_between"
+    inherit_cache = True
+
+
+@compiles(seconds_between)
+def _seconds_between(element, compiler, **kw):
+    start, end = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"EXTRACT(EPOCH FROM ({end} - {start}))"
+
+
+@compiles(seconds_between, "sqlite")
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"((julianday({end}) - julianday({start})) * 86400.0)"
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+
+from app.database import Base
+
+
+class TeamMembership(Base):
+    """
+    Current team and org of each employee, mirrored from the employee registry
+    (its `team` and `department`) through SyncTeamMemberships. Team and org KPI
+    rollups group employee results by it.
+    """
+    __tablename__ = "ea_team_memberships"
+
+    employee_id = Column(String(128), primary_key=True)
+    team_id = Column(String(128), nullable=True, index=True)
+    org_id = Column(String(128), nullable=True, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
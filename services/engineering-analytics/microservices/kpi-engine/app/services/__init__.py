@@ -2,5 +2,18 @@ from app.services.dora_service import DORAService
 from app.services.quality_service import QualityService
 from app.services.reliability_service import ReliabilityService
 from app.services.employee_kpi_service import EmployeeKPIService
+from app.services.rolling_dora_service import RollingDORAService
+from app.services.kpi_cache import KPICache
+from app.services.rollup_service import RollupService
+from app.services.sketch_service import SketchService
 
-__all__ = ["DORAService", "QualityService", "ReliabilityService", "EmployeeKPIService"]
+__all__ = [
+    "DORAService",
+    "QualityService",
+    "ReliabilityService",
+    "EmployeeKPIService",
+    "RollingDORAService",
+    "KPICache",
+    "RollupService",
+    "SketchService",
+]
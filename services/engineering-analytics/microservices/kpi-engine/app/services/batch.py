@@ -0,0 +1,20 @@
+"""
+Helpers shared by the batch (multi-entity) KPI calculations
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def input_column(inputs: Sequence, field: str, default: float) -> np.ndarray:
+    """One input field across all entities as a float array, with None replaced by `default`"""
+    column = np.array([getattr(entity, field) for entity in inputs], dtype=float)
+    return np.where(np.isnan(column), default, column)
+
+
+def mean_of_lists(lists: Sequence[Optional[List[float]]]) -> np.ndarray:
+    """Mean of each entity's samples (0.0 where there are none), without a Python loop per entity"""
+    lengths = np.array([len(samples) if samples else 0 for samples in lists], dtype=int)
+    flat = np.fromiter((value for samples in lists if samples for value in samples), dtype=float, count=lengths.sum())
+    sums = np.bincount(np.repeat(np.arange(len(lists)), lengths), weights=flat, minlength=len(lists))
+    return np.divide(sums, lengths, out=np.zeros(len(lists)), where=lengths > 0)
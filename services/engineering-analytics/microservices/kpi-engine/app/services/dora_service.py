@@ -3,30 +3,445 @@ Associated Frontend Files:
   - web/app/src/lib/api.ts (analyticsApi.metrics.dora - line 94)
   - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
 """
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
 from dataclasses import dataclass
 import numpy as np
+import pandas as pd
+from sqlalchemy import Select, case, exists, func, or_, select, union
 from sqlalchemy.orm import Session
 
-from app.models.kpi_result import KPIResult, KPIType
+from app.config import get_settings
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+from app.models.source_tables import (
+    ACTIVITY_COMMIT,
+    EVENT_PERIOD_TYPE,
+    METRIC_DEPLOYMENT,
+    METRIC_INCIDENT,
+    ea_activities,
+    ea_metrics,
+    seconds_between,
+)
+from app.services.kpi_cache import KPICache
+
+DORA_KPI_TYPES = [
+    KPIType.DORA_DEPLOYMENT_FREQUENCY,
+    KPIType.DORA_LEAD_TIME,
+    KPIType.DORA_CHANGE_FAILURE_RATE,
+    KPIType.DORA_MTTR,
+]
 
 
 @dataclass
 class DORAMetrics:
     repository_id: str
     deployment_frequency: float  # deployments per day
-    lead_time_for_changes: float  # hours
+    lead_time_for_changes: Optional[float]  # hours; None without deployments traceable to a commit
     change_failure_rate: float  # percentage
-    mean_time_to_recovery: float  # hours
+    mean_time_to_recovery: Optional[float]  # hours; None without resolved incidents
     period_start: datetime
     period_end: datetime
     calculated_at: datetime
+    deployment_count: int = 0
+    incident_count: int = 0
+    lead_time_median: Optional[float] = None  # hours
+    lead_time_p90: Optional[float] = None  # hours
 
 
 class DORAService:
     def __init__(self, db: Session):
         self.db = db
+        self.settings = get_settings()
+
+    def calculate_dora_metrics_from_events(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        repository_ids: Optional[List[str]] = None,
+    ) -> Dict[str, DORAMetrics]:
+        """
+        DORA metrics per repository from the deployment and incident events the
+        collector's CI/CD and Prometheus webhooks store in ea_metrics, computed for
+        all repositories (or the given ones) by a single set-based statement.
+
+        - deployment frequency: deployments per day of the period
+        - lead time: deploy time minus the time of the deployed commit, joined
+          from ea_activities by commit_sha
+        - change failure rate: share of deployments followed by an incident on the
+          same repository before the next deployment, within dora_failure_window_hours
+        - MTTR: mean time from an incident firing to its resolution
+        """
+        days_in_period = (period_end - period_start).days or 1
+        # Taken before reading, so events changed while the query runs make the result stale
+        calculated_at = datetime.utcnow()
+        rows = self.db.execute(self._dora_statement(period_start, period_end, repository_ids)).all()
+
+        metrics = {}
+        for row in rows:
+            deployments = row.deployments or 0
+            metrics[row.repository_id] = DORAMetrics(
+                repository_id=row.repository_id,
+                deployment_frequency=round(deployments / days_in_period, 2),
+                lead_time_for_changes=_hours(row.lead_time_seconds),
+                change_failure_rate=round((row.failed_deployments or 0) / deployments * 100, 2) if deployments else 0.0,
+                mean_time_to_recovery=_hours(row.recovery_seconds),
+                period_start=period_start,
+                period_end=period_end,
+                calculated_at=calculated_at,
+                deployment_count=deployments,
+                incident_count=row.incidents or 0,
+            )
+        return self._fill_missing(metrics, repository_ids, period_start, period_end, calculated_at)
+
+    def get_dora_metrics(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        repository_ids: List[str],
+        vectorized: bool = False,
+    ) -> Dict[str, DORAMetrics]:
+        """
+        Read-through DORA metrics for the given repositories. Stored results are
+        served while no deployment or incident event they depend on has changed
+        since; the other repositories are calculated (by the vectorized engine for
+        large batches) and saved.
+        """
+        cached = KPICache(self.db).lookup(
+            entity_type="repository",
+            entity_ids=repository_ids,
+            kpi_types=DORA_KPI_TYPES,
+            anchor=KPIType.DORA_DEPLOYMENT_FREQUENCY,
+            period_start=period_start,
+            period_end=period_end,
+            period_type="custom",
+            watermarks=self.source_watermarks(period_start, period_end, repository_ids),
+        )
+        metrics = {
+            repository_id: _metrics_from_results(repository_id, results, period_start, period_end)
+            for repository_id, results in cached.items()
+        }
+
+        stale = [repository_id for repository_id in dict.fromkeys(repository_ids) if repository_id not in metrics]
+        if stale:
+            calculate = self.calculate_dora_metrics_batch if vectorized else self.calculate_dora_metrics_from_events
+            calculated = calculate(period_start, period_end, stale)
+            self.save_dora_metrics_batch(calculated.values())
+            metrics.update(calculated)
+        return metrics
+
+    def active_repositories(self, period_start: datetime, period_end: datetime) -> List[str]:
+        """Ids of repositories with deployment or incident events in the period"""
+        m = ea_metrics
+        query = select(m.c.repository_id).distinct().where(
+            m.c.metric_type.in_([METRIC_DEPLOYMENT, METRIC_INCIDENT]),
+            m.c.period_type == EVENT_PERIOD_TYPE,
+            m.c.repository_id.isnot(None),
+            m.c.period_start >= period_start,
+            m.c.period_start < period_end,
+        )
+        return sorted(self.db.execute(query).scalars())
+
+    def source_watermarks(
+        self, period_start: datetime, period_end: datetime, repository_ids: List[str]
+    ) -> Dict[str, datetime]:
+        """
+        Latest change per repository to the events its metrics for the period are
+        computed from: deployment and incident events, including incidents up to
+        dora_failure_window_hours after the period, and the commits of its
+        deployments, which set their lead time and are often stored later
+        """
+        m = ea_metrics
+        window_end = period_end + timedelta(hours=self.settings.dora_failure_window_hours)
+        query = (
+            select(m.c.repository_id, func.max(m.c.updated_at))
+            .where(
+                m.c.metric_type.in_([METRIC_DEPLOYMENT, METRIC_INCIDENT]),
+                m.c.period_type == EVENT_PERIOD_TYPE,
+                m.c.repository_id.in_(repository_ids),
+                m.c.period_start >= period_start,
+                m.c.period_start < window_end,
+            )
+            .group_by(m.c.repository_id)
+        )
+        watermarks = dict(self.db.execute(query).all())
+        for repository_id, _, stored_at in self.deployment_commits(period_start, period_end, repository_ids):
+            if stored_at and (watermarks.get(repository_id) is None or stored_at > watermarks[repository_id]):
+                watermarks[repository_id] = stored_at
+        return watermarks
+
+    def deployment_commits(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        repository_ids: Optional[List[str]] = None,
+        stored_after: Optional[datetime] = None,
+    ) -> list:
+        """
+        (repository_id, deployed_at, stored_at) of the deployments in the period
+        whose commit is in ea_activities, stored_at being when the collector stored
+        the commit; only commits stored after `stored_after` when given
+        """
+        m = ea_metrics
+        commit = ea_activities
+        query = (
+            select(m.c.repository_id, m.c.period_start, commit.c.created_at)
+            .join(
+                commit,
+                (commit.c.activity_type == ACTIVITY_COMMIT)
+                & (commit.c.external_id == m.c["metadata"]["commit_sha"].as_string()),
+            )
+            .where(*self._event_criteria(METRIC_DEPLOYMENT, period_start, period_end, repository_ids))
+        )
+        if stored_after is not None:
+            query = query.where(commit.c.created_at > stored_after)
+        return self.db.execute(query).all()
+
+    def calculate_dora_metrics_batch(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        repository_ids: Optional[List[str]] = None,
+    ) -> Dict[str, DORAMetrics]:
+        """
+        Same metrics as calculate_dora_metrics_from_events, for bulk runs over many
+        repositories: deployments and incidents are loaded once into DataFrames
+        and every metric is a grouped vectorized operation. Also reports the
+        lead-time median and p90.
+        """
+        days_in_period = (period_end - period_start).days or 1
+        calculated_at = datetime.utcnow()
+        deploys = self.load_deployment_outcomes(period_start, period_end, repository_ids)
+        incidents = self.load_incidents(period_start, period_end, repository_ids)
+
+        lead_hours = deploys.groupby("repository_id")["lead_hours"]
+        deploy_stats = pd.DataFrame({
+            "deployments": deploys.groupby("repository_id").size(),
+            "failed_deployments": deploys.groupby("repository_id")["failed"].sum(),
+            "lead_time_mean": lead_hours.mean(),
+            "lead_time_median": lead_hours.median(),
+            "lead_time_p90": lead_hours.quantile(0.9),
+        })
+
+        recovery_hours = (incidents["ended_at"] - incidents["started_at"]).dt.total_seconds() / 3600
+        incident_stats = pd.DataFrame({
+            "incidents": incidents.groupby("repository_id").size(),
+            # Unresolved incidents (ended_at == started_at) have no recovery time yet
+            "recovery_mean": recovery_hours.where(recovery_hours > 0).groupby(incidents["repository_id"]).mean(),
+        })
+
+        stats = deploy_stats.join(incident_stats, how="outer")
+        stats[["deployments", "failed_deployments", "incidents"]] = (
+            stats[["deployments", "failed_deployments", "incidents"]].fillna(0).astype(int)
+        )
+        stats["deployment_frequency"] = stats["deployments"] / days_in_period
+        stats["change_failure_rate"] = np.where(
+            stats["deployments"] > 0, stats["failed_deployments"] / stats["deployments"].clip(lower=1) * 100, 0.0
+        )
+
+        metrics = {
+            row.Index: DORAMetrics(
+                repository_id=row.Index,
+                deployment_frequency=round(float(row.deployment_frequency), 2),
+                lead_time_for_changes=_round(row.lead_time_mean),
+                change_failure_rate=round(float(row.change_failure_rate), 2),
+                mean_time_to_recovery=_round(row.recovery_mean),
+                period_start=period_start,
+                period_end=period_end,
+                calculated_at=calculated_at,
+                deployment_count=int(row.deployments),
+                incident_count=int(row.incidents),
+                lead_time_median=_round(row.lead_time_median),
+                lead_time_p90=_round(row.lead_time_p90),
+            )
+            for row in stats.itertuples()
+        }
+        return self._fill_missing(metrics, repository_ids, period_start, period_end, calculated_at)
+
+    def load_deployment_outcomes(
+        self, period_start: datetime, period_end: datetime, repository_ids: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        One row per deployment in the period: repository_id, deployed_at,
+        committed_at, lead_hours and whether it failed (an incident on the same
+        repository within dora_failure_window_hours and before the next deployment)
+        """
+        window = pd.Timedelta(hours=self.settings.dora_failure_window_hours)
+        deploys = self._load_deployments(period_start, period_end, repository_ids)
+        # Incidents shortly after the period can still fail a deployment inside it
+        incidents = self.load_incidents(period_start, period_end + window.to_pytimedelta(), repository_ids)
+
+        deploys = deploys.sort_values(["repository_id", "deployed_at"], ignore_index=True)
+        deploys["next_deployed_at"] = deploys.groupby("repository_id")["deployed_at"].shift(-1)
+        deploys["lead_hours"] = (deploys["deployed_at"] - deploys["committed_at"]).dt.total_seconds() / 3600
+
+        # First incident on the same repository at or after each deployment, within the window
+        first_incident = pd.merge_asof(
+            deploys.sort_values("deployed_at"),
+            incidents[["repository_id", "started_at"]].sort_values("started_at"),
+            left_on="deployed_at",
+            right_on="started_at",
+            by="repository_id",
+            direction="forward",
+            tolerance=window,
+        )
+        first_incident["failed"] = first_incident["started_at"].notna() & (
+            first_incident["next_deployed_at"].isna()
+            | (first_incident["started_at"] < first_incident["next_deployed_at"])
+        )
+        return first_incident.drop(columns=["started_at", "next_deployed_at"])
+
+    def _load_deployments(
+        self, period_start: datetime, period_end: datetime, repository_ids: Optional[List[str]]
+    ) -> pd.DataFrame:
+        m = ea_metrics
+        commit_sha = m.c["metadata"]["commit_sha"].as_string()
+        committed_at = (
+            select(func.min(ea_activities.c.occurred_at))
+            .where(ea_activities.c.activity_type == ACTIVITY_COMMIT, ea_activities.c.external_id == commit_sha)
+            .scalar_subquery()
+        )
+        query = select(m.c.repository_id, m.c.period_start, committed_at).where(
+            *self._event_criteria(METRIC_DEPLOYMENT, period_start, period_end, repository_ids)
+        )
+        return _frame(self.db.execute(query).all(), ["repository_id", "deployed_at", "committed_at"])
+
+    def load_incidents(
+        self, period_start: datetime, period_end: datetime, repository_ids: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Incidents starting in the period: repository_id, started_at, ended_at (== started_at while unresolved)"""
+        m = ea_metrics
+        query = select(m.c.repository_id, m.c.period_start, m.c.period_end).where(
+            *self._event_criteria(METRIC_INCIDENT, period_start, period_end, repository_ids)
+        )
+        return _frame(self.db.execute(query).all(), ["repository_id", "started_at", "ended_at"])
+
+    @staticmethod
+    def _event_criteria(
+        metric_type: str, period_start: datetime, period_end: datetime, repository_ids: Optional[List[str]]
+    ) -> list:
+        m = ea_metrics
+        criteria = [
+            m.c.metric_type == metric_type,
+            m.c.period_type == EVENT_PERIOD_TYPE,
+            m.c.repository_id.isnot(None),
+            m.c.period_start >= period_start,
+            m.c.period_start < period_end,
+        ]
+        if repository_ids:
+            criteria.append(m.c.repository_id.in_(repository_ids))
+        return criteria
+
+    @staticmethod
+    def _fill_missing(
+        metrics: Dict[str, DORAMetrics],
+        repository_ids: Optional[List[str]],
+        period_start: datetime,
+        period_end: datetime,
+        calculated_at: datetime,
+    ) -> Dict[str, DORAMetrics]:
+        """Requested repositories without any events get zero frequency and failure rate"""
+        for repository_id in repository_ids or []:
+            if repository_id not in metrics:
+                metrics[repository_id] = DORAMetrics(
+                    repository_id=repository_id,
+                    deployment_frequency=0.0,
+                    lead_time_for_changes=None,
+                    change_failure_rate=0.0,
+                    mean_time_to_recovery=None,
+                    period_start=period_start,
+                    period_end=period_end,
+                    calculated_at=calculated_at,
+                )
+        return metrics
+
+    def _dora_statement(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        repository_ids: Optional[List[str]],
+    ) -> Select:
+        m = ea_metrics
+
+        def events(metric_type: str) -> list:
+            return self._event_criteria(metric_type, period_start, period_end, repository_ids)
+
+        deploys = (
+            select(
+                m.c.repository_id,
+                m.c.period_start.label("deployed_at"),
+                m.c["metadata"]["commit_sha"].as_string().label("commit_sha"),
+                func.lead(m.c.period_start)
+                .over(partition_by=m.c.repository_id, order_by=m.c.period_start)
+                .label("next_deployed_at"),
+            )
+            .where(*events(METRIC_DEPLOYMENT))
+            .cte("deploys")
+        )
+
+        incident = ea_metrics.alias("incident")
+        caused_incident = exists().where(
+            incident.c.metric_type == METRIC_INCIDENT,
+            incident.c.period_type == EVENT_PERIOD_TYPE,
+            incident.c.repository_id == deploys.c.repository_id,
+            incident.c.period_start >= deploys.c.deployed_at,
+            seconds_between(deploys.c.deployed_at, incident.c.period_start)
+            <= self.settings.dora_failure_window_hours * 3600,
+            or_(deploys.c.next_deployed_at.is_(None), incident.c.period_start < deploys.c.next_deployed_at),
+        )
+        committed_at = (
+            select(func.min(ea_activities.c.occurred_at))
+            .where(
+                ea_activities.c.activity_type == ACTIVITY_COMMIT,
+                ea_activities.c.external_id == deploys.c.commit_sha,
+            )
+            .scalar_subquery()
+        )
+        per_deploy = select(
+            deploys.c.repository_id,
+            case((caused_incident, 1), else_=0).label("failed"),
+            seconds_between(committed_at, deploys.c.deployed_at).label("lead_seconds"),
+        ).subquery("per_deploy")
+
+        deploy_stats = (
+            select(
+                per_deploy.c.repository_id,
+                func.count().label("deployments"),
+                func.sum(per_deploy.c.failed).label("failed_deployments"),
+                func.avg(per_deploy.c.lead_seconds).label("lead_time_seconds"),
+            )
+            .group_by(per_deploy.c.repository_id)
+            .cte("deploy_stats")
+        )
+        incident_stats = (
+            select(
+                m.c.repository_id,
+                func.count().label("incidents"),
+                func.avg(
+                    case((m.c.period_end > m.c.period_start, seconds_between(m.c.period_start, m.c.period_end)))
+                ).label("recovery_seconds"),
+            )
+            .where(*events(METRIC_INCIDENT))
+            .group_by(m.c.repository_id)
+            .cte("incident_stats")
+        )
+
+        repositories = union(
+            select(deploy_stats.c.repository_id), select(incident_stats.c.repository_id)
+        ).subquery("repositories")
+        return select(
+            repositories.c.repository_id,
+            deploy_stats.c.deployments,
+            deploy_stats.c.failed_deployments,
+            deploy_stats.c.lead_time_seconds,
+            incident_stats.c.incidents,
+            incident_stats.c.recovery_seconds,
+        ).select_from(
+            repositories.outerjoin(
+                deploy_stats, deploy_stats.c.repository_id == repositories.c.repository_id
+            ).outerjoin(
+                incident_stats, incident_stats.c.repository_id == repositories.c.repository_id
+            )
+        )
 
     def calculate_dora_metrics(
         self,
@@ -83,50 +498,57 @@ class DORAService:
         )
 
     def save_dora_metrics(self, metrics: DORAMetrics) -> None:
-        kpi_records = [
-            KPIResult(
-                entity_type="repository",
-                entity_id=metrics.repository_id,
-                kpi_type=KPIType.DORA_DEPLOYMENT_FREQUENCY,
-                value=metrics.deployment_frequency,
-                unit="per_day",
-                period_start=metrics.period_start,
-                period_end=metrics.period_end,
-                period_type="custom",
-            ),
-            KPIResult(
-                entity_type="repository",
-                entity_id=metrics.repository_id,
-                kpi_type=KPIType.DORA_LEAD_TIME,
-                value=metrics.lead_time_for_changes,
-                unit="hours",
-                period_start=metrics.period_start,
-                period_end=metrics.period_end,
-                period_type="custom",
-            ),
-            KPIResult(
-                entity_type="repository",
-                entity_id=metrics.repository_id,
-                kpi_type=KPIType.DORA_CHANGE_FAILURE_RATE,
-                value=metrics.change_failure_rate,
-                unit="percentage",
-                period_start=metrics.period_start,
-                period_end=metrics.period_end,
-                period_type="custom",
-            ),
-            KPIResult(
-                entity_type="repository",
-                entity_id=metrics.repository_id,
-                kpi_type=KPIType.DORA_MTTR,
-                value=metrics.mean_time_to_recovery,
-                unit="hours",
-                period_start=metrics.period_start,
-                period_end=metrics.period_end,
-                period_type="custom",
-            ),
-        ]
-        self.db.add_all(kpi_records)
+        self.save_dora_metrics_batch([metrics])
+
+    def save_dora_metrics_batch(self, metrics: Iterable[DORAMetrics]) -> int:
+        """Insert the KPI rows of many repositories in one executemany; returns the row count"""
+        rows = [row for repository_metrics in metrics for row in self._dora_rows(repository_metrics)]
+        upsert_kpi_results(self.db, rows)
         self.db.commit()
+        return len(rows)
+
+    @staticmethod
+    def _dora_rows(metrics: DORAMetrics) -> List[dict]:
+        # The rows of one calculation share calculated_at, which is how KPICache groups them
+        common = {
+            "entity_type": "repository",
+            "entity_id": metrics.repository_id,
+            "period_start": metrics.period_start,
+            "period_end": metrics.period_end,
+            "period_type": "custom",
+            "calculated_at": metrics.calculated_at,
+        }
+        rows = [
+            {
+                **common,
+                "kpi_type": KPIType.DORA_DEPLOYMENT_FREQUENCY,
+                "value": metrics.deployment_frequency,
+                "unit": "per_day",
+                "metadata_": {"deployments": metrics.deployment_count, "incidents": metrics.incident_count},
+            },
+            {
+                **common,
+                "kpi_type": KPIType.DORA_LEAD_TIME,
+                "value": metrics.lead_time_for_changes,
+                "unit": "hours",
+                "metadata_": {"median": metrics.lead_time_median, "p90": metrics.lead_time_p90},
+            },
+            {
+                **common,
+                "kpi_type": KPIType.DORA_CHANGE_FAILURE_RATE,
+                "value": metrics.change_failure_rate,
+                "unit": "percentage",
+            },
+            {
+                **common,
+                "kpi_type": KPIType.DORA_MTTR,
+                "value": metrics.mean_time_to_recovery,
+                "unit": "hours",
+                "metadata_": {"incidents": metrics.incident_count},
+            },
+        ]
+        # Lead time and MTTR are unknown without samples; store nothing rather than a made-up value
+        return [row for row in rows if row["value"] is not None]
 
     def get_dora_performance_level(self, metrics: DORAMetrics) -> str:
         score = 0
@@ -134,11 +556,11 @@ class DORAService:
         # Elite performers: daily deploys, < 1 hour lead time, < 15% CFR, < 1 hour MTTR
         if metrics.deployment_frequency >= 1:
             score += 1
-        if metrics.lead_time_for_changes < 24:
+        if metrics.lead_time_for_changes is not None and metrics.lead_time_for_changes < 24:
             score += 1
         if metrics.change_failure_rate < 15:
             score += 1
-        if metrics.mean_time_to_recovery < 1:
+        if metrics.mean_time_to_recovery is not None and metrics.mean_time_to_recovery < 1:
             score += 1
 
         if score >= 4:
@@ -149,3 +571,45 @@ class DORAService:
             return "medium"
         else:
             return "low"
+
+
+def _metrics_from_results(
+    repository_id: str, results: Dict[KPIType, KPIResult], period_start: datetime, period_end: datetime
+) -> DORAMetrics:
+    """Rebuild DORAMetrics from the KPIResult rows of one stored calculation"""
+    frequency = results[KPIType.DORA_DEPLOYMENT_FREQUENCY]
+    lead_time = results.get(KPIType.DORA_LEAD_TIME)
+    failure_rate = results.get(KPIType.DORA_CHANGE_FAILURE_RATE)
+    mttr = results.get(KPIType.DORA_MTTR)
+    counts = frequency.metadata_ or {}
+    lead_time_stats = (lead_time.metadata_ or {}) if lead_time is not None else {}
+    return DORAMetrics(
+        repository_id=repository_id,
+        deployment_frequency=frequency.value,
+        lead_time_for_changes=lead_time.value if lead_time is not None else None,
+        change_failure_rate=failure_rate.value if failure_rate is not None else 0.0,
+        mean_time_to_recovery=mttr.value if mttr is not None else None,
+        period_start=period_start,
+        period_end=period_end,
+        calculated_at=frequency.calculated_at,
+        deployment_count=counts.get("deployments", 0),
+        incident_count=counts.get("incidents", 0),
+        lead_time_median=lead_time_stats.get("median"),
+        lead_time_p90=lead_time_stats.get("p90"),
+    )
+
+
+def _hours(seconds: Optional[float]) -> Optional[float]:
+    # EXTRACT(EPOCH ...) is NUMERIC on PostgreSQL
+    return round(float(seconds) / 3600, 2) if seconds is not None else None
+
+
+def _round(value: float) -> Optional[float]:
+    return None if pd.isna(value) else round(float(value), 2)
+
+
+def _frame(rows: list, columns: List[str]) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=columns)
+    for column in columns[1:]:
+        frame[column] = pd.to_datetime(frame[column])
+    return frame
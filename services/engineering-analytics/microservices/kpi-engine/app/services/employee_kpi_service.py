@@ -4,11 +4,36 @@ Associated Frontend Files:
   - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
 """
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List, Sequence, Tuple
 from dataclasses import dataclass
+from uuid import UUID
+import numpy as np
+import pandas as pd
+from sqlalchemy import Select, and_, case, func, select, union
 from sqlalchemy.orm import Session
 
-from app.models.kpi_result import KPIResult, KPIType
+from app.config import get_settings
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+from app.models.kpi_sketch import SKETCH_CYCLE_TIME, SKETCH_LEAD_TIME, upsert_kpi_sketches
+from app.models.source_tables import (
+    ACTIVITY_CODE_REVIEW,
+    ACTIVITY_COMMIT,
+    ACTIVITY_ISSUE_COMPLETED,
+    ACTIVITY_PULL_REQUEST,
+    CLOSED_PULL_REQUEST_STATES,
+    METRIC_CYCLE_TIME,
+    METRIC_LEAD_TIME,
+    ea_activities,
+    ea_metrics,
+)
+from app.services.batch import input_column, mean_of_lists
+from app.services.rollup_service import RollupService
+from app.services.sketch import sketches_by_group
+from app.services.sketch_service import sketch_row
+
+
+# ea_metrics.metric_type of flow-time samples -> ea_kpi_sketches.metric
+FLOW_TIME_SKETCHES = {METRIC_LEAD_TIME: SKETCH_LEAD_TIME, METRIC_CYCLE_TIME: SKETCH_CYCLE_TIME}
 
 
 @dataclass
@@ -28,9 +53,159 @@ class EmployeeKPIs:
     productivity_score: float
 
 
+@dataclass
+class EmployeeActivityInput:
+    """Activity of one employee over the period"""
+    employee_id: str
+    commits: int = 0
+    prs_opened: int = 0
+    prs_closed: int = 0
+    code_reviews: int = 0
+    issues_completed: int = 0
+    lead_times: Optional[List[float]] = None
+    cycle_times: Optional[List[float]] = None
+    # Averages aggregated elsewhere (e.g. in SQL); used instead of the sample lists when set
+    average_lead_time: Optional[float] = None
+    average_cycle_time: Optional[float] = None
+
+
 class EmployeeKPIService:
     def __init__(self, db: Session):
         self.db = db
+        self.settings = get_settings()
+
+    def calculate_employee_kpis_from_activity(
+        self,
+        employee_ids: Sequence[str],
+        period: str,
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None,
+    ) -> List[EmployeeKPIs]:
+        """KPIs from the activities and lead/cycle time metrics the collector stored for the period"""
+        period_start, period_end = resolve_period(period, period_start, period_end)
+        return self.calculate_employee_kpis_batch(
+            self.load_activity_inputs(employee_ids, period_start, period_end), period, period_start, period_end
+        )
+
+    def active_employees(self, period_start: datetime, period_end: datetime) -> List[str]:
+        """Ids of employees with activities or lead/cycle time samples in the period"""
+        a, m = ea_activities, ea_metrics
+        query = union(
+            select(a.c.employee_id).where(
+                a.c.employee_id.isnot(None), a.c.occurred_at >= period_start, a.c.occurred_at < period_end
+            ),
+            select(m.c.employee_id).where(
+                m.c.employee_id.isnot(None),
+                m.c.metric_type.in_([METRIC_LEAD_TIME, METRIC_CYCLE_TIME]),
+                m.c.period_start >= period_start,
+                m.c.period_start < period_end,
+            ),
+        )
+        return sorted(str(employee_id) for employee_id in self.db.execute(query).scalars())
+
+    def load_activity_inputs(
+        self,
+        employee_ids: Sequence[str],
+        period_start: datetime,
+        period_end: datetime,
+    ) -> List[EmployeeActivityInput]:
+        """
+        Activity counts and average lead/cycle times per employee from ea_activities
+        and ea_metrics, one grouped statement per employee_kpi_query_batch_size
+        employees. Employees without activity (or whose id is not a UUID the
+        collector could have recorded) get zero counts. Pulled and webhook
+        activities count once the collector has matched their author to the
+        employee (ea_employee_identities).
+        """
+        ids = [(employee_id, _as_uuid(employee_id)) for employee_id in employee_ids]
+        known = list({uuid for _, uuid in ids if uuid is not None})
+        size = self.settings.employee_kpi_query_batch_size
+
+        rows: Dict[UUID, object] = {}
+        for offset in range(0, len(known), size):
+            statement = self._activity_statement(known[offset:offset + size], period_start, period_end)
+            rows.update((row.employee_id, row) for row in self.db.execute(statement))
+
+        inputs = []
+        for employee_id, uuid in ids:
+            row = rows.get(uuid)
+            if row is None:
+                inputs.append(EmployeeActivityInput(employee_id=employee_id))
+                continue
+            inputs.append(EmployeeActivityInput(
+                employee_id=employee_id,
+                commits=int(row.commits or 0),
+                prs_opened=int(row.prs_opened or 0),
+                prs_closed=int(row.prs_closed or 0),
+                code_reviews=int(row.code_reviews or 0),
+                issues_completed=int(row.issues_completed or 0),
+                average_lead_time=row.average_lead_time,
+                average_cycle_time=row.average_cycle_time,
+            ))
+        return inputs
+
+    def _activity_statement(self, employee_ids: List[UUID], period_start: datetime, period_end: datetime) -> Select:
+        a = ea_activities
+        m = ea_metrics
+
+        def count_of(*criteria):
+            return func.sum(case((and_(*criteria), 1), else_=0))
+
+        pull_request = a.c.activity_type == ACTIVITY_PULL_REQUEST
+        activity_counts = (
+            select(
+                a.c.employee_id,
+                count_of(a.c.activity_type == ACTIVITY_COMMIT).label("commits"),
+                count_of(pull_request).label("prs_opened"),
+                count_of(
+                    pull_request, a.c.raw_data["state"].as_string().in_(CLOSED_PULL_REQUEST_STATES)
+                ).label("prs_closed"),
+                count_of(a.c.activity_type == ACTIVITY_CODE_REVIEW).label("code_reviews"),
+                count_of(a.c.activity_type == ACTIVITY_ISSUE_COMPLETED).label("issues_completed"),
+            )
+            .where(
+                a.c.employee_id.in_(employee_ids),
+                a.c.occurred_at >= period_start,
+                a.c.occurred_at < period_end,
+            )
+            .group_by(a.c.employee_id)
+            .cte("activity_counts")
+        )
+        flow_times = (
+            select(
+                m.c.employee_id,
+                func.avg(case((m.c.metric_type == METRIC_LEAD_TIME, m.c.value))).label("average_lead_time"),
+                func.avg(case((m.c.metric_type == METRIC_CYCLE_TIME, m.c.value))).label("average_cycle_time"),
+            )
+            .where(
+                m.c.employee_id.in_(employee_ids),
+                m.c.metric_type.in_([METRIC_LEAD_TIME, METRIC_CYCLE_TIME]),
+                m.c.period_start >= period_start,
+                m.c.period_start < period_end,
+            )
+            .group_by(m.c.employee_id)
+            .cte("flow_times")
+        )
+
+        employees = union(
+            select(activity_counts.c.employee_id), select(flow_times.c.employee_id)
+        ).subquery("employees")
+        return select(
+            employees.c.employee_id,
+            activity_counts.c.commits,
+            activity_counts.c.prs_opened,
+            activity_counts.c.prs_closed,
+            activity_counts.c.code_reviews,
+            activity_counts.c.issues_completed,
+            flow_times.c.average_lead_time,
+            flow_times.c.average_cycle_time,
+        ).select_from(
+            employees.outerjoin(
+                activity_counts, activity_counts.c.employee_id == employees.c.employee_id
+            ).outerjoin(
+                flow_times, flow_times.c.employee_id == employees.c.employee_id
+            )
+        )
 
     def calculate_employee_kpis(
         self,
@@ -46,31 +221,52 @@ class EmployeeKPIService:
         lead_times: Optional[List[float]] = None,
         cycle_times: Optional[List[float]] = None,
     ) -> EmployeeKPIs:
-        now = datetime.utcnow()
-
-        # Calculate period dates if not provided
-        if not period_start or not period_end:
-            if period == "week":
-                period_start = now - timedelta(days=7)
-            elif period == "sprint":
-                period_start = now - timedelta(days=14)
-            else:  # month
-                period_start = now - timedelta(days=30)
-            period_end = now
+        activity = EmployeeActivityInput(
+            employee_id=employee_id,
+            commits=commits,
+            prs_opened=prs_opened,
+            prs_closed=prs_closed,
+            code_reviews=code_reviews,
+            issues_completed=issues_completed,
+            lead_times=lead_times,
+            cycle_times=cycle_times,
+        )
+        return self.calculate_employee_kpis_batch([activity], period, period_start, period_end)[0]
+
+    def calculate_employee_kpis_batch(
+        self,
+        inputs: Sequence[EmployeeActivityInput],
+        period: str,
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None,
+    ) -> List[EmployeeKPIs]:
+        """KPIs for many employees over the same period, as NumPy vector math over the activity columns"""
+        period_start, period_end = resolve_period(period, period_start, period_end)
 
         # Calculate average lead and cycle times
-        avg_lead_time = sum(lead_times) / len(lead_times) if lead_times else 0.0
-        avg_cycle_time = sum(cycle_times) / len(cycle_times) if cycle_times else 0.0
+        avg_lead_time = input_column(inputs, "average_lead_time", np.nan)
+        avg_lead_time = np.where(
+            np.isnan(avg_lead_time), mean_of_lists([entity.lead_times for entity in inputs]), avg_lead_time
+        )
+        avg_cycle_time = input_column(inputs, "average_cycle_time", np.nan)
+        avg_cycle_time = np.where(
+            np.isnan(avg_cycle_time), mean_of_lists([entity.cycle_times for entity in inputs]), avg_cycle_time
+        )
 
         # Calculate productivity score (normalized 0-100)
         days_in_period = (period_end - period_start).days or 1
+        commits = input_column(inputs, "commits", 0)
+        prs_opened = input_column(inputs, "prs_opened", 0)
+        prs_closed = input_column(inputs, "prs_closed", 0)
+        code_reviews = input_column(inputs, "code_reviews", 0)
+        issues_completed = input_column(inputs, "issues_completed", 0)
         commits_per_day = commits / days_in_period
         prs_per_day = (prs_opened + prs_closed) / 2 / days_in_period
         reviews_per_day = code_reviews / days_in_period
         issues_per_day = issues_completed / days_in_period
 
         # Productivity based on typical benchmarks
-        productivity_score = min(100, (
+        productivity_score = np.minimum(100, (
             (commits_per_day / 2) * 25 +  # expect ~2 commits/day
             (prs_per_day / 0.5) * 25 +  # expect ~0.5 PRs/day
             (reviews_per_day / 1) * 25 +  # expect ~1 review/day
@@ -80,54 +276,111 @@ class EmployeeKPIService:
         # Quality score (simplified - would normally come from code analysis)
         quality_score = 75.0  # Default baseline
 
-        return EmployeeKPIs(
-            employee_id=employee_id,
-            period=period,
-            period_start=period_start,
-            period_end=period_end,
-            commits=commits,
-            pull_requests_opened=prs_opened,
-            pull_requests_closed=prs_closed,
-            code_reviews=code_reviews,
-            issues_completed=issues_completed,
-            average_lead_time=round(avg_lead_time, 2),
-            average_cycle_time=round(avg_cycle_time, 2),
-            quality_score=round(quality_score, 2),
-            productivity_score=round(productivity_score, 2),
+        columns = zip(
+            inputs,
+            np.round(avg_lead_time, 2).tolist(),
+            np.round(avg_cycle_time, 2).tolist(),
+            np.round(productivity_score, 2).tolist(),
         )
+        return [
+            EmployeeKPIs(
+                employee_id=entity.employee_id,
+                period=period,
+                period_start=period_start,
+                period_end=period_end,
+                commits=entity.commits,
+                pull_requests_opened=entity.prs_opened,
+                pull_requests_closed=entity.prs_closed,
+                code_reviews=entity.code_reviews,
+                issues_completed=entity.issues_completed,
+                average_lead_time=lead_time,
+                average_cycle_time=cycle_time,
+                quality_score=round(quality_score, 2),
+                productivity_score=productivity,
+            )
+            for entity, lead_time, cycle_time, productivity in columns
+        ]
 
     def save_employee_kpis(self, kpis: EmployeeKPIs) -> None:
-        kpi_records = [
-            KPIResult(
-                entity_type="employee",
-                entity_id=kpis.employee_id,
-                kpi_type=KPIType.PRODUCTIVITY_SCORE,
-                value=kpis.productivity_score,
-                unit="score",
-                period_start=kpis.period_start,
-                period_end=kpis.period_end,
-                period_type=kpis.period,
-                metadata={
-                    "commits": kpis.commits,
-                    "pull_requests_opened": kpis.pull_requests_opened,
-                    "pull_requests_closed": kpis.pull_requests_closed,
-                    "code_reviews": kpis.code_reviews,
-                    "issues_completed": kpis.issues_completed,
+        self.save_employee_kpis_batch([kpis])
+
+    def save_employee_kpis_batch(self, kpis: Sequence[EmployeeKPIs], rollup: bool = True) -> int:
+        """
+        Store the KPI rows of many employees in one executemany and refresh the
+        rollups of their teams and orgs (unless the caller rolls up itself once
+        all employees are saved); returns the employee row count
+        """
+        rows = []
+        for employee_kpis in kpis:
+            common = {
+                "entity_type": "employee",
+                "entity_id": employee_kpis.employee_id,
+                "unit": "score",
+                "period_start": employee_kpis.period_start,
+                "period_end": employee_kpis.period_end,
+                "period_type": employee_kpis.period,
+            }
+            rows.append({
+                **common,
+                "kpi_type": KPIType.PRODUCTIVITY_SCORE,
+                "value": employee_kpis.productivity_score,
+                "metadata_": {
+                    "commits": employee_kpis.commits,
+                    "pull_requests_opened": employee_kpis.pull_requests_opened,
+                    "pull_requests_closed": employee_kpis.pull_requests_closed,
+                    "code_reviews": employee_kpis.code_reviews,
+                    "issues_completed": employee_kpis.issues_completed,
                 },
-            ),
-            KPIResult(
-                entity_type="employee",
-                entity_id=kpis.employee_id,
-                kpi_type=KPIType.QUALITY_SCORE,
-                value=kpis.quality_score,
-                unit="score",
-                period_start=kpis.period_start,
-                period_end=kpis.period_end,
-                period_type=kpis.period,
-            ),
-        ]
-        self.db.add_all(kpi_records)
+            })
+            rows.append({**common, "kpi_type": KPIType.QUALITY_SCORE, "value": employee_kpis.quality_score})
+        upsert_kpi_results(self.db, rows)
+        self._save_flow_time_sketches(kpis)
+        if rollup:
+            # Larger teams and orgs are left to the recompute job's exact pass
+            RollupService(self.db).rollup_employees(
+                [employee_kpis.employee_id for employee_kpis in kpis],
+                {(employee_kpis.period, employee_kpis.period_start, employee_kpis.period_end) for employee_kpis in kpis},
+                max_members=self.settings.rollup_inline_max_members,
+            )
         self.db.commit()
+        return len(rows)
+
+    def _save_flow_time_sketches(self, kpis: Sequence[EmployeeKPIs]) -> None:
+        """Lead and cycle time sketches per employee and saved period, from the collector's samples"""
+        by_period: Dict[Tuple[str, datetime, datetime], Dict[UUID, str]] = {}
+        for employee_kpis in kpis:
+            uuid = _as_uuid(employee_kpis.employee_id)
+            if uuid is not None:
+                key = (employee_kpis.period, employee_kpis.period_start, employee_kpis.period_end)
+                by_period.setdefault(key, {})[uuid] = employee_kpis.employee_id
+
+        m = ea_metrics
+        size = self.settings.employee_kpi_query_batch_size
+        rows = []
+        for (period, period_start, period_end), employee_ids in by_period.items():
+            known = list(employee_ids)
+            samples = pd.DataFrame(
+                [
+                    sample
+                    for offset in range(0, len(known), size)
+                    for sample in self.db.execute(
+                        select(m.c.employee_id, m.c.metric_type, m.c.value).where(
+                            m.c.employee_id.in_(known[offset:offset + size]),
+                            m.c.metric_type.in_(list(FLOW_TIME_SKETCHES)),
+                            m.c.period_start >= period_start,
+                            m.c.period_start < period_end,
+                        )
+                    )
+                ],
+                columns=["employee_id", "metric_type", "value"],
+            )
+            grouped = sketches_by_group(
+                samples, ["employee_id", "metric_type"], "value", self.settings.kpi_sketch_relative_accuracy
+            )
+            for (uuid, metric_type), sketch in grouped.items():
+                metric = FLOW_TIME_SKETCHES[metric_type]
+                rows.append(sketch_row("employee", employee_ids[uuid], metric, period, period_start, period_end, sketch))
+        upsert_kpi_sketches(self.db, rows)
 
     def get_historical_kpis(
         self,
@@ -146,3 +399,29 @@ class EmployeeKPIService:
             .limit(limit)
             .all()
         )
+
+
+def resolve_period(
+    period: str,
+    period_start: Optional[datetime] = None,
+    period_end: Optional[datetime] = None,
+) -> Tuple[datetime, datetime]:
+    """Explicit bounds, or the trailing week/sprint/month ending now"""
+    if period_start and period_end:
+        return period_start, period_end
+
+    now = datetime.utcnow()
+    if period == "week":
+        period_start = now - timedelta(days=7)
+    elif period == "sprint":
+        period_start = now - timedelta(days=14)
+    else:  # month
+        period_start = now - timedelta(days=30)
+    return period_start, now
+
+
+def _as_uuid(value: str) -> Optional[UUID]:
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
@@ -0,0 +1,79 @@
+"""
+Read-through cache over stored KPI results
+
+A calculation is cached as the KPIResult rows it saved: they share the key
+(entity, period_type, period_start, period_end) and the same calculated_at.
+A stored calculation is served as long as it is at least as new as the
+entity's source watermark (the latest change to the data it was computed
+from), so repeated dashboard loads neither recompute nor write new rows.
+
+Associated Frontend Files:
+  - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.kpi_result import KPIResult, KPIType
+
+logger = logging.getLogger(__name__)
+
+
+class KPICache:
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def lookup(
+        self,
+        entity_type: str,
+        entity_ids: Sequence[str],
+        kpi_types: List[KPIType],
+        anchor: KPIType,
+        period_start: datetime,
+        period_end: datetime,
+        period_type: str,
+        watermarks: Dict[str, Optional[datetime]],
+    ) -> Dict[str, Dict[KPIType, KPIResult]]:
+        """
+        Latest fresh calculation per entity, as {entity_id: {kpi_type: row}}.
+        `anchor` is a KPI every calculation stores; the calculation is the set of
+        rows sharing its calculated_at, and KPIs missing from it could not be
+        computed at the time. Entities without a fresh calculation are left out.
+        """
+        if not self.settings.kpi_cache_enabled or not entity_ids:
+            return {}
+
+        rows = (
+            self.db.query(KPIResult)
+            .filter(
+                KPIResult.entity_type == entity_type,
+                KPIResult.entity_id.in_(set(entity_ids)),
+                KPIResult.kpi_type.in_(kpi_types),
+                KPIResult.period_type == period_type,
+                KPIResult.period_start == period_start,
+                KPIResult.period_end == period_end,
+            )
+            .order_by(KPIResult.calculated_at.desc())
+            .all()
+        )
+
+        by_entity: Dict[str, List[KPIResult]] = {}
+        for row in rows:
+            by_entity.setdefault(row.entity_id, []).append(row)
+
+        hits = {}
+        for entity_id, entity_rows in by_entity.items():
+            latest = next((row for row in entity_rows if row.kpi_type == anchor), None)
+            if latest is None:
+                continue
+            watermark = watermarks.get(entity_id)
+            if watermark is not None and latest.calculated_at < watermark:
+                continue
+            hits[entity_id] = {row.kpi_type: row for row in entity_rows if row.calculated_at == latest.calculated_at}
+
+        logger.debug(f"KPI cache: {len(hits)}/{len(set(entity_ids))} {entity_type} hits for {anchor.value}")
+        return hits
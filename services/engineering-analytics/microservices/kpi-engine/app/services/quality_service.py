@@ -1,14 +1,27 @@
 """
+Code quality scores of repositories
+
+Inputs come from the collector's ea_quality_snapshots (the latest SonarQube
+measures per project, keyed by project key = repository_id); inputs a
+repository has no measure for fall back to the scoring model defaults. The
+stored score records those inputs as unmeasured (None), so a re-score under
+another model applies that model's defaults instead of the old ones.
+Repositories without a snapshot are scored but not stored.
+
 Associated Frontend Files:
   - web/app/src/lib/api.ts (analyticsApi.metrics.codeQuality - lines 96)
   - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 from dataclasses import dataclass
+import numpy as np
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.models.kpi_result import KPIResult, KPIType
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+from app.models.source_tables import ea_quality_snapshots
+from app.services.scoring import SCORED_INPUTS, get_scoring_model
 
 
 @dataclass
@@ -20,6 +33,18 @@ class QualityMetrics:
     bug_density: float
     code_complexity: float
     calculated_at: datetime
+    scoring_model_version: int = 1
+    unmeasured: Tuple[str, ...] = ()  # inputs scored with the model default
+
+
+@dataclass
+class QualityInput:
+    """Measured inputs of one repository; None falls back to the baseline default"""
+    repository_id: str
+    code_coverage: Optional[float] = None
+    technical_debt_ratio: Optional[float] = None
+    bug_density: Optional[float] = None
+    code_complexity: Optional[float] = None
 
 
 class QualityService:
@@ -36,35 +61,83 @@ class QualityService:
         period_start: Optional[datetime] = None,
         period_end: Optional[datetime] = None,
     ) -> QualityMetrics:
-        # Default values if not provided
-        coverage = code_coverage if code_coverage is not None else 70.0
-        debt_ratio = technical_debt_ratio if technical_debt_ratio is not None else 5.0
-        bugs = bug_density if bug_density is not None else 0.5
-        complexity = code_complexity if code_complexity is not None else 10.0
-
-        # Calculate overall score (0-100)
-        # Weights: coverage 30%, debt 25%, bugs 25%, complexity 20%
-        coverage_score = min(coverage, 100)  # 0-100
-        debt_score = max(0, 100 - (debt_ratio * 5))  # lower is better
-        bug_score = max(0, 100 - (bugs * 50))  # lower is better
-        complexity_score = max(0, 100 - (complexity * 2))  # lower is better
-
-        overall = (
-            coverage_score * 0.30
-            + debt_score * 0.25
-            + bug_score * 0.25
-            + complexity_score * 0.20
+        """Score one repository; inputs not given are read from its quality snapshot"""
+        entity = QualityInput(
+            repository_id=repository_id,
+            code_coverage=code_coverage,
+            technical_debt_ratio=technical_debt_ratio,
+            bug_density=bug_density,
+            code_complexity=code_complexity,
         )
+        if None in (code_coverage, technical_debt_ratio, bug_density, code_complexity):
+            snapshot = self.load_quality_inputs([repository_id])[0]
+            for name in ("code_coverage", "technical_debt_ratio", "bug_density", "code_complexity"):
+                if getattr(entity, name) is None:
+                    setattr(entity, name, getattr(snapshot, name))
+        return self.calculate_quality_scores([entity])[0]
 
-        return QualityMetrics(
-            repository_id=repository_id,
-            overall_score=round(overall, 2),
-            code_coverage=round(coverage, 2),
-            technical_debt_ratio=round(debt_ratio, 2),
-            bug_density=round(bugs, 2),
-            code_complexity=round(complexity, 2),
-            calculated_at=datetime.utcnow(),
+    def load_quality_inputs(self, repository_ids: Optional[Sequence[str]] = None) -> List[QualityInput]:
+        """
+        Measured inputs of the given repositories (in order, empty for those
+        without a snapshot), or of every project with a snapshot, in one query
+        """
+        query = select(
+            ea_quality_snapshots.c.repository_id,
+            ea_quality_snapshots.c.code_coverage,
+            ea_quality_snapshots.c.technical_debt_ratio,
+            ea_quality_snapshots.c.bug_density,
+            ea_quality_snapshots.c.code_complexity,
+        )
+        if repository_ids is None:
+            return [QualityInput(*row) for row in self.db.execute(query.order_by(ea_quality_snapshots.c.repository_id))]
+
+        query = query.where(ea_quality_snapshots.c.repository_id.in_(list(repository_ids)))
+        snapshots = {row.repository_id: QualityInput(*row) for row in self.db.execute(query)}
+        return [
+            snapshots.get(repository_id) or QualityInput(repository_id=repository_id)
+            for repository_id in repository_ids
+        ]
+
+    def calculate_quality_scores_from_snapshots(
+        self, repository_ids: Optional[Sequence[str]] = None, model_version: Optional[int] = None
+    ) -> List[QualityMetrics]:
+        """Scores of the given repositories, or of every project with a quality snapshot"""
+        return self.calculate_quality_scores(self.load_quality_inputs(repository_ids), model_version)
+
+    def calculate_quality_scores(
+        self, inputs: Sequence[QualityInput], model_version: Optional[int] = None
+    ) -> List[QualityMetrics]:
+        """
+        Scores for many repositories at once under the configured quality scoring
+        model (or `model_version`), as NumPy vector math over the input columns
+        """
+        model = get_scoring_model("quality", model_version)
+        columns = model.input_columns(inputs)
+        overall = model.evaluate(columns)
+
+        calculated_at = datetime.utcnow()
+        columns = zip(
+            inputs,
+            np.round(overall, 2).tolist(),
+            np.round(columns["code_coverage"], 2).tolist(),
+            np.round(columns["technical_debt_ratio"], 2).tolist(),
+            np.round(columns["bug_density"], 2).tolist(),
+            np.round(columns["code_complexity"], 2).tolist(),
         )
+        return [
+            QualityMetrics(
+                repository_id=entity.repository_id,
+                overall_score=score,
+                code_coverage=cov,
+                technical_debt_ratio=debt,
+                bug_density=bug,
+                code_complexity=cplx,
+                calculated_at=calculated_at,
+                scoring_model_version=model.version,
+                unmeasured=tuple(name for name in SCORED_INPUTS["quality"] if getattr(entity, name) is None),
+            )
+            for entity, score, cov, debt, bug, cplx in columns
+        ]
 
     def save_quality_metrics(
         self,
@@ -72,24 +145,76 @@ class QualityService:
         period_start: datetime,
         period_end: datetime,
     ) -> None:
-        kpi_record = KPIResult(
-            entity_type="repository",
-            entity_id=metrics.repository_id,
-            kpi_type=KPIType.QUALITY_SCORE,
-            value=metrics.overall_score,
-            unit="score",
-            period_start=period_start,
-            period_end=period_end,
-            period_type="custom",
-            metadata={
-                "code_coverage": metrics.code_coverage,
-                "technical_debt_ratio": metrics.technical_debt_ratio,
-                "bug_density": metrics.bug_density,
-                "code_complexity": metrics.code_complexity,
-            },
-        )
-        self.db.add(kpi_record)
+        self.save_quality_metrics_batch([metrics], period_start, period_end)
+
+    def save_quality_metrics_batch(
+        self,
+        metrics: Sequence[QualityMetrics],
+        period_start: datetime,
+        period_end: datetime,
+    ) -> int:
+        """
+        Insert the KPI rows of many repositories in one executemany; returns the
+        row count. Repositories without any measure are not stored: their score
+        would be the model defaults alone.
+        """
+        rows = [
+            {
+                "entity_type": "repository",
+                "entity_id": repository_metrics.repository_id,
+                "kpi_type": KPIType.QUALITY_SCORE,
+                "value": repository_metrics.overall_score,
+                "unit": "score",
+                "period_start": period_start,
+                "period_end": period_end,
+                "period_type": "custom",
+                "metadata_": {
+                    # Unmeasured inputs are stored as None, not as the default they were scored with
+                    **{
+                        name: None if name in repository_metrics.unmeasured else getattr(repository_metrics, name)
+                        for name in SCORED_INPUTS["quality"]
+                    },
+                    "scoring_model_version": repository_metrics.scoring_model_version,
+                },
+            }
+            for repository_metrics in metrics
+            if len(repository_metrics.unmeasured) < len(SCORED_INPUTS["quality"])
+        ]
+        upsert_kpi_results(self.db, rows)
         self.db.commit()
+        return len(rows)
+
+    def rescore_quality_scores(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        model_version: Optional[int] = None,
+    ) -> List[QualityMetrics]:
+        """
+        Re-score every repository with a stored quality score for the period
+        under another scoring model version (default: the configured one), from
+        the inputs recorded with the scores, in one evaluation and one upsert
+        """
+        stored = self.db.query(KPIResult.entity_id, KPIResult.metadata_).filter(
+            KPIResult.entity_type == "repository",
+            KPIResult.kpi_type == KPIType.QUALITY_SCORE,
+            KPIResult.period_type == "custom",
+            KPIResult.period_start == period_start,
+            KPIResult.period_end == period_end,
+        ).all()
+        inputs = [
+            QualityInput(
+                repository_id=repository_id,
+                code_coverage=(metadata or {}).get("code_coverage"),
+                technical_debt_ratio=(metadata or {}).get("technical_debt_ratio"),
+                bug_density=(metadata or {}).get("bug_density"),
+                code_complexity=(metadata or {}).get("code_complexity"),
+            )
+            for repository_id, metadata in stored
+        ]
+        metrics = self.calculate_quality_scores(inputs, model_version)
+        self.save_quality_metrics_batch(metrics, period_start, period_end)
+        return metrics
 
     def get_quality_grade(self, score: float) -> str:
         if score >= 90:
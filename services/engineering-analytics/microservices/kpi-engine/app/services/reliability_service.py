@@ -1,14 +1,38 @@
 """
+Reliability scores of services
+
+Inputs come from the collector's Prometheus import: SYSTEM_UPTIME and
+INCIDENT_FREQUENCY rows of ea_metrics and the ea_service_latency series,
+aggregated over the scored period (hourly rows where a service has them,
+daily rows otherwise, so a range imported at both resolutions is not counted
+twice). Inputs a service has no data for fall back to the scoring model
+defaults, and are recorded as unmeasured (None) with the stored score so a
+re-score under another model applies that model's defaults; gRPC responses
+leave them unset so callers can tell measured inputs from defaults. Services
+with no data at all are scored but not stored.
+
 Associated Frontend Files:
   - web/app/src/lib/api.ts (analyticsApi.metrics - lines 93-97)
   - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
 """
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
+import numpy as np
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
-from app.models.kpi_result import KPIResult, KPIType
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+from app.models.source_tables import (
+    IMPORT_PERIOD_TYPES,
+    METRIC_INCIDENT,
+    METRIC_UPTIME,
+    ea_metrics,
+    ea_service_latency,
+)
+from app.services.scoring import SCORED_INPUTS, get_scoring_model
+
+SECONDS_PER_DAY = 86400.0
 
 
 @dataclass
@@ -20,6 +44,18 @@ class ReliabilityMetrics:
     error_rate: float
     latency_p99: float
     calculated_at: datetime
+    scoring_model_version: int = 1
+    unmeasured: Tuple[str, ...] = ()  # inputs scored with the model default
+
+
+@dataclass
+class ReliabilityInput:
+    """Observed inputs of one service; None falls back to the baseline default"""
+    service_id: str
+    uptime_percentage: Optional[float] = None
+    incident_frequency: Optional[float] = None
+    error_rate: Optional[float] = None
+    latency_p99: Optional[float] = None
 
 
 class ReliabilityService:
@@ -36,60 +72,255 @@ class ReliabilityService:
         period_start: Optional[datetime] = None,
         period_end: Optional[datetime] = None,
     ) -> ReliabilityMetrics:
-        # Default values if not provided
-        uptime = uptime_percentage if uptime_percentage is not None else 99.9
-        incidents = incident_frequency if incident_frequency is not None else 0.1
-        errors = error_rate if error_rate is not None else 0.1
-        latency = latency_p99 if latency_p99 is not None else 200.0
-
-        # Calculate overall score (0-100)
-        # Weights: uptime 40%, incidents 25%, errors 20%, latency 15%
-        uptime_score = uptime  # already 0-100
-        incident_score = max(0, 100 - (incidents * 100))  # lower is better
-        error_score = max(0, 100 - (errors * 100))  # lower is better
-        latency_score = max(0, 100 - (latency / 10))  # lower is better, assuming 1000ms is 0
-
-        overall = (
-            uptime_score * 0.40
-            + incident_score * 0.25
-            + error_score * 0.20
-            + latency_score * 0.15
+        """Score one service; inputs not given are read from its imported metrics for the period"""
+        entity = ReliabilityInput(
+            service_id=service_id,
+            uptime_percentage=uptime_percentage,
+            incident_frequency=incident_frequency,
+            error_rate=error_rate,
+            latency_p99=latency_p99,
         )
+        missing = None in (uptime_percentage, incident_frequency, error_rate, latency_p99)
+        if missing and period_start and period_end:
+            observed = self.load_reliability_inputs([service_id], period_start, period_end)[0]
+            for name in ("uptime_percentage", "incident_frequency", "error_rate", "latency_p99"):
+                if getattr(entity, name) is None:
+                    setattr(entity, name, getattr(observed, name))
+        return self.calculate_reliability_scores([entity])[0]
 
-        return ReliabilityMetrics(
-            service_id=service_id,
-            overall_score=round(overall, 2),
-            uptime_percentage=round(uptime, 2),
-            incident_frequency=round(incidents, 2),
-            error_rate=round(errors, 2),
-            latency_p99=round(latency, 2),
-            calculated_at=datetime.utcnow(),
+    def load_reliability_inputs(
+        self,
+        service_ids: Optional[Sequence[str]],
+        period_start: datetime,
+        period_end: datetime,
+    ) -> List[ReliabilityInput]:
+        """
+        Observed inputs of the given services (in order, empty for those without
+        data), or of every service with imported data, over the period:
+          - uptime_percentage: mean of the SYSTEM_UPTIME buckets
+          - incident_frequency: incident onsets per day
+          - error_rate (percent) and latency_p99 (ms): means weighted by sample count
+        """
+        uptime = self._by_resolution(
+            select(
+                ea_metrics.c.repository_id,
+                ea_metrics.c.period_type,
+                func.avg(ea_metrics.c.value),
+            ),
+            ea_metrics.c.repository_id,
+            ea_metrics.c.period_type,
+            ea_metrics.c.period_start,
+            service_ids,
+            period_start,
+            period_end,
+            ea_metrics.c.metric_type == METRIC_UPTIME,
+        )
+        incidents = self._by_resolution(
+            select(
+                ea_metrics.c.repository_id,
+                ea_metrics.c.period_type,
+                func.sum(ea_metrics.c.value),
+            ),
+            ea_metrics.c.repository_id,
+            ea_metrics.c.period_type,
+            ea_metrics.c.period_start,
+            service_ids,
+            period_start,
+            period_end,
+            ea_metrics.c.metric_type == METRIC_INCIDENT,
+        )
+        weight = ea_service_latency.c.sample_count
+        latency = self._by_resolution(
+            select(
+                ea_service_latency.c.service_id,
+                ea_service_latency.c.period_type,
+                _weighted_mean(ea_service_latency.c.error_rate, weight),
+                _weighted_mean(ea_service_latency.c.latency_p99_ms, weight),
+            ),
+            ea_service_latency.c.service_id,
+            ea_service_latency.c.period_type,
+            ea_service_latency.c.period_start,
+            service_ids,
+            period_start,
+            period_end,
+        )
+
+        days = (period_end - period_start).total_seconds() / SECONDS_PER_DAY
+        if service_ids is None:
+            service_ids = sorted({*uptime, *incidents, *latency})
+        inputs = []
+        for service_id in service_ids:
+            error_rate, latency_p99 = latency.get(service_id, (None, None))
+            incident_count = incidents.get(service_id, (None,))[0]
+            inputs.append(ReliabilityInput(
+                service_id=service_id,
+                uptime_percentage=uptime.get(service_id, (None,))[0],
+                incident_frequency=incident_count / days if incident_count is not None and days > 0 else None,
+                error_rate=error_rate * 100 if error_rate is not None else None,
+                latency_p99=latency_p99,
+            ))
+        return inputs
+
+    def calculate_reliability_scores_from_metrics(
+        self,
+        service_ids: Optional[Sequence[str]],
+        period_start: datetime,
+        period_end: datetime,
+        model_version: Optional[int] = None,
+    ) -> List[ReliabilityMetrics]:
+        """Scores of the given services, or of every service with imported data, over the period"""
+        return self.calculate_reliability_scores(
+            self.load_reliability_inputs(service_ids, period_start, period_end), model_version
         )
 
+    def calculate_reliability_scores(
+        self, inputs: Sequence[ReliabilityInput], model_version: Optional[int] = None
+    ) -> List[ReliabilityMetrics]:
+        """
+        Scores for many services at once under the configured reliability scoring
+        model (or `model_version`), as NumPy vector math over the input columns
+        """
+        model = get_scoring_model("reliability", model_version)
+        columns = model.input_columns(inputs)
+        overall = model.evaluate(columns)
+
+        calculated_at = datetime.utcnow()
+        columns = zip(
+            inputs,
+            np.round(overall, 2).tolist(),
+            np.round(columns["uptime_percentage"], 2).tolist(),
+            np.round(columns["incident_frequency"], 2).tolist(),
+            np.round(columns["error_rate"], 2).tolist(),
+            np.round(columns["latency_p99"], 2).tolist(),
+        )
+        return [
+            ReliabilityMetrics(
+                service_id=entity.service_id,
+                overall_score=score,
+                uptime_percentage=up,
+                incident_frequency=inc,
+                error_rate=err,
+                latency_p99=lat,
+                calculated_at=calculated_at,
+                scoring_model_version=model.version,
+                unmeasured=tuple(name for name in SCORED_INPUTS["reliability"] if getattr(entity, name) is None),
+            )
+            for entity, score, up, inc, err, lat in columns
+        ]
+
     def save_reliability_metrics(
         self,
         metrics: ReliabilityMetrics,
         period_start: datetime,
         period_end: datetime,
     ) -> None:
-        kpi_record = KPIResult(
-            entity_type="service",
-            entity_id=metrics.service_id,
-            kpi_type=KPIType.RELIABILITY_SCORE,
-            value=metrics.overall_score,
-            unit="score",
-            period_start=period_start,
-            period_end=period_end,
-            period_type="custom",
-            metadata={
-                "uptime_percentage": metrics.uptime_percentage,
-                "incident_frequency": metrics.incident_frequency,
-                "error_rate": metrics.error_rate,
-                "latency_p99": metrics.latency_p99,
-            },
-        )
-        self.db.add(kpi_record)
+        self.save_reliability_metrics_batch([metrics], period_start, period_end)
+
+    def save_reliability_metrics_batch(
+        self,
+        metrics: Sequence[ReliabilityMetrics],
+        period_start: datetime,
+        period_end: datetime,
+    ) -> int:
+        """
+        Insert the KPI rows of many services in one executemany; returns the row
+        count. Services without any measured input are not stored: their score
+        would be the model defaults alone.
+        """
+        rows = [
+            {
+                "entity_type": "service",
+                "entity_id": service_metrics.service_id,
+                "kpi_type": KPIType.RELIABILITY_SCORE,
+                "value": service_metrics.overall_score,
+                "unit": "score",
+                "period_start": period_start,
+                "period_end": period_end,
+                "period_type": "custom",
+                "metadata_": {
+                    # Unmeasured inputs are stored as None, not as the default they were scored with
+                    **{
+                        name: None if name in service_metrics.unmeasured else getattr(service_metrics, name)
+                        for name in SCORED_INPUTS["reliability"]
+                    },
+                    "scoring_model_version": service_metrics.scoring_model_version,
+                },
+            }
+            for service_metrics in metrics
+            if len(service_metrics.unmeasured) < len(SCORED_INPUTS["reliability"])
+        ]
+        upsert_kpi_results(self.db, rows)
         self.db.commit()
+        return len(rows)
+
+    def rescore_reliability_scores(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        model_version: Optional[int] = None,
+    ) -> List[ReliabilityMetrics]:
+        """
+        Re-score every service with a stored reliability score for the period
+        under another scoring model version (default: the configured one), from
+        the inputs recorded with the scores, in one evaluation and one upsert
+        """
+        stored = self.db.query(KPIResult.entity_id, KPIResult.metadata_).filter(
+            KPIResult.entity_type == "service",
+            KPIResult.kpi_type == KPIType.RELIABILITY_SCORE,
+            KPIResult.period_type == "custom",
+            KPIResult.period_start == period_start,
+            KPIResult.period_end == period_end,
+        ).all()
+        inputs = [
+            ReliabilityInput(
+                service_id=service_id,
+                uptime_percentage=(metadata or {}).get("uptime_percentage"),
+                incident_frequency=(metadata or {}).get("incident_frequency"),
+                error_rate=(metadata or {}).get("error_rate"),
+                latency_p99=(metadata or {}).get("latency_p99"),
+            )
+            for service_id, metadata in stored
+        ]
+        metrics = self.calculate_reliability_scores(inputs, model_version)
+        self.save_reliability_metrics_batch(metrics, period_start, period_end)
+        return metrics
 
     def get_sla_compliance(self, uptime: float, sla_target: float = 99.9) -> bool:
         return uptime >= sla_target
+
+    def _by_resolution(
+        self,
+        query,
+        service,
+        period_type,
+        bucket_start,
+        service_ids: Optional[Sequence[str]],
+        period_start: datetime,
+        period_end: datetime,
+        *conditions,
+    ) -> Dict[str, Tuple[Optional[float], ...]]:
+        """
+        Run an aggregate `query` (service, period_type, *values) grouped per service
+        and resolution over the buckets starting in the period; per service, keep
+        the values of its finest resolution
+        """
+        query = query.where(
+            period_type.in_(IMPORT_PERIOD_TYPES),
+            bucket_start >= period_start,
+            bucket_start < period_end,
+            *conditions,
+        ).group_by(service, period_type)
+        if service_ids is not None:
+            query = query.where(service.in_(list(service_ids)))
+
+        rank = {resolution: position for position, resolution in enumerate(IMPORT_PERIOD_TYPES)}
+        found: Dict[str, Tuple[int, Tuple[Optional[float], ...]]] = {}
+        for service_id, resolution, *values in self.db.execute(query):
+            if service_id not in found or rank[resolution] < found[service_id][0]:
+                found[service_id] = (rank[resolution], tuple(None if v is None else float(v) for v in values))
+        return {service_id: values for service_id, (_, values) in found.items()}
+
+
+def _weighted_mean(column, weight):
+    """SQL mean of `column` weighted by `weight`, over the rows where `column` is set"""
+    return func.sum(column * weight) / func.nullif(func.sum(case((column.isnot(None), weight), else_=0)), 0)
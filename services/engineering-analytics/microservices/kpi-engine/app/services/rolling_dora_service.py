@@ -0,0 +1,380 @@
+"""
+Rolling DORA time series
+
+Keeps 7/30/90-day DORA values per repository as daily points in
+ea_kpi_results (period_type rolling_7d, rolling_30d, rolling_90d; one point
+per day, period_end = the following midnight). Deployment and incident events
+are picked up from ea_metrics as the collector stores or resolves them, past a
+watermark on updated_at, and so are commits stored after the deployment that
+shipped them (past a watermark on their created_at), since they set its lead
+time. An event only rebuilds the per-day buckets
+(ea_dora_daily) it can affect, and every window is a running sum over those
+buckets, so nothing is recomputed from the raw events of the whole window.
+Once a day the windows of all active repositories slide forward even without
+new events.
+
+Associated Frontend Files:
+  - web/app/src/lib/api.ts (analyticsApi.metrics.dora - line 94)
+  - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from typing import Dict, List, Optional
+import asyncio
+import logging
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.dora_daily import DORADailyBucket, EngineWatermark
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+from app.models.kpi_sketch import SKETCH_LEAD_TIME, SKETCH_RECOVERY_TIME, upsert_kpi_sketches
+from app.models.source_tables import EVENT_PERIOD_TYPE, METRIC_DEPLOYMENT, METRIC_INCIDENT, ea_metrics
+from app.services.dora_service import DORAService
+from app.services.sketch import sketches_by_group
+from app.services.sketch_service import sketch_row
+
+logger = logging.getLogger(__name__)
+
+ROLLING_WINDOWS = (7, 30, 90)
+EVENTS_WATERMARK = "dora_rolling_events"
+COMMITS_WATERMARK = "dora_rolling_commits"
+DAY_WATERMARK = "dora_rolling_day"
+
+BUCKET_FIELDS = [
+    "deployments",
+    "failed_deployments",
+    "lead_time_seconds",
+    "lead_time_samples",
+    "incidents",
+    "recovery_seconds",
+    "recovered_incidents",
+]
+
+
+def rolling_period_type(window_days: int) -> str:
+    return f"rolling_{window_days}d"
+
+
+@dataclass
+class RollingDORAPoint:
+    day: date
+    deployment_frequency: float  # deployments per day over the window
+    lead_time_for_changes: Optional[float]  # hours
+    change_failure_rate: float  # percentage
+    mean_time_to_recovery: Optional[float]  # hours
+
+
+class RollingDORAService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+        self.dora = DORAService(db)
+
+    def process_new_events(self, today: Optional[date] = None) -> int:
+        """
+        Fold deployments and incidents changed since the last run, and deployments
+        whose commit was stored since, into buckets and points; returns the event count
+        """
+        today = today or datetime.utcnow().date()
+        m = ea_metrics
+        query = select(m.c.repository_id, m.c.period_start, m.c.updated_at).where(
+            m.c.metric_type.in_([METRIC_DEPLOYMENT, METRIC_INCIDENT]),
+            m.c.period_type == EVENT_PERIOD_TYPE,
+            m.c.repository_id.isnot(None),
+        )
+        watermark = self._watermark(EVENTS_WATERMARK)
+        if watermark is not None:
+            query = query.where(m.c.updated_at > watermark)
+        else:
+            query = query.where(m.c.period_start >= self._history_start(today))
+        rows = self.db.execute(query).all()
+        # The initial backfill reads every commit stored so far
+        commits_watermark = self._watermark(COMMITS_WATERMARK)
+        late_commits = self.dora.deployment_commits(
+            datetime.combine(self._history_start(today), time.min),
+            datetime.combine(today + timedelta(days=1), time.min),
+            stored_after=commits_watermark,
+        )
+        if not rows and not late_commits:
+            return 0
+
+        # An event can flip the failure flag of deployments up to one failure window earlier
+        lookback = timedelta(hours=self.settings.dora_failure_window_hours)
+        first_days: Dict[str, date] = {}
+        for repository_id, period_start, *_ in [*rows, *late_commits]:
+            day = (period_start - lookback).date()
+            first_days[repository_id] = min(day, first_days.get(repository_id, day))
+
+        self.refresh(first_days, today)
+        if rows:
+            # Rows written before the collector stamped updated_at only appear in the initial backfill
+            latest = max((row.updated_at for row in rows if row.updated_at), default=datetime.utcnow())
+            self._set_watermark(EVENTS_WATERMARK, latest)
+        stored = [stored_at for _, _, stored_at in late_commits if stored_at]
+        if stored:
+            self._set_watermark(COMMITS_WATERMARK, max(stored))
+        self.db.commit()
+        logger.info(
+            f"Rolling DORA: folded {len(rows)} events and {len(late_commits)} late commits "
+            f"for {len(first_days)} repositories"
+        )
+        return len(rows) + len(late_commits)
+
+    def advance(self, today: Optional[date] = None) -> int:
+        """Slide the windows of every active repository forward to today; returns the repository count"""
+        today = today or datetime.utcnow().date()
+        last_day = self._watermark(DAY_WATERMARK)
+        if last_day is not None and last_day.date() >= today:
+            return 0
+
+        first_day = max(last_day.date() + timedelta(days=1) if last_day else today, self._history_start(today))
+        # Repositories whose longest window still covers a bucket, including ones just emptying out
+        active_since = first_day - timedelta(days=max(ROLLING_WINDOWS))
+        repository_ids = self.db.execute(
+            select(DORADailyBucket.repository_id).where(DORADailyBucket.day > active_since).distinct()
+        ).scalars().all()
+        if repository_ids:
+            self._write_points({repository_id: first_day for repository_id in repository_ids}, today)
+        self._set_watermark(DAY_WATERMARK, datetime.combine(today, time.min))
+        self.db.commit()
+        return len(repository_ids)
+
+    def refresh(self, first_days: Dict[str, date], today: date) -> None:
+        """Rebuild each repository's buckets and daily points from its first affected day through today"""
+        history_start = self._history_start(today)
+        first_days = {repository_id: max(day, history_start) for repository_id, day in first_days.items()}
+        self._write_buckets(first_days, today)
+        self._write_points(first_days, today)
+
+    def get_trend(
+        self, repository_id: str, window_days: int, start: date, end: date
+    ) -> List[RollingDORAPoint]:
+        """Daily points of one rolling window for days in [start, end]"""
+        if window_days not in ROLLING_WINDOWS:
+            raise ValueError(f"Unsupported window of {window_days} days; expected one of {ROLLING_WINDOWS}")
+
+        rows = self.db.query(KPIResult.kpi_type, KPIResult.period_end, KPIResult.value).filter(
+            KPIResult.entity_type == "repository",
+            KPIResult.entity_id == repository_id,
+            KPIResult.period_type == rolling_period_type(window_days),
+            KPIResult.period_end > datetime.combine(start, time.min),
+            KPIResult.period_end <= datetime.combine(end + timedelta(days=1), time.min),
+        ).all()
+
+        values: Dict[date, Dict[KPIType, float]] = {}
+        for kpi_type, period_end, value in rows:
+            values.setdefault(period_end.date() - timedelta(days=1), {})[kpi_type] = value
+        return [
+            RollingDORAPoint(
+                day=day,
+                deployment_frequency=kpis.get(KPIType.DORA_DEPLOYMENT_FREQUENCY, 0.0),
+                lead_time_for_changes=kpis.get(KPIType.DORA_LEAD_TIME),
+                change_failure_rate=kpis.get(KPIType.DORA_CHANGE_FAILURE_RATE, 0.0),
+                mean_time_to_recovery=kpis.get(KPIType.DORA_MTTR),
+            )
+            for day, kpis in sorted(values.items())
+        ]
+
+    def _write_buckets(self, first_days: Dict[str, date], today: date) -> None:
+        start = datetime.combine(min(first_days.values()), time.min)
+        end = datetime.combine(today + timedelta(days=1), time.min)
+        repository_ids = list(first_days)
+
+        deploys = self.dora.load_deployment_outcomes(start, end, repository_ids)
+        deploys["day"] = deploys["deployed_at"].dt.normalize()
+        deploys["lead_seconds"] = (deploys["deployed_at"] - deploys["committed_at"]).dt.total_seconds()
+        deploy_days = deploys.groupby(["repository_id", "day"]).agg(
+            deployments=("deployed_at", "size"),
+            failed_deployments=("failed", "sum"),
+            lead_time_seconds=("lead_seconds", "sum"),
+            lead_time_samples=("lead_seconds", "count"),
+        )
+
+        incidents = self.dora.load_incidents(start, end, repository_ids)
+        incidents["day"] = incidents["started_at"].dt.normalize()
+        recovery = (incidents["ended_at"] - incidents["started_at"]).dt.total_seconds()
+        # Unresolved incidents (ended_at == started_at) have no recovery time yet
+        incidents["recovery_seconds"] = recovery.where(recovery > 0)
+        incident_days = incidents.groupby(["repository_id", "day"]).agg(
+            incidents=("started_at", "size"),
+            recovery_seconds=("recovery_seconds", "sum"),
+            recovered_incidents=("recovery_seconds", "count"),
+        )
+
+        buckets = deploy_days.join(incident_days, how="outer").fillna(0).reset_index()
+
+        for first_day, repositories in _by_first_day(first_days):
+            self.db.execute(
+                delete(DORADailyBucket).where(
+                    DORADailyBucket.repository_id.in_(repositories),
+                    DORADailyBucket.day >= first_day,
+                )
+            )
+        if not buckets.empty:
+            buckets["day"] = buckets["day"].dt.date
+            buckets = buckets[buckets["day"] >= buckets["repository_id"].map(first_days)]
+            counts = ["deployments", "failed_deployments", "lead_time_samples", "incidents", "recovered_incidents"]
+            buckets[counts] = buckets[counts].astype(int)
+            self.db.execute(insert(DORADailyBucket), buckets[["repository_id", "day", *BUCKET_FIELDS]].to_dict("records"))
+
+        # Daily lead and recovery time sketches, merged for percentiles over any range of days
+        incidents["recovery_hours"] = incidents["recovery_seconds"] / 3600
+        sketches = []
+        for metric, samples, column in (
+            (SKETCH_LEAD_TIME, deploys, "lead_hours"),
+            (SKETCH_RECOVERY_TIME, incidents, "recovery_hours"),
+        ):
+            grouped = sketches_by_group(
+                samples, ["repository_id", "day"], column, self.settings.kpi_sketch_relative_accuracy
+            )
+            for (repository_id, day), sketch in grouped.items():
+                if day.date() >= first_days[repository_id]:
+                    day = day.to_pydatetime()
+                    sketches.append(
+                        sketch_row("repository", repository_id, metric, "day", day, day + timedelta(days=1), sketch)
+                    )
+        upsert_kpi_sketches(self.db, sketches)
+
+    def _write_points(self, first_days: Dict[str, date], today: date) -> None:
+        repository_ids = list(first_days)
+        span_start = min(first_days.values()) - timedelta(days=max(ROLLING_WINDOWS) - 1)
+        buckets = pd.DataFrame(
+            self.db.execute(
+                select(DORADailyBucket.repository_id, DORADailyBucket.day, *(
+                    getattr(DORADailyBucket, field) for field in BUCKET_FIELDS
+                )).where(
+                    DORADailyBucket.repository_id.in_(repository_ids),
+                    DORADailyBucket.day >= span_start,
+                    DORADailyBucket.day <= today,
+                )
+            ).all(),
+            columns=["repository_id", "day", *BUCKET_FIELDS],
+        )
+        buckets["day"] = pd.to_datetime(buckets["day"])
+
+        # days x repositories matrix per field, zero on days without events
+        days = pd.date_range(span_start, today, freq="D")
+        daily = {
+            field: buckets.pivot(index="day", columns="repository_id", values=field)
+            .reindex(index=days, columns=repository_ids)
+            .fillna(0.0)
+            for field in BUCKET_FIELDS
+        }
+
+        # Long (day, repository) layout, limited to each repository's days to (re)write
+        point_day = np.repeat(days.to_numpy(), len(repository_ids))
+        point_repository = np.tile(np.array(repository_ids, dtype=object), len(days))
+        first = np.tile(np.array([np.datetime64(first_days[r], "ns") for r in repository_ids]), len(days))
+        keep = point_day >= first
+
+        rows = []
+        for window in ROLLING_WINDOWS:
+            sums = pd.DataFrame({
+                "day": point_day[keep],
+                "repository_id": point_repository[keep],
+                **{
+                    field: frame.rolling(window, min_periods=1).sum().to_numpy().ravel()[keep]
+                    for field, frame in daily.items()
+                },
+            })
+            rows.extend(_point_rows(sums, window))
+
+        # Buckets only ever gain events, so a point with lead time or MTTR samples keeps them and
+        # upserting the recomputed rows leaves nothing stale behind
+        upsert_kpi_results(self.db, rows)
+
+    def _history_start(self, today: date) -> date:
+        return today - timedelta(days=self.settings.dora_rolling_history_days)
+
+    def _watermark(self, name: str) -> Optional[datetime]:
+        watermark = self.db.get(EngineWatermark, name)
+        return watermark.value if watermark else None
+
+    def _set_watermark(self, name: str, value: datetime) -> None:
+        watermark = self.db.get(EngineWatermark, name)
+        if watermark is None:
+            self.db.add(EngineWatermark(name=name, value=value))
+        else:
+            watermark.value = value
+
+
+def _point_rows(sums: pd.DataFrame, window: int) -> List[dict]:
+    deployments = sums["deployments"]
+    values = {
+        KPIType.DORA_DEPLOYMENT_FREQUENCY: (deployments / window, "per_day"),
+        KPIType.DORA_LEAD_TIME: (
+            sums["lead_time_seconds"] / sums["lead_time_samples"].where(sums["lead_time_samples"] > 0) / 3600,
+            "hours",
+        ),
+        KPIType.DORA_CHANGE_FAILURE_RATE: (
+            pd.Series(np.where(deployments > 0, sums["failed_deployments"] / deployments.clip(lower=1) * 100, 0.0)),
+            "percentage",
+        ),
+        KPIType.DORA_MTTR: (
+            sums["recovery_seconds"] / sums["recovered_incidents"].where(sums["recovered_incidents"] > 0) / 3600,
+            "hours",
+        ),
+    }
+    period_end = sums["day"] + pd.Timedelta(days=1)
+    common = pd.DataFrame({
+        "entity_id": sums["repository_id"],
+        "period_start": period_end - pd.Timedelta(days=window),
+        "period_end": period_end,
+        "deployments": deployments.astype(int),
+        "incidents": sums["incidents"].astype(int),
+    })
+
+    rows = []
+    for kpi_type, (value, unit) in values.items():
+        value = value.round(2).to_numpy()
+        for point, point_value in zip(common.itertuples(index=False), value):
+            # Lead time and MTTR are unknown without samples in the window
+            if np.isnan(point_value):
+                continue
+            rows.append({
+                "entity_type": "repository",
+                "entity_id": point.entity_id,
+                "kpi_type": kpi_type,
+                "value": float(point_value),
+                "unit": unit,
+                "period_start": point.period_start.to_pydatetime(),
+                "period_end": point.period_end.to_pydatetime(),
+                "period_type": rolling_period_type(window),
+                "metadata_": {"deployments": int(point.deployments), "incidents": int(point.incidents)},
+            })
+    return rows
+
+
+def _by_first_day(first_days: Dict[str, date]):
+    """(first_day, [repository_id, ...]) groups, so deletes take one IN list per distinct day"""
+    ordered = sorted(first_days.items(), key=lambda item: item[1])
+    for first_day, items in groupby(ordered, key=lambda item: item[1]):
+        yield first_day, [repository_id for repository_id, _ in items]
+
+
+def _update_rolling_dora() -> None:
+    with SessionLocal() as db:
+        service = RollingDORAService(db)
+        today = datetime.utcnow().date()
+        service.advance(today)
+        service.process_new_events(today)
+
+
+async def run_rolling_dora(stop: asyncio.Event) -> None:
+    """Poll for new DORA events every dora_rolling_poll_seconds until `stop` is set"""
+    settings = get_settings()
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(_update_rolling_dora)
+        except Exception as e:
+            logger.error(f"Error updating rolling DORA metrics: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.dora_rolling_poll_seconds)
+        except asyncio.TimeoutError:
+            pass
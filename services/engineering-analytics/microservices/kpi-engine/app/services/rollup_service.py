@@ -0,0 +1,264 @@
+"""
+Team and org KPI rollups
+
+Whenever employee KPIs are saved, the rollups of the teams and orgs those
+employees belong to are recomputed for the saved periods and stored as
+KPIResult rows with entity_type "team" / "org": the value is the member mean,
+the metadata carries the member count, median, percentiles and activity
+totals. Both levels are aggregated from the member values in one grouped
+query, so medians and percentiles are exact, and dashboards read a handful of
+rollup rows instead of every employee row. The members' lead and cycle time
+sketches are merged into team and org sketches the same way.
+
+Re-aggregating a large org on every save of one member costs a read of the
+whole org, so saves only roll up groups of at most rollup_inline_max_members;
+larger ones are rolled up once per run by the recompute job
+(python -m app.jobs.recompute employee), which should be scheduled for them.
+
+Associated Frontend Files:
+  - web/app/src/lib/api.ts (analyticsApi.kpi - lines 98-100)
+  - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+from app.models.kpi_sketch import KPISketch, upsert_kpi_sketches
+from app.models.team_membership import TeamMembership
+from app.services.sketch import DDSketch
+from app.services.sketch_service import sketch_row
+
+ROLLUP_KPI_TYPES = [KPIType.PRODUCTIVITY_SCORE, KPIType.QUALITY_SCORE]
+# entity_type of the rollup -> TeamMembership column grouping its members
+ROLLUP_LEVELS = {"team": "team_id", "org": "org_id"}
+# Counts in the metadata of employee productivity rows, summed per team/org
+ACTIVITY_TOTALS = ["commits", "pull_requests_opened", "pull_requests_closed", "code_reviews", "issues_completed"]
+PERCENTILES = {"p25": 0.25, "p75": 0.75, "p90": 0.9}
+
+# (period_type, period_start, period_end)
+PeriodKey = Tuple[str, datetime, datetime]
+
+
+@dataclass
+class MembershipInput:
+    employee_id: str
+    team_id: Optional[str] = None
+    org_id: Optional[str] = None
+
+
+class RollupService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def sync_memberships(self, memberships: Sequence[MembershipInput], replace: bool = False) -> int:
+        """
+        Upsert employee memberships; with `replace`, employees missing from
+        `memberships` are removed. Existing rollups are not recomputed, the next
+        save of the period does that. Returns the number of memberships written.
+        """
+        if replace:
+            self.db.execute(
+                delete(TeamMembership).where(
+                    TeamMembership.employee_id.notin_([membership.employee_id for membership in memberships])
+                )
+            )
+        rows = [
+            {
+                "employee_id": membership.employee_id,
+                "team_id": membership.team_id,
+                "org_id": membership.org_id,
+                "updated_at": datetime.utcnow(),
+            }
+            for membership in memberships
+        ]
+        if rows:
+            upsert(self.db, TeamMembership, rows, key=("employee_id",), update=("team_id", "org_id", "updated_at"))
+        self.db.commit()
+        return len(rows)
+
+    def rollup_employees(
+        self, employee_ids: Iterable[str], periods: Iterable[PeriodKey], max_members: Optional[int] = None
+    ) -> int:
+        """
+        Recompute the rollups of every team and org of `employee_ids` for the
+        given periods from the stored employee KPIs, skipping groups of more than
+        `max_members` members when given. Does not commit; returns the number of
+        rollup rows written.
+        """
+        employee_ids, periods = set(employee_ids), set(periods)
+        if not employee_ids or not periods:
+            return 0
+
+        groups = self.db.execute(
+            select(TeamMembership.team_id, TeamMembership.org_id).where(TeamMembership.employee_id.in_(employee_ids))
+        ).all()
+        affected = {
+            "team_id": {team_id for team_id, _ in groups if team_id},
+            "org_id": {org_id for _, org_id in groups if org_id},
+        }
+        if max_members is not None:
+            affected = self._at_most(affected, max_members)
+        if not affected["team_id"] and not affected["org_id"]:
+            return 0
+
+        member_values = pd.DataFrame(
+            self.db.execute(
+                select(
+                    TeamMembership.team_id,
+                    TeamMembership.org_id,
+                    KPIResult.kpi_type,
+                    KPIResult.period_type,
+                    KPIResult.period_start,
+                    KPIResult.period_end,
+                    KPIResult.value,
+                    KPIResult.metadata_,
+                )
+                .join(TeamMembership, TeamMembership.employee_id == KPIResult.entity_id)
+                .where(
+                    KPIResult.entity_type == "employee",
+                    KPIResult.kpi_type.in_(ROLLUP_KPI_TYPES),
+                    _in_groups(affected),
+                    _in_periods(KPIResult, periods),
+                )
+            ).all(),
+            columns=[
+                "team_id", "org_id", "kpi_type", "period_type", "period_start", "period_end", "value", "metadata",
+            ],
+        )
+        if member_values.empty:
+            return 0
+        counts = pd.DataFrame(
+            [metadata or {} for metadata in member_values.pop("metadata")], index=member_values.index
+        ).reindex(columns=ACTIVITY_TOTALS)
+        member_values = member_values.join(counts)
+
+        rows = []
+        for entity_type, column in ROLLUP_LEVELS.items():
+            scoped = member_values[member_values[column].isin(affected[column])]
+            if not scoped.empty:
+                rows.extend(_rollup_rows(scoped, entity_type, column))
+        upsert_kpi_results(self.db, rows)
+        upsert_kpi_sketches(self.db, self._rollup_sketches(affected, periods))
+        return len(rows)
+
+    def _at_most(self, affected: Dict[str, set], max_members: int) -> Dict[str, set]:
+        """The affected groups with at most `max_members` members"""
+        small = {}
+        for column, group_ids in affected.items():
+            group = getattr(TeamMembership, column)
+            sizes = self.db.execute(
+                select(group, func.count()).where(group.in_(group_ids)).group_by(group)
+            ).all()
+            small[column] = {group_id for group_id, members in sizes if members <= max_members}
+        return small
+
+    def _rollup_sketches(self, affected: Dict[str, set], periods: Set[PeriodKey]) -> List[dict]:
+        """Team and org lead/cycle time sketches, the merge of their members' sketches"""
+        member_sketches = self.db.execute(
+            select(
+                TeamMembership.team_id,
+                TeamMembership.org_id,
+                KPISketch.metric,
+                KPISketch.period_type,
+                KPISketch.period_start,
+                KPISketch.period_end,
+                KPISketch.sketch,
+            )
+            .join(TeamMembership, TeamMembership.employee_id == KPISketch.entity_id)
+            .where(KPISketch.entity_type == "employee", _in_groups(affected), _in_periods(KPISketch, periods))
+        ).all()
+
+        merged: Dict[tuple, DDSketch] = {}
+        for row in member_sketches:
+            sketch = DDSketch.from_dict(row.sketch)
+            for entity_type, column in ROLLUP_LEVELS.items():
+                entity_id = getattr(row, column)
+                if entity_id in affected[column]:
+                    key = (entity_type, entity_id, row.metric, row.period_type, row.period_start, row.period_end)
+                    merged.setdefault(key, DDSketch(sketch.relative_accuracy)).merge(sketch)
+        return [sketch_row(*key, sketch) for key, sketch in merged.items()]
+
+    def get_rollup(
+        self,
+        entity_type: str,
+        entity_id: str,
+        period_type: str,
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None,
+    ) -> Dict[KPIType, KPIResult]:
+        """
+        Stored rollup of a team or org for the period with exactly these bounds,
+        or the latest one of `period_type` when no bounds are given; empty when
+        there is none
+        """
+        if entity_type not in ROLLUP_LEVELS:
+            raise ValueError(f"Unsupported rollup entity type {entity_type!r}; expected one of {list(ROLLUP_LEVELS)}")
+
+        query = self.db.query(KPIResult).filter(
+            KPIResult.entity_type == entity_type,
+            KPIResult.entity_id == entity_id,
+            KPIResult.kpi_type.in_(ROLLUP_KPI_TYPES),
+            KPIResult.period_type == period_type,
+        )
+        if period_start and period_end:
+            query = query.filter(KPIResult.period_start == period_start, KPIResult.period_end == period_end)
+        else:
+            latest = query.order_by(KPIResult.period_end.desc()).first()
+            if latest is None:
+                return {}
+            query = query.filter(KPIResult.period_start == latest.period_start, KPIResult.period_end == latest.period_end)
+        return {row.kpi_type: row for row in query.all()}
+
+
+def _in_groups(affected: Dict[str, set]):
+    return or_(TeamMembership.team_id.in_(affected["team_id"]), TeamMembership.org_id.in_(affected["org_id"]))
+
+
+def _in_periods(model, periods: Set[PeriodKey]):
+    return or_(*(
+        and_(model.period_type == period_type, model.period_start == period_start, model.period_end == period_end)
+        for period_type, period_start, period_end in periods
+    ))
+
+
+def _rollup_rows(member_values: pd.DataFrame, entity_type: str, column: str) -> List[dict]:
+    keys = [column, "kpi_type", "period_type", "period_start", "period_end"]
+    grouped = member_values.groupby(keys)
+    stats = grouped["value"].agg(["mean", "median", "min", "max"]).join(grouped.size().rename("members"))
+    percentiles = grouped["value"].quantile(list(PERCENTILES.values())).unstack()
+    percentiles.columns = list(PERCENTILES)
+    totals = grouped[ACTIVITY_TOTALS].sum(min_count=1)
+    stats = stats.join(percentiles).join(totals)
+
+    rows = []
+    for key, group in zip(stats.index, stats.itertuples(index=False)):
+        entity_id, kpi_type, period_type, period_start, period_end = key
+        metadata = {
+            "members": int(group.members),
+            "median": round(float(group.median), 2),
+            **{name: round(float(getattr(group, name)), 2) for name in PERCENTILES},
+            "min": round(float(group.min), 2),
+            "max": round(float(group.max), 2),
+        }
+        if kpi_type == KPIType.PRODUCTIVITY_SCORE:
+            metadata["totals"] = {
+                name: int(getattr(group, name)) for name in ACTIVITY_TOTALS if not pd.isna(getattr(group, name))
+            }
+        rows.append({
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "kpi_type": kpi_type,
+            "value": round(float(group.mean), 2),
+            "unit": "score",
+            "period_start": pd.Timestamp(period_start).to_pydatetime(),
+            "period_end": pd.Timestamp(period_end).to_pydatetime(),
+            "period_type": period_type,
+            "metadata_": metadata,
+        })
+    return rows
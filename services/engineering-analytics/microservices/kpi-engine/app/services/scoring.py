@@ -0,0 +1,206 @@
+"""
+Declarative, versioned scoring models for the quality and reliability scores
+
+A scoring model maps each input metric through a curve to a 0-100 component
+score and takes the weighted sum of the components. Models are plain data:
+version 1 of each (the built-in defaults below) reproduces the original
+hard-coded formulas, and further versions are loaded from the JSON file at
+SCORING_MODELS_PATH, shaped like DEFAULT_MODELS:
+
+    {"quality": [{"version": 2, "components": [
+        {"input": "code_coverage", "weight": 0.5, "default": 70.0,
+         "curve": {"type": "piecewise", "points": [[0, 0], [60, 50], [90, 100]]}},
+        ...]}]}
+
+Curve types (x is the input, scores are clipped to 0-100):
+  - linear: intercept + slope * x
+  - piecewise: linear interpolation between [x, score] points, flat beyond them
+  - step: scores[i] for thresholds[i-1] <= x < thresholds[i] (len(scores) == len(thresholds) + 1)
+  - logistic: 100 / (1 + exp(steepness * (x - midpoint))); positive steepness
+    means lower is better
+
+Each model is compiled once into NumPy evaluators, so scoring thousands of
+entities is a handful of array operations whatever the model.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence
+import json
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.batch import input_column
+
+# Model name -> its input fields; every model has one component per field (weight 0 to ignore one)
+SCORED_INPUTS = {
+    "quality": ("code_coverage", "technical_debt_ratio", "bug_density", "code_complexity"),
+    "reliability": ("uptime_percentage", "incident_frequency", "error_rate", "latency_p99"),
+}
+
+DEFAULT_MODELS = {
+    "quality": [{
+        "version": 1,
+        "components": [
+            {"input": "code_coverage", "weight": 0.30, "default": 70.0,
+             "curve": {"type": "linear", "intercept": 0.0, "slope": 1.0}},
+            {"input": "technical_debt_ratio", "weight": 0.25, "default": 5.0,
+             "curve": {"type": "linear", "intercept": 100.0, "slope": -5.0}},
+            {"input": "bug_density", "weight": 0.25, "default": 0.5,
+             "curve": {"type": "linear", "intercept": 100.0, "slope": -50.0}},
+            {"input": "code_complexity", "weight": 0.20, "default": 10.0,
+             "curve": {"type": "linear", "intercept": 100.0, "slope": -2.0}},
+        ],
+    }],
+    "reliability": [{
+        "version": 1,
+        "components": [
+            {"input": "uptime_percentage", "weight": 0.40, "default": 99.9,
+             "curve": {"type": "linear", "intercept": 0.0, "slope": 1.0}},
+            {"input": "incident_frequency", "weight": 0.25, "default": 0.1,
+             "curve": {"type": "linear", "intercept": 100.0, "slope": -100.0}},
+            {"input": "error_rate", "weight": 0.20, "default": 0.1,
+             "curve": {"type": "linear", "intercept": 100.0, "slope": -100.0}},
+            # 1000ms and slower scores 0
+            {"input": "latency_p99", "weight": 0.15, "default": 200.0,
+             "curve": {"type": "linear", "intercept": 100.0, "slope": -0.1}},
+        ],
+    }],
+}
+
+Curve = Callable[[np.ndarray], np.ndarray]
+
+
+def _linear(intercept: float, slope: float) -> Curve:
+    return lambda x: intercept + slope * x
+
+
+def _piecewise(points: Sequence[Sequence[float]]) -> Curve:
+    xs, scores = (np.array(column, dtype=float) for column in zip(*sorted(points)))
+    return lambda x: np.interp(x, xs, scores)
+
+
+def _step(thresholds: Sequence[float], scores: Sequence[float]) -> Curve:
+    if len(scores) != len(thresholds) + 1:
+        raise ValueError(f"A step curve needs one more score than thresholds, got {len(scores)} and {len(thresholds)}")
+    if list(thresholds) != sorted(thresholds):
+        raise ValueError(f"Step curve thresholds must be ascending, got {list(thresholds)}")
+    thresholds, scores = np.array(thresholds, dtype=float), np.array(scores, dtype=float)
+    return lambda x: scores[np.searchsorted(thresholds, x, side="right")]
+
+
+def _logistic(midpoint: float, steepness: float) -> Curve:
+    return lambda x: 100 / (1 + np.exp(steepness * (x - midpoint)))
+
+
+CURVES: Dict[str, Callable[..., Curve]] = {
+    "linear": _linear,
+    "piecewise": _piecewise,
+    "step": _step,
+    "logistic": _logistic,
+}
+
+
+@dataclass(frozen=True)
+class ScoringComponent:
+    input: str
+    weight: float
+    default: float  # used where an entity has no value for the input
+    curve: dict  # {"type": ..., **parameters}
+
+    def compile(self) -> Curve:
+        parameters = dict(self.curve)
+        curve_type = parameters.pop("type", None)
+        if curve_type not in CURVES:
+            raise ValueError(f"Unknown curve type {curve_type!r} for {self.input}; expected one of {list(CURVES)}")
+        try:
+            curve = CURVES[curve_type](**parameters)
+        except TypeError as e:
+            raise ValueError(f"Invalid parameters for the {curve_type} curve of {self.input}: {e}") from e
+        return lambda x: np.clip(curve(x), 0, 100)
+
+
+@dataclass
+class ScoringModel:
+    name: str
+    version: int
+    components: List[ScoringComponent]
+    _curves: List[Curve] = field(init=False, repr=False)
+    _weights: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        allowed = SCORED_INPUTS.get(self.name)
+        if allowed is None:
+            raise ValueError(f"Unknown scoring model {self.name!r}; expected one of {list(SCORED_INPUTS)}")
+        scored = [component.input for component in self.components]
+        if sorted(scored) != sorted(allowed):
+            raise ValueError(
+                f"{self.name} scoring model v{self.version} must have one component per input "
+                f"{list(allowed)}, got {scored}"
+            )
+        weights = np.array([component.weight for component in self.components], dtype=float)
+        if (weights < 0).any() or not np.isclose(weights.sum(), 1.0):
+            raise ValueError(
+                f"{self.name} scoring model v{self.version} weights must be non-negative and sum to 1, "
+                f"got {weights.tolist()}"
+            )
+        self._curves = [component.compile() for component in self.components]
+        self._weights = weights
+
+    @classmethod
+    def from_dict(cls, name: str, spec: dict) -> "ScoringModel":
+        try:
+            return cls(
+                name=name,
+                version=int(spec["version"]),
+                components=[ScoringComponent(**component) for component in spec["components"]],
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid {name} scoring model {spec.get('version', '?')}: {e}") from e
+
+    def input_columns(self, inputs: Sequence) -> Dict[str, np.ndarray]:
+        """Each scored input field across all entities, with missing values replaced by the component default"""
+        return {
+            component.input: input_column(inputs, component.input, component.default)
+            for component in self.components
+        }
+
+    def evaluate(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Overall 0-100 score of every entity, from the input columns"""
+        scores = np.column_stack([
+            curve(columns[component.input]) for component, curve in zip(self.components, self._curves)
+        ])
+        return scores @ self._weights
+
+
+@lru_cache
+def _models(path: Optional[str]) -> Dict[str, Dict[int, ScoringModel]]:
+    specs = {name: list(versions) for name, versions in DEFAULT_MODELS.items()}
+    if path:
+        with open(path) as f:
+            for name, versions in json.load(f).items():
+                specs.setdefault(name, []).extend(versions)
+
+    models: Dict[str, Dict[int, ScoringModel]] = {}
+    for name, versions in specs.items():
+        for spec in versions:
+            model = ScoringModel.from_dict(name, spec)
+            if model.version in models.setdefault(name, {}):
+                raise ValueError(f"{name} scoring model v{model.version} is defined more than once")
+            models[name][model.version] = model
+    return models
+
+
+def get_scoring_model(name: str, version: Optional[int] = None) -> ScoringModel:
+    """
+    The given version of a scoring model, or the configured one
+    (<NAME>_SCORING_MODEL_VERSION, the latest defined when 0)
+    """
+    settings = get_settings()
+    versions = _models(settings.scoring_models_path).get(name)
+    if versions is None:
+        raise ValueError(f"Unknown scoring model {name!r}; expected one of {list(SCORED_INPUTS)}")
+    version = version or getattr(settings, f"{name}_scoring_model_version") or max(versions)
+    if version not in versions:
+        raise ValueError(f"Unknown {name} scoring model version {version}; defined: {sorted(versions)}")
+    return versions[version]
@@ -0,0 +1,132 @@
+"""
+Mergeable quantile sketches for duration KPIs
+
+DDSketch (Masson, Rim & Lee, VLDB 2019): values are counted in logarithmic
+buckets, so every quantile is within `relative_accuracy` of the true value,
+and two sketches of the same accuracy merge exactly by adding bucket counts.
+A sketch of a day or a period is a few hundred integers at most, which is what
+lets percentiles be combined across time ranges and entities without the raw
+samples.
+"""
+import math
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Smallest value with its own bucket; anything at or below it (including negative
+# durations from skewed clocks) is counted in the zero bucket
+MIN_INDEXABLE = 1e-9
+# When more buckets are needed, the lowest ones are folded together (upper quantiles stay exact)
+MAX_BINS = 2048
+
+
+class DDSketch:
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.offset = 0  # bucket key of bins[0]
+        self.bins = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values) -> "DDSketch":
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        indexable = values > MIN_INDEXABLE
+        keys = np.ceil(np.log(values[indexable]) / self._log_gamma).astype(np.int64)
+        self._add_counts(keys, np.ones(keys.size, dtype=np.int64))
+        self.zero_count += int(values.size - keys.size)
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def merge(self, other: "DDSketch") -> "DDSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"Cannot merge sketches of relative accuracy {other.relative_accuracy} and {self.relative_accuracy}"
+            )
+        self._add_counts(np.arange(other.offset, other.offset + other.bins.size), other.bins)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q in [0, 1]; None for an empty sketch"""
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be in [0, 1], got {q}")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            value = 0.0
+        else:
+            index = int(np.searchsorted(np.cumsum(self.bins), rank - self.zero_count, side="right"))
+            value = 2 * self.gamma ** (self.offset + index) / (self.gamma + 1)
+        return float(min(max(value, self.min), self.max))
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "offset": self.offset,
+            "bins": self.bins.tolist(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DDSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.offset = data["offset"]
+        sketch.bins = np.array(data["bins"], dtype=np.int64)
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"] if data["min"] is not None else math.inf
+        sketch.max = data["max"] if data["max"] is not None else -math.inf
+        return sketch
+
+    def _add_counts(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        if keys.size == 0:
+            return
+        low, high = int(keys.min()), int(keys.max())
+        if self.bins.size:
+            low, high = min(low, self.offset), max(high, self.offset + self.bins.size - 1)
+        bins = np.zeros(high - low + 1, dtype=np.int64)
+        bins[self.offset - low:self.offset - low + self.bins.size] += self.bins
+        np.add.at(bins, keys - low, counts)
+        if bins.size > MAX_BINS:
+            folded = bins.size - MAX_BINS
+            bins[folded] += bins[:folded].sum()
+            bins, low = bins[folded:], low + folded
+        self.offset, self.bins = low, bins
+
+
+def sketches_by_group(
+    frame: pd.DataFrame, by: list, column: str, relative_accuracy: float
+) -> Dict[Hashable, DDSketch]:
+    """One sketch of `column` per group of `by`, leaving out groups without values"""
+    sketches = {}
+    for key, values in frame.dropna(subset=[column]).groupby(by)[column]:
+        sketches[key] = DDSketch(relative_accuracy).add(values.to_numpy())
+    return sketches
@@ -0,0 +1,105 @@
+"""
+Percentiles of lead, cycle and recovery times from stored quantile sketches
+
+Sketches are written next to the KPI results (daily per repository by the
+rolling DORA service, per saved period for employees and their teams/orgs).
+Percentiles over any range of periods and any set of entities are the merge of
+their sketches, without rescanning the raw samples.
+
+Associated Frontend Files:
+  - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.kpi_sketch import KPISketch, SKETCH_CYCLE_TIME, SKETCH_LEAD_TIME, SKETCH_RECOVERY_TIME
+from app.services.sketch import DDSketch
+
+SKETCH_METRICS = (SKETCH_LEAD_TIME, SKETCH_CYCLE_TIME, SKETCH_RECOVERY_TIME)
+
+
+@dataclass
+class DurationPercentiles:
+    metric: str
+    count: int
+    mean: Optional[float]  # hours; None without samples
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+
+class SketchService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def percentiles(
+        self,
+        entity_type: str,
+        entity_ids: Sequence[str],
+        metric: str,
+        period_start: datetime,
+        period_end: datetime,
+        period_type: str = "day",
+    ) -> DurationPercentiles:
+        """Percentiles over all samples of the entities in `period_type` periods lying within [start, end)"""
+        if metric not in SKETCH_METRICS:
+            raise ValueError(f"Unsupported metric {metric!r}; expected one of {list(SKETCH_METRICS)}")
+
+        sketches = self.db.query(KPISketch.sketch).filter(
+            KPISketch.entity_type == entity_type,
+            KPISketch.entity_id.in_(set(entity_ids)),
+            KPISketch.metric == metric,
+            KPISketch.period_type == period_type,
+            KPISketch.period_start >= period_start,
+            KPISketch.period_end <= period_end,
+        ).all()
+        merged = merge_sketches(
+            (DDSketch.from_dict(sketch) for sketch, in sketches), self.settings.kpi_sketch_relative_accuracy
+        )
+        return DurationPercentiles(
+            metric=metric,
+            count=merged.count,
+            mean=_round(merged.mean),
+            p50=_round(merged.quantile(0.5)),
+            p90=_round(merged.quantile(0.9)),
+            p99=_round(merged.quantile(0.99)),
+        )
+
+
+def merge_sketches(sketches: Iterable[DDSketch], relative_accuracy: float) -> DDSketch:
+    merged = DDSketch(relative_accuracy)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def sketch_row(
+    entity_type: str,
+    entity_id: str,
+    metric: str,
+    period_type: str,
+    period_start: datetime,
+    period_end: datetime,
+    sketch: DDSketch,
+) -> dict:
+    """An ea_kpi_sketches row for upsert_kpi_sketches"""
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "metric": metric,
+        "period_type": period_type,
+        "period_start": period_start,
+        "period_end": period_end,
+        "count": sketch.count,
+        "sketch": sketch.to_dict(),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
@@ -0,0 +1,132 @@
+"""
+RPC throughput benchmark for the KPI Engine gRPC server
+
+Drives unary and server-streaming RPCs from a local grpc.aio client with a
+fixed number of concurrent callers and prints a JSON report (RPC/s, streamed
+messages/s, latency percentiles). Without --target an in-process server is
+started on an ephemeral port, using the same settings as production
+(GRPC_MAX_WORKERS, GRPC_MAX_CONCURRENT_RPCS, ...).
+
+    python -m benchmarks.grpc_bench --requests 5000 --concurrency 64
+    python -m benchmarks.grpc_bench --target localhost:50052 --rpc batch_employee_kpis
+"""
+from concurrent import futures
+from typing import Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import time
+
+import grpc
+import numpy as np
+
+from app.config import get_settings
+from app.grpc_server import create_server, kpi_pb2, kpi_pb2_grpc
+
+
+def _rpc_calls(stub, batch_size: int) -> Dict[str, Callable[[int], Awaitable[int]]]:
+    async def reliability(i: int) -> int:
+        await stub.CalculateReliabilityScore(kpi_pb2.ReliabilityScoreRequest(service_id=f"service-{i}"))
+        return 1
+
+    async def employee_kpis(i: int) -> int:
+        await stub.GetEmployeeKPIs(kpi_pb2.EmployeeKPIRequest(employee_id=f"employee-{i}", period="month"))
+        return 1
+
+    async def batch_quality(i: int) -> int:
+        request = kpi_pb2.BatchQualityScoreRequest(
+            repository_ids=[f"repository-{i}-{n}" for n in range(batch_size)],
+            period_start="2026-01-01T00:00:00",
+            period_end="2026-02-01T00:00:00",
+        )
+        return len([response async for response in stub.BatchCalculateQualityScores(request)])
+
+    async def batch_employee_kpis(i: int) -> int:
+        request = kpi_pb2.BatchEmployeeKPIRequest(
+            employee_ids=[f"employee-{i}-{n}" for n in range(batch_size)], period="month"
+        )
+        return len([response async for response in stub.BatchGetEmployeeKPIs(request)])
+
+    return {
+        "reliability": reliability,
+        "employee_kpis": employee_kpis,
+        "batch_employee_kpis": batch_employee_kpis,
+        "batch_quality": batch_quality,
+    }
+
+
+async def run_benchmark(target: str, rpc: str, requests: int, concurrency: int, batch_size: int) -> dict:
+    async with grpc.aio.insecure_channel(target) as channel:
+        call = _rpc_calls(kpi_pb2_grpc.KPIServiceStub(channel), batch_size)[rpc]
+        # Warm up the channel and server thread pool
+        await asyncio.gather(*(call(i) for i in range(min(concurrency, requests))))
+
+        latencies: List[float] = []
+        messages = 0
+        counter = iter(range(requests))
+
+        async def worker():
+            nonlocal messages
+            for i in counter:
+                started = time.perf_counter()
+                received = await call(i)
+                latencies.append(time.perf_counter() - started)
+                messages += received
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "rpc": rpc,
+        "target": target,
+        "requests": requests,
+        "concurrency": concurrency,
+        "batch_size": batch_size if rpc.startswith("batch_") else 1,
+        "elapsed_seconds": round(elapsed, 3),
+        "rpc_per_second": round(requests / elapsed, 1),
+        "messages_per_second": round(messages / elapsed, 1),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latency_ms, 50)), 3),
+            "p95": round(float(np.percentile(latency_ms, 95)), 3),
+            "p99": round(float(np.percentile(latency_ms, 99)), 3),
+            "max": round(float(latency_ms.max()), 3),
+        },
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    server: Optional[grpc.aio.Server] = None
+    executor: Optional[futures.ThreadPoolExecutor] = None
+    target = args.target
+    if target is None:
+        executor = futures.ThreadPoolExecutor(max_workers=get_settings().grpc_max_workers)
+        server = create_server(executor)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        target = f"127.0.0.1:{port}"
+
+    try:
+        for rpc in args.rpc:
+            report = await run_benchmark(target, rpc, args.requests, args.concurrency, args.batch_size)
+            print(json.dumps(report))
+    finally:
+        if server is not None:
+            await server.stop(grace=None)
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="host:port of a running server (default: start one in-process)")
+    parser.add_argument(
+        "--rpc",
+        nargs="+",
+        default=["reliability", "employee_kpis", "batch_employee_kpis"],
+        choices=["reliability", "employee_kpis", "batch_employee_kpis", "batch_quality"],
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,248 @@
+"""
+Compute and persistence throughput of the KPI services, per-entity vs batch
+
+Generates a synthetic org (benchmarks.synthetic_org) with --entities
+repositories, services and employees, loads its collector data into the
+database, and for each service computes and stores the KPIs of its entities
+twice: once entity by entity (calculate + save, one commit each, as the
+single-entity API does) and once through the batch variant (one vectorized
+calculation and one bulk upsert per --batch-size entities). Calculation and
+saving are timed separately. DORA and employee KPIs are computed from the
+generated deployments, incidents and activities, quality and reliability from
+generated inputs.
+
+Prints one JSON report per service (and appends it to --output), tagged with
+the database dialect, scale and seed so runs against SQLite and Postgres, or
+before and after a change, can be compared. The per-entity pass runs over the
+first --per-entity-sample entities only; its rates are per entity, so they
+compare with the batch rates at any scale. The org and its KPIs are deleted
+from the database afterwards.
+
+    python -m benchmarks.kpi_batch_bench --entities 10000
+    python -m benchmarks.kpi_batch_bench --service dora employee --database-url postgresql://localhost/kpi_bench
+    python -m benchmarks.kpi_batch_bench --service quality --no-save --output reports.jsonl
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+import argparse
+import json
+import time
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base, create_db_engine
+from app.services.dora_service import DORAService
+from app.services.employee_kpi_service import EmployeeKPIService
+from app.services.quality_service import QualityService
+from app.services.reliability_service import ReliabilityService
+from benchmarks.synthetic_org import (
+    SyntheticOrg,
+    create_source_tables,
+    delete_org,
+    delete_results,
+    generate_org,
+    load_org,
+)
+
+
+@dataclass
+class ServiceBench:
+    service: type
+    # The org's entities of this service (ids or inputs)
+    entities: Callable[[SyntheticOrg], list]
+    # (service, org, entities) -> results; a single entity is a batch of one
+    calculate_one: Callable
+    calculate_batch: Callable
+    # (service, org, results); the single-entity save takes one result
+    save_one: Callable
+    save_batch: Callable
+
+
+SERVICES = {
+    "dora": ServiceBench(
+        service=DORAService,
+        entities=lambda org: org.repository_ids,
+        calculate_one=lambda service, org, repository_id: service.calculate_dora_metrics_from_events(
+            org.period_start, org.period_end, [repository_id]
+        )[repository_id],
+        calculate_batch=lambda service, org, repository_ids: list(
+            service.calculate_dora_metrics_batch(org.period_start, org.period_end, repository_ids).values()
+        ),
+        save_one=lambda service, org, metrics: service.save_dora_metrics(metrics),
+        save_batch=lambda service, org, metrics: service.save_dora_metrics_batch(metrics),
+    ),
+    "quality": ServiceBench(
+        service=QualityService,
+        entities=lambda org: org.quality_inputs,
+        calculate_one=lambda service, org, entity: service.calculate_quality_score(
+            repository_id=entity.repository_id,
+            code_coverage=entity.code_coverage,
+            technical_debt_ratio=entity.technical_debt_ratio,
+            bug_density=entity.bug_density,
+            code_complexity=entity.code_complexity,
+        ),
+        calculate_batch=lambda service, org, inputs: service.calculate_quality_scores(inputs),
+        save_one=lambda service, org, metrics: service.save_quality_metrics(metrics, org.period_start, org.period_end),
+        save_batch=lambda service, org, metrics: service.save_quality_metrics_batch(
+            metrics, org.period_start, org.period_end
+        ),
+    ),
+    "reliability": ServiceBench(
+        service=ReliabilityService,
+        entities=lambda org: org.reliability_inputs,
+        calculate_one=lambda service, org, entity: service.calculate_reliability_score(
+            service_id=entity.service_id,
+            uptime_percentage=entity.uptime_percentage,
+            incident_frequency=entity.incident_frequency,
+            error_rate=entity.error_rate,
+            latency_p99=entity.latency_p99,
+        ),
+        calculate_batch=lambda service, org, inputs: service.calculate_reliability_scores(inputs),
+        save_one=lambda service, org, metrics: service.save_reliability_metrics(
+            metrics, org.period_start, org.period_end
+        ),
+        save_batch=lambda service, org, metrics: service.save_reliability_metrics_batch(
+            metrics, org.period_start, org.period_end
+        ),
+    ),
+    "employee": ServiceBench(
+        service=EmployeeKPIService,
+        entities=lambda org: org.employee_ids,
+        calculate_one=lambda service, org, employee_id: service.calculate_employee_kpis_from_activity(
+            [employee_id], "custom", org.period_start, org.period_end
+        )[0],
+        calculate_batch=lambda service, org, employee_ids: service.calculate_employee_kpis_from_activity(
+            employee_ids, "custom", org.period_start, org.period_end
+        ),
+        save_one=lambda service, org, kpis: service.save_employee_kpis(kpis),
+        save_batch=lambda service, org, kpis: service.save_employee_kpis_batch(kpis),
+    ),
+}
+
+
+def _throughput(entities: int, compute_seconds: float, save_seconds: Optional[float]) -> dict:
+    elapsed = compute_seconds + (save_seconds or 0.0)
+    report = {
+        "entities": entities,
+        "compute_seconds": round(compute_seconds, 3),
+        "compute_entities_per_second": round(entities / compute_seconds, 1) if compute_seconds else None,
+    }
+    if save_seconds is not None:
+        report["save_seconds"] = round(save_seconds, 3)
+        report["save_entities_per_second"] = round(entities / save_seconds, 1) if save_seconds else None
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["entities_per_second"] = round(entities / elapsed, 1) if elapsed else None
+    return report
+
+
+def _per_entity(db: Session, bench: ServiceBench, org: SyntheticOrg, entities: list, save: bool) -> dict:
+    service = bench.service(db)
+    compute_seconds = save_seconds = 0.0
+    for entity in entities:
+        started = time.perf_counter()
+        result = bench.calculate_one(service, org, entity)
+        compute_seconds += time.perf_counter() - started
+        if save:
+            started = time.perf_counter()
+            bench.save_one(service, org, result)
+            save_seconds += time.perf_counter() - started
+    return _throughput(len(entities), compute_seconds, save_seconds if save else None)
+
+
+def _batch(db: Session, bench: ServiceBench, org: SyntheticOrg, entities: list, save: bool, batch_size: int) -> dict:
+    service = bench.service(db)
+    compute_seconds = save_seconds = 0.0
+    for offset in range(0, len(entities), batch_size):
+        started = time.perf_counter()
+        results = bench.calculate_batch(service, org, entities[offset:offset + batch_size])
+        compute_seconds += time.perf_counter() - started
+        if save:
+            started = time.perf_counter()
+            bench.save_batch(service, org, results)
+            save_seconds += time.perf_counter() - started
+    return _throughput(len(entities), compute_seconds, save_seconds if save else None)
+
+
+def run_benchmark(
+    sessions: sessionmaker,
+    org: SyntheticOrg,
+    service: str,
+    save: bool,
+    batch_size: int,
+    per_entity_sample: int,
+) -> dict:
+    bench = SERVICES[service]
+    entities = bench.entities(org)
+    with sessions() as db:
+        per_entity = _per_entity(db, bench, org, entities[:per_entity_sample], save)
+        # Both passes insert: results of the first one would turn the second one's inserts into updates
+        delete_results(db)
+        batch = _batch(db, bench, org, entities, save, batch_size)
+        delete_results(db)
+
+    return {
+        "service": service,
+        "entities": len(entities),
+        "save": save,
+        "batch_size": batch_size,
+        "per_entity": per_entity,
+        "batch": batch,
+        "speedup": round(batch["entities_per_second"] / per_entity["entities_per_second"], 1)
+        if per_entity["entities"] and batch["entities_per_second"] and per_entity["entities_per_second"] else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", nargs="+", default=list(SERVICES), choices=list(SERVICES))
+    parser.add_argument("--entities", type=int, default=5000, help="repositories, services and employees each")
+    parser.add_argument("--days", type=int, default=30, help="length of the generated activity period")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000, help="entities per batch calculation and upsert")
+    parser.add_argument("--per-entity-sample", type=int, default=1000, help="entities timed one by one")
+    parser.add_argument("--no-save", dest="save", action="store_false", help="only time the calculation")
+    parser.add_argument("--database-url", help="database to benchmark against (default: DATABASE_URL)")
+    parser.add_argument("--output", help="also append the JSON reports to this file")
+    args = parser.parse_args(argv)
+
+    engine = create_db_engine(args.database_url)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    create_source_tables(engine)
+
+    started = time.perf_counter()
+    org = generate_org(args.entities, args.entities, args.entities, days=args.days, seed=args.seed)
+    generated = time.perf_counter()
+    with sessions() as db:
+        delete_org(db)  # leftovers of an interrupted run
+        loaded_rows = load_org(db, org)
+    loaded = time.perf_counter()
+    context = {
+        "database": engine.dialect.name,
+        "scale": args.entities,
+        "days": args.days,
+        "seed": args.seed,
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "source_rows": loaded_rows,
+        "generate_seconds": round(generated - started, 3),
+        "load_rows_per_second": round(org.source_rows / (loaded - generated), 1),
+    }
+
+    try:
+        for service in args.service:
+            report = {
+                **run_benchmark(sessions, org, service, args.save, args.batch_size, args.per_entity_sample),
+                **context,
+            }
+            print(json.dumps(report))
+            if args.output:
+                with open(args.output, "a") as f:
+                    f.write(json.dumps(report) + "\n")
+    finally:
+        with sessions() as db:
+            delete_org(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Synthetic engineering organisation for the KPI engine benchmarks
+
+Generates repositories, services and employees at a given scale, together with
+the collector data the engine computes from: deployments (ea_metrics events
+carrying the deployed commit_sha), incidents, and commits, pull requests, code
+reviews, completed issues (ea_activities) and lead/cycle time samples of the
+employees. Services, which have no source tables, get the metric inputs of the
+quality and reliability calculations instead. Generation is seeded and
+vectorized, so the same arguments give the same org (up to row ids) even at
+100k entities per kind.
+
+All generated ids are recognisable (repositories, services, teams and orgs
+start with BENCH_PREFIX, employee UUIDs with EMPLOYEE_ID_PREFIX), so
+delete_org removes the org and every KPI computed from it from a shared
+database.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import uuid
+
+import numpy as np
+from sqlalchemy import Index, delete, or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.kpi_result import KPIResult
+from app.models.kpi_sketch import KPISketch
+from app.models.source_tables import (
+    ACTIVITY_CODE_REVIEW,
+    ACTIVITY_COMMIT,
+    ACTIVITY_ISSUE_COMPLETED,
+    ACTIVITY_PULL_REQUEST,
+    EVENT_PERIOD_TYPE,
+    METRIC_CYCLE_TIME,
+    METRIC_DEPLOYMENT,
+    METRIC_INCIDENT,
+    METRIC_LEAD_TIME,
+    ea_activities,
+    ea_metrics,
+    source_metadata,
+)
+from app.models.team_membership import TeamMembership
+from app.services.quality_service import QualityInput
+from app.services.reliability_service import ReliabilityInput
+from app.services.rollup_service import MembershipInput, RollupService
+
+BENCH_PREFIX = "bench-"
+EMPLOYEE_ID_PREFIX = "be0c0000-"
+
+# Mean events per entity and day of the period
+DEPLOYMENTS_PER_DAY = 1.0
+INCIDENTS_PER_DAY = 0.1
+PULL_REQUESTS_PER_DAY = 0.4
+CODE_REVIEWS_PER_DAY = 0.6
+ISSUES_PER_DAY = 0.3
+# Mean durations in hours
+COMMIT_TO_DEPLOY_HOURS = 20.0
+INCIDENT_RECOVERY_HOURS = 3.0
+PULL_REQUEST_CYCLE_HOURS = 8.0
+UNRESOLVED_INCIDENT_SHARE = 0.1
+TEAM_SIZE = 8
+TEAMS_PER_ORG = 10
+
+# The collector's indexes on what the engine reads, so a bare benchmark database is not scanned per deployment
+COLLECTOR_INDEXES = [
+    Index(
+        "ix_ea_metrics_type_repository_period",
+        ea_metrics.c.metric_type,
+        ea_metrics.c.repository_id,
+        ea_metrics.c.period_start,
+    ),
+    Index("ix_ea_metrics_employee_id", ea_metrics.c.employee_id),
+    Index("ix_ea_activities_type_external", ea_activities.c.activity_type, ea_activities.c.external_id),
+    Index("ix_ea_activities_employee_occurred", ea_activities.c.employee_id, ea_activities.c.occurred_at),
+]
+
+
+@dataclass
+class SyntheticOrg:
+    period_start: datetime
+    period_end: datetime
+    repository_ids: List[str]
+    service_ids: List[str]
+    employee_ids: List[str]
+    memberships: List[MembershipInput]
+    quality_inputs: List[QualityInput]
+    reliability_inputs: List[ReliabilityInput]
+    # Rows of the collector tables, keyed by column name
+    metrics: List[dict] = field(default_factory=list)
+    activities: List[dict] = field(default_factory=list)
+
+    @property
+    def source_rows(self) -> int:
+        return len(self.metrics) + len(self.activities)
+
+
+def generate_org(
+    repositories: int,
+    employees: int,
+    services: int,
+    days: int = 30,
+    seed: int = 42,
+    period_end: Optional[datetime] = None,
+) -> SyntheticOrg:
+    """An org with the given number of entities of each kind and `days` of activity up to `period_end`"""
+    rng = np.random.default_rng(seed)
+    period_end = period_end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    period_start = period_end - timedelta(days=days)
+    repository_ids = [f"{BENCH_PREFIX}repo-{i}" for i in range(repositories)]
+    employee_ids = [f"{EMPLOYEE_ID_PREFIX}0000-4000-8000-{i:012x}" for i in range(employees)]
+    employee_uuids = [uuid.UUID(employee_id) for employee_id in employee_ids]
+    period_hours = days * 24
+
+    def times(count: int) -> np.ndarray:
+        return rng.uniform(0, period_hours, count)
+
+    def at(hours: float) -> datetime:
+        return period_start + timedelta(hours=float(hours))
+
+    def metric(metric_type, repository_id, start, end, value=1.0, employee=None, period_type=EVENT_PERIOD_TYPE,
+               metadata=None) -> dict:
+        return {
+            "metric_id": uuid.uuid4(),
+            "employee_id": employee,
+            "repository_id": repository_id,
+            "metric_type": metric_type,
+            "value": float(value),
+            "period_start": start,
+            "period_end": end,
+            "period_type": period_type,
+            "source": "benchmark",
+            "metadata": metadata or {},
+            "updated_at": period_end,
+        }
+
+    def activity(activity_type, employee, repository_id, occurred_at, external_id, raw_data=None) -> dict:
+        return {
+            "activity_id": uuid.uuid4(),
+            "employee_id": employee,
+            "source": "benchmark",
+            "activity_type": activity_type,
+            "external_id": external_id,
+            "repository_id": repository_id,
+            "occurred_at": occurred_at,
+            "raw_data": raw_data or {},
+        }
+
+    metrics, activities = [], []
+    # Deployments, each of a commit by a random employee made some hours before
+    deploy_repos = np.repeat(np.arange(repositories), rng.poisson(DEPLOYMENTS_PER_DAY * days, repositories))
+    deploy_hours = times(deploy_repos.size)
+    commit_hours = deploy_hours - rng.exponential(COMMIT_TO_DEPLOY_HOURS, deploy_repos.size)
+    authors = rng.integers(0, max(employees, 1), deploy_repos.size)
+    for n, (repo, deployed, committed, author) in enumerate(zip(deploy_repos, deploy_hours, commit_hours, authors)):
+        repository_id, sha = repository_ids[repo], f"{BENCH_PREFIX}{n:x}"
+        deployed_at = at(deployed)
+        metrics.append(metric(METRIC_DEPLOYMENT, repository_id, deployed_at, deployed_at, metadata={"commit_sha": sha}))
+        if employees:
+            activities.append(activity(ACTIVITY_COMMIT, employee_uuids[author], repository_id, at(committed), sha))
+
+    # Incidents, some still unresolved (ended == started)
+    incident_repos = np.repeat(np.arange(repositories), rng.poisson(INCIDENTS_PER_DAY * days, repositories))
+    incident_hours = times(incident_repos.size)
+    recovery_hours = rng.exponential(INCIDENT_RECOVERY_HOURS, incident_repos.size)
+    recovery_hours[rng.random(incident_repos.size) < UNRESOLVED_INCIDENT_SHARE] = 0
+    for repo, started, recovery in zip(incident_repos, incident_hours, recovery_hours):
+        metrics.append(metric(METRIC_INCIDENT, repository_ids[repo], at(started), at(started + recovery)))
+
+    # Pull requests with their lead/cycle time samples, code reviews and completed issues per employee
+    if employees and repositories:
+        pr_authors = np.repeat(np.arange(employees), rng.poisson(PULL_REQUESTS_PER_DAY * days, employees))
+        pr_hours = times(pr_authors.size)
+        pr_repos = rng.integers(0, repositories, pr_authors.size)
+        cycle_hours = rng.exponential(PULL_REQUEST_CYCLE_HOURS, pr_authors.size)
+        lead_hours = cycle_hours + rng.exponential(PULL_REQUEST_CYCLE_HOURS, pr_authors.size)
+        states = rng.choice(["open", "closed", "merged"], pr_authors.size, p=[0.2, 0.1, 0.7])
+        for n, (author, opened, repo, cycle, lead, state) in enumerate(
+            zip(pr_authors, pr_hours, pr_repos, cycle_hours, lead_hours, states)
+        ):
+            employee, repository_id, opened_at = employee_uuids[author], repository_ids[repo], at(opened)
+            activities.append(activity(
+                ACTIVITY_PULL_REQUEST, employee, repository_id, opened_at, f"{BENCH_PREFIX}pr-{n}", {"state": state}
+            ))
+            if state == "merged":
+                merged_at = at(opened + cycle)
+                metrics.append(metric(METRIC_CYCLE_TIME, repository_id, opened_at, merged_at, cycle, employee, "pr"))
+                metrics.append(metric(METRIC_LEAD_TIME, repository_id, opened_at, merged_at, lead, employee, "pr"))
+
+        per_day = {ACTIVITY_CODE_REVIEW: CODE_REVIEWS_PER_DAY, ACTIVITY_ISSUE_COMPLETED: ISSUES_PER_DAY}
+        for activity_type, rate in per_day.items():
+            actors = np.repeat(np.arange(employees), rng.poisson(rate * days, employees))
+            for n, (actor, occurred, repo) in enumerate(
+                zip(actors, times(actors.size), rng.integers(0, repositories, actors.size))
+            ):
+                activities.append(activity(
+                    activity_type, employee_uuids[actor], repository_ids[repo], at(occurred),
+                    f"{BENCH_PREFIX}{activity_type.lower()}-{n}",
+                ))
+
+    teams = np.arange(employees) // TEAM_SIZE
+    memberships = [
+        MembershipInput(employee_id, f"{BENCH_PREFIX}team-{team}", f"{BENCH_PREFIX}org-{team // TEAMS_PER_ORG}")
+        for employee_id, team in zip(employee_ids, teams)
+    ]
+
+    service_ids = [f"{BENCH_PREFIX}service-{i}" for i in range(services)]
+    quality = np.column_stack([
+        rng.uniform(20, 100, repositories), rng.uniform(0, 20, repositories),
+        rng.uniform(0, 2, repositories), rng.uniform(1, 40, repositories),
+    ])
+    reliability = np.column_stack([
+        rng.uniform(98, 100, services), rng.uniform(0, 1, services),
+        rng.uniform(0, 1, services), rng.uniform(50, 1500, services),
+    ])
+    return SyntheticOrg(
+        period_start=period_start,
+        period_end=period_end,
+        repository_ids=repository_ids,
+        service_ids=service_ids,
+        employee_ids=employee_ids,
+        memberships=memberships,
+        quality_inputs=[
+            QualityInput(repository_id, *map(float, values)) for repository_id, values in zip(repository_ids, quality)
+        ],
+        reliability_inputs=[
+            ReliabilityInput(service_id, *map(float, values)) for service_id, values in zip(service_ids, reliability)
+        ],
+        metrics=metrics,
+        activities=activities,
+    )
+
+
+def create_source_tables(engine: Engine) -> None:
+    """Create the collector tables, with COLLECTOR_INDEXES, where the collector has not"""
+    source_metadata.create_all(bind=engine)
+
+
+def load_org(db: Session, org: SyntheticOrg, chunk_size: int = 10000) -> Dict[str, int]:
+    """Insert the org's collector rows and team memberships; returns the row count per table"""
+    for table, rows in ((ea_metrics, org.metrics), (ea_activities, org.activities)):
+        for offset in range(0, len(rows), chunk_size):
+            db.execute(table.insert(), rows[offset:offset + chunk_size])
+    db.commit()
+    RollupService(db).sync_memberships(org.memberships)
+    return {
+        ea_metrics.name: len(org.metrics),
+        ea_activities.name: len(org.activities),
+        TeamMembership.__tablename__: len(org.memberships),
+    }
+
+
+def delete_results(db: Session) -> None:
+    """Remove the KPI results and sketches computed for any synthetic org"""
+    for model in (KPIResult, KPISketch):
+        db.execute(delete(model).where(_generated(model.entity_id)))
+    db.commit()
+
+
+def delete_org(db: Session) -> None:
+    """Remove every synthetic org: collector rows, memberships, KPI results and sketches"""
+    delete_results(db)
+    db.execute(delete(ea_metrics).where(ea_metrics.c.repository_id.like(f"{BENCH_PREFIX}%")))
+    db.execute(delete(ea_activities).where(ea_activities.c.repository_id.like(f"{BENCH_PREFIX}%")))
+    db.execute(delete(TeamMembership).where(_generated(TeamMembership.employee_id)))
+    db.commit()
+
+
+def _generated(column):
+    return or_(column.like(f"{BENCH_PREFIX}%"), column.like(f"{EMPLOYEE_ID_PREFIX}%"))
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.models.source_tables import ACTIVITY_COMMIT, ACTIVITY_PULL_REQUEST, ea_activities
+from app.services.employee_kpi_service import EmployeeKPIService
+
+PERIOD_START = datetime(2024, 3, 4)
+PERIOD_END = datetime(2024, 3, 11)
+
+
+def test_activities_count_toward_the_employee_the_collector_attributed_them_to(db):
+    employee_id = uuid4()
+    activity = {"source": "GITLAB", "repository_id": "42", "raw_data": None, "created_at": PERIOD_START}
+    db.execute(ea_activities.insert(), [
+        # Synced and webhook commits, attributed through the identity of their author
+        *({**activity, "activity_id": uuid4(), "employee_id": employee_id, "activity_type": ACTIVITY_COMMIT,
+           "external_id": f"sha{n}", "occurred_at": PERIOD_START + timedelta(days=n)} for n in range(3)),
+        {**activity, "activity_id": uuid4(), "employee_id": employee_id, "activity_type": ACTIVITY_PULL_REQUEST,
+         "external_id": "42!1", "occurred_at": PERIOD_START, "raw_data": {"state": "merged"}},
+        # An author not matched to any employee, and a commit outside the period
+        {**activity, "activity_id": uuid4(), "employee_id": None, "activity_type": ACTIVITY_COMMIT,
+         "external_id": "sha-other", "occurred_at": PERIOD_START},
+        {**activity, "activity_id": uuid4(), "employee_id": employee_id, "activity_type": ACTIVITY_COMMIT,
+         "external_id": "sha-old", "occurred_at": PERIOD_START - timedelta(days=1)},
+    ])
+    db.commit()
+    service = EmployeeKPIService(db)
+
+    [attributed, other] = service.load_activity_inputs([str(employee_id), str(uuid4())], PERIOD_START, PERIOD_END)
+
+    assert (attributed.commits, attributed.prs_opened, attributed.prs_closed) == (3, 1, 1)
+    assert other.commits == 0
+    assert service.active_employees(PERIOD_START, PERIOD_END) == [str(employee_id)]
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.kpi_result import KPIResult, KPIType
+from app.models.source_tables import EVENT_PERIOD_TYPE, METRIC_DEPLOYMENT, ea_metrics
+from app.services.dora_service import DORAService
+
+PERIOD_START = datetime(2024, 3, 1)
+PERIOD_END = datetime(2024, 3, 11)
+
+
+def deploy(db, repository_id: str, deployed_at: datetime) -> None:
+    db.execute(ea_metrics.insert().values(
+        metric_id=uuid4(),
+        repository_id=repository_id,
+        metric_type=METRIC_DEPLOYMENT,
+        value=1,
+        period_start=deployed_at,
+        period_end=deployed_at,
+        period_type=EVENT_PERIOD_TYPE,
+        source="gitlab",
+        updated_at=datetime.utcnow(),
+    ))
+    db.commit()
+
+
+def dora(db, *repository_ids: str):
+    return DORAService(db).get_dora_metrics(PERIOD_START, PERIOD_END, list(repository_ids))
+
+
+@pytest.fixture
+def repositories(db):
+    deploy(db, "web", PERIOD_START + timedelta(days=1))
+    deploy(db, "api", PERIOD_START + timedelta(days=2))
+    return dora(db, "web", "api")
+
+
+def test_unchanged_repositories_are_served_from_stored_results(db, repositories):
+    again = dora(db, "web", "api")
+
+    assert {r: m.calculated_at for r, m in again.items()} == {r: m.calculated_at for r, m in repositories.items()}
+    assert again["web"].deployment_frequency == 0.1
+    assert db.query(KPIResult).filter(KPIResult.kpi_type == KPIType.DORA_DEPLOYMENT_FREQUENCY).count() == 2
+
+
+def test_a_new_event_invalidates_only_its_repository(db, repositories):
+    deploy(db, "web", PERIOD_START + timedelta(days=3))
+
+    again = dora(db, "web", "api")
+
+    assert again["web"].calculated_at > repositories["web"].calculated_at
+    assert again["web"].deployment_frequency == 0.2
+    assert again["api"].calculated_at == repositories["api"].calculated_at
+    stored = db.query(KPIResult).filter(
+        KPIResult.entity_id == "web", KPIResult.kpi_type == KPIType.DORA_DEPLOYMENT_FREQUENCY
+    ).one()
+    assert (stored.value, stored.calculated_at) == (0.2, again["web"].calculated_at)
+
+
+def test_disabled_cache_recalculates(db, repositories, settings, monkeypatch):
+    monkeypatch.setattr(settings, "kpi_cache_enabled", False)
+
+    again = dora(db, "web")
+
+    assert again["web"].calculated_at > repositories["web"].calculated_at
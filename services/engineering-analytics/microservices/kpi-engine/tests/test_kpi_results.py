@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from app.models.kpi_result import KPIResult, KPIType, upsert_kpi_results
+
+PERIOD_START = datetime(2024, 3, 1)
+PERIOD_END = datetime(2024, 3, 31)
+
+
+def result(entity_id: str, value: float, **columns) -> dict:
+    return {
+        "entity_type": "repository",
+        "entity_id": entity_id,
+        "kpi_type": KPIType.QUALITY_SCORE,
+        "value": value,
+        "unit": "score",
+        "period_start": PERIOD_START,
+        "period_end": PERIOD_END,
+        "period_type": "custom",
+        "metadata_": {"code_coverage": value},
+        **columns,
+    }
+
+
+def stored(db):
+    return {
+        (row.entity_id, row.period_end): (row.value, row.metadata_)
+        for row in db.query(KPIResult).order_by(KPIResult.entity_id)
+    }
+
+
+def test_upsert_kpi_results_is_idempotent(db):
+    rows = [result("web", 80.0), result("api", 70.0)]
+    upsert_kpi_results(db, rows)
+    db.commit()
+    upsert_kpi_results(db, rows)
+    db.commit()
+
+    assert db.query(KPIResult).count() == 2
+    assert stored(db)[("web", PERIOD_END)] == (80.0, {"code_coverage": 80.0})
+
+
+def test_upsert_kpi_results_overwrites_a_recalculated_result(db):
+    upsert_kpi_results(db, [result("web", 80.0)])
+    db.commit()
+    recalculated_at = datetime(2024, 4, 2)
+    upsert_kpi_results(db, [
+        result("web", 85.0, calculated_at=recalculated_at),
+        result("web", 60.0, period_end=datetime(2024, 4, 30)),  # another period is another result
+    ])
+    db.commit()
+
+    assert stored(db) == {
+        ("web", PERIOD_END): (85.0, {"code_coverage": 85.0}),
+        ("web", datetime(2024, 4, 30)): (60.0, {"code_coverage": 60.0}),
+    }
+    row = db.query(KPIResult).filter(KPIResult.period_end == PERIOD_END).one()
+    assert row.calculated_at == recalculated_at
+
+
+def test_upsert_kpi_results_keeps_the_last_duplicate_of_a_batch(db):
+    upsert_kpi_results(db, [result("web", 80.0), result("web", 90.0)])
+    db.commit()
+
+    assert stored(db) == {("web", PERIOD_END): (90.0, {"code_coverage": 90.0})}
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from app.models.kpi_result import KPIResult, KPIType
+from app.models.source_tables import ea_quality_snapshots
+from app.services.quality_service import QualityService
+
+PERIOD_START = datetime(2024, 3, 1)
+PERIOD_END = datetime(2024, 3, 31)
+
+
+def test_repositories_without_a_snapshot_are_scored_but_not_stored(db):
+    db.execute(ea_quality_snapshots.insert().values(
+        repository_id="web", code_coverage=82.0, technical_debt_ratio=None, bug_density=0.4, code_complexity=None,
+    ))
+    db.commit()
+    service = QualityService(db)
+
+    metrics = service.calculate_quality_scores_from_snapshots(["web", "unknown"])
+    saved = service.save_quality_metrics_batch(metrics, PERIOD_START, PERIOD_END)
+
+    assert [m.repository_id for m in metrics] == ["web", "unknown"]
+    assert len(metrics[1].unmeasured) == 4
+    assert saved == 1
+    [stored] = db.query(KPIResult).filter(KPIResult.kpi_type == KPIType.QUALITY_SCORE).all()
+    assert stored.entity_id == "web"
+    assert (stored.metadata_["code_coverage"], stored.metadata_["technical_debt_ratio"]) == (82.0, None)
@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import uuid4
+
+from app.models.kpi_result import KPIResult, KPIType
+from app.models.source_tables import METRIC_UPTIME, ea_metrics
+from app.services.reliability_service import ReliabilityService
+
+PERIOD_START = datetime(2024, 3, 1)
+PERIOD_END = datetime(2024, 3, 2)
+
+
+def test_services_without_data_are_scored_but_not_stored(db):
+    db.execute(ea_metrics.insert().values(
+        metric_id=uuid4(),
+        repository_id="api",
+        metric_type=METRIC_UPTIME,
+        value=99.5,
+        period_start=PERIOD_START,
+        period_end=PERIOD_END,
+        period_type="day",
+    ))
+    db.commit()
+    service = ReliabilityService(db)
+
+    metrics = service.calculate_reliability_scores_from_metrics(["api", "unknown"], PERIOD_START, PERIOD_END)
+    saved = service.save_reliability_metrics_batch(metrics, PERIOD_START, PERIOD_END)
+
+    assert [m.service_id for m in metrics] == ["api", "unknown"]
+    assert len(metrics[1].unmeasured) == 4
+    assert saved == 1
+    [stored] = db.query(KPIResult).filter(KPIResult.kpi_type == KPIType.RELIABILITY_SCORE).all()
+    assert stored.entity_id == "api"
+    assert stored.metadata_["uptime_percentage"] == 99.5
+    assert stored.metadata_["latency_p99"] is None
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.source_tables import METRIC_UPTIME, ea_metrics, ea_quality_snapshots
+from app.services.quality_service import QualityInput, QualityService
+from app.services.reliability_service import ReliabilityInput, ReliabilityService
+from app.services.scoring import SCORED_INPUTS
+
+PERIOD_START = datetime(2024, 3, 1)
+PERIOD_END = datetime(2024, 3, 2)
+
+
+def test_batch_reliability_scores_match_single_scores(db):
+    inputs = [
+        ReliabilityInput("api", uptime_percentage=99.99, incident_frequency=0.1, error_rate=0.5, latency_p99=150),
+        ReliabilityInput("web", uptime_percentage=97.0, incident_frequency=2.0, error_rate=4.0, latency_p99=900),
+        ReliabilityInput("jobs", uptime_percentage=99.5),
+    ]
+    service = ReliabilityService(db)
+
+    batch = service.calculate_reliability_scores(inputs)
+
+    assert [m.service_id for m in batch] == ["api", "web", "jobs"]
+    for entity, metrics in zip(inputs, batch):
+        single = service.calculate_reliability_score(
+            entity.service_id, entity.uptime_percentage, entity.incident_frequency, entity.error_rate,
+            entity.latency_p99,
+        )
+        assert metrics.overall_score == single.overall_score
+    assert batch[0].overall_score > batch[1].overall_score
+    assert batch[0].unmeasured == ()
+    assert batch[2].unmeasured == ("incident_frequency", "error_rate", "latency_p99")
+
+
+def test_batch_quality_scores_read_every_snapshot_in_order(db):
+    db.execute(ea_quality_snapshots.insert(), [
+        {"repository_id": "web", "code_coverage": 85.0, "technical_debt_ratio": 2.0, "bug_density": 0.2,
+         "code_complexity": 6.0},
+        {"repository_id": "api", "code_coverage": 40.0, "technical_debt_ratio": None, "bug_density": None,
+         "code_complexity": None},
+    ])
+    db.commit()
+    service = QualityService(db)
+
+    every = service.calculate_quality_scores_from_snapshots()
+    requested = service.calculate_quality_scores_from_snapshots(["web", "api"])
+
+    assert [m.repository_id for m in every] == ["api", "web"]
+    assert [m.repository_id for m in requested] == ["web", "api"]
+    expected = service.calculate_quality_scores([
+        QualityInput("web", 85.0, 2.0, 0.2, 6.0), QualityInput("api", code_coverage=40.0),
+    ])
+    assert [m.overall_score for m in requested] == [m.overall_score for m in expected]
+    assert requested[1].unmeasured == SCORED_INPUTS["quality"][1:]
+
+
+def test_reliability_inputs_use_the_finest_imported_resolution(db):
+    def uptime(period_type: str, period_start: datetime, value: float) -> dict:
+        return {"metric_id": uuid4(), "repository_id": "api", "metric_type": METRIC_UPTIME, "value": value,
+                "period_start": period_start, "period_end": period_start, "period_type": period_type}
+
+    db.execute(ea_metrics.insert(), [
+        uptime("day", PERIOD_START, 90.0),
+        *(uptime("hour", PERIOD_START + timedelta(hours=h), 100.0 if h else 76.0) for h in range(24)),
+    ])
+    db.commit()
+
+    [entity] = ReliabilityService(db).load_reliability_inputs(["api"], PERIOD_START, PERIOD_END)
+
+    assert entity.uptime_percentage == pytest.approx(99.0)
+    assert entity.latency_p99 is None
@@ -0,0 +1,8 @@
+from app.clients.http_client import (
+    IntegrationHttpClient,
+    TokenBucket,
+    close_http_client,
+    get_http_client,
+)
+
+__all__ = ["IntegrationHttpClient", "TokenBucket", "get_http_client", "close_http_client"]
@@ -0,0 +1,248 @@
+"""
+Pooled HTTP client for external integrations
+Supports: Story 5.1 - Integrate Engineering Tools
+
+One process-wide httpx.AsyncClient (HTTP/2, keep-alive pool) is shared by all
+connectors. On top of the pool each upstream host gets:
+  - a connection slot limit, so one busy Jira instance cannot take the whole pool
+  - a token bucket, refilled at the configured rate and corrected from the
+    host's X-RateLimit-* / RateLimit-* headers
+  - a pause honouring Retry-After (or an exhausted rate-limit window) with
+    automatic retries of the throttled request
+Request timings, in-flight requests and throttling are exported as Prometheus
+metrics on the service's /metrics endpoint.
+"""
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import logging
+import time
+
+import httpx
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DURATION = Histogram(
+    "ea_http_client_request_duration_seconds",
+    "Duration of outbound integration HTTP requests",
+    ["host", "method", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "ea_http_client_requests_in_flight",
+    "Outbound integration HTTP requests in flight",
+    ["host"],
+)
+THROTTLED = Counter(
+    "ea_http_client_throttled_total",
+    "Outbound requests delayed by upstream rate limiting",
+    ["host", "reason"],
+)
+
+RETRYABLE_STATUS = {429, 502, 503, 504}
+# Reset headers above this are epoch seconds (GitHub, GitLab); below it, seconds from now
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, waiting for refill or a server-imposed pause; returns seconds waited"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def observe(self, remaining: Optional[int], reset_in: Optional[float]) -> None:
+        """Align the bucket with the quota the server reports as left"""
+        if remaining is None:
+            return
+        self.tokens = min(self.tokens, float(remaining))
+        if remaining <= 0 and reset_in:
+            self.pause(reset_in)
+
+
+class IntegrationHttpClient:
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.settings = get_settings()
+        self._client = httpx.AsyncClient(
+            http2=self.settings.http_client_http2,
+            timeout=self.settings.http_client_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self.settings.http_client_max_connections,
+                max_keepalive_connections=self.settings.http_client_max_keepalive,
+                keepalive_expiry=self.settings.http_client_keepalive_expiry_seconds,
+            ),
+            transport=transport,
+            follow_redirects=True,
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.loop = asyncio.get_running_loop()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the host's slot and rate limit, retrying throttled responses"""
+        host = httpx.URL(url).host
+        for attempt in range(self.settings.http_client_max_retries + 1):
+            async with self._slot(host):
+                response = await self._send(host, method, url, **kwargs)
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+            logger.info(f"{host} throttled {method} {url} ({response.status_code}); retrying in {delay:.1f}s")
+            self._bucket(host).pause(delay)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Stream a large response body (aiter_bytes / aiter_lines) instead of buffering it.
+        The host slot is held until the body has been consumed; throttled responses are not retried.
+        """
+        host = httpx.URL(url).host
+        async with self._slot(host):
+            started = time.perf_counter()
+            async with self._client.stream(method, url, **kwargs) as response:
+                self._observe_limits(host, response)
+                try:
+                    yield response
+                finally:
+                    REQUEST_DURATION.labels(host, method, response.status_code).observe(
+                        time.perf_counter() - started
+                    )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @asynccontextmanager
+    async def _slot(self, host: str) -> AsyncIterator[None]:
+        slots = self._host_slots.setdefault(
+            host, asyncio.Semaphore(self.settings.http_client_connections_per_host)
+        )
+        async with slots:
+            waited = await self._bucket(host).acquire()
+            if waited:
+                THROTTLED.labels(host, "rate_limit").inc()
+            REQUESTS_IN_FLIGHT.labels(host).inc()
+            try:
+                yield
+            finally:
+                REQUESTS_IN_FLIGHT.labels(host).dec()
+
+    async def _send(self, host: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._client.request(method, url, **kwargs)
+            status = response.status_code
+            self._observe_limits(host, response)
+            return response
+        finally:
+            REQUEST_DURATION.labels(host, method, status).observe(time.perf_counter() - started)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(
+                self.settings.http_client_rate_per_second, self.settings.http_client_burst
+            )
+        return bucket
+
+    def _observe_limits(self, host: str, response: httpx.Response) -> None:
+        headers = response.headers
+        remaining = _int_header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        reset_in = None
+        if reset is not None:
+            reset_in = max(0.0, reset - time.time()) if reset > _EPOCH_THRESHOLD else float(reset)
+        self._bucket(host).observe(remaining, reset_in)
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        if attempt >= self.settings.http_client_max_retries:
+            return None
+        exhausted = response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+        if response.status_code not in RETRYABLE_STATUS and not exhausted:
+            return None
+
+        host = response.request.url.host
+        retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            THROTTLED.labels(host, "retry_after").inc()
+            return min(retry_after, self.settings.http_client_max_retry_wait_seconds)
+        if exhausted or response.status_code == 429:
+            THROTTLED.labels(host, "quota_exhausted").inc()
+            reset = _int_header(response.headers, "X-RateLimit-Reset", "RateLimit-Reset")
+            wait = reset - time.time() if reset and reset > _EPOCH_THRESHOLD else (reset or 2 ** attempt)
+            return min(max(wait, 0.0), self.settings.http_client_max_retry_wait_seconds)
+        # Transient gateway errors: exponential backoff
+        return float(2 ** attempt)
+
+
+def _int_header(headers: httpx.Headers, *names: str) -> Optional[int]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_client: Optional[IntegrationHttpClient] = None
+
+
+def get_http_client() -> IntegrationHttpClient:
+    """Process-wide pooled client; created lazily inside the running event loop"""
+    global _client
+    # Pools and locks are bound to the loop that created them
+    if _client is None or _client.loop is not asyncio.get_running_loop():
+        _client = IntegrationHttpClient()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
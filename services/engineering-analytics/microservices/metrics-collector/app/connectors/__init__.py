@@ -0,0 +1,42 @@
+from typing import Dict, Optional
+
+from app.clients.http_client import IntegrationHttpClient
+from app.connectors.base import BaseConnector, SyncResult, Watermark
+from app.connectors.github import GitHubConnector
+from app.connectors.gitlab import GitLabConnector
+from app.connectors.jira import JiraConnector
+from app.connectors.prometheus import PrometheusConnector
+from app.connectors.sonarqube import SonarQubeConnector
+from app.models.integration import Integration, IntegrationType
+
+CONNECTORS = {
+    IntegrationType.JIRA: JiraConnector,
+    IntegrationType.GITLAB: GitLabConnector,
+    IntegrationType.GITHUB: GitHubConnector,
+    IntegrationType.PROMETHEUS: PrometheusConnector,
+    IntegrationType.SONARQUBE: SonarQubeConnector,
+}
+
+
+def get_connector(
+    integration: Integration,
+    client: IntegrationHttpClient,
+    watermarks: Dict[str, Watermark],
+    **options,
+) -> Optional[BaseConnector]:
+    connector_cls = CONNECTORS.get(integration.integration_type)
+    return connector_cls(integration, client, watermarks, **options) if connector_cls else None
+
+
+__all__ = [
+    "BaseConnector",
+    "SyncResult",
+    "Watermark",
+    "JiraConnector",
+    "GitLabConnector",
+    "GitHubConnector",
+    "PrometheusConnector",
+    "SonarQubeConnector",
+    "CONNECTORS",
+    "get_connector",
+]
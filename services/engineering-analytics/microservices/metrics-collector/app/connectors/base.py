@@ -0,0 +1,299 @@
+"""
+Base connector for pull-based integration sync
+Supports: Story 5.1 - Integrate Engineering Tools
+
+A connector pulls records changed since its per-resource watermarks from an
+external API and normalizes them into `ea_activities` rows (or, for code
+quality measures, `ea_quality_snapshots` rows). Listings are fetched as
+deltas (updated-since filters), first pages are sent with If-None-Match so
+unchanged listings cost a 304, and when the API reports the page count the
+remaining pages are fetched in parallel. Listings longer than `max_pages`
+resume from a stored page cursor on the next run, except listings sorted by
+update time ascending (fetch_ascending): an item updated meanwhile moves to
+their end and shifts every later page, so they resume from the newest update
+read instead.
+
+Connectors only talk HTTP and move watermarks forward in memory; persistence
+and status bookkeeping are done by the SyncScheduler.
+
+Associated Frontend Files:
+  - web/app/src/pages/integrations/IntegrationsPage.tsx
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import base64
+
+import httpx
+
+from app.clients.http_client import IntegrationHttpClient
+from app.models.activity import ActivitySource, ActivityType
+from app.models.integration import Integration, IntegrationType
+
+
+@dataclass
+class Watermark:
+    resource: str
+    updated_since: Optional[datetime] = None
+    etag: Optional[str] = None
+    cursor: Optional[str] = None
+    pending_since: Optional[datetime] = None
+
+
+@dataclass
+class Page:
+    body: Any
+    response: httpx.Response
+
+
+@dataclass
+class SyncResult:
+    activities: List[Dict[str, Any]] = field(default_factory=list)
+    # Latest measures per project (ea_quality_snapshots rows), overwritten rather than appended
+    quality_snapshots: List[Dict[str, Any]] = field(default_factory=list)
+    api_calls: int = 0
+    not_modified: int = 0
+
+    def add_activity(
+        self,
+        source: ActivitySource,
+        activity_type: ActivityType,
+        external_id: str,
+        occurred_at: datetime,
+        author_ref: Optional[str] = None,
+        title: Optional[str] = None,
+        repository_id: Optional[str] = None,
+        raw_data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.activities.append({
+            "source": source,
+            "activity_type": activity_type,
+            "external_id": external_id,
+            "occurred_at": occurred_at,
+            "author_ref": author_ref,
+            "title": title[:500] if title else None,
+            "repository_id": repository_id,
+            "raw_data": raw_data,
+        })
+
+    def add_quality_snapshot(
+        self,
+        repository_id: str,
+        analysed_at: Optional[datetime],
+        project_name: Optional[str] = None,
+        code_coverage: Optional[float] = None,
+        technical_debt_ratio: Optional[float] = None,
+        bug_density: Optional[float] = None,
+        code_complexity: Optional[float] = None,
+        lines_of_code: Optional[int] = None,
+    ) -> None:
+        self.quality_snapshots.append({
+            "repository_id": repository_id,
+            "project_name": project_name[:255] if project_name else None,
+            "code_coverage": code_coverage,
+            "technical_debt_ratio": technical_debt_ratio,
+            "bug_density": bug_density,
+            "code_complexity": code_complexity,
+            "lines_of_code": lines_of_code,
+            "analysed_at": analysed_at,
+        })
+
+    @property
+    def records(self) -> int:
+        return len(self.activities) + len(self.quality_snapshots)
+
+
+class BaseConnector:
+    integration_type: IntegrationType
+
+    def __init__(
+        self,
+        integration: Integration,
+        client: IntegrationHttpClient,
+        watermarks: Dict[str, Watermark],
+        page_size: int = 100,
+        page_concurrency: int = 4,
+        max_pages: int = 50,
+    ):
+        self.integration = integration
+        self.client = client
+        self.watermarks = watermarks
+        self.page_size = page_size
+        self.page_concurrency = page_concurrency
+        self.max_pages = max_pages
+        self.base_url = integration.api_endpoint.rstrip("/")
+
+    async def pull(self) -> SyncResult:
+        """Fetch records changed since the stored watermarks, advancing them in place"""
+        raise NotImplementedError
+
+    def watermark(self, resource: str) -> Watermark:
+        return self.watermarks.setdefault(resource, Watermark(resource=resource))
+
+    def auth_headers(self) -> Dict[str, str]:
+        token = self.integration.credentials_encrypted
+        if not token:
+            return {}
+        if self.integration.auth_method == "basic":
+            return {"Authorization": f"Basic {base64.b64encode(token.encode()).decode()}"}
+        return {"Authorization": f"Bearer {token}"}
+
+    async def get_page(
+        self,
+        result: SyncResult,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None,
+    ) -> Optional[Page]:
+        """GET a JSON page; returns None when `etag` still matches (304 Not Modified)"""
+        headers = self.auth_headers()
+        if etag:
+            headers["If-None-Match"] = etag
+
+        result.api_calls += 1
+        response = await self.client.get(f"{self.base_url}{path}", params=params, headers=headers)
+        if response.status_code == 304:
+            result.not_modified += 1
+            return None
+        response.raise_for_status()
+        return Page(body=response.json(), response=response)
+
+    async def fetch_listing(
+        self,
+        result: SyncResult,
+        path: str,
+        watermark: Watermark,
+        params: Dict[str, Any],
+        page_params: Callable[[int], Dict[str, Any]],
+        page_count: Callable[[Page], Optional[int]],
+        items_of: Callable[[Any], List[Dict[str, Any]]] = lambda body: body,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a paged delta listing, resuming from `watermark.cursor`.
+
+        The first page is conditional on the stored ETag. If `page_count` can read
+        the total from it, the remaining pages are fetched in parallel; otherwise
+        pages are followed until a short page. Leaves `watermark.cursor` set when
+        the page budget ran out before the end of the listing.
+        """
+        start = int(watermark.cursor or 1)
+        first = await self.get_page(
+            result, path, {**params, **page_params(start)}, watermark.etag if start == 1 else None
+        )
+        if first is None:
+            return []
+
+        pages = {start: items_of(first.body)}
+        last_allowed = start + self.max_pages - 1
+        total = page_count(first)
+
+        if total is not None:
+            last = min(total, last_allowed)
+            slots = asyncio.Semaphore(self.page_concurrency)
+
+            async def fetch(number: int):
+                async with slots:
+                    page = await self.get_page(result, path, {**params, **page_params(number)})
+                    return number, items_of(page.body)
+
+            pages.update(await asyncio.gather(*(fetch(n) for n in range(start + 1, last + 1))))
+            exhausted = last >= total
+        else:
+            last = start
+            while len(pages[last]) >= self.page_size and last < last_allowed:
+                last += 1
+                page = await self.get_page(result, path, {**params, **page_params(last)})
+                pages[last] = items_of(page.body)
+            exhausted = len(pages[last]) < self.page_size
+
+        # A validator is only meaningful for a listing read completely from its first page
+        watermark.cursor = None if exhausted else str(last + 1)
+        watermark.etag = first.response.headers.get("ETag") if exhausted and start == 1 else None
+        return [item for number in sorted(pages) for item in pages[number]]
+
+    async def fetch_ascending(
+        self,
+        result: SyncResult,
+        path: str,
+        watermark: Watermark,
+        params: Callable[[Optional[datetime]], Dict[str, Any]],
+        page_params: Callable[[int], Dict[str, Any]],
+        updated_of: Callable[[Dict[str, Any]], Optional[datetime]],
+        key_of: Callable[[Dict[str, Any]], Any],
+        items_of: Callable[[Any], List[Dict[str, Any]]] = lambda body: body,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a listing sorted oldest update first, where `params(since)` filters it
+        to updates at or after `since`, and move the watermark past what was read.
+
+        Pages are read in order, each from the newest update read so far rather
+        than at a page offset; items read twice across that overlap are dropped.
+        A full page that brings no newer update (items sharing one update time)
+        is paged past. When the page budget runs out, `updated_since` still moves
+        to the newest update read and `cursor` marks the listing unfinished.
+        """
+        since = watermark.updated_since
+        items: Dict[Any, Dict[str, Any]] = {}
+        number, exhausted, first = 1, False, None
+        for _ in range(self.max_pages):
+            page = await self.get_page(
+                result, path, {**params(since), **page_params(number)}, watermark.etag if first is None else None
+            )
+            if page is None:
+                return []
+            first = first or page
+            page_items = items_of(page.body)
+            fresh = [item for item in page_items if key_of(item) not in items]
+            items.update((key_of(item), item) for item in page_items)
+            if len(page_items) < self.page_size:
+                exhausted = True
+                break
+            newest = max((t for t in map(updated_of, fresh) if t), default=None)
+            if newest and (since is None or newest > since):
+                since, number = newest, 1
+            else:
+                number += 1
+
+        newest = max((t for t in map(updated_of, items.values()) if t), default=None)
+        watermark.updated_since = max((t for t in (newest, watermark.updated_since) if t), default=None)
+        watermark.pending_since = None
+        unfinished = not exhausted and watermark.updated_since is not None
+        watermark.cursor = watermark.updated_since.isoformat() if unfinished else None
+        # A validator is only meaningful for a listing read completely from its first page
+        watermark.etag = first.response.headers.get("ETag") if exhausted and first is page else None
+        return list(items.values())
+
+    def advance(self, watermark: Watermark, timestamps: Iterable[Optional[datetime]]) -> None:
+        """
+        Move `updated_since` to the newest timestamp seen once the listing is complete.
+        While a listing is unfinished the newest timestamp is held in `pending_since`,
+        since newest-first listings return it on the first run, not the last.
+        """
+        latest = max(
+            (t for t in (*timestamps, watermark.pending_since, watermark.updated_since) if t),
+            default=None,
+        )
+        if watermark.cursor is not None:
+            watermark.pending_since = latest
+        else:
+            watermark.updated_since = latest
+            watermark.pending_since = None
+
+
+def page_number_params(page_size: int, per_page_param: str = "per_page") -> Callable[[int], Dict[str, Any]]:
+    return lambda number: {"page": number, per_page_param: page_size}
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse ISO-8601 / Jira timestamps into naive UTC datetimes"""
+    if not value:
+        return None
+    value = value.replace("Z", "+00:00")
+    # Jira sends offsets without a colon, e.g. 2024-01-01T10:00:00.000+0000
+    if len(value) > 5 and value[-5] in "+-" and value[-3] != ":":
+        value = f"{value[:-2]}:{value[-2:]}"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = datetime.utcfromtimestamp(parsed.timestamp())
+    return parsed
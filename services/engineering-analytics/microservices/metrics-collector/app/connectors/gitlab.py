@@ -0,0 +1,82 @@
+"""
+GitLab connector
+Supports: Story 5.1 - Integrate Engineering Tools (GitLab)
+
+`api_endpoint` is the project API URL, e.g. https://gitlab.example.com/api/v4/projects/42.
+Pulls commits and merge requests changed since their watermarks. GitLab
+reports X-Total-Pages, so remaining commit pages are fetched in parallel.
+Merge requests are listed oldest update first and read with fetch_ascending.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.connectors.base import BaseConnector, Page, SyncResult, page_number_params, parse_timestamp
+from app.models.activity import ActivitySource, ActivityType
+from app.models.integration import IntegrationType
+
+
+class GitLabConnector(BaseConnector):
+    integration_type = IntegrationType.GITLAB
+
+    def auth_headers(self) -> Dict[str, str]:
+        if self.integration.auth_method == "private_token" and self.integration.credentials_encrypted:
+            return {"PRIVATE-TOKEN": self.integration.credentials_encrypted}
+        return super().auth_headers()
+
+    async def pull(self) -> SyncResult:
+        result = SyncResult()
+        repository_id = self.base_url.rsplit("/", 1)[-1]
+
+        commits_mark = self.watermark("commits")
+        commit_params = {"since": commits_mark.updated_since.isoformat()} if commits_mark.updated_since else {}
+        commits = await self.fetch_listing(
+            result, "/repository/commits", commits_mark, commit_params,
+            page_number_params(self.page_size), _total_pages,
+        )
+        for commit in commits:
+            result.add_activity(
+                source=ActivitySource.GITLAB,
+                activity_type=ActivityType.COMMIT,
+                external_id=commit["id"],
+                occurred_at=parse_timestamp(commit.get("committed_date") or commit.get("created_at")),
+                author_ref=commit.get("author_email"),
+                title=commit.get("title"),
+                repository_id=repository_id,
+            )
+        self.advance(commits_mark, (parse_timestamp(c.get("committed_date")) for c in commits))
+
+        merge_requests = await self.fetch_ascending(
+            result,
+            "/merge_requests",
+            self.watermark("merge_requests"),
+            params=_merge_request_params,
+            page_params=page_number_params(self.page_size),
+            updated_of=lambda mr: parse_timestamp(mr.get("updated_at")),
+            key_of=lambda mr: mr["iid"],
+        )
+        for mr in merge_requests:
+            result.add_activity(
+                source=ActivitySource.GITLAB,
+                activity_type=ActivityType.PULL_REQUEST,
+                external_id=f"{repository_id}!{mr['iid']}",
+                occurred_at=parse_timestamp(mr.get("merged_at") or mr.get("updated_at")),
+                author_ref=(mr.get("author") or {}).get("username"),
+                title=mr.get("title"),
+                repository_id=repository_id,
+                raw_data={"state": mr.get("state")},
+            )
+        return result
+
+
+def _merge_request_params(since: Optional[datetime]) -> Dict[str, Any]:
+    params = {"state": "all", "order_by": "updated_at", "sort": "asc"}
+    if since:
+        # updated_after includes MRs updated at exactly `since`
+        params["updated_after"] = f"{since.isoformat()}Z"
+    return params
+
+
+def _total_pages(page: Page) -> Optional[int]:
+    # Omitted by GitLab for very large result sets; fetch_listing then pages sequentially
+    total = page.response.headers.get("X-Total-Pages")
+    return int(total) if total else None
@@ -0,0 +1,69 @@
+"""
+Jira connector
+Supports: Story 5.1 - Integrate Engineering Tools (Jira)
+
+Pulls issues updated since the `issues` watermark through the search API and
+records completed issues as ISSUE_COMPLETED activities. Issues are listed
+oldest update first and read with fetch_ascending. JQL reads dates in the API
+user's time zone (from /myself) at minute precision, so the UTC watermark is
+converted to that zone and rounded down; the re-read issues are deduplicated.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from app.connectors.base import BaseConnector, SyncResult, parse_timestamp
+from app.models.activity import ActivitySource, ActivityType
+from app.models.integration import IntegrationType
+
+SEARCH_FIELDS = "summary,status,assignee,project,updated,resolutiondate"
+
+
+class JiraConnector(BaseConnector):
+    integration_type = IntegrationType.JIRA
+
+    async def pull(self) -> SyncResult:
+        result = SyncResult()
+        myself = await self.get_page(result, "/rest/api/2/myself")
+        zone = ZoneInfo(myself.body.get("timeZone") or "UTC")
+
+        def params(since: Optional[datetime]) -> Dict[str, Any]:
+            jql = "ORDER BY updated ASC"
+            if since:
+                local = since.replace(tzinfo=timezone.utc).astimezone(zone)
+                jql = f'updated >= "{local:%Y-%m-%d %H:%M}" {jql}'
+            return {"jql": jql, "fields": SEARCH_FIELDS}
+
+        issues = await self.fetch_ascending(
+            result,
+            "/rest/api/2/search",
+            self.watermark("issues"),
+            params=params,
+            page_params=lambda number: {"startAt": (number - 1) * self.page_size, "maxResults": self.page_size},
+            updated_of=lambda issue: parse_timestamp(issue.get("fields", {}).get("updated")),
+            key_of=lambda issue: issue["key"],
+            items_of=lambda body: body.get("issues", []),
+        )
+        for issue in issues:
+            self._add_issue(result, issue)
+        return result
+
+    def _add_issue(self, result: SyncResult, issue: dict) -> None:
+        fields = issue.get("fields", {})
+        status = fields.get("status") or {}
+        if (status.get("statusCategory") or {}).get("key") != "done":
+            return
+
+        assignee = fields.get("assignee") or {}
+        result.add_activity(
+            source=ActivitySource.JIRA,
+            activity_type=ActivityType.ISSUE_COMPLETED,
+            external_id=issue["key"],
+            occurred_at=parse_timestamp(fields.get("resolutiondate") or fields.get("updated")),
+            author_ref=assignee.get("emailAddress") or assignee.get("accountId"),
+            title=fields.get("summary"),
+            raw_data={
+                "project": (fields.get("project") or {}).get("key"),
+                "status": status.get("name"),
+            },
+        )
@@ -0,0 +1,49 @@
+"""
+Prometheus connector
+Supports: Story 5.1 - Integrate Engineering Tools (Prometheus)
+
+`api_endpoint` is the Prometheus base URL. Records firing alerts activated
+since the `alerts` watermark as INCIDENT activities, keyed by alert and
+activation time so repeated syncs of the same alert are not double counted.
+"""
+from datetime import datetime
+
+from app.connectors.base import BaseConnector, SyncResult, parse_timestamp
+from app.models.activity import ActivitySource, ActivityType
+from app.models.integration import IntegrationType
+
+
+class PrometheusConnector(BaseConnector):
+    integration_type = IntegrationType.PROMETHEUS
+
+    async def pull(self) -> SyncResult:
+        result = SyncResult()
+        watermark = self.watermark("alerts")
+        page = await self.get_page(result, "/api/v1/alerts", etag=watermark.etag)
+        if page is None:
+            return result
+        watermark.etag = page.response.headers.get("ETag")
+
+        activated = []
+        for alert in page.body.get("data", {}).get("alerts", []):
+            if alert.get("state") != "firing":
+                continue
+            labels = alert.get("labels", {})
+            active_at = parse_timestamp(alert.get("activeAt"))
+            if watermark.updated_since and active_at and active_at < watermark.updated_since:
+                continue
+            activated.append(active_at)
+
+            service = labels.get("service") or labels.get("job")
+            result.add_activity(
+                source=ActivitySource.PROMETHEUS,
+                activity_type=ActivityType.INCIDENT,
+                external_id=f"{labels.get('alertname')}:{service}:{alert.get('activeAt')}"[:256],
+                occurred_at=active_at or datetime.utcnow(),
+                title=labels.get("alertname"),
+                repository_id=service,
+                raw_data={"labels": labels, "annotations": alert.get("annotations", {})},
+            )
+
+        self.advance(watermark, activated)
+        return result
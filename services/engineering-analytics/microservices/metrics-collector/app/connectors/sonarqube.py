@@ -0,0 +1,159 @@
+"""
+SonarQube connector
+Supports: Story 5.1 - Integrate Engineering Tools (SonarQube)
+
+`api_endpoint` is the SonarQube base URL; the token needs Browse on the
+projects and permission to list them (/api/projects/search). Lists projects
+analysed since the `projects` watermark, page by page (the listing reports its
+total, so pages after the first are fetched in parallel). The listing serves
+only its first MAX_RESULTS projects, so a longer one is listed in analysis date
+slices instead, halved until each fits. It then bulk-fetches their measures
+with /api/measures/search, up to MEASURES_BATCH projects per request and
+`page_concurrency` requests at a time. Each project becomes one
+`ea_quality_snapshots` row keyed by its project key, which the KPI engine's
+QualityService scores as the repository_id.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import math
+
+from app.connectors.base import BaseConnector, SyncResult, parse_timestamp
+from app.models.integration import IntegrationType
+
+MEASURE_KEYS = ("coverage", "sqale_debt_ratio", "bugs", "ncloc", "complexity", "functions")
+MEASURES_BATCH = 100  # projectKeys accepted by one /api/measures/search request
+MAX_PAGE_SIZE = 500  # largest `ps` of /api/projects/search
+MAX_RESULTS = 10000  # /api/projects/search rejects pages past p * ps = 10,000
+SLICE_START = datetime(2008, 1, 1)  # lower bound of the first slice without a watermark; predates SonarQube
+
+
+class SonarQubeConnector(BaseConnector):
+    integration_type = IntegrationType.SONARQUBE
+
+    async def pull(self) -> SyncResult:
+        result = SyncResult()
+        watermark = self.watermark("projects")
+        page_size = min(self.page_size, MAX_PAGE_SIZE)
+        params = {"qualifiers": "TRK"}
+        if watermark.updated_since:
+            params["analyzedAfter"] = _sonar_time(watermark.updated_since)
+        listed = {"total": 0}
+
+        def page_count(page) -> int:
+            listed["total"] = page.body.get("paging", {}).get("total", 0)
+            # Too long to page through; listed in date slices below instead
+            return 1 if listed["total"] > MAX_RESULTS else math.ceil(listed["total"] / page_size)
+
+        projects = await self.fetch_listing(
+            result,
+            "/api/projects/search",
+            watermark,
+            params=params,
+            page_params=lambda number: {"p": number, "ps": page_size},
+            page_count=page_count,
+            items_of=lambda body: body.get("components", []),
+        )
+        if listed["total"] > MAX_RESULTS:
+            watermark.cursor = watermark.etag = None
+            projects = await self._list_slice(
+                result,
+                params,
+                page_size,
+                asyncio.Semaphore(self.page_concurrency),
+                watermark.updated_since or SLICE_START,
+                datetime.utcnow(),
+            )
+        # Projects never analysed have no measures yet
+        analysed = {
+            project["key"]: project for project in projects if project.get("lastAnalysisDate")
+        }
+        measures = await self._fetch_measures(result, list(analysed))
+        for key, project in analysed.items():
+            self._add_snapshot(result, project, measures.get(key, {}))
+
+        self.advance(watermark, (parse_timestamp(p["lastAnalysisDate"]) for p in analysed.values()))
+        return result
+
+    async def _list_slice(
+        self,
+        result: SyncResult,
+        params: Dict[str, Any],
+        page_size: int,
+        slots: asyncio.Semaphore,
+        after: datetime,
+        before: datetime,
+    ) -> List[dict]:
+        """Projects analysed between `after` and `before`, halving the range while it lists over MAX_RESULTS"""
+        sliced = {**params, "analyzedAfter": _sonar_time(after), "analyzedBefore": _sonar_time(before)}
+
+        async def fetch(number: int) -> dict:
+            async with slots:
+                page = await self.get_page(result, "/api/projects/search", {**sliced, "p": number, "ps": page_size})
+                return page.body
+
+        first = await fetch(1)
+        total = first.get("paging", {}).get("total", 0)
+        half = timedelta(seconds=(before - after) // timedelta(seconds=2))
+        if total > MAX_RESULTS and half:
+            earlier, later = await asyncio.gather(
+                self._list_slice(result, params, page_size, slots, after, after + half),
+                self._list_slice(result, params, page_size, slots, after + half, before),
+            )
+            return earlier + later
+
+        # A single second with more projects than the listing returns keeps only its first MAX_RESULTS
+        last = min(math.ceil(total / page_size), MAX_RESULTS // page_size)
+        pages = [first, *await asyncio.gather(*(fetch(number) for number in range(2, last + 1)))]
+        return [project for body in pages for project in body.get("components", [])]
+
+    async def _fetch_measures(self, result: SyncResult, project_keys: List[str]) -> Dict[str, Dict[str, float]]:
+        """Measure values per project key and metric key, MEASURES_BATCH projects per request"""
+        slots = asyncio.Semaphore(self.page_concurrency)
+
+        async def fetch(keys: List[str]):
+            async with slots:
+                page = await self.get_page(
+                    result,
+                    "/api/measures/search",
+                    {"projectKeys": ",".join(keys), "metricKeys": ",".join(MEASURE_KEYS)},
+                )
+                return page.body.get("measures", [])
+
+        batches = await asyncio.gather(*(
+            fetch(project_keys[offset:offset + MEASURES_BATCH])
+            for offset in range(0, len(project_keys), MEASURES_BATCH)
+        ))
+        measures: Dict[str, Dict[str, float]] = {}
+        for batch in batches:
+            for measure in batch:
+                value = _float(measure.get("value"))
+                if value is not None:
+                    measures.setdefault(measure["component"], {})[measure["metric"]] = value
+        return measures
+
+    def _add_snapshot(self, result: SyncResult, project: dict, measures: Dict[str, float]) -> None:
+        lines = measures.get("ncloc")
+        bugs = measures.get("bugs")
+        complexity, functions = measures.get("complexity"), measures.get("functions")
+        result.add_quality_snapshot(
+            repository_id=project["key"],
+            analysed_at=parse_timestamp(project.get("lastAnalysisDate")),
+            project_name=project.get("name"),
+            code_coverage=measures.get("coverage"),
+            technical_debt_ratio=measures.get("sqale_debt_ratio"),
+            bug_density=bugs * 1000 / lines if bugs is not None and lines else None,
+            code_complexity=complexity / functions if complexity is not None and functions else None,
+            lines_of_code=int(lines) if lines is not None else None,
+        )
+
+
+def _sonar_time(value: datetime) -> str:
+    return f"{value:%Y-%m-%dT%H:%M:%S}+0000"
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -1,11 +1,32 @@
-from sqlalchemy import create_engine
+"""
+Database engine and sessions
+
+The engine's pool is sized from the DB_* settings (request handlers and sync
+jobs each hold a connection while they run), and Postgres sessions get
+DB_STATEMENT_TIMEOUT_MS. instrument_engine (ea_shared.database, shared with
+the KPIEngine) exports how long checkouts wait for a connection, how many
+connections are in use and how long statements take on /metrics, to size the
+pool against the HTTP and sync concurrency.
+"""
+from typing import Optional
+
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from ea_shared import database as shared_database
+from ea_shared.database import dialect_insert, instrument_engine
 from app.config import get_settings
 
+
+def create_db_engine(database_url: Optional[str] = None, **overrides) -> Engine:
+    """An engine configured from the DB_* settings; `overrides` replace individual create_engine options"""
+    return shared_database.create_db_engine(get_settings(), database_url, **overrides)
+
+
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = create_db_engine()
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -17,3 +38,4 @@ def get_db():
         yield db
     finally:
         db.close()
+
@@ -1,13 +1,18 @@
-from app.models.integration import Integration, IntegrationStatus, IntegrationType
-from app.models.metrics import EngineeringMetric, MetricType
-from app.models.activity import EngineeringActivity, ActivitySource
+from app.models.integration import Integration, IntegrationStatus, IntegrationType, SyncWatermark
+from app.models.metrics import EngineeringMetric, MetricType, ServiceLatency
+from app.models.activity import EngineeringActivity, ActivitySource, EmployeeIdentity
+from app.models.quality_snapshot import QualitySnapshot
 
 __all__ = [
     "Integration",
     "IntegrationStatus",
     "IntegrationType",
+    "SyncWatermark",
     "EngineeringMetric",
     "MetricType",
+    "ServiceLatency",
     "EngineeringActivity",
     "ActivitySource",
+    "EmployeeIdentity",
+    "QualitySnapshot",
 ]
@@ -1,10 +1,43 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, JSON, Text
+from typing import Any, Dict, List
+from sqlalchemy import (
+    Column, String, DateTime, Enum as SQLEnum, Index, JSON, Text, UniqueConstraint, func, inspect, text,
+)
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 
-from app.database import Base
+from app.database import Base, dialect_insert
+
+# Columns of an activity row as written by upsert_activities
+ACTIVITY_COLUMNS = (
+    "activity_id",
+    "employee_id",
+    "author_ref",
+    "source",
+    "activity_type",
+    "external_id",
+    "title",
+    "description",
+    "repository_id",
+    "project_id",
+    "occurred_at",
+    "raw_data",
+)
+# Columns refreshed when an already stored record arrives again, e.g. a pull
+# request that has since been merged; values the new row lacks are kept
+REFRESHED_COLUMNS = (
+    "employee_id",
+    "author_ref",
+    "title",
+    "description",
+    "repository_id",
+    "project_id",
+    "occurred_at",
+    "raw_data",
+)
 
 
 class ActivitySource(str, Enum):
@@ -26,9 +59,19 @@ class ActivityType(str, Enum):
 
 class EngineeringActivity(Base):
     __tablename__ = "ea_activities"
+    __table_args__ = (
+        # One row per upstream record, so concurrent syncs and webhooks cannot duplicate it
+        Index("uq_ea_activities_source_external", "source", "external_id", unique=True),
+        # Commit lookup by SHA when joining deployments for lead time
+        Index("ix_ea_activities_type_external", "activity_type", "external_id"),
+        # Per-employee activity counts over a period, read by the KPI engine
+        Index("ix_ea_activities_employee_occurred", "employee_id", "occurred_at"),
+    )
 
     activity_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Null until the author is matched to an employee (e.g. records pulled by integration sync)
+    employee_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    author_ref = Column(String(255), nullable=True, index=True)  # external email, login or account id
     source = Column(SQLEnum(ActivitySource), nullable=False)
     activity_type = Column(SQLEnum(ActivityType), nullable=False)
     external_id = Column(String(256), nullable=True)
@@ -39,3 +82,101 @@ class EngineeringActivity(Base):
     occurred_at = Column(DateTime, nullable=False)
     raw_data = Column(JSON, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EmployeeIdentity(Base):
+    """
+    An external author (commit email, login or account id on one source) matched
+    to an employee; activities by the author are stored with the employee's id
+    """
+    __tablename__ = "ea_employee_identities"
+    __table_args__ = (
+        UniqueConstraint("source", "author_ref", name="uq_ea_employee_identities_ref"),
+    )
+
+    identity_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    source = Column(SQLEnum(ActivitySource), nullable=False)
+    author_ref = Column(String(255), nullable=False)  # lower case; refs match case-insensitively
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def _attribute_authors(db: Session, activities: List[Dict[str, Any]]) -> None:
+    """Set the employee_id of activities without one whose author has a stored identity, in one query"""
+    refs = {
+        (ActivitySource(a["source"]), a["author_ref"].lower())
+        for a in activities
+        if a.get("employee_id") is None and a.get("author_ref")
+    }
+    if not refs:
+        return
+    identities = {
+        (source, author_ref): employee_id
+        for source, author_ref, employee_id in db.query(
+            EmployeeIdentity.source, EmployeeIdentity.author_ref, EmployeeIdentity.employee_id
+        ).filter(EmployeeIdentity.author_ref.in_({author_ref for _, author_ref in refs}))
+    }
+    for activity in activities:
+        if activity.get("employee_id") is None and activity.get("author_ref"):
+            key = (ActivitySource(activity["source"]), activity["author_ref"].lower())
+            activity["employee_id"] = identities.get(key)
+
+
+def upsert_activities(db: Session, activities: List[Dict[str, Any]]) -> List[uuid.UUID]:
+    """
+    Insert activities, refreshing the stored row of a (source, external_id) seen
+    before, in one statement; the caller commits. Activities without an employee
+    are attributed through the identity of their author, when one is stored.
+    Returns the activity ids of the rows in input order (duplicates within the
+    input collapse to the last one).
+    """
+    if not activities:
+        return []
+    # One statement cannot touch the same row twice; rows without an external id never conflict
+    unique = {
+        (a["source"], a["external_id"]) if a.get("external_id") else object(): dict(a) for a in activities
+    }
+    _attribute_authors(db, list(unique.values()))
+    rows = [
+        {**{column: row.get(column) for column in ACTIVITY_COLUMNS}, "activity_id": row.get("activity_id") or uuid.uuid4()}
+        for row in unique.values()
+    ]
+    table = EngineeringActivity.__table__
+    statement = dialect_insert(db)(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.source, table.c.external_id],
+        set_={column: func.coalesce(statement.excluded[column], table.c[column]) for column in REFRESHED_COLUMNS},
+    )
+    return list(db.execute(
+        statement.returning(table.c.activity_id, sort_by_parameter_order=True), rows
+    ).scalars())
+
+
+def ensure_unique_external_ids(engine: Engine) -> bool:
+    """
+    Replace the non-unique (source, external_id) index of a table created before
+    it was unique, deleting duplicate rows first (the newest row of each record
+    is kept). Run before create_all; returns True when the index was created.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(EngineeringActivity.__tablename__):
+        return False
+    if any(index["name"] == "uq_ea_activities_source_external" for index in inspector.get_indexes("ea_activities")):
+        return False
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "DELETE FROM ea_activities WHERE activity_id IN ("
+            " SELECT activity_id FROM ("
+            "  SELECT activity_id, row_number() OVER ("
+            "   PARTITION BY source, external_id ORDER BY created_at DESC, activity_id DESC"
+            "  ) AS position FROM ea_activities WHERE external_id IS NOT NULL"
+            " ) ranked WHERE position > 1"
+            ")"
+        ))
+        connection.execute(text("DROP INDEX IF EXISTS ix_ea_activities_source_external"))
+        for index in EngineeringActivity.__table__.indexes:
+            if index.name == "uq_ea_activities_source_external":
+                index.create(bind=connection)
+    return True
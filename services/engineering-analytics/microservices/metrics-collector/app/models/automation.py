@@ -7,10 +7,11 @@ from typing import Optional
 from uuid import uuid4
 import enum
 
-from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, JSON, Enum, Text
+from sqlalchemy import Column, String, Boolean, Integer, Float, Date, DateTime, JSON, Enum, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 
 from app.database import Base
+from app.models.types import CompactJSON
 
 
 class ConditionOperator(str, enum.Enum):
@@ -63,6 +64,10 @@ class AutomationRule(Base):
     action_config = Column(JSON, default=dict)  # Action-specific configuration
     notification_recipients = Column(JSON, default=list)  # List of user IDs or roles
 
+    # Trigger deduplication
+    cooldown_minutes = Column(Integer, default=0)  # Minimum gap between triggers for the same entity
+    hysteresis = Column(Float, nullable=True)  # Re-arm margin past the threshold, null = re-trigger while breached
+
     # Status
     status = Column(Enum(RuleStatus), default=RuleStatus.DRAFT)
 
@@ -72,10 +77,21 @@ class AutomationRule(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_triggered_at = Column(DateTime, nullable=True)
     trigger_count = Column(Integer, default=0)
+    suppressed_count = Column(Integer, default=0)
 
 
 class RuleExecution(Base):
+    """
+    Rule trigger history. On PostgreSQL the table is range-partitioned by month
+    on triggered_at (see ExecutionStorageService), so triggered_at is part of the key.
+    """
     __tablename__ = "rule_executions"
+    __table_args__ = (
+        Index("ix_rule_executions_rule_triggered", "rule_id", "triggered_at"),
+        Index("ix_rule_executions_entity_triggered", "entity_id", "triggered_at"),
+        Index("ix_rule_executions_triggered", "triggered_at"),
+        {"postgresql_partition_by": "RANGE (triggered_at)"},
+    )
 
     execution_id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     rule_id = Column(PGUUID(as_uuid=True), nullable=False)
@@ -85,29 +101,70 @@ class RuleExecution(Base):
     entity_id = Column(String(255), nullable=False)
 
     # Trigger details
-    triggered_at = Column(DateTime, default=datetime.utcnow)
+    triggered_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     metric_value = Column(Float, nullable=False)
     threshold_value = Column(Float, nullable=False)
 
     # Execution result
     action_executed = Column(String(100), nullable=False)
     execution_success = Column(Boolean, default=True)
-    execution_result = Column(JSON, default=dict)
+    execution_result = Column(CompactJSON, default=dict)
     error_message = Column(Text, nullable=True)
 
     # Test mode
     is_test_run = Column(Boolean, default=False)
 
 
+class RuleExecutionDailyRollup(Base):
+    """Precomputed per-rule daily execution counts for effectiveness reporting"""
+    __tablename__ = "rule_execution_daily_rollups"
+
+    rule_id = Column(PGUUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True)
+    trigger_count = Column(Integer, default=0)
+    success_count = Column(Integer, default=0)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RuleSuppression(Base):
+    """Per (rule, entity) trigger state backing cooldown and hysteresis suppression"""
+    __tablename__ = "rule_suppressions"
+    __table_args__ = (
+        UniqueConstraint("rule_id", "entity_type", "entity_id", name="uq_rule_suppressions_entity"),
+    )
+
+    suppression_id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    rule_id = Column(PGUUID(as_uuid=True), nullable=False)
+
+    # Entity
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(String(255), nullable=False)
+
+    # Trigger state
+    is_armed = Column(Boolean, default=True)  # False until the metric clears the hysteresis band
+    last_triggered_at = Column(DateTime, nullable=True)
+    last_metric_value = Column(Float, nullable=True)
+
+    # Suppressed triggers
+    suppressed_count = Column(Integer, default=0)
+    last_suppressed_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class ThresholdConfig(Base):
     """Custom threshold configurations per team/employee"""
     __tablename__ = "threshold_configs"
+    __table_args__ = (
+        Index("ix_threshold_configs_metric", "metric_type"),
+    )
 
     config_id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
 
     # Scope
     entity_type = Column(String(50), nullable=False)  # team, employee
     entity_id = Column(String(255), nullable=False)
+    rule_id = Column(PGUUID(as_uuid=True), nullable=True)  # null applies to every rule on the metric
 
     # Threshold overrides
     metric_type = Column(String(100), nullable=False)
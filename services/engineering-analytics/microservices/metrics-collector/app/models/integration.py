@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.database import Base
@@ -45,3 +45,20 @@ class Integration(Base):
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncWatermark(Base):
+    """Per-resource incremental sync position of an integration"""
+    __tablename__ = "ea_sync_watermarks"
+    __table_args__ = (
+        UniqueConstraint("integration_id", "resource", name="uq_ea_sync_watermarks_resource"),
+    )
+
+    watermark_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    integration_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    resource = Column(String(100), nullable=False)  # e.g. issues, commits, merge_requests
+    updated_since = Column(DateTime, nullable=True)  # newest upstream update already ingested
+    etag = Column(String(255), nullable=True)  # validator of the last delta listing
+    cursor = Column(String(255), nullable=True)  # next page of an unfinished listing
+    pending_since = Column(DateTime, nullable=True)  # newest update seen by the unfinished listing
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Integer, Float, Enum as SQLEnum, JSON
+from sqlalchemy import Column, String, DateTime, Integer, Float, Enum as SQLEnum, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.database import Base
@@ -24,9 +24,16 @@ class MetricType(str, Enum):
 
 class EngineeringMetric(Base):
     __tablename__ = "ea_metrics"
+    __table_args__ = (
+        # Event scans per metric type and repository (DORA deployments/incidents, reliability series)
+        Index("ix_ea_metrics_type_repository_period", "metric_type", "repository_id", "period_start"),
+        # Change feed for the KPI engine's rolling DORA windows
+        Index("ix_ea_metrics_updated_at", "updated_at"),
+    )
 
     metric_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Null for service-level metrics (uptime, incidents) that are not attributed to an employee
+    employee_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     repository_id = Column(String(128), nullable=True)
     metric_type = Column(SQLEnum(MetricType), nullable=False)
     value = Column(Float, nullable=False)
@@ -35,5 +42,30 @@ class EngineeringMetric(Base):
     period_end = Column(DateTime, nullable=False)
     period_type = Column(String(20), nullable=False)  # week, sprint, month
     source = Column(String(50), nullable=False)
-    metadata = Column(JSON, nullable=True)
+    # `metadata` is reserved on declarative models, so the attribute is suffixed
+    metadata_ = Column("metadata", JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Also bumped when an incident is resolved
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ServiceLatency(Base):
+    """Downsampled latency and error-rate series per service, imported from Prometheus"""
+    __tablename__ = "ea_service_latency"
+    __table_args__ = (
+        Index("ix_ea_service_latency_service_period", "service_id", "period_start"),
+    )
+
+    latency_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    service_id = Column(String(128), nullable=False)
+    period_start = Column(DateTime, nullable=False)
+    period_end = Column(DateTime, nullable=False)
+    period_type = Column(String(20), nullable=False)  # hour, day
+    latency_p50_ms = Column(Float, nullable=True)
+    latency_p95_ms = Column(Float, nullable=True)
+    latency_p99_ms = Column(Float, nullable=True)
+    error_rate = Column(Float, nullable=True)  # fraction of requests failing, 0-1
+    request_rate = Column(Float, nullable=True)  # requests per second
+    sample_count = Column(Integer, nullable=False, default=0)
+    source = Column(String(50), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.database import Base, dialect_insert
+
+# Columns refreshed when a snapshot of an already known project is stored again
+SNAPSHOT_COLUMNS = (
+    "integration_id",
+    "project_name",
+    "code_coverage",
+    "technical_debt_ratio",
+    "bug_density",
+    "code_complexity",
+    "lines_of_code",
+    "analysed_at",
+    "updated_at",
+)
+
+
+class QualitySnapshot(Base):
+    """
+    Latest code quality measures of one project, imported from SonarQube.
+    One row per project (keyed by the project key, which is the repository_id
+    the KPI engine scores), overwritten on every sync.
+    """
+    __tablename__ = "ea_quality_snapshots"
+
+    repository_id = Column(String(128), primary_key=True)
+    integration_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    project_name = Column(String(255), nullable=True)
+    code_coverage = Column(Float, nullable=True)  # % of lines covered by tests
+    technical_debt_ratio = Column(Float, nullable=True)  # % of development cost (sqale_debt_ratio)
+    bug_density = Column(Float, nullable=True)  # bugs per 1000 lines of code
+    code_complexity = Column(Float, nullable=True)  # cyclomatic complexity per function
+    lines_of_code = Column(Integer, nullable=True)
+    analysed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def upsert_quality_snapshots(db: Session, snapshots: List[Dict[str, Any]]) -> int:
+    """Insert or overwrite the snapshots of many projects in one statement; the caller commits"""
+    if not snapshots:
+        return 0
+    # The last snapshot of a project wins; one statement cannot touch the same row twice
+    rows = list({row["repository_id"]: {**row, "updated_at": datetime.utcnow()} for row in snapshots}.values())
+    statement = dialect_insert(db)(QualitySnapshot)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[QualitySnapshot.repository_id],
+            set_={column: statement.excluded[column] for column in SNAPSHOT_COLUMNS},
+        ),
+        rows,
+    )
+    return len(rows)
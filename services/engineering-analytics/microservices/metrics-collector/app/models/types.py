@@ -0,0 +1,33 @@
+import json
+from typing import Any
+
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+
+def _drop_nulls(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _drop_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_nulls(v) for v in value]
+    return value
+
+
+class CompactJSON(TypeDecorator):
+    """
+    JSON stored as minified text with null-valued keys dropped. Reads also accept
+    values the driver has already decoded, as from a column still typed json.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return json.dumps(_drop_nulls(value), separators=(",", ":"), default=str)
+
+    def process_result_value(self, value, dialect):
+        if value is None or not isinstance(value, (str, bytes, bytearray)):
+            return value
+        return json.loads(value)
@@ -15,6 +15,9 @@ from app.schemas.metrics import (
     EngineeringActivityCreate,
     EngineeringActivityResponse,
     EmployeeActivitySummary,
+    EmployeeIdentityCreate,
+    EmployeeIdentityResponse,
+    EmployeeIdentitySyncResponse,
     PageResponse,
 )
 from app.services.activity_service import ActivityService
@@ -46,6 +49,24 @@ async def create_activities_batch(
     return activities
 
 
+@router.put("/identities", response_model=EmployeeIdentitySyncResponse)
+async def set_identities(
+    data: List[EmployeeIdentityCreate], db: Session = Depends(get_db)
+):
+    """Match commit emails, logins and account ids to employees, so their pulled and webhook activities count"""
+    service = ActivityService(db)
+    identities, attributed = service.set_identities(data)
+    return EmployeeIdentitySyncResponse(identities=identities, activities_attributed=attributed)
+
+
+@router.get("/identities", response_model=List[EmployeeIdentityResponse])
+async def list_identities(
+    employee_id: Optional[UUID] = None, db: Session = Depends(get_db)
+):
+    service = ActivityService(db)
+    return service.list_identities(employee_id)
+
+
 @router.get("/{activity_id}", response_model=EngineeringActivityResponse)
 async def get_activity(activity_id: UUID, db: Session = Depends(get_db)):
     service = ActivityService(db)
@@ -6,7 +6,7 @@ Associated Frontend Files:
   - web/app/src/lib/api.ts (automationApi - lines 185-200)
   - web/app/src/pages/automation/AutomationRulesPage.tsx
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, Header, status
@@ -18,7 +18,10 @@ from app.schemas.automation import (
     AutomationRuleCreate,
     AutomationRuleUpdate,
     AutomationRuleResponse,
+    RuleBacktestRequest,
+    RuleBacktestResponse,
     RuleExecutionResponse,
+    RuleSuppressionResponse,
     RuleTestRequest,
     RuleTestResponse,
     ThresholdConfigCreate,
@@ -27,6 +30,8 @@ from app.schemas.automation import (
     PageResponse,
 )
 from app.services.automation_service import AutomationService
+from app.services.execution_storage import ExecutionStorageService
+from app.services.rule_backtest_service import RuleBacktestService
 
 router = APIRouter(prefix="/automation", tags=["Automation"])
 
@@ -136,6 +141,36 @@ async def test_automation_rule(
         )
 
 
+@router.post("/rules/{rule_id}/backtest", response_model=RuleBacktestResponse)
+async def backtest_automation_rule(
+    rule_id: UUID,
+    request: RuleBacktestRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Replay an automation rule over historical metrics without executing actions.
+    Supports: Story 8.1 - Test automation rule before activation
+    """
+    if request.period_end < request.period_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="period_end must not be before period_start",
+        )
+    rule = AutomationService(db).get_rule(rule_id)
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Automation rule not found: {rule_id}",
+        )
+    try:
+        return RuleBacktestService(db).backtest(rule, request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.post("/rules/{rule_id}/activate", response_model=AutomationRuleResponse)
 async def activate_automation_rule(
     rule_id: UUID,
@@ -172,12 +207,31 @@ async def pause_automation_rule(
     return rule
 
 
+@router.get("/rules/{rule_id}/suppressions", response_model=List[RuleSuppressionResponse])
+async def list_rule_suppressions(
+    rule_id: UUID,
+    db: Session = Depends(get_db),
+):
+    """
+    Get per-entity cooldown/hysteresis state and suppressed-trigger counters.
+    Supports: Story 8.2 - Performance-based workflow triggers
+    """
+    service = AutomationService(db)
+    if not service.get_rule(rule_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Automation rule not found: {rule_id}",
+        )
+    return service.get_suppressions(rule_id)
+
+
 @router.post("/evaluate", response_model=List[RuleExecutionResponse])
 async def evaluate_and_trigger_rules(
     entity_type: str = Query(..., description="employee, team, repository, or service"),
     entity_id: str = Query(...),
     metric_type: str = Query(..., description="deployment_frequency, incident_frequency, etc."),
     current_value: float = Query(...),
+    team_id: Optional[str] = Query(default=None, description="Employee's team, for team threshold inheritance"),
     db: Session = Depends(get_db),
 ):
     """
@@ -185,7 +239,7 @@ async def evaluate_and_trigger_rules(
     Supports: Story 8.2 - Performance-based workflow triggers
     """
     service = AutomationService(db)
-    executions = service.evaluate_and_trigger(entity_type, entity_id, metric_type, current_value)
+    executions = service.evaluate_and_trigger(entity_type, entity_id, metric_type, current_value, team_id)
     return executions
 
 
@@ -195,6 +249,8 @@ async def list_rule_executions(
     size: int = Query(default=50, ge=1, le=100),
     rule_id: Optional[UUID] = None,
     entity_id: Optional[str] = None,
+    triggered_after: Optional[datetime] = None,
+    triggered_before: Optional[datetime] = None,
     db: Session = Depends(get_db),
 ):
     """
@@ -202,7 +258,9 @@ async def list_rule_executions(
     Supports: Story 8.2 - Track workflow execution history
     """
     service = AutomationService(db)
-    executions, total = service.get_execution_history(rule_id, entity_id, page, size)
+    executions, total = service.get_execution_history(
+        rule_id, entity_id, page, size, triggered_after, triggered_before
+    )
     return PageResponse(
         content=[RuleExecutionResponse.model_validate(e) for e in executions],
         total=total,
@@ -211,6 +269,15 @@ async def list_rule_executions(
     )
 
 
+@router.post("/executions/maintenance")
+async def maintain_execution_storage(db: Session = Depends(get_db)):
+    """Create upcoming execution partitions and apply the retention policy"""
+    storage = ExecutionStorageService(db)
+    created = storage.ensure_partitions()
+    retention = storage.apply_retention()
+    return {"partitions_ensured": created, **retention}
+
+
 @router.post("/thresholds", response_model=ThresholdConfigResponse, status_code=status.HTTP_201_CREATED)
 async def create_threshold_config(
     data: ThresholdConfigCreate,
@@ -242,6 +309,7 @@ async def list_threshold_configs(
 async def generate_effectiveness_report(
     period_start: datetime = Query(...),
     period_end: datetime = Query(...),
+    use_rollups: bool = Query(default=False, description="Read day-granular counts from daily rollups"),
     db: Session = Depends(get_db),
 ):
     """
@@ -249,4 +317,21 @@ async def generate_effectiveness_report(
     Supports: Story 8.2 - Generate report on workflow trigger effectiveness
     """
     service = AutomationService(db)
-    return service.generate_effectiveness_report(period_start, period_end)
+    return service.generate_effectiveness_report(period_start, period_end, use_rollups)
+
+
+@router.post("/report/rollups/refresh")
+async def refresh_execution_rollups(
+    day_start: date = Query(...),
+    day_end: date = Query(...),
+    db: Session = Depends(get_db),
+):
+    """Recompute daily execution rollups used by the effectiveness report"""
+    if day_end < day_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="day_end must not be before day_start",
+        )
+    service = AutomationService(db)
+    rows = service.refresh_daily_rollups(day_start, day_end)
+    return {"day_start": day_start, "day_end": day_end, "rollup_rows": rows}
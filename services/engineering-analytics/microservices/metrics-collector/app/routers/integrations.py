@@ -3,6 +3,7 @@ Associated Frontend Files:
   - web/app/src/lib/api.ts (integrationApi.connections - lines 132-139)
   - web/app/src/pages/integrations/IntegrationsPage.tsx
 """
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -14,8 +15,11 @@ from app.schemas.integration import (
     IntegrationCreate,
     IntegrationUpdate,
     IntegrationResponse,
+    SyncStatsResponse,
 )
 from app.services.integration_service import IntegrationService
+from app.services.sync_scheduler import SyncInProgressError, get_sync_scheduler
+from app.services.sync_stats import get_sync_stats
 
 router = APIRouter(prefix="/integrations", tags=["Integrations"])
 
@@ -73,10 +77,28 @@ async def delete_integration(integration_id: UUID, db: Session = Depends(get_db)
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Integration not found: {integration_id}",
         )
+    get_sync_stats().forget(integration_id)
 
 
 @router.post("/{integration_id}/sync", response_model=IntegrationResponse)
 async def trigger_sync(integration_id: UUID, db: Session = Depends(get_db)):
+    try:
+        outcome = await get_sync_scheduler().sync_now(integration_id)
+    except SyncInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if not outcome:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Integration not found: {integration_id}",
+        )
+
+    service = IntegrationService(db)
+    return service.get_integration(integration_id)
+
+
+@router.get("/{integration_id}/sync-stats", response_model=SyncStatsResponse)
+async def get_sync_stats_for_integration(integration_id: UUID, db: Session = Depends(get_db)):
+    """Sync durations, throughput, API usage and errors over the recent runs of this process"""
     service = IntegrationService(db)
     integration = service.get_integration(integration_id)
     if not integration:
@@ -85,9 +107,13 @@ async def trigger_sync(integration_id: UUID, db: Session = Depends(get_db)):
             detail=f"Integration not found: {integration_id}",
         )
 
-    # In production, this would trigger an async sync job
-    # For now, just update the status
-    updated = service.update_sync_status(
-        integration_id, IntegrationStatus.ACTIVE, None
+    staleness = None
+    if integration.last_sync_at:
+        staleness = (datetime.utcnow() - integration.last_sync_at).total_seconds()
+    return SyncStatsResponse(
+        integration_id=integration.integration_id,
+        status=integration.status,
+        last_sync_at=integration.last_sync_at,
+        staleness_seconds=staleness,
+        **get_sync_stats().summary(integration_id),
     )
-    return updated
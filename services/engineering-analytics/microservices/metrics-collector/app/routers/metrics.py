@@ -8,11 +8,20 @@ from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+import httpx
 
 from app.database import get_db
 from app.models.metrics import MetricType
-from app.schemas.metrics import MetricCreate, MetricResponse, PageResponse
+from app.schemas.metrics import (
+    MetricCreate,
+    MetricResponse,
+    PageResponse,
+    PrometheusImportRequest,
+    PrometheusImportResponse,
+    ServiceLatencyResponse,
+)
 from app.services.metrics_service import MetricsService
+from app.services.prometheus_importer import PrometheusImporter
 
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
 
@@ -33,6 +42,36 @@ async def create_metrics_batch(
     return metrics
 
 
+@router.post("/prometheus/import", response_model=PrometheusImportResponse)
+async def import_prometheus_range(data: PrometheusImportRequest, db: Session = Depends(get_db)):
+    """
+    Import uptime, incident and latency series from Prometheus for a time range.
+    Re-importing a range replaces the rows written by the earlier import.
+    """
+    importer = PrometheusImporter(db)
+    try:
+        return await importer.import_range(data.start, data.end, data.resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Prometheus query_range failed: {e}",
+        )
+
+
+@router.get("/services/{service_id}/latency", response_model=List[ServiceLatencyResponse])
+async def get_service_latency(
+    service_id: str,
+    period_type: Optional[str] = None,
+    period_start: Optional[datetime] = None,
+    period_end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+):
+    service = MetricsService(db)
+    return service.get_service_latency(service_id, period_type, period_start, period_end)
+
+
 @router.get("/{metric_id}", response_model=MetricResponse)
 async def get_metric(metric_id: UUID, db: Session = Depends(get_db)):
     service = MetricsService(db)
@@ -24,6 +24,12 @@ class AutomationRuleCreate(BaseModel):
     threshold_value: float
     duration_days: int = Field(default=0, ge=0)
 
+    # Trigger deduplication
+    cooldown_minutes: int = Field(default=0, ge=0, description="Minimum minutes between triggers for the same entity")
+    hysteresis: Optional[float] = Field(
+        default=None, ge=0, description="Margin the metric must clear before the rule re-arms; null disables"
+    )
+
     # Custom formula (optional)
     custom_formula: Optional[str] = None
 
@@ -42,6 +48,8 @@ class AutomationRuleUpdate(BaseModel):
     operator: Optional[ConditionOperator] = None
     threshold_value: Optional[float] = None
     duration_days: Optional[int] = None
+    cooldown_minutes: Optional[int] = Field(None, ge=0)
+    hysteresis: Optional[float] = Field(None, ge=0)
     custom_formula: Optional[str] = None
     action_type: Optional[ActionType] = None
     action_config: Optional[Dict[str, Any]] = None
@@ -59,6 +67,8 @@ class AutomationRuleResponse(BaseModel):
     operator: ConditionOperator
     threshold_value: float
     duration_days: int
+    cooldown_minutes: int
+    hysteresis: Optional[float]
     custom_formula: Optional[str]
     action_type: ActionType
     action_config: Dict[str, Any]
@@ -69,6 +79,7 @@ class AutomationRuleResponse(BaseModel):
     updated_at: datetime
     last_triggered_at: Optional[datetime]
     trigger_count: int
+    suppressed_count: int
 
     class Config:
         from_attributes = True
@@ -92,6 +103,22 @@ class RuleExecutionResponse(BaseModel):
         from_attributes = True
 
 
+class RuleSuppressionResponse(BaseModel):
+    suppression_id: UUID
+    rule_id: UUID
+    entity_type: str
+    entity_id: str
+    is_armed: bool
+    last_triggered_at: Optional[datetime]
+    last_metric_value: Optional[float]
+    suppressed_count: int
+    last_suppressed_at: Optional[datetime]
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class RuleTestRequest(BaseModel):
     """Request to test a rule without executing actual actions"""
     entity_type: str
@@ -109,9 +136,61 @@ class RuleTestResponse(BaseModel):
     simulated_result: Dict[str, Any]
 
 
+class RuleBacktestRequest(BaseModel):
+    """Request to replay a rule over historical metrics"""
+    period_start: datetime
+    period_end: datetime
+    threshold_value: Optional[float] = Field(
+        default=None, description="What-if threshold; overrides the rule and per-entity threshold configs"
+    )
+    duration_days: Optional[int] = Field(default=None, ge=0)
+    entity_ids: Optional[List[str]] = None
+    team_ids: Dict[str, str] = Field(
+        default_factory=dict, description="Employee to team mapping for team threshold inheritance"
+    )
+    apply_threshold_configs: bool = True
+    timeline_limit: int = Field(default=1000, ge=0, le=10000)
+
+
+class BacktestTrigger(BaseModel):
+    entity_id: str
+    triggered_at: datetime
+    metric_value: float
+    threshold_value: float
+
+
+class BacktestEntitySummary(BaseModel):
+    entity_id: str
+    points_evaluated: int
+    breach_count: int
+    trigger_count: int
+    suppressed_count: int = 0
+    episode_count: int
+    first_triggered_at: Optional[datetime]
+    last_triggered_at: Optional[datetime]
+
+
+class RuleBacktestResponse(BaseModel):
+    """Backtest result: trigger counts and timeline, no executions are written"""
+    rule_id: UUID
+    period_start: datetime
+    period_end: datetime
+    threshold_value: float
+    duration_days: int
+    entities_evaluated: int
+    points_evaluated: int
+    trigger_count: int
+    suppressed_count: int = 0  # would have fired but for the rule's cooldown or hysteresis
+    episode_count: int
+    entities: List[BacktestEntitySummary]
+    timeline: List[BacktestTrigger]
+    timeline_truncated: bool
+
+
 class ThresholdConfigCreate(BaseModel):
     entity_type: str
     entity_id: str
+    rule_id: Optional[UUID] = None
     metric_type: str
     custom_threshold: float
     custom_action: Optional[ActionType] = None
@@ -121,6 +200,7 @@ class ThresholdConfigResponse(BaseModel):
     config_id: UUID
     entity_type: str
     entity_id: str
+    rule_id: Optional[UUID]
     metric_type: str
     custom_threshold: float
     custom_action: Optional[ActionType]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -37,3 +37,39 @@ class IntegrationResponse(IntegrationBase):
 
     class Config:
         from_attributes = True
+
+
+class SyncRunResponse(BaseModel):
+    status: IntegrationStatus
+    started_at: datetime
+    finished_at: datetime
+    records_fetched: int
+    records_stored: int
+    api_calls: int
+    not_modified: int
+    error_message: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SyncStatsResponse(BaseModel):
+    integration_id: UUID
+    status: IntegrationStatus
+    last_sync_at: Optional[datetime] = None
+    staleness_seconds: Optional[float] = None
+    last_success_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    runs: int
+    successful_runs: int
+    failed_runs: int
+    error_rate: float
+    duration_avg_seconds: Optional[float] = None
+    duration_p50_seconds: Optional[float] = None
+    duration_p95_seconds: Optional[float] = None
+    duration_max_seconds: Optional[float] = None
+    records_fetched: int
+    records_per_second: Optional[float] = None
+    api_calls: int
+    not_modified: int
+    recent_runs: List[SyncRunResponse]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 from app.models.metrics import MetricType
 from app.models.activity import ActivitySource, ActivityType
@@ -22,7 +22,7 @@ class MetricCreate(BaseModel):
 
 class MetricResponse(BaseModel):
     metric_id: UUID
-    employee_id: UUID
+    employee_id: Optional[UUID] = None
     repository_id: Optional[str] = None
     metric_type: MetricType
     value: float
@@ -31,7 +31,9 @@ class MetricResponse(BaseModel):
     period_end: datetime
     period_type: str
     source: str
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, validation_alias=AliasChoices("metadata_", "metadata")
+    )
     created_at: datetime
 
     class Config:
@@ -53,7 +55,8 @@ class EngineeringActivityCreate(BaseModel):
 
 class EngineeringActivityResponse(BaseModel):
     activity_id: UUID
-    employee_id: UUID
+    employee_id: Optional[UUID] = None
+    author_ref: Optional[str] = None
     source: ActivitySource
     activity_type: ActivityType
     external_id: Optional[str] = None
@@ -68,6 +71,28 @@ class EngineeringActivityResponse(BaseModel):
         from_attributes = True
 
 
+class EmployeeIdentityCreate(BaseModel):
+    employee_id: UUID
+    source: ActivitySource
+    author_ref: str = Field(..., min_length=1, max_length=255)  # commit email, login or account id
+
+
+class EmployeeIdentityResponse(BaseModel):
+    identity_id: UUID
+    employee_id: UUID
+    source: ActivitySource
+    author_ref: str
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class EmployeeIdentitySyncResponse(BaseModel):
+    identities: int
+    activities_attributed: int  # stored activities of the authors, now attributed to their employee
+
+
 class EmployeeActivitySummary(BaseModel):
     employee_id: UUID
     period: str
@@ -84,6 +109,44 @@ class EmployeeActivitySummary(BaseModel):
     system_uptime: Optional[float] = None
 
 
+class PrometheusImportRequest(BaseModel):
+    start: datetime
+    end: datetime
+    resolution: str = Field(default="hour", pattern="^(hour|day)$")
+
+
+class PrometheusImportResponse(BaseModel):
+    start: datetime
+    end: datetime
+    resolution: str
+    api_calls: int
+    samples: int
+    services: int
+    metrics_written: int
+    latency_rows_written: int
+
+    class Config:
+        from_attributes = True
+
+
+class ServiceLatencyResponse(BaseModel):
+    latency_id: UUID
+    service_id: str
+    period_start: datetime
+    period_end: datetime
+    period_type: str
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    latency_p99_ms: Optional[float] = None
+    error_rate: Optional[float] = None
+    request_rate: Optional[float] = None
+    sample_count: int
+    source: str
+
+    class Config:
+        from_attributes = True
+
+
 class PageResponse(BaseModel):
     content: List[Any]
     total: int
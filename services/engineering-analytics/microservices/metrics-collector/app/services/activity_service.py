@@ -4,13 +4,20 @@ Associated Frontend Files:
   - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
 """
 from datetime import datetime, timedelta
-from typing import List, Optional
-from uuid import UUID
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, exists, func, select
 
-from app.models.activity import EngineeringActivity, ActivitySource, ActivityType
-from app.schemas.metrics import EngineeringActivityCreate, EmployeeActivitySummary
+from app.database import dialect_insert
+from app.models.activity import (
+    ActivitySource,
+    ActivityType,
+    EmployeeIdentity,
+    EngineeringActivity,
+    upsert_activities,
+)
+from app.schemas.metrics import EngineeringActivityCreate, EmployeeActivitySummary, EmployeeIdentityCreate
 
 
 class ActivityService:
@@ -18,44 +25,76 @@ class ActivityService:
         self.db = db
 
     def create_activity(self, data: EngineeringActivityCreate) -> EngineeringActivity:
-        activity = EngineeringActivity(
-            employee_id=data.employee_id,
-            source=data.source,
-            activity_type=data.activity_type,
-            external_id=data.external_id,
-            title=data.title,
-            description=data.description,
-            repository_id=data.repository_id,
-            project_id=data.project_id,
-            occurred_at=data.occurred_at,
-            raw_data=data.raw_data,
-        )
-        self.db.add(activity)
-        self.db.commit()
-        self.db.refresh(activity)
-        return activity
+        return self.create_activities_batch([data])[0]
 
     def create_activities_batch(
         self, activities: List[EngineeringActivityCreate]
     ) -> List[EngineeringActivity]:
-        db_activities = []
-        for data in activities:
-            activity = EngineeringActivity(
-                employee_id=data.employee_id,
-                source=data.source,
-                activity_type=data.activity_type,
-                external_id=data.external_id,
-                title=data.title,
-                description=data.description,
-                repository_id=data.repository_id,
-                project_id=data.project_id,
-                occurred_at=data.occurred_at,
-                raw_data=data.raw_data,
+        """Store activities; one already stored under its (source, external_id) is refreshed instead"""
+        activity_ids = upsert_activities(self.db, [data.model_dump() for data in activities])
+        self.db.commit()
+        stored = {
+            activity.activity_id: activity
+            for activity in self.db.query(EngineeringActivity).filter(
+                EngineeringActivity.activity_id.in_(activity_ids)
             )
-            db_activities.append(activity)
-        self.db.add_all(db_activities)
+        }
+        return [stored[activity_id] for activity_id in activity_ids]
+
+    def set_identities(self, identities: List[EmployeeIdentityCreate]) -> Tuple[int, int]:
+        """
+        Match external authors to employees, replacing an earlier match of the same
+        (source, author_ref), and attribute the authors' stored activities to them;
+        activities stored later are attributed by upsert_activities. Returns the
+        number of identities stored and of activities attributed.
+        """
+        now = datetime.utcnow()
+        rows = {
+            (identity.source, identity.author_ref.lower()): {
+                "identity_id": uuid4(),
+                "employee_id": identity.employee_id,
+                "source": identity.source,
+                "author_ref": identity.author_ref.lower(),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for identity in identities
+        }
+        if not rows:
+            return 0, 0
+
+        identity_table = EmployeeIdentity.__table__
+        statement = dialect_insert(self.db)(identity_table)
+        self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[identity_table.c.source, identity_table.c.author_ref],
+                set_={"employee_id": statement.excluded.employee_id, "updated_at": statement.excluded.updated_at},
+            ),
+            list(rows.values()),
+        )
+
+        # The identity is authoritative for its author: rows attributed through an earlier match move too
+        activity_table = EngineeringActivity.__table__
+        match = and_(
+            identity_table.c.source == activity_table.c.source,
+            identity_table.c.author_ref == func.lower(activity_table.c.author_ref),
+        )
+        attributed = self.db.execute(
+            activity_table.update()
+            .where(
+                func.lower(activity_table.c.author_ref).in_({author_ref for _, author_ref in rows}),
+                exists().where(match),
+            )
+            .values(employee_id=select(identity_table.c.employee_id).where(match).scalar_subquery())
+        ).rowcount
         self.db.commit()
-        return db_activities
+        return len(rows), attributed
+
+    def list_identities(self, employee_id: Optional[UUID] = None) -> List[EmployeeIdentity]:
+        query = self.db.query(EmployeeIdentity)
+        if employee_id:
+            query = query.filter(EmployeeIdentity.employee_id == employee_id)
+        return query.order_by(EmployeeIdentity.source, EmployeeIdentity.author_ref).all()
 
     def get_activity(self, activity_id: UUID) -> Optional[EngineeringActivity]:
         return self.db.query(EngineeringActivity).filter(
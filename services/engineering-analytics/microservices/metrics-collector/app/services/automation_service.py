@@ -6,23 +6,26 @@ Associated Frontend Files:
   - web/app/src/lib/api.ts (automationApi - lines 184-200)
   - web/app/src/pages/automation/AutomationRulesPage.tsx
 """
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 import logging
 import re
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import String, and_, case, cast, delete, func, insert, or_, select
 
 from app.models.automation import (
     AutomationRule,
     RuleExecution,
+    RuleExecutionDailyRollup,
     ThresholdConfig,
+    RuleSuppression,
     ConditionOperator,
     ActionType,
     RuleStatus,
 )
+from app.models.metrics import EngineeringMetric, MetricType
 from app.schemas.automation import (
     AutomationRuleCreate,
     AutomationRuleUpdate,
@@ -31,6 +34,8 @@ from app.schemas.automation import (
     ThresholdConfigCreate,
     WorkflowEffectivenessReport,
 )
+from app.services.threshold_resolver import ThresholdResolver
+from app.services.trigger_suppression import TriggerSuppressor
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +55,8 @@ class AutomationService:
             operator=data.operator,
             threshold_value=data.threshold_value,
             duration_days=data.duration_days,
+            cooldown_minutes=data.cooldown_minutes,
+            hysteresis=data.hysteresis,
             custom_formula=data.custom_formula,
             action_type=data.action_type,
             action_config=data.action_config,
@@ -84,8 +91,10 @@ class AutomationService:
         if not rule:
             return False
 
+        self.db.query(RuleSuppression).filter(RuleSuppression.rule_id == rule_id).delete()
         self.db.delete(rule)
         self.db.commit()
+        TriggerSuppressor.forget_rule(rule_id)
         return True
 
     def list_rules(
@@ -166,18 +175,14 @@ class AutomationService:
         entity_id: str,
         metric_type: str,
         current_value: float,
+        team_id: Optional[str] = None,
     ) -> List[RuleExecution]:
-        """Evaluate all applicable rules and trigger matching ones"""
+        """
+        Evaluate all applicable rules and trigger matching ones.
+        Employees inherit their team's threshold configs when `team_id` is given.
+        """
         executions = []
-
-        # Get custom threshold if exists
-        custom_config = self.db.query(ThresholdConfig).filter(
-            and_(
-                ThresholdConfig.entity_type == entity_type,
-                ThresholdConfig.entity_id == entity_id,
-                ThresholdConfig.metric_type == metric_type,
-            )
-        ).first()
+        now = datetime.utcnow()
 
         # Get active rules for this metric
         rules = self.db.query(AutomationRule).filter(
@@ -191,26 +196,50 @@ class AutomationService:
                 AutomationRule.scope_type == entity_type,
             )
         ).all()
+        if not rules:
+            return executions
+
+        resolver = ThresholdResolver(self.db)
+        suppressor = TriggerSuppressor(self.db)
+        suppressor.load([rule.rule_id for rule in rules], entity_type, entity_id)
 
         for rule in rules:
             # Use custom threshold if configured
-            threshold = custom_config.custom_threshold if custom_config else rule.threshold_value
-            action_type = custom_config.custom_action if custom_config and custom_config.custom_action else rule.action_type
-
-            if self._evaluate_condition(current_value, rule.operator, threshold):
-                # Check duration requirement
-                if rule.duration_days > 0:
-                    if not self._check_duration_requirement(rule, entity_type, entity_id, current_value):
-                        continue
-
-                # Execute action
-                execution = self._execute_action(rule, entity_type, entity_id, current_value, threshold, action_type)
-                executions.append(execution)
-
-                # Update rule stats
-                rule.last_triggered_at = datetime.utcnow()
-                rule.trigger_count += 1
-                self.db.commit()
+            effective = resolver.resolve(rule, entity_type, entity_id, team_id)
+            threshold = effective.threshold
+            action_type = effective.action_type
+            state = suppressor.state_for(rule, entity_type, entity_id)
+
+            if not self._evaluate_condition(current_value, rule.operator, threshold):
+                suppressor.observe_clear(rule, state, current_value, threshold)
+                continue
+
+            # Check duration requirement
+            if rule.duration_days > 0:
+                if not self._check_duration_requirement(rule, entity_type, entity_id, current_value):
+                    continue
+
+            # Skip entities still inside the cooldown window or hysteresis band
+            reason = suppressor.suppression_reason(rule, state, now)
+            if reason:
+                suppressor.record_suppression(state, now)
+                rule.suppressed_count = (rule.suppressed_count or 0) + 1
+                logger.debug(f"Suppressed trigger for rule {rule.rule_id} on {entity_type}:{entity_id} ({reason})")
+                continue
+
+            # Execute action
+            execution = self._execute_action(rule, entity_type, entity_id, current_value, threshold, action_type)
+            executions.append(execution)
+            suppressor.record_trigger(state, current_value, now, rule.hysteresis)
+
+            # Update rule stats
+            rule.last_triggered_at = now
+            rule.trigger_count += 1
+
+        # Persist executions, rule stats and suppression state in one transaction
+        suppressor.flush()
+        self.db.commit()
+        suppressor.publish()
 
         return executions
 
@@ -305,8 +334,6 @@ class AutomationService:
             is_test_run=False,
         )
         self.db.add(execution)
-        self.db.commit()
-        self.db.refresh(execution)
 
         return execution
 
@@ -387,19 +414,34 @@ class AutomationService:
         entity_id: Optional[str] = None,
         page: int = 0,
         size: int = 50,
+        triggered_after: Optional[datetime] = None,
+        triggered_before: Optional[datetime] = None,
     ) -> Tuple[List[RuleExecution], int]:
-        """Get workflow execution history"""
+        """Get workflow execution history (time bounds let PostgreSQL prune partitions)"""
         query = self.db.query(RuleExecution)
 
         if rule_id:
             query = query.filter(RuleExecution.rule_id == rule_id)
         if entity_id:
             query = query.filter(RuleExecution.entity_id == entity_id)
+        if triggered_after:
+            query = query.filter(RuleExecution.triggered_at >= triggered_after)
+        if triggered_before:
+            query = query.filter(RuleExecution.triggered_at <= triggered_before)
 
         total = query.count()
         executions = query.order_by(RuleExecution.triggered_at.desc()).offset(page * size).limit(size).all()
         return executions, total
 
+    def get_suppressions(self, rule_id: UUID) -> List[RuleSuppression]:
+        """Get per-entity trigger suppression state for a rule"""
+        return (
+            self.db.query(RuleSuppression)
+            .filter(RuleSuppression.rule_id == rule_id)
+            .order_by(RuleSuppression.suppressed_count.desc())
+            .all()
+        )
+
     def create_threshold_config(
         self,
         data: ThresholdConfigCreate,
@@ -409,6 +451,7 @@ class AutomationService:
         config = ThresholdConfig(
             entity_type=data.entity_type,
             entity_id=data.entity_id,
+            rule_id=data.rule_id,
             metric_type=data.metric_type,
             custom_threshold=data.custom_threshold,
             custom_action=data.custom_action,
@@ -417,6 +460,7 @@ class AutomationService:
         self.db.add(config)
         self.db.commit()
         self.db.refresh(config)
+        ThresholdResolver.invalidate(config.metric_type)
         return config
 
     def get_threshold_configs(
@@ -438,41 +482,39 @@ class AutomationService:
         self,
         period_start: datetime,
         period_end: datetime,
+        use_rollups: bool = False,
     ) -> WorkflowEffectivenessReport:
         """Generate report on workflow trigger effectiveness"""
-        executions = self.db.query(RuleExecution).filter(
-            and_(
-                RuleExecution.triggered_at >= period_start,
-                RuleExecution.triggered_at <= period_end,
-                RuleExecution.is_test_run == False,
-            )
-        ).all()
-
-        total_triggers = len(executions)
-        successful = sum(1 for e in executions if e.execution_success)
+        if use_rollups:
+            rule_rows = self._rule_counts_from_rollups(period_start.date(), period_end.date())
+        else:
+            rule_rows = self._rule_counts_from_executions(period_start, period_end)
+
+        rules_summary = [
+            {
+                "rule_id": str(row.rule_id),
+                "rule_name": row.rule_name or "Unknown",
+                "trigger_count": int(row.trigger_count or 0),
+                "success_count": int(row.success_count or 0),
+            }
+            for row in rule_rows
+        ]
+        total_triggers = sum(r["trigger_count"] for r in rules_summary)
+        successful = sum(r["success_count"] for r in rules_summary)
         failed = total_triggers - successful
 
-        # Aggregate by rule
-        rules_summary = {}
-        for execution in executions:
-            rule_id = str(execution.rule_id)
-            if rule_id not in rules_summary:
-                rule = self.get_rule(execution.rule_id)
-                rules_summary[rule_id] = {
-                    "rule_id": rule_id,
-                    "rule_name": rule.name if rule else "Unknown",
-                    "trigger_count": 0,
-                    "success_count": 0,
-                }
-            rules_summary[rule_id]["trigger_count"] += 1
-            if execution.execution_success:
-                rules_summary[rule_id]["success_count"] += 1
+        improvements = self._metric_deltas(period_start, period_end)
 
         recommendations = []
         if failed > 0:
             recommendations.append(f"Review {failed} failed executions for potential configuration issues")
         if total_triggers == 0:
             recommendations.append("Consider adjusting thresholds if no rules have triggered")
+        for item in improvements:
+            if item["improved"] is False:
+                recommendations.append(
+                    f"Rule '{item['rule_name']}' triggered without improving {item['metric_type']}; review its action"
+                )
 
         return WorkflowEffectivenessReport(
             period_start=period_start,
@@ -480,7 +522,202 @@ class AutomationService:
             total_triggers=total_triggers,
             successful_executions=successful,
             failed_executions=failed,
-            rules_summary=list(rules_summary.values()),
-            improvements_detected=[],
+            rules_summary=rules_summary,
+            improvements_detected=improvements,
             recommendations=recommendations,
         )
+
+    def refresh_daily_rollups(self, day_start: date, day_end: date) -> int:
+        """Recompute daily execution rollups for the inclusive day range"""
+        day = func.date(RuleExecution.triggered_at)
+        self.db.execute(
+            delete(RuleExecutionDailyRollup).where(
+                and_(
+                    RuleExecutionDailyRollup.day >= day_start,
+                    RuleExecutionDailyRollup.day <= day_end,
+                )
+            )
+        )
+        aggregated = (
+            select(
+                RuleExecution.rule_id,
+                day,
+                func.count(RuleExecution.execution_id),
+                func.sum(case((RuleExecution.execution_success.is_(True), 1), else_=0)),
+                func.now(),
+            )
+            .where(
+                and_(
+                    RuleExecution.triggered_at >= datetime.combine(day_start, datetime.min.time()),
+                    RuleExecution.triggered_at < datetime.combine(day_end + timedelta(days=1), datetime.min.time()),
+                    RuleExecution.is_test_run.is_(False),
+                )
+            )
+            .group_by(RuleExecution.rule_id, day)
+        )
+        result = self.db.execute(
+            insert(RuleExecutionDailyRollup).from_select(
+                ["rule_id", "day", "trigger_count", "success_count", "refreshed_at"],
+                aggregated,
+            )
+        )
+        self.db.commit()
+        logger.info(f"Refreshed execution rollups for {day_start}..{day_end}")
+        return result.rowcount
+
+    def _rule_counts_from_executions(self, period_start: datetime, period_end: datetime) -> List[Any]:
+        """Per-rule trigger and success counts in a single grouped query"""
+        return (
+            self.db.query(
+                RuleExecution.rule_id,
+                AutomationRule.name.label("rule_name"),
+                func.count(RuleExecution.execution_id).label("trigger_count"),
+                func.sum(case((RuleExecution.execution_success.is_(True), 1), else_=0)).label("success_count"),
+            )
+            .outerjoin(AutomationRule, AutomationRule.rule_id == RuleExecution.rule_id)
+            .filter(
+                and_(
+                    RuleExecution.triggered_at >= period_start,
+                    RuleExecution.triggered_at <= period_end,
+                    RuleExecution.is_test_run.is_(False),
+                )
+            )
+            .group_by(RuleExecution.rule_id, AutomationRule.name)
+            .all()
+        )
+
+    def _rule_counts_from_rollups(self, day_start: date, day_end: date) -> List[Any]:
+        """Per-rule counts from precomputed daily rollups (day granularity)"""
+        return (
+            self.db.query(
+                RuleExecutionDailyRollup.rule_id,
+                AutomationRule.name.label("rule_name"),
+                func.sum(RuleExecutionDailyRollup.trigger_count).label("trigger_count"),
+                func.sum(RuleExecutionDailyRollup.success_count).label("success_count"),
+            )
+            .outerjoin(AutomationRule, AutomationRule.rule_id == RuleExecutionDailyRollup.rule_id)
+            .filter(
+                and_(
+                    RuleExecutionDailyRollup.day >= day_start,
+                    RuleExecutionDailyRollup.day <= day_end,
+                )
+            )
+            .group_by(RuleExecutionDailyRollup.rule_id, AutomationRule.name)
+            .all()
+        )
+
+    def _metric_deltas(self, period_start: datetime, period_end: datetime) -> List[Dict[str, Any]]:
+        """
+        Compare each rule's metric before and after it first triggered for an entity.
+
+        The "before" window mirrors the report period length ending at the first
+        trigger; the "after" window runs from the first trigger to period_end.
+        Rule metric types are mapped to MetricType here, so each metric type and
+        entity kind is one query on typed, indexed columns, bounded to
+        [period_start - lookback, period_end].
+        """
+        lookback = period_end - period_start
+        first_triggers = (
+            select(
+                RuleExecution.rule_id,
+                RuleExecution.entity_type,
+                RuleExecution.entity_id,
+                func.min(RuleExecution.triggered_at).label("first_triggered_at"),
+            )
+            .where(
+                and_(
+                    RuleExecution.triggered_at >= period_start,
+                    RuleExecution.triggered_at <= period_end,
+                    RuleExecution.is_test_run.is_(False),
+                )
+            )
+            .group_by(RuleExecution.rule_id, RuleExecution.entity_type, RuleExecution.entity_id)
+            .subquery()
+        )
+        rules = (
+            self.db.query(AutomationRule)
+            .filter(AutomationRule.rule_id.in_(select(first_triggers.c.rule_id)))
+            .all()
+        )
+        rules_by_metric: Dict[MetricType, List[AutomationRule]] = {}
+        for rule in rules:
+            try:
+                rules_by_metric.setdefault(MetricType(rule.metric_type.lower()), []).append(rule)
+            except ValueError:
+                continue  # not a collected metric (e.g. blocked_tickets), nothing to compare
+
+        before = and_(
+            EngineeringMetric.period_end <= first_triggers.c.first_triggered_at,
+            EngineeringMetric.period_end >= first_triggers.c.first_triggered_at - lookback,
+        )
+        after = EngineeringMetric.period_start >= first_triggers.c.first_triggered_at
+        # Employee metrics are keyed by employee_id, the others by repository/service id. Trigger
+        # entity ids are free-form, so the UUID is compared as text (without hyphens, which SQLite
+        # does not store) rather than casting the ids, which fails on the first non-UUID one
+        entity_kinds = [
+            (
+                first_triggers.c.entity_type == "employee",
+                func.replace(cast(EngineeringMetric.employee_id, String), "-", "")
+                == func.lower(func.replace(first_triggers.c.entity_id, "-", "")),
+            ),
+            (first_triggers.c.entity_type != "employee", EngineeringMetric.repository_id == first_triggers.c.entity_id),
+        ]
+
+        # rule_id -> [entities, sum before, count before, sum after, count after]
+        totals: Dict[UUID, List[float]] = {}
+        for metric_type, metric_rules in rules_by_metric.items():
+            for is_kind, entity_matches in entity_kinds:
+                rows = (
+                    self.db.query(
+                        first_triggers.c.rule_id,
+                        func.count(func.distinct(first_triggers.c.entity_id)),
+                        func.sum(case((before, EngineeringMetric.value))),
+                        func.count(case((before, EngineeringMetric.value))),
+                        func.sum(case((after, EngineeringMetric.value))),
+                        func.count(case((after, EngineeringMetric.value))),
+                    )
+                    .select_from(first_triggers)
+                    .join(EngineeringMetric, entity_matches)
+                    .filter(
+                        first_triggers.c.rule_id.in_([rule.rule_id for rule in metric_rules]),
+                        is_kind,
+                        EngineeringMetric.metric_type == metric_type,
+                        EngineeringMetric.period_start >= period_start - lookback,
+                        EngineeringMetric.period_start <= period_end,
+                        or_(before, after),
+                    )
+                    .group_by(first_triggers.c.rule_id)
+                    .all()
+                )
+                for rule_id, *values in rows:
+                    total = totals.setdefault(rule_id, [0, 0.0, 0, 0.0, 0])
+                    for i, value in enumerate(values):
+                        total[i] += value or 0
+
+        improvements = []
+        for rule in rules:
+            entities, sum_before, count_before, sum_after, count_after = totals.get(rule.rule_id, (0, 0, 0, 0, 0))
+            if not count_before or not count_after:
+                continue
+            average_before, average_after = sum_before / count_before, sum_after / count_after
+            delta = average_after - average_before
+            improvements.append({
+                "rule_id": str(rule.rule_id),
+                "rule_name": rule.name,
+                "metric_type": rule.metric_type,
+                "entities": entities,
+                "average_before": round(average_before, 4),
+                "average_after": round(average_after, 4),
+                "delta": round(delta, 4),
+                "delta_percentage": round(delta / average_before * 100, 2) if average_before else None,
+                "improved": self._is_improvement(rule.operator, delta),
+            })
+        return improvements
+
+    def _is_improvement(self, operator: ConditionOperator, delta: float) -> Optional[bool]:
+        """A rule firing on high values improves things when the metric drops, and vice versa"""
+        if operator in (ConditionOperator.GREATER_THAN, ConditionOperator.GREATER_THAN_OR_EQUAL):
+            return delta < 0
+        if operator in (ConditionOperator.LESS_THAN, ConditionOperator.LESS_THAN_OR_EQUAL):
+            return delta > 0
+        return None
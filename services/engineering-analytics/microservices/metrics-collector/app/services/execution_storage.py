@@ -0,0 +1,192 @@
+"""
+Execution Storage Service for Cluster_0002
+Supports: Track workflow execution history (Story 8.2)
+
+Maintains monthly range partitions of `rule_executions` on PostgreSQL and
+applies the configured retention policy by dropping expired partitions.
+Other databases fall back to deleting expired rows. A table created before
+partitioning is rebuilt as a partitioned one at startup
+(migrate_to_partitioned), and run_partition_maintenance keeps creating the
+upcoming partitions while the service runs.
+
+Associated Frontend Files:
+  - web/app/src/pages/automation/AutomationRulesPage.tsx
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import re
+
+from sqlalchemy import delete, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.automation import RuleExecution
+
+logger = logging.getLogger(__name__)
+
+_TABLE = RuleExecution.__tablename__
+_DEFAULT_PARTITION = f"{_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+class ExecutionStorageService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def is_partitioned(self) -> bool:
+        """True when rule_executions was created as a partitioned table"""
+        if self.db.bind.dialect.name != "postgresql":
+            return False
+        return bool(self.db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table"
+            ),
+            {"table": _TABLE},
+        ).scalar())
+
+    def migrate_to_partitioned(self, now: Optional[datetime] = None) -> bool:
+        """
+        Rebuild a rule_executions table created before partitioning (a plain
+        table, execution_result typed json) as the partitioned table, with a
+        partition per month of its rows, in one transaction. Returns True when
+        a table was migrated.
+        """
+        if self.db.bind.dialect.name != "postgresql" or self.is_partitioned():
+            return False
+        if self.db.execute(text("SELECT to_regclass(:table)"), {"table": _TABLE}).scalar() is None:
+            return False
+
+        legacy = f"{_TABLE}_legacy"
+        self.db.execute(text(f"ALTER TABLE {_TABLE} RENAME TO {legacy}"))
+        # Free the index and primary key names for the new table
+        indexes = self.db.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": legacy}
+        ).scalars().all()
+        for index in indexes:
+            self.db.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index[:56]}_legacy"'))
+        RuleExecution.__table__.create(bind=self.db.connection())
+
+        first, last = self.db.execute(text(f"SELECT min(triggered_at), max(triggered_at) FROM {legacy}")).one()
+        now = now or datetime.utcnow()
+        month, last = _month_start((first or now).date()), max(last or now, now).date()
+        while month <= last:
+            self.db.execute(text(self._partition_ddl(month)))
+            month = _next_month(month)
+        self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {_DEFAULT_PARTITION} PARTITION OF {_TABLE} DEFAULT"))
+
+        columns = [column.name for column in RuleExecution.__table__.columns]
+        selected = [f"{name}::text" if name == "execution_result" else name for name in columns]
+        copied = self.db.execute(text(
+            f"INSERT INTO {_TABLE} ({', '.join(columns)}) SELECT {', '.join(selected)} FROM {legacy}"
+        )).rowcount
+        self.db.execute(text(f"DROP TABLE {legacy}"))
+        self.db.commit()
+        logger.info(f"Migrated {copied} rule executions to the partitioned {_TABLE} table")
+        return True
+
+    def ensure_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """Create the current and upcoming monthly partitions plus a default partition"""
+        if not self.is_partitioned():
+            return []
+
+        month = _month_start((now or datetime.utcnow()).date())
+        created = []
+        for _ in range(self.settings.rule_execution_partitions_ahead + 1):
+            name = _partition_name(month)
+            try:
+                self.db.execute(text(self._partition_ddl(month)))
+                self.db.commit()
+                created.append(name)
+            except SQLAlchemyError as e:
+                # Rows for this month already landed in the default partition
+                self.db.rollback()
+                logger.warning(f"Could not create partition {name}: {e}")
+            month = _next_month(month)
+
+        self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {_DEFAULT_PARTITION} PARTITION OF {_TABLE} DEFAULT"))
+        self.db.commit()
+        return created
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Drop partitions (or delete rows) older than the retention window"""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.settings.rule_execution_retention_days)
+        dropped = []
+
+        if self.is_partitioned():
+            for name in self._list_partitions():
+                match = _PARTITION_NAME.match(name)
+                if not match:
+                    continue
+                upper = _next_month(date(int(match.group(1)), int(match.group(2)), 1))
+                if datetime.combine(upper, datetime.min.time()) <= cutoff:
+                    self.db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    dropped.append(name)
+
+        # Rows outside monthly partitions (default partition or unpartitioned table)
+        result = self.db.execute(delete(RuleExecution).where(RuleExecution.triggered_at < cutoff))
+        self.db.commit()
+
+        if dropped or result.rowcount:
+            logger.info(f"Execution retention: dropped {len(dropped)} partitions, deleted {result.rowcount} rows")
+        return {
+            "cutoff": cutoff,
+            "dropped_partitions": dropped,
+            "deleted_rows": result.rowcount,
+        }
+
+    def _partition_ddl(self, month: date) -> str:
+        return (
+            f"CREATE TABLE IF NOT EXISTS {_partition_name(month)} PARTITION OF {_TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        )
+
+    def _list_partitions(self) -> List[str]:
+        rows = self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table ORDER BY c.relname"
+            ),
+            {"table": _TABLE},
+        ).all()
+        return [row.relname for row in rows]
+
+
+async def run_partition_maintenance(stop: asyncio.Event) -> None:
+    """Create upcoming partitions every rule_execution_maintenance_interval_hours until `stop` is set"""
+    interval = get_settings().rule_execution_maintenance_interval_hours * 3600
+
+    def maintain() -> None:
+        with SessionLocal() as db:
+            ExecutionStorageService(db).ensure_partitions()
+
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        if stop.is_set():
+            break
+        try:
+            await asyncio.to_thread(maintain)
+        except Exception as e:
+            logger.error(f"Rule execution partition maintenance failed: {e}")
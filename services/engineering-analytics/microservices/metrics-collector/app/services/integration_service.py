@@ -4,11 +4,11 @@ Associated Frontend Files:
   - web/app/src/pages/integrations/IntegrationsPage.tsx
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 
-from app.models.integration import Integration, IntegrationStatus
+from app.models.integration import Integration, IntegrationStatus, SyncWatermark
 from app.schemas.integration import IntegrationCreate, IntegrationUpdate
 
 
@@ -88,10 +88,31 @@ class IntegrationService:
         self.db.refresh(integration)
         return integration
 
+    def bulk_update_sync_status(
+        self,
+        results: Iterable[Tuple[UUID, IntegrationStatus, Optional[str], datetime]],
+    ) -> int:
+        """Record (integration_id, status, error_message, synced_at) for many integrations in one statement"""
+        mappings = [
+            {
+                "integration_id": integration_id,
+                "status": status,
+                "error_message": error_message,
+                "last_sync_at": synced_at,
+                "updated_at": synced_at,
+            }
+            for integration_id, status, error_message, synced_at in results
+        ]
+        if mappings:
+            self.db.bulk_update_mappings(Integration, mappings)
+            self.db.commit()
+        return len(mappings)
+
     def delete_integration(self, integration_id: UUID) -> bool:
         integration = self.get_integration(integration_id)
         if not integration:
             return False
+        self.db.query(SyncWatermark).filter(SyncWatermark.integration_id == integration_id).delete()
         self.db.delete(integration)
         self.db.commit()
         return True
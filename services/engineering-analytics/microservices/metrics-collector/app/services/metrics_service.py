@@ -9,7 +9,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.models.metrics import EngineeringMetric, MetricType
+from app.models.metrics import EngineeringMetric, MetricType, ServiceLatency
 from app.schemas.metrics import MetricCreate
 
 
@@ -28,7 +28,7 @@ class MetricsService:
             period_end=data.period_end,
             period_type=data.period_type,
             source=data.source,
-            metadata=data.metadata,
+            metadata_=data.metadata,
         )
         self.db.add(metric)
         self.db.commit()
@@ -50,7 +50,7 @@ class MetricsService:
                 period_end=data.period_end,
                 period_type=data.period_type,
                 source=data.source,
-                metadata=data.metadata,
+                metadata_=data.metadata,
             )
             db_metrics.append(metric)
         self.db.add_all(db_metrics)
@@ -120,3 +120,21 @@ class MetricsService:
         total = query.count()
         metrics = query.offset(page * size).limit(size).all()
         return metrics, total
+
+    def get_service_latency(
+        self,
+        service_id: str,
+        period_type: Optional[str] = None,
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None,
+    ) -> List[ServiceLatency]:
+        query = self.db.query(ServiceLatency).filter(ServiceLatency.service_id == service_id)
+
+        if period_type:
+            query = query.filter(ServiceLatency.period_type == period_type)
+        if period_start:
+            query = query.filter(ServiceLatency.period_start >= period_start)
+        if period_end:
+            query = query.filter(ServiceLatency.period_end <= period_end)
+
+        return query.order_by(ServiceLatency.period_start.desc()).all()
@@ -0,0 +1,279 @@
+"""
+Prometheus Range Importer for Cluster_0002
+Supports: Story 5.1 - Integrate Engineering Tools (Prometheus uptime, incidents, latency)
+
+Pulls `query_range` results for the configured uptime, incident, request-rate,
+error-rate and latency-quantile queries from `prometheus_url`. The range is
+aligned to whole buckets and split into chunks of `prometheus_import_chunk_hours`;
+every (query, chunk) request runs concurrently through the pooled integration
+HTTP client. Samples are loaded into pandas, de-duplicated on (service, ts)
+where chunks overlap, and downsampled per hour or day into:
+  - SYSTEM_UPTIME metrics (percent of scrapes up)
+  - INCIDENT_FREQUENCY metrics (critical alert onsets, zero-filled)
+  - `ea_service_latency` rows (p50/p95/p99 ms, error and request rate)
+A re-import of the same range replaces the earlier rows in one transaction.
+
+Associated Frontend Files:
+  - web/app/src/pages/analytics/EngineeringMetricsPage.tsx
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.clients.http_client import IntegrationHttpClient, get_http_client
+from app.config import get_settings
+from app.models.metrics import EngineeringMetric, MetricType, ServiceLatency
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "prometheus"
+RESOLUTIONS = {"hour": "1h", "day": "1D"}
+LATENCY_QUANTILES = {"latency_p50_ms": 0.5, "latency_p95_ms": 0.95, "latency_p99_ms": 0.99}
+LATENCY_COLUMNS = [*LATENCY_QUANTILES, "error_rate", "request_rate"]
+_COLUMNS = ["service", "ts", "value"]
+
+
+@dataclass
+class ImportSummary:
+    start: datetime
+    end: datetime
+    resolution: str
+    api_calls: int
+    samples: int
+    services: int
+    metrics_written: int
+    latency_rows_written: int
+
+
+class PrometheusImporter:
+    def __init__(
+        self,
+        db: Session,
+        base_url: Optional[str] = None,
+        client: Optional[IntegrationHttpClient] = None,
+    ):
+        self.db = db
+        self.settings = get_settings()
+        self.base_url = (base_url or self.settings.prometheus_url).rstrip("/")
+        self.client = client
+
+    def queries(self) -> Dict[str, str]:
+        latency = self.settings.prometheus_latency_query
+        return {
+            "uptime": self.settings.prometheus_uptime_query,
+            "incidents": self.settings.prometheus_incident_query,
+            "request_rate": self.settings.prometheus_request_rate_query,
+            "error_rate": self.settings.prometheus_error_rate_query,
+            **{column: latency.format(quantile=q) for column, q in LATENCY_QUANTILES.items()},
+        }
+
+    async def import_range(self, start: datetime, end: datetime, resolution: str = "hour") -> ImportSummary:
+        if not self.base_url:
+            raise ValueError("prometheus_url is not configured")
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unsupported resolution: {resolution}")
+        freq = pd.Timedelta(RESOLUTIONS[resolution])
+        start = pd.Timestamp(_naive_utc(start)).floor(freq).to_pydatetime()
+        end = pd.Timestamp(_naive_utc(end)).ceil(freq).to_pydatetime()
+        if end <= start:
+            raise ValueError("end must be after start")
+
+        client = self.client or get_http_client()
+        requests = [(name, query, chunk) for name, query in self.queries().items() for chunk in self._chunks(start, end)]
+        results = await asyncio.gather(
+            *(self._query_range(client, query, chunk_start, chunk_end) for _, query, (chunk_start, chunk_end) in requests)
+        )
+
+        frames: Dict[str, List[pd.DataFrame]] = {}
+        for (name, _, _), frame in zip(requests, results):
+            frames.setdefault(name, []).append(frame)
+        series = {name: self._combine(parts, end) for name, parts in frames.items()}
+
+        metric_rows = self._uptime_rows(series["uptime"], freq, resolution)
+        metric_rows += self._incident_rows(series["incidents"], series["uptime"], freq, resolution)
+        latency_rows = self._latency_rows(series, freq, resolution)
+        self._write(start, end, resolution, metric_rows, latency_rows)
+
+        services = set().union(*(frame["service"].unique() for frame in series.values()))
+        summary = ImportSummary(
+            start=start,
+            end=end,
+            resolution=resolution,
+            api_calls=len(requests),
+            samples=sum(len(frame) for frame in series.values()),
+            services=len(services),
+            metrics_written=len(metric_rows),
+            latency_rows_written=len(latency_rows),
+        )
+        logger.info(
+            f"Imported Prometheus {start}..{end} ({resolution}): {summary.samples} samples, "
+            f"{summary.metrics_written} metrics, {summary.latency_rows_written} latency rows"
+        )
+        return summary
+
+    def _chunks(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        size = timedelta(hours=self.settings.prometheus_import_chunk_hours)
+        chunks = []
+        while start < end:
+            chunk_end = min(start + size, end)
+            chunks.append((start, chunk_end))
+            start = chunk_end
+        return chunks
+
+    async def _query_range(
+        self, client: IntegrationHttpClient, query: str, start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        response = await client.get(
+            f"{self.base_url}/api/v1/query_range",
+            params={
+                "query": query,
+                "start": _unix(start),
+                "end": _unix(end),
+                "step": f"{self.settings.prometheus_import_step_seconds}s",
+            },
+        )
+        response.raise_for_status()
+        body = response.json()
+        if body.get("status") != "success":
+            raise ValueError(f"Prometheus query failed: {body.get('error', 'unknown error')}")
+
+        label = self.settings.prometheus_service_label
+        parts = []
+        for result in body.get("data", {}).get("result", []):
+            service = result.get("metric", {}).get(label)
+            values = result.get("values")
+            if not service or not values:
+                continue
+            # Prometheus sends sample values as strings ("NaN", "+Inf" included)
+            samples = np.array(values, dtype=float)
+            parts.append(pd.DataFrame({"service": service, "ts": samples[:, 0], "value": samples[:, 1]}))
+        if not parts:
+            return pd.DataFrame(columns=_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    def _combine(self, parts: List[pd.DataFrame], end: datetime) -> pd.DataFrame:
+        """Concatenate chunk results; chunk edges are returned by both neighbours"""
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return pd.DataFrame({
+                "service": pd.Series(dtype=object),
+                "ts": pd.Series(dtype="datetime64[ns]"),
+                "value": pd.Series(dtype=float),
+            })
+        frame = pd.concat(parts, ignore_index=True)
+        frame["ts"] = pd.to_datetime(frame["ts"], unit="s")
+        frame = frame[np.isfinite(frame["value"]) & (frame["ts"] < end)]
+        return frame.drop_duplicates(["service", "ts"]).sort_values(["service", "ts"], ignore_index=True)
+
+    def _uptime_rows(self, uptime: pd.DataFrame, freq: pd.Timedelta, resolution: str) -> List[dict]:
+        buckets = uptime.assign(bucket=uptime["ts"].dt.floor(freq)).groupby(["service", "bucket"])["value"].mean()
+        return [
+            self._metric_row(MetricType.SYSTEM_UPTIME, service, bucket, value * 100, "percent", freq, resolution)
+            for (service, bucket), value in buckets.items()
+        ]
+
+    def _incident_rows(
+        self, incidents: pd.DataFrame, uptime: pd.DataFrame, freq: pd.Timedelta, resolution: str
+    ) -> List[dict]:
+        """Count alert onsets: a firing series' first sample, or one after a gap longer than a step"""
+        step = pd.Timedelta(seconds=self.settings.prometheus_import_step_seconds)
+        gaps = incidents.groupby("service")["ts"].diff()
+        onsets = incidents[gaps.isna() | (gaps > step)]
+        counts = onsets.groupby(["service", onsets["ts"].dt.floor(freq).rename("bucket")]).size()
+
+        # Every observed (service, bucket) gets a row, so quiet periods read as 0 rather than missing
+        observed = pd.MultiIndex.from_frame(
+            uptime.assign(bucket=uptime["ts"].dt.floor(freq))[["service", "bucket"]].drop_duplicates()
+        )
+        counts = counts.reindex(observed.union(counts.index), fill_value=0)
+        return [
+            self._metric_row(MetricType.INCIDENT_FREQUENCY, service, bucket, float(count), "count", freq, resolution)
+            for (service, bucket), count in counts.items()
+        ]
+
+    def _latency_rows(self, series: Dict[str, pd.DataFrame], freq: pd.Timedelta, resolution: str) -> List[dict]:
+        present = {
+            column: series[column].set_index(["service", "ts"])["value"]
+            for column in LATENCY_COLUMNS
+            if not series[column].empty
+        }
+        if not present:
+            return []
+        wide = pd.concat(present, axis=1).reindex(columns=LATENCY_COLUMNS).reset_index()
+        for column in LATENCY_QUANTILES:
+            wide[column] *= 1000  # histogram_quantile over *_seconds buckets
+        wide["bucket"] = wide["ts"].dt.floor(freq)
+        grouped = wide.groupby(["service", "bucket"])
+        buckets = grouped[LATENCY_COLUMNS].mean().join(grouped.size().rename("sample_count"))
+
+        rows = []
+        for (service, bucket), values in buckets.iterrows():
+            rows.append({
+                "service_id": service,
+                "period_start": bucket.to_pydatetime(),
+                "period_end": (bucket + freq).to_pydatetime(),
+                "period_type": resolution,
+                **{column: None if pd.isna(values[column]) else float(values[column]) for column in LATENCY_COLUMNS},
+                "sample_count": int(values["sample_count"]),
+                "source": SOURCE,
+            })
+        return rows
+
+    @staticmethod
+    def _metric_row(
+        metric_type: MetricType,
+        service: str,
+        bucket: pd.Timestamp,
+        value: float,
+        unit: str,
+        freq: pd.Timedelta,
+        resolution: str,
+    ) -> dict:
+        return {
+            "employee_id": None,
+            "repository_id": service,
+            "metric_type": metric_type,
+            "value": float(value),
+            "unit": unit,
+            "period_start": bucket.to_pydatetime(),
+            "period_end": (bucket + freq).to_pydatetime(),
+            "period_type": resolution,
+            "source": SOURCE,
+        }
+
+    def _write(
+        self, start: datetime, end: datetime, resolution: str, metric_rows: List[dict], latency_rows: List[dict]
+    ) -> None:
+        """Replace previously imported rows for the range, in one transaction"""
+        self.db.query(EngineeringMetric).filter(
+            EngineeringMetric.source == SOURCE,
+            EngineeringMetric.metric_type.in_([MetricType.SYSTEM_UPTIME, MetricType.INCIDENT_FREQUENCY]),
+            EngineeringMetric.period_type == resolution,
+            EngineeringMetric.period_start >= start,
+            EngineeringMetric.period_start < end,
+        ).delete(synchronize_session=False)
+        self.db.query(ServiceLatency).filter(
+            ServiceLatency.source == SOURCE,
+            ServiceLatency.period_type == resolution,
+            ServiceLatency.period_start >= start,
+            ServiceLatency.period_start < end,
+        ).delete(synchronize_session=False)
+        self.db.bulk_insert_mappings(EngineeringMetric, metric_rows)
+        self.db.bulk_insert_mappings(ServiceLatency, latency_rows)
+        self.db.commit()
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _unix(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
@@ -0,0 +1,252 @@
+"""
+Rule Backtest Service for Cluster_0002
+Implements: threshold tuning for Performance-Based Workflow Triggers (Story 8.2)
+
+Replays an automation rule over historical `ea_metrics` for every in-scope
+entity as one vectorized pass, without executing actions or writing
+`RuleExecution` rows. The rule's cooldown and hysteresis are then replayed per
+entity over the points that would fire, as evaluate_and_trigger applies them,
+so trigger counts match what the rule would actually have fired.
+
+Associated Frontend Files:
+  - web/app/src/pages/automation/AutomationRulesPage.tsx
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+import operator
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import String, and_, cast
+from sqlalchemy.orm import Session
+
+from app.models.automation import AutomationRule, ConditionOperator
+from app.models.metrics import EngineeringMetric, MetricType
+from app.schemas.automation import (
+    BacktestEntitySummary,
+    BacktestTrigger,
+    RuleBacktestRequest,
+    RuleBacktestResponse,
+)
+from app.services.threshold_resolver import ThresholdResolver
+from app.services.trigger_suppression import has_cleared
+
+logger = logging.getLogger(__name__)
+
+_OPERATORS = {
+    ConditionOperator.LESS_THAN: operator.lt,
+    ConditionOperator.LESS_THAN_OR_EQUAL: operator.le,
+    ConditionOperator.GREATER_THAN: operator.gt,
+    ConditionOperator.GREATER_THAN_OR_EQUAL: operator.ge,
+    ConditionOperator.EQUAL: operator.eq,
+    ConditionOperator.NOT_EQUAL: operator.ne,
+}
+
+
+class RuleBacktestService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def backtest(self, rule: AutomationRule, request: RuleBacktestRequest) -> RuleBacktestResponse:
+        """Replay a rule across the historical metric series of all in-scope entities"""
+        threshold = request.threshold_value if request.threshold_value is not None else rule.threshold_value
+        duration_days = request.duration_days if request.duration_days is not None else rule.duration_days
+
+        series = self._load_series(rule, request)
+        overrides = {}
+        if request.threshold_value is None and request.apply_threshold_configs and not series.empty:
+            overrides = self._threshold_overrides(rule, series["entity_id"].unique().tolist(), request.team_ids)
+
+        evaluated = self._evaluate(series, rule.operator, threshold, overrides, duration_days)
+        self._suppress(evaluated, rule.operator, rule.cooldown_minutes, rule.hysteresis)
+        triggers = evaluated[evaluated["triggered"]]
+
+        entities = self._summarize_entities(evaluated)
+        timeline = [
+            BacktestTrigger(
+                entity_id=row.entity_id,
+                triggered_at=row.observed_at.to_pydatetime(),
+                metric_value=float(row.value),
+                threshold_value=float(row.threshold),
+            )
+            for row in triggers.head(request.timeline_limit).itertuples(index=False)
+        ]
+
+        logger.info(
+            f"Backtested rule {rule.rule_id}: {len(evaluated)} points, {len(triggers)} triggers"
+        )
+        return RuleBacktestResponse(
+            rule_id=rule.rule_id,
+            period_start=request.period_start,
+            period_end=request.period_end,
+            threshold_value=threshold,
+            duration_days=duration_days,
+            entities_evaluated=len(entities),
+            points_evaluated=len(evaluated),
+            trigger_count=int(evaluated["triggered"].sum()),
+            suppressed_count=int(evaluated["suppressed"].sum()),
+            episode_count=int(evaluated["episode_start"].sum()),
+            entities=entities,
+            timeline=timeline,
+            timeline_truncated=len(triggers) > request.timeline_limit,
+        )
+
+    def _load_series(self, rule: AutomationRule, request: RuleBacktestRequest) -> pd.DataFrame:
+        """Load the rule's metric series for in-scope entities with a single query"""
+        try:
+            metric_type = MetricType(rule.metric_type.lower())
+        except ValueError:
+            raise ValueError(f"No collected metric series for metric type: {rule.metric_type}")
+
+        if rule.scope_type == "employee":
+            entity_column = cast(EngineeringMetric.employee_id, String)
+        elif rule.scope_type in ("repository", "service"):
+            entity_column = EngineeringMetric.repository_id
+        else:
+            raise ValueError(f"Backtesting is not supported for {rule.scope_type}-scoped rules")
+
+        query = self.db.query(
+            entity_column.label("entity_id"),
+            EngineeringMetric.period_end.label("observed_at"),
+            EngineeringMetric.value.label("value"),
+        ).filter(
+            and_(
+                EngineeringMetric.metric_type == metric_type,
+                EngineeringMetric.period_end >= request.period_start,
+                EngineeringMetric.period_end <= request.period_end,
+                entity_column.isnot(None),
+            )
+        )
+
+        entity_ids = request.entity_ids
+        if rule.scope_id:
+            entity_ids = [e for e in entity_ids if e == rule.scope_id] if entity_ids else [rule.scope_id]
+        if entity_ids is not None:
+            query = query.filter(entity_column.in_(entity_ids))
+
+        series = pd.read_sql(query.statement, self.db.bind)
+        series["observed_at"] = pd.to_datetime(series["observed_at"])
+        return series.sort_values(["entity_id", "observed_at"], kind="mergesort").reset_index(drop=True)
+
+    def _threshold_overrides(
+        self,
+        rule: AutomationRule,
+        entity_ids: List[str],
+        team_ids: Dict[str, str],
+    ) -> Dict[str, float]:
+        resolver = ThresholdResolver(self.db)
+        overrides = {}
+        for entity_id in entity_ids:
+            resolved = resolver.resolve(rule, rule.scope_type, entity_id, team_ids.get(entity_id))
+            if resolved.config_id:
+                overrides[entity_id] = resolved.threshold
+        return overrides
+
+    def _evaluate(
+        self,
+        series: pd.DataFrame,
+        condition: ConditionOperator,
+        threshold: float,
+        overrides: Dict[str, float],
+        duration_days: int,
+    ) -> pd.DataFrame:
+        """
+        Flag breaches, the start of each breach run, and points where the breach
+        has persisted for `duration_days` (the points at which the rule would fire).
+        """
+        frame = series.copy()
+        frame["threshold"] = frame["entity_id"].map(overrides).fillna(threshold).astype(float)
+        breached = pd.Series(
+            _OPERATORS[condition](frame["value"].to_numpy(), frame["threshold"].to_numpy()),
+            index=frame.index,
+        )
+
+        new_entity = frame["entity_id"].ne(frame["entity_id"].shift())
+        previous_breached = breached.shift(fill_value=False) & ~new_entity
+        run_start = breached & ~previous_breached
+        run_started_at = frame["observed_at"].where(run_start).ffill()
+
+        persisted = breached & (frame["observed_at"] - run_started_at >= timedelta(days=duration_days))
+        run_id = run_start.cumsum()
+        previously_persisted = persisted.groupby(run_id).shift(fill_value=False)
+
+        frame["breached"] = breached.to_numpy()
+        frame["triggered"] = persisted.to_numpy()
+        frame["episode_start"] = (persisted & ~previously_persisted).to_numpy()
+        return frame
+
+    def _suppress(
+        self,
+        evaluated: pd.DataFrame,
+        condition: ConditionOperator,
+        cooldown_minutes: Optional[int],
+        hysteresis: Optional[float],
+    ) -> None:
+        """
+        Clear `triggered` where the live rule would have been suppressed: while it is
+        disarmed after a trigger until the metric clears the hysteresis band, or within
+        `cooldown_minutes` of the entity's last trigger. Flags those points `suppressed`.
+        """
+        evaluated["suppressed"] = False
+        if not cooldown_minutes and hysteresis is None:
+            return
+
+        fires = evaluated["triggered"].to_numpy().copy()
+        suppressed = np.zeros(len(evaluated), dtype=bool)
+        entity_ids = evaluated["entity_id"].to_numpy()
+        observed_at = evaluated["observed_at"].to_numpy()
+        values, thresholds = evaluated["value"].to_numpy(), evaluated["threshold"].to_numpy()
+        cooldown = np.timedelta64(cooldown_minutes or 0, "m")
+
+        # The state only changes at points that would fire and, with hysteresis, points off the breach
+        relevant = fires | (~evaluated["breached"].to_numpy() if hysteresis is not None else False)
+        entity_id, armed, last_triggered_at = None, True, None
+        for i in np.flatnonzero(relevant):
+            if entity_ids[i] != entity_id:
+                entity_id, armed, last_triggered_at = entity_ids[i], True, None
+            if not fires[i]:
+                if not armed and has_cleared(condition, values[i], thresholds[i], hysteresis):
+                    armed = True
+                continue
+            cooling_down = cooldown and last_triggered_at is not None and observed_at[i] - last_triggered_at < cooldown
+            if not armed or cooling_down:
+                fires[i], suppressed[i] = False, True
+                continue
+            armed, last_triggered_at = hysteresis is None, observed_at[i]
+
+        evaluated["triggered"] = fires
+        evaluated["suppressed"] = suppressed
+
+    def _summarize_entities(self, evaluated: pd.DataFrame) -> List[BacktestEntitySummary]:
+        if evaluated.empty:
+            return []
+
+        triggered_at = evaluated["observed_at"].where(evaluated["triggered"])
+        summary = evaluated.assign(triggered_at=triggered_at).groupby("entity_id", sort=True).agg(
+            points_evaluated=("value", "size"),
+            breach_count=("breached", "sum"),
+            trigger_count=("triggered", "sum"),
+            suppressed_count=("suppressed", "sum"),
+            episode_count=("episode_start", "sum"),
+            first_triggered_at=("triggered_at", "min"),
+            last_triggered_at=("triggered_at", "max"),
+        )
+
+        return [
+            BacktestEntitySummary(
+                entity_id=entity_id,
+                points_evaluated=int(row.points_evaluated),
+                breach_count=int(row.breach_count),
+                trigger_count=int(row.trigger_count),
+                suppressed_count=int(row.suppressed_count),
+                episode_count=int(row.episode_count),
+                first_triggered_at=_optional_datetime(row.first_triggered_at),
+                last_triggered_at=_optional_datetime(row.last_triggered_at),
+            )
+            for entity_id, row in summary.iterrows()
+        ]
+
+
+def _optional_datetime(value) -> Optional[datetime]:
+    return None if pd.isna(value) else value.to_pydatetime()
@@ -0,0 +1,268 @@
+"""
+Integration Sync Scheduler for Cluster_0002
+Implements: Story 5.1 - Integrate Engineering Tools (scheduled pull sync)
+
+Each tick picks every integration whose `sync_frequency` interval has elapsed
+with a single query, then runs the pull jobs concurrently. Concurrency is
+capped overall and per integration type (so one slow Jira instance cannot hold
+every slot), and each job starts after a random jitter to avoid bursts against
+the same upstream. Connectors pull deltas from per-resource watermarks in
+`ea_sync_watermarks`. Activities are upserted on (source, external_id), so a
+record pulled again (a merged pull request, an updated issue) refreshes its
+row; they are committed with the upserted quality snapshots and the advanced
+watermarks, so a failed sync resumes from the last good position. Sync status
+is written back for the whole batch in one statement, and every run is
+recorded in the SyncStatsRegistry.
+
+Associated Frontend Files:
+  - web/app/src/pages/integrations/IntegrationsPage.tsx
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+import random
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.clients.http_client import IntegrationHttpClient, get_http_client
+from app.config import get_settings
+from app.connectors import SyncResult, Watermark, get_connector
+from app.database import SessionLocal
+from app.models.activity import upsert_activities
+from app.models.integration import Integration, IntegrationStatus, SyncFrequency, SyncWatermark
+from app.models.quality_snapshot import upsert_quality_snapshots
+from app.services.integration_service import IntegrationService
+from app.services.sync_stats import SyncStatsRegistry, get_sync_stats
+
+logger = logging.getLogger(__name__)
+
+SYNC_INTERVALS = {
+    SyncFrequency.HOURLY: timedelta(hours=1),
+    SyncFrequency.DAILY: timedelta(days=1),
+    SyncFrequency.WEEKLY: timedelta(weeks=1),
+}
+
+
+@dataclass
+class SyncOutcome:
+    integration_id: UUID
+    integration_type: str
+    status: IntegrationStatus
+    started_at: datetime
+    finished_at: datetime
+    records_fetched: int = 0
+    records_stored: int = 0
+    api_calls: int = 0
+    not_modified: int = 0
+    error_message: Optional[str] = None
+
+
+class SyncInProgressError(Exception):
+    def __init__(self, integration_id: UUID):
+        super().__init__(f"Integration {integration_id} is already syncing")
+        self.integration_id = integration_id
+
+
+class SyncScheduler:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        client: Optional[IntegrationHttpClient] = None,
+        stats: Optional[SyncStatsRegistry] = None,
+    ):
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.client = client
+        self.stats = stats or get_sync_stats()
+        self._running: Set[UUID] = set()
+        self._global_slots = asyncio.Semaphore(self.settings.sync_max_concurrency)
+        self._type_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def due_integrations(self, db: Session, now: Optional[datetime] = None) -> List[Integration]:
+        """
+        Integrations whose sync interval has elapsed, never-synced ones first.
+        Integrations with a listing left unfinished by the page budget are due right away.
+        """
+        now = now or datetime.utcnow()
+        overdue = [
+            and_(Integration.sync_frequency == frequency, Integration.last_sync_at <= now - interval)
+            for frequency, interval in SYNC_INTERVALS.items()
+        ]
+        unfinished = select(SyncWatermark.integration_id).where(SyncWatermark.cursor.isnot(None))
+        return (
+            db.query(Integration)
+            .filter(
+                and_(
+                    Integration.status != IntegrationStatus.INACTIVE,
+                    Integration.sync_frequency != SyncFrequency.MANUAL,
+                    or_(
+                        Integration.last_sync_at.is_(None),
+                        Integration.integration_id.in_(unfinished),
+                        *overdue,
+                    ),
+                )
+            )
+            .order_by(Integration.last_sync_at.asc().nullsfirst())
+            .all()
+        )
+
+    async def run_once(self, now: Optional[datetime] = None) -> List[SyncOutcome]:
+        """Sync every due integration concurrently and record the results"""
+        with self.session_factory() as db:
+            due = [i for i in self.due_integrations(db, now) if i.integration_id not in self._running]
+            db.expunge_all()
+        if not due:
+            return []
+
+        logger.info(f"Syncing {len(due)} due integrations")
+        return await self._run(due, jitter=True)
+
+    async def sync_now(self, integration_id: UUID) -> Optional[SyncOutcome]:
+        """
+        Sync a single integration immediately (manual trigger). Raises
+        SyncInProgressError while a sync of the integration is already running.
+        """
+        if integration_id in self._running:
+            raise SyncInProgressError(integration_id)
+        with self.session_factory() as db:
+            integration = IntegrationService(db).get_integration(integration_id)
+            if not integration:
+                return None
+            db.expunge(integration)
+
+        outcomes = await self._run([integration], jitter=False)
+        return outcomes[0]
+
+    async def run_forever(self, stop: asyncio.Event) -> None:
+        interval = self.settings.sync_scheduler_interval_seconds
+        logger.info(f"Integration sync scheduler started (tick {interval}s)")
+        while not stop.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Sync scheduler tick failed: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Integration sync scheduler stopped")
+
+    async def _run(self, integrations: List[Integration], jitter: bool) -> List[SyncOutcome]:
+        self._running.update(i.integration_id for i in integrations)
+        client = self.client or get_http_client()
+        try:
+            outcomes = await asyncio.gather(
+                *(self._sync(integration, client, jitter) for integration in integrations)
+            )
+        finally:
+            self._running.difference_update(i.integration_id for i in integrations)
+
+        for outcome in outcomes:
+            self.stats.record(outcome)
+        with self.session_factory() as db:
+            IntegrationService(db).bulk_update_sync_status(
+                (o.integration_id, o.status, o.error_message, o.finished_at) for o in outcomes
+            )
+        return list(outcomes)
+
+    async def _sync(self, integration: Integration, client: IntegrationHttpClient, jitter: bool) -> SyncOutcome:
+        integration_type = integration.integration_type.value
+        if jitter and self.settings.sync_jitter_seconds > 0:
+            await asyncio.sleep(random.uniform(0, self.settings.sync_jitter_seconds))
+
+        type_slots = self._type_slots.setdefault(
+            integration_type, asyncio.Semaphore(self.settings.sync_concurrency_per_type)
+        )
+        # Wait for a slot of this type first so queued jobs don't hold global slots
+        async with type_slots, self._global_slots:
+            started_at = datetime.utcnow()
+            outcome = SyncOutcome(
+                integration_id=integration.integration_id,
+                integration_type=integration_type,
+                status=IntegrationStatus.ACTIVE,
+                started_at=started_at,
+                finished_at=started_at,
+            )
+
+            try:
+                watermarks = await asyncio.to_thread(self._load_watermarks, integration.integration_id)
+                connector = get_connector(
+                    integration,
+                    client,
+                    watermarks,
+                    page_size=self.settings.sync_page_size,
+                    page_concurrency=self.settings.sync_page_concurrency,
+                    max_pages=self.settings.sync_max_pages_per_run,
+                )
+                if connector is None:
+                    raise ValueError(f"No pull connector for {integration_type}")
+
+                result = await connector.pull()
+                outcome.api_calls = result.api_calls
+                outcome.not_modified = result.not_modified
+                outcome.records_fetched = result.records
+                outcome.records_stored = await asyncio.to_thread(
+                    self._store, integration.integration_id, result, watermarks
+                )
+            except Exception as e:
+                outcome.status = IntegrationStatus.ERROR
+                outcome.error_message = str(e)[:1000]
+                logger.warning(f"Sync failed for integration {integration.integration_id}: {e}")
+
+            outcome.finished_at = datetime.utcnow()
+            logger.info(
+                f"Synced {integration_type} integration {integration.integration_id}: "
+                f"{outcome.records_stored}/{outcome.records_fetched} records stored, "
+                f"{outcome.api_calls} API calls ({outcome.not_modified} not modified)"
+            )
+            return outcome
+
+    def _load_watermarks(self, integration_id: UUID) -> Dict[str, Watermark]:
+        with self.session_factory() as db:
+            rows = db.query(SyncWatermark).filter(SyncWatermark.integration_id == integration_id).all()
+            return {
+                row.resource: Watermark(
+                    resource=row.resource,
+                    updated_since=row.updated_since,
+                    etag=row.etag,
+                    cursor=row.cursor,
+                    pending_since=row.pending_since,
+                )
+                for row in rows
+            }
+
+    def _store(self, integration_id: UUID, result: SyncResult, watermarks: Dict[str, Watermark]) -> int:
+        """Upsert activities and quality snapshots and save advanced watermarks in one transaction"""
+        with self.session_factory() as db:
+            stored = len(upsert_activities(db, result.activities))
+            stored += upsert_quality_snapshots(
+                db, [{**snapshot, "integration_id": integration_id} for snapshot in result.quality_snapshots]
+            )
+
+            rows = {
+                row.resource: row
+                for row in db.query(SyncWatermark).filter(SyncWatermark.integration_id == integration_id)
+            }
+            for resource, watermark in watermarks.items():
+                row = rows.get(resource)
+                if row is None:
+                    row = SyncWatermark(integration_id=integration_id, resource=resource)
+                    db.add(row)
+                row.updated_since = watermark.updated_since
+                row.etag = watermark.etag
+                row.cursor = watermark.cursor
+                row.pending_since = watermark.pending_since
+
+            db.commit()
+            return stored
+
+
+@lru_cache
+def get_sync_scheduler() -> SyncScheduler:
+    """Process-wide scheduler, so manual syncs share the concurrency caps of scheduled ones"""
+    return SyncScheduler()
@@ -0,0 +1,206 @@
+"""
+Integration Sync Statistics for Cluster_0002
+Supports: Story 5.1 - Integrate Engineering Tools (sync health monitoring)
+
+Every finished sync run is recorded in a bounded per-integration ring buffer
+(served by GET /integrations/{id}/sync-stats) and in Prometheus metrics on the
+service's /metrics endpoint:
+  - ea_integration_sync_duration_seconds       histogram per integration and status
+  - ea_integration_sync_runs_total             runs per integration and status (error rate)
+  - ea_integration_sync_records_fetched_total  records pulled (rate() gives records/s)
+  - ea_integration_sync_records_per_second     throughput of the last run
+  - ea_integration_sync_api_calls_total        upstream API calls (and 304s)
+  - ea_integration_last_success_timestamp_seconds
+  - ea_integration_sync_staleness_seconds      now - last_sync_at, read from the
+                                               database at scrape time
+
+Associated Frontend Files:
+  - web/app/src/pages/integrations/IntegrationsPage.tsx
+"""
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+from uuid import UUID
+import logging
+
+import numpy as np
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.integration import Integration, IntegrationStatus
+
+logger = logging.getLogger(__name__)
+
+SYNC_DURATION = Histogram(
+    "ea_integration_sync_duration_seconds",
+    "Wall-clock duration of integration sync runs",
+    ["integration_id", "integration_type", "status"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+SYNC_RUNS = Counter(
+    "ea_integration_sync_runs_total",
+    "Integration sync runs by outcome",
+    ["integration_id", "integration_type", "status"],
+)
+RECORDS_FETCHED = Counter(
+    "ea_integration_sync_records_fetched_total",
+    "Records fetched from the upstream API by integration syncs",
+    ["integration_id", "integration_type"],
+)
+RECORDS_PER_SECOND = Gauge(
+    "ea_integration_sync_records_per_second",
+    "Records fetched per second during the last sync run",
+    ["integration_id", "integration_type"],
+)
+API_CALLS = Counter(
+    "ea_integration_sync_api_calls_total",
+    "Upstream API calls made by integration syncs",
+    ["integration_id", "integration_type", "result"],
+)
+LAST_SUCCESS = Gauge(
+    "ea_integration_last_success_timestamp_seconds",
+    "Unix time of the last successful sync run",
+    ["integration_id", "integration_type"],
+)
+
+
+class SyncStatsRegistry:
+    """Recent sync runs per integration, kept in memory as fixed-size ring buffers"""
+
+    def __init__(self, history_size: Optional[int] = None):
+        self.history_size = history_size or get_settings().sync_stats_history_size
+        self._runs: Dict[UUID, Deque] = {}
+
+    def record(self, outcome) -> None:
+        """Record a finished SyncOutcome in the ring buffer and the Prometheus metrics"""
+        runs = self._runs.setdefault(outcome.integration_id, deque(maxlen=self.history_size))
+        runs.append(outcome)
+
+        integration_id = str(outcome.integration_id)
+        integration_type = outcome.integration_type
+        status = outcome.status.value
+        duration = _duration(outcome)
+
+        SYNC_DURATION.labels(integration_id, integration_type, status).observe(duration)
+        SYNC_RUNS.labels(integration_id, integration_type, status).inc()
+        RECORDS_FETCHED.labels(integration_id, integration_type).inc(outcome.records_fetched)
+        API_CALLS.labels(integration_id, integration_type, "modified").inc(outcome.api_calls - outcome.not_modified)
+        API_CALLS.labels(integration_id, integration_type, "not_modified").inc(outcome.not_modified)
+        if outcome.status != IntegrationStatus.ERROR:
+            RECORDS_PER_SECOND.labels(integration_id, integration_type).set(
+                outcome.records_fetched / duration if duration > 0 else 0.0
+            )
+            LAST_SUCCESS.labels(integration_id, integration_type).set(
+                (outcome.finished_at - datetime(1970, 1, 1)).total_seconds()
+            )
+
+    def recent(self, integration_id: UUID) -> List:
+        """Recorded runs for an integration, newest first"""
+        return list(reversed(self._runs.get(integration_id, ())))
+
+    def summary(self, integration_id: UUID) -> dict:
+        runs = self.recent(integration_id)
+        failed = [run for run in runs if run.status == IntegrationStatus.ERROR]
+        succeeded = [run for run in runs if run.status != IntegrationStatus.ERROR]
+        durations = np.array([_duration(run) for run in runs], dtype=float)
+        fetched = sum(run.records_fetched for run in succeeded)
+        busy = sum(_duration(run) for run in succeeded)
+
+        return {
+            "runs": len(runs),
+            "successful_runs": len(succeeded),
+            "failed_runs": len(failed),
+            "error_rate": len(failed) / len(runs) if runs else 0.0,
+            "duration_avg_seconds": float(durations.mean()) if runs else None,
+            "duration_p50_seconds": float(np.percentile(durations, 50)) if runs else None,
+            "duration_p95_seconds": float(np.percentile(durations, 95)) if runs else None,
+            "duration_max_seconds": float(durations.max()) if runs else None,
+            "records_fetched": fetched,
+            "records_per_second": fetched / busy if busy > 0 else None,
+            "api_calls": sum(run.api_calls for run in runs),
+            "not_modified": sum(run.not_modified for run in runs),
+            "last_success_at": succeeded[0].finished_at if succeeded else None,
+            "last_error": failed[0].error_message if failed else None,
+            "recent_runs": runs,
+        }
+
+    def forget(self, integration_id: UUID) -> None:
+        """Drop the history and metric series of a deleted integration"""
+        runs = self._runs.pop(integration_id, None)
+        if not runs:
+            return
+        integration_id_label = str(integration_id)
+        integration_type = runs[-1].integration_type
+        for status in IntegrationStatus:
+            _remove(SYNC_DURATION, integration_id_label, integration_type, status.value)
+            _remove(SYNC_RUNS, integration_id_label, integration_type, status.value)
+        for result in ("modified", "not_modified"):
+            _remove(API_CALLS, integration_id_label, integration_type, result)
+        for metric in (RECORDS_FETCHED, RECORDS_PER_SECOND, LAST_SUCCESS):
+            _remove(metric, integration_id_label, integration_type)
+
+
+class SyncStalenessCollector:
+    """
+    Reports how long ago each integration last synced. Computed from the
+    database when /metrics is scraped, so it also covers integrations that
+    have not synced since this process started.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        staleness = GaugeMetricFamily(
+            "ea_integration_sync_staleness_seconds",
+            "Seconds since the integration last synced (now - last_sync_at)",
+            labels=["integration_id", "integration_type", "status"],
+        )
+        try:
+            with self.session_factory() as db:
+                rows = db.query(
+                    Integration.integration_id,
+                    Integration.integration_type,
+                    Integration.status,
+                    Integration.last_sync_at,
+                ).filter(
+                    Integration.status != IntegrationStatus.INACTIVE,
+                    Integration.last_sync_at.isnot(None),
+                ).all()
+        except Exception as e:
+            # A database outage must not break the whole /metrics scrape
+            logger.warning(f"Could not collect sync staleness: {e}")
+            rows = []
+
+        now = datetime.utcnow()
+        for row in rows:
+            staleness.add_metric(
+                [str(row.integration_id), row.integration_type.value, row.status.value],
+                (now - row.last_sync_at).total_seconds(),
+            )
+        yield staleness
+
+    def describe(self) -> List[GaugeMetricFamily]:
+        # Skip the database query prometheus_client would otherwise run on registration
+        return []
+
+
+def _duration(outcome) -> float:
+    return max((outcome.finished_at - outcome.started_at).total_seconds(), 0.0)
+
+
+def _remove(metric, *labels: str) -> None:
+    try:
+        metric.remove(*labels)
+    except KeyError:
+        pass
+
+
+@lru_cache
+def get_sync_stats() -> SyncStatsRegistry:
+    """Process-wide registry shared by the scheduler and the sync-stats endpoint"""
+    return SyncStatsRegistry()
@@ -0,0 +1,149 @@
+"""
+Threshold Resolution for Automation Rules
+Supports: Story 8.2 - Customize workflow triggers based on team/individual needs
+
+Resolves the effective threshold and action of a rule for an entity from
+`threshold_configs`, most specific first:
+
+  1. config for this rule and entity
+  2. config for any rule on this entity's metric
+  3. for employees, the same two lookups for the employee's team
+  4. the rule's own threshold
+
+All configs of a metric type are loaded with one query and resolutions are
+memoized per (rule, entity, team), so mass evaluations do no per-entity
+lookups. Only the matched config is memoized; the rule's own threshold is read
+at resolution time so rule edits need no invalidation. Caches are invalidated
+on config changes and expire after `threshold_cache_ttl_seconds` so other
+worker processes converge.
+
+Associated Frontend Files:
+  - web/app/src/pages/automation/AutomationRulesPage.tsx
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+import time
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.automation import ActionType, AutomationRule, ThresholdConfig
+
+ConfigKey = Tuple[Optional[str], str, str]
+ResolutionKey = Tuple[str, str, str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class EffectiveThreshold:
+    threshold: float
+    action_type: ActionType
+    source: str  # rule, or the entity_type of the config that applied
+    config_id: Optional[UUID] = None
+
+
+@dataclass(frozen=True)
+class _Override:
+    config_id: UUID
+    source: str
+    threshold: float
+    action_type: Optional[ActionType]
+
+
+class _ResolverCache:
+    def __init__(self):
+        self.lock = Lock()
+        self.configs: Dict[str, Tuple[float, Dict[ConfigKey, _Override]]] = {}
+        self.resolved: Dict[ResolutionKey, Optional[_Override]] = {}
+
+    def clear(self, metric_type: Optional[str] = None) -> None:
+        with self.lock:
+            if metric_type is None:
+                self.configs.clear()
+            else:
+                self.configs.pop(metric_type, None)
+            # Resolutions are keyed by rule, not metric, so drop them all
+            self.resolved.clear()
+
+
+_cache = _ResolverCache()
+
+
+class ThresholdResolver:
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def resolve(
+        self,
+        rule: AutomationRule,
+        entity_type: str,
+        entity_id: str,
+        team_id: Optional[str] = None,
+    ) -> EffectiveThreshold:
+        """Effective threshold and action of a rule for one entity"""
+        override = self._override_for(rule, entity_type, entity_id, team_id)
+        if override is None:
+            return EffectiveThreshold(threshold=rule.threshold_value, action_type=rule.action_type, source="rule")
+        return EffectiveThreshold(
+            threshold=override.threshold,
+            action_type=override.action_type or rule.action_type,
+            source=override.source,
+            config_id=override.config_id,
+        )
+
+    def _override_for(
+        self,
+        rule: AutomationRule,
+        entity_type: str,
+        entity_id: str,
+        team_id: Optional[str],
+    ) -> Optional[_Override]:
+        # Refreshes expired configs (and their resolutions) before the memo is read
+        overrides = self._overrides_for(rule.metric_type)
+        key = (str(rule.rule_id), entity_type, entity_id, team_id)
+        if key in _cache.resolved:
+            return _cache.resolved[key]
+
+        rule_key = str(rule.rule_id)
+        candidates = [(rule_key, entity_type, entity_id), (None, entity_type, entity_id)]
+        if entity_type == "employee" and team_id:
+            candidates += [(rule_key, "team", team_id), (None, "team", team_id)]
+        override = next((overrides[c] for c in candidates if c in overrides), None)
+
+        with _cache.lock:
+            if len(_cache.resolved) >= self.settings.threshold_resolution_cache_size:
+                _cache.resolved.clear()
+            _cache.resolved[key] = override
+        return override
+
+    @staticmethod
+    def invalidate(metric_type: Optional[str] = None) -> None:
+        _cache.clear(metric_type)
+
+    def _overrides_for(self, metric_type: str) -> Dict[ConfigKey, _Override]:
+        now = time.monotonic()
+        entry = _cache.configs.get(metric_type)
+        if entry and now - entry[0] < self.settings.threshold_cache_ttl_seconds:
+            return entry[1]
+        if entry:
+            # Expired: resolutions built from the stale configs must go too
+            _cache.clear(metric_type)
+
+        configs = self.db.query(ThresholdConfig).filter(ThresholdConfig.metric_type == metric_type).all()
+        overrides = {}
+        # Oldest first so the most recent config for a key wins
+        for config in sorted(configs, key=lambda c: c.created_at or datetime.min):
+            rule_key = str(config.rule_id) if config.rule_id else None
+            overrides[(rule_key, config.entity_type, config.entity_id)] = _Override(
+                config_id=config.config_id,
+                source=config.entity_type,
+                threshold=config.custom_threshold,
+                action_type=config.custom_action,
+            )
+
+        with _cache.lock:
+            _cache.configs[metric_type] = (now, overrides)
+        return overrides
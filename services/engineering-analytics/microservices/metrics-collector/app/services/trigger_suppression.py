@@ -0,0 +1,268 @@
+"""
+Trigger Suppression for Automation Rules
+Implements: cooldown windows and hysteresis for Performance-Based Workflow Triggers (Story 8.2)
+
+State is kept per (rule, entity) in a process-local LRU cache and persisted to
+`rule_suppressions`, so an entity that stays over threshold does not write a new
+execution and send a notification on every evaluation. Cached states expire
+after `automation_suppression_cache_ttl_seconds`, so triggers recorded by other
+workers are picked up. Writes are upserts that add suppressions to the stored
+count and only move timestamps forward, so concurrent evaluations of the same
+(rule, entity) neither collide on insert nor overwrite newer state.
+
+Associated Frontend Files:
+  - web/app/src/pages/automation/AutomationRulesPage.tsx
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from threading import Lock
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import dialect_insert
+from app.models.automation import AutomationRule, ConditionOperator, RuleSuppression
+
+StateKey = Tuple[str, str, str]
+
+
+@dataclass
+class SuppressionState:
+    suppression_id: UUID
+    rule_id: UUID
+    entity_type: str
+    entity_id: str
+    is_armed: bool = True
+    last_triggered_at: Optional[datetime] = None
+    last_metric_value: Optional[float] = None
+    suppressed_count: int = 0
+    last_suppressed_at: Optional[datetime] = None
+    dirty: bool = False
+    arming_changed: bool = False  # is_armed / last_metric_value were set by this evaluation
+    new_suppressions: int = 0  # added to the stored suppressed_count on flush
+
+
+class _StateCache:
+    """Bounded LRU of suppression states shared by all sessions in the process, expiring after `ttl_seconds`"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._states: "OrderedDict[StateKey, Tuple[float, SuppressionState]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: StateKey) -> Optional[SuppressionState]:
+        with self._lock:
+            entry = self._states.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._states[key]
+                return None
+            self._states.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: StateKey, state: SuppressionState) -> None:
+        with self._lock:
+            self._states[key] = (time.monotonic(), state)
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+
+    def drop_rule(self, rule_id: UUID) -> None:
+        prefix = str(rule_id)
+        with self._lock:
+            for key in [k for k in self._states if k[0] == prefix]:
+                del self._states[key]
+
+
+_cache = _StateCache(
+    get_settings().automation_suppression_cache_size,
+    get_settings().automation_suppression_cache_ttl_seconds,
+)
+
+
+def _key(rule_id: UUID, entity_type: str, entity_id: str) -> StateKey:
+    return str(rule_id), entity_type, entity_id
+
+
+def _latest(stored, new):
+    """The later of two nullable timestamps, in SQL"""
+    return case((stored.is_(None), new), (new.is_(None), stored), (new > stored, new), else_=stored)
+
+
+class TriggerSuppressor:
+    """
+    Decides whether a breached rule should fire for an entity.
+
+    Changes are staged per evaluation: `flush` writes them to the session and
+    `publish` makes them visible in the shared cache once the caller has committed.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._staged: Dict[StateKey, SuppressionState] = {}
+
+    def load(self, rule_ids: Iterable[UUID], entity_type: str, entity_id: str) -> None:
+        """Stage states for the given rules, reading cache misses with a single query"""
+        missing = []
+        for rule_id in rule_ids:
+            key = _key(rule_id, entity_type, entity_id)
+            cached = _cache.get(key)
+            if cached is not None:
+                self._staged[key] = replace(cached)
+            else:
+                missing.append(rule_id)
+
+        if not missing:
+            return
+
+        rows = self.db.query(RuleSuppression).filter(
+            and_(
+                RuleSuppression.rule_id.in_(missing),
+                RuleSuppression.entity_type == entity_type,
+                RuleSuppression.entity_id == entity_id,
+            )
+        ).all()
+        found = {row.rule_id: row for row in rows}
+
+        for rule_id in missing:
+            row = found.get(rule_id)
+            if row:
+                state = SuppressionState(
+                    suppression_id=row.suppression_id,
+                    rule_id=row.rule_id,
+                    entity_type=row.entity_type,
+                    entity_id=row.entity_id,
+                    is_armed=row.is_armed,
+                    last_triggered_at=row.last_triggered_at,
+                    last_metric_value=row.last_metric_value,
+                    suppressed_count=row.suppressed_count or 0,
+                    last_suppressed_at=row.last_suppressed_at,
+                )
+            else:
+                state = SuppressionState(
+                    suppression_id=uuid4(),
+                    rule_id=rule_id,
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                )
+            self._staged[_key(rule_id, entity_type, entity_id)] = state
+
+    def state_for(self, rule: AutomationRule, entity_type: str, entity_id: str) -> SuppressionState:
+        key = _key(rule.rule_id, entity_type, entity_id)
+        if key not in self._staged:
+            self.load([rule.rule_id], entity_type, entity_id)
+        return self._staged[key]
+
+    def suppression_reason(self, rule: AutomationRule, state: SuppressionState, now: datetime) -> Optional[str]:
+        """Return why a breached rule must not fire, or None if it may trigger"""
+        if rule.hysteresis is not None and not state.is_armed:
+            return "hysteresis"
+        if rule.cooldown_minutes and state.last_triggered_at:
+            if now - state.last_triggered_at < timedelta(minutes=rule.cooldown_minutes):
+                return "cooldown"
+        return None
+
+    def observe_clear(
+        self,
+        rule: AutomationRule,
+        state: SuppressionState,
+        value: float,
+        threshold: float,
+    ) -> None:
+        """Re-arm the rule once the metric has moved past the hysteresis band"""
+        if state.is_armed or rule.hysteresis is None:
+            return
+        if has_cleared(rule.operator, value, threshold, rule.hysteresis):
+            state.is_armed = True
+            state.last_metric_value = value
+            state.arming_changed = True
+            self._mark(state)
+
+    def record_trigger(self, state: SuppressionState, value: float, now: datetime, hysteresis: Optional[float]) -> None:
+        state.last_triggered_at = now
+        state.last_metric_value = value
+        state.is_armed = hysteresis is None
+        state.arming_changed = True
+        self._mark(state)
+
+    def record_suppression(self, state: SuppressionState, now: datetime) -> None:
+        state.suppressed_count += 1
+        state.new_suppressions += 1
+        state.last_suppressed_at = now
+        self._mark(state)
+
+    def flush(self) -> None:
+        """
+        Upsert staged changes into the session without committing. Rows whose
+        arming did not change keep the stored is_armed and last_metric_value,
+        which another worker may have updated since this one loaded them.
+        """
+        dirty = [s for s in self._staged.values() if s.dirty]
+        for arming_changed in (True, False):
+            rows = [self._to_row(s) for s in dirty if s.arming_changed == arming_changed]
+            if rows:
+                self.db.execute(self._upsert(arming_changed), rows)
+
+    def publish(self) -> None:
+        """Expose committed states to other evaluations in this process"""
+        for key, state in self._staged.items():
+            state.dirty = state.arming_changed = False
+            state.new_suppressions = 0
+            _cache.put(key, replace(state))
+        self._staged.clear()
+
+    @staticmethod
+    def forget_rule(rule_id: UUID) -> None:
+        _cache.drop_rule(rule_id)
+
+    def _mark(self, state: SuppressionState) -> None:
+        state.dirty = True
+
+    def _upsert(self, arming_changed: bool):
+        statement = dialect_insert(self.db)(RuleSuppression)
+        stored, new = RuleSuppression.__table__.c, statement.excluded
+        updates = {
+            "last_triggered_at": _latest(stored.last_triggered_at, new.last_triggered_at),
+            "suppressed_count": func.coalesce(stored.suppressed_count, 0) + new.suppressed_count,
+            "last_suppressed_at": _latest(stored.last_suppressed_at, new.last_suppressed_at),
+            "updated_at": new.updated_at,
+        }
+        if arming_changed:
+            updates.update(is_armed=new.is_armed, last_metric_value=new.last_metric_value)
+        return statement.on_conflict_do_update(
+            index_elements=[stored.rule_id, stored.entity_type, stored.entity_id],
+            set_=updates,
+        )
+
+    def _to_row(self, state: SuppressionState) -> Dict[str, Any]:
+        return {
+            "suppression_id": state.suppression_id,
+            "rule_id": state.rule_id,
+            "entity_type": state.entity_type,
+            "entity_id": state.entity_id,
+            "is_armed": state.is_armed,
+            "last_triggered_at": state.last_triggered_at,
+            "last_metric_value": state.last_metric_value,
+            # Inserted as the count of a new row, added to the stored count otherwise
+            "suppressed_count": state.new_suppressions,
+            "last_suppressed_at": state.last_suppressed_at,
+            "updated_at": datetime.utcnow(),
+        }
+
+
+def has_cleared(operator: ConditionOperator, value: float, threshold: float, margin: float) -> bool:
+    """Whether `value` is past the hysteresis band of width `margin` around a breached threshold"""
+    if operator in (ConditionOperator.GREATER_THAN, ConditionOperator.GREATER_THAN_OR_EQUAL):
+        return value < threshold - margin
+    if operator in (ConditionOperator.LESS_THAN, ConditionOperator.LESS_THAN_OR_EQUAL):
+        return value > threshold + margin
+    if operator == ConditionOperator.EQUAL:
+        return abs(value - threshold) > margin
+    return abs(value - threshold) <= margin
@@ -30,10 +30,34 @@ from app.schemas.webhook import (
     WebhookStats,
 )
 from app.models.metrics import EngineeringMetric, MetricType
-from app.models.activity import CodeActivity, ActivityType
+from app.models.activity import ActivitySource, ActivityType, upsert_activities
+from app.connectors.base import SyncResult, parse_timestamp
 
 logger = logging.getLogger(__name__)
 
+# period_type of single-event metric rows (one deployment, one incident)
+EVENT_PERIOD_TYPE = "event"
+
+
+def _event_time(value: Optional[str]) -> datetime:
+    """Timestamp from the payload as naive UTC, or now when the sender omits it"""
+    try:
+        parsed = parse_timestamp(value)
+    except ValueError:
+        parsed = None
+    # Alertmanager sends endsAt 0001-01-01T00:00:00Z while an alert is still firing
+    if parsed is None or parsed.year < 2000:
+        return datetime.utcnow()
+    return parsed
+
+
+def _employee_id(value: Optional[str]) -> Optional[UUID]:
+    """Employee id of an attribution; None for external refs (emails, logins) not matched to an employee"""
+    try:
+        return UUID(value) if value else None
+    except ValueError:
+        return None
+
 
 class WebhookService:
     def __init__(self, db: Session):
@@ -196,134 +220,113 @@ class WebhookService:
             )
 
     def _process_gitlab_event(self, event: WebhookEvent) -> Tuple[int, Optional[str]]:
-        """Process GitLab webhook events"""
+        """Process GitLab webhook events into the same activity rows the GitLab connector pulls"""
         payload = event.payload
-        metrics_created = 0
+        activities = SyncResult()
         attributed_to = None
 
         if event.event_type == WebhookEventType.PUSH:
-            user_email = payload.get("user_email")
-            attributed_to = self._resolve_employee_by_email(user_email)
-            commits = payload.get("commits", [])
-
-            for commit in commits:
-                activity = CodeActivity(
-                    employee_id=attributed_to,
-                    repository_id=str(payload.get("project_id")),
+            attributed_to = self._resolve_employee_by_email(payload.get("user_email"))
+            repository_id = str(payload.get("project_id"))
+            for commit in payload.get("commits", []):
+                if not commit.get("id"):
+                    continue
+                activities.add_activity(
+                    source=ActivitySource.GITLAB,
                     activity_type=ActivityType.COMMIT,
-                    external_id=commit.get("id"),
-                    title=commit.get("message", "")[:255],
-                    occurred_at=datetime.fromisoformat(commit.get("timestamp", datetime.utcnow().isoformat()).replace("Z", "+00:00")),
-                    metadata={"author": commit.get("author", {})},
+                    external_id=commit["id"],
+                    occurred_at=_event_time(commit.get("timestamp")),
+                    author_ref=(commit.get("author") or {}).get("email"),
+                    title=commit.get("title") or (commit.get("message") or "").split("\n", 1)[0],
+                    repository_id=repository_id,
                 )
-                self.db.add(activity)
-                metrics_created += 1
 
         elif event.event_type == WebhookEventType.MERGE_REQUEST:
             user = payload.get("user", {})
             attributed_to = self._resolve_employee_by_email(user.get("email"))
             obj = payload.get("object_attributes", {})
-
-            activity = CodeActivity(
-                employee_id=attributed_to,
-                repository_id=str(payload.get("project", {}).get("id")),
-                activity_type=ActivityType.PULL_REQUEST_OPENED if obj.get("action") == "open" else ActivityType.PULL_REQUEST_MERGED,
-                external_id=str(obj.get("iid")),
-                title=obj.get("title", "")[:255],
-                occurred_at=datetime.utcnow(),
-                metadata={"state": obj.get("state"), "action": obj.get("action")},
+            repository_id = str(payload.get("project", {}).get("id"))
+            activities.add_activity(
+                source=ActivitySource.GITLAB,
+                activity_type=ActivityType.PULL_REQUEST,
+                external_id=f"{repository_id}!{obj.get('iid')}",
+                occurred_at=_event_time(obj.get("merged_at") or obj.get("updated_at")),
+                # The user of later actions (merge, close) is not the author; keep the stored one
+                author_ref=user.get("username") if obj.get("action") == "open" else None,
+                title=obj.get("title"),
+                repository_id=repository_id,
+                raw_data={"state": obj.get("state"), "action": obj.get("action")},
             )
-            self.db.add(activity)
-            metrics_created = 1
 
-        return metrics_created, attributed_to
+        return self._store_activities(activities), attributed_to
 
     def _process_github_event(self, event: WebhookEvent) -> Tuple[int, Optional[str]]:
-        """Process GitHub webhook events"""
+        """Process GitHub webhook events into the same activity rows the GitHub connector pulls"""
         payload = event.payload
-        metrics_created = 0
+        activities = SyncResult()
         attributed_to = None
+        repository_id = payload.get("repository", {}).get("full_name")
 
         if event.event_type == WebhookEventType.PUSH:
             pusher = payload.get("pusher", {})
             attributed_to = self._resolve_employee_by_email(pusher.get("email"))
-            commits = payload.get("commits", [])
-
-            for commit in commits:
-                activity = CodeActivity(
-                    employee_id=attributed_to,
-                    repository_id=str(payload.get("repository", {}).get("id")),
+            for commit in payload.get("commits", []):
+                if not commit.get("id"):
+                    continue
+                activities.add_activity(
+                    source=ActivitySource.GITHUB,
                     activity_type=ActivityType.COMMIT,
-                    external_id=commit.get("id"),
-                    title=commit.get("message", "")[:255],
-                    occurred_at=datetime.fromisoformat(commit.get("timestamp", datetime.utcnow().isoformat()).replace("Z", "+00:00")),
-                    metadata={"author": commit.get("author", {})},
+                    external_id=commit["id"],
+                    occurred_at=_event_time(commit.get("timestamp")),
+                    author_ref=(commit.get("author") or {}).get("email"),
+                    title=(commit.get("message") or "").split("\n", 1)[0],
+                    repository_id=repository_id,
                 )
-                self.db.add(activity)
-                metrics_created += 1
 
         elif event.event_type == WebhookEventType.PULL_REQUEST:
-            sender = payload.get("sender", {})
-            attributed_to = sender.get("login")
+            attributed_to = payload.get("sender", {}).get("login")
             pr = payload.get("pull_request", {})
-            action = payload.get("action")
-
-            activity_type = ActivityType.PULL_REQUEST_OPENED
-            if action == "closed" and pr.get("merged"):
-                activity_type = ActivityType.PULL_REQUEST_MERGED
-            elif action == "closed":
-                activity_type = ActivityType.PULL_REQUEST_CLOSED
-
-            activity = CodeActivity(
-                employee_id=attributed_to,
-                repository_id=str(payload.get("repository", {}).get("id")),
-                activity_type=activity_type,
-                external_id=str(pr.get("number")),
-                title=pr.get("title", "")[:255],
-                occurred_at=datetime.utcnow(),
-                metadata={"action": action, "state": pr.get("state")},
+            activities.add_activity(
+                source=ActivitySource.GITHUB,
+                activity_type=ActivityType.PULL_REQUEST,
+                external_id=f"{repository_id}#{pr.get('number')}",
+                occurred_at=_event_time(pr.get("merged_at") or pr.get("updated_at")),
+                author_ref=(pr.get("user") or {}).get("login"),
+                title=pr.get("title"),
+                repository_id=repository_id,
+                raw_data={"state": pr.get("state"), "action": payload.get("action"), "merged": pr.get("merged")},
             )
-            self.db.add(activity)
-            metrics_created = 1
 
-        return metrics_created, attributed_to
+        return self._store_activities(activities), attributed_to
 
     def _process_jira_event(self, event: WebhookEvent) -> Tuple[int, Optional[str]]:
-        """Process Jira webhook events"""
+        """Process Jira webhook events; an issue moved to Done is stored like the Jira connector's completed issues"""
         payload = event.payload
-        metrics_created = 0
+        activities = SyncResult()
 
         user = payload.get("user", {})
         attributed_to = user.get("emailAddress")
         issue = payload.get("issue", {})
+        fields = issue.get("fields", {})
+
+        event.project_id = fields.get("project", {}).get("key")
+
+        if "issue_updated" in payload.get("webhookEvent", ""):
+            items = payload.get("changelog", {}).get("items", [])
+            completed = any(item.get("field") == "status" and item.get("toString") == "Done" for item in items)
+            if completed and issue.get("key"):
+                assignee = fields.get("assignee") or {}
+                activities.add_activity(
+                    source=ActivitySource.JIRA,
+                    activity_type=ActivityType.ISSUE_COMPLETED,
+                    external_id=issue["key"],
+                    occurred_at=_event_time(fields.get("resolutiondate") or fields.get("updated")),
+                    author_ref=assignee.get("emailAddress") or assignee.get("accountId"),
+                    title=fields.get("summary"),
+                    raw_data={"project": event.project_id, "status": "Done"},
+                )
 
-        event.project_id = issue.get("fields", {}).get("project", {}).get("key")
-
-        if "issue_created" in payload.get("webhookEvent", ""):
-            # Track issue creation
-            metrics_created = 1
-        elif "issue_updated" in payload.get("webhookEvent", ""):
-            changelog = payload.get("changelog", {})
-            items = changelog.get("items", [])
-
-            # Check for status changes
-            for item in items:
-                if item.get("field") == "status" and item.get("toString") == "Done":
-                    # Issue completed - create metric
-                    metric = EngineeringMetric(
-                        employee_id=attributed_to,
-                        metric_type=MetricType.ISSUES_COMPLETED,
-                        value=1,
-                        unit="count",
-                        period_start=datetime.utcnow(),
-                        period_end=datetime.utcnow(),
-                        source="jira",
-                        metadata={"issue_key": issue.get("key")},
-                    )
-                    self.db.add(metric)
-                    metrics_created = 1
-
-        return metrics_created, attributed_to
+        return self._store_activities(activities), attributed_to
 
     def _process_cicd_event(self, event: WebhookEvent) -> Tuple[int, Optional[str]]:
         """Process CI/CD deployment events"""
@@ -335,17 +338,19 @@ class WebhookService:
             status = payload.get("status")
 
             if status == "success":
-                # Create deployment frequency metric
+                # One row per deployment; the KPI engine derives DORA metrics from these events
+                deployed_at = _event_time(payload.get("finished_at") or payload.get("timestamp"))
                 metric = EngineeringMetric(
-                    employee_id=attributed_to,
+                    employee_id=_employee_id(attributed_to),
                     repository_id=payload.get("service"),
                     metric_type=MetricType.DEPLOYMENT_FREQUENCY,
                     value=1,
                     unit="count",
-                    period_start=datetime.utcnow(),
-                    period_end=datetime.utcnow(),
+                    period_start=deployed_at,
+                    period_end=deployed_at,
+                    period_type=EVENT_PERIOD_TYPE,
                     source="cicd",
-                    metadata={
+                    metadata_={
                         "environment": payload.get("environment"),
                         "version": payload.get("version"),
                         "commit_sha": payload.get("commit_sha"),
@@ -357,7 +362,11 @@ class WebhookService:
         return metrics_created, attributed_to
 
     def _process_prometheus_event(self, event: WebhookEvent) -> Tuple[int, Optional[str]]:
-        """Process Prometheus alert events"""
+        """
+        Process Prometheus alert events. A firing alert opens an incident row
+        (period_start = startsAt); the matching resolved notification sets its
+        period_end to endsAt, which gives the recovery time used for MTTR.
+        """
         payload = event.payload
         metrics_created = 0
         attributed_to = None
@@ -365,18 +374,23 @@ class WebhookService:
         labels = payload.get("labels", {})
         service = labels.get("service") or labels.get("job")
         severity = labels.get("severity", "warning")
+        started_at = _event_time(payload.get("startsAt"))
 
         # Create incident metric
         if payload.get("status") == "firing":
+            if self._find_incident(service, labels.get("alertname"), started_at):
+                return metrics_created, attributed_to  # repeated notification for the same alert
+
             metric = EngineeringMetric(
                 repository_id=service,
                 metric_type=MetricType.INCIDENT_FREQUENCY,
                 value=1,
                 unit="count",
-                period_start=datetime.utcnow(),
-                period_end=datetime.utcnow(),
+                period_start=started_at,
+                period_end=started_at,
+                period_type=EVENT_PERIOD_TYPE,
                 source="prometheus",
-                metadata={
+                metadata_={
                     "alert_name": labels.get("alertname"),
                     "severity": severity,
                     "annotations": payload.get("annotations", {}),
@@ -385,8 +399,32 @@ class WebhookService:
             self.db.add(metric)
             metrics_created = 1
 
+        elif payload.get("status") == "resolved":
+            incident = self._find_incident(service, labels.get("alertname"), started_at)
+            if incident:
+                resolved_at = _event_time(payload.get("endsAt"))
+                incident.period_end = max(resolved_at, incident.period_start)
+                incident.metadata_ = {**(incident.metadata_ or {}), "resolved_at": resolved_at.isoformat()}
+                metrics_created = 1
+
         return metrics_created, attributed_to
 
+    def _find_incident(
+        self, service: Optional[str], alert_name: Optional[str], started_at: datetime
+    ) -> Optional[EngineeringMetric]:
+        """An alert episode is identified by service, alert name and its startsAt"""
+        candidates = self.db.query(EngineeringMetric).filter(
+            EngineeringMetric.metric_type == MetricType.INCIDENT_FREQUENCY,
+            EngineeringMetric.period_type == EVENT_PERIOD_TYPE,
+            EngineeringMetric.repository_id == service,
+            EngineeringMetric.period_start == started_at,
+        )
+        return next((m for m in candidates if (m.metadata_ or {}).get("alert_name") == alert_name), None)
+
+    def _store_activities(self, activities: SyncResult) -> int:
+        """Upsert on (source, external_id), so redelivered events and later syncs update one row"""
+        return len(upsert_activities(self.db, activities.activities))
+
     def _resolve_employee_by_email(self, email: Optional[str]) -> Optional[str]:
         """Resolve employee ID from email (simplified for MVP)"""
         # In production, this would query the employee-registry service
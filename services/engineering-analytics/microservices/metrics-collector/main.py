@@ -5,12 +5,17 @@ Associated Frontend Files:
   - web/app/src/pages/automation/AutomationRulesPage.tsx
   - web/app/src/pages/webhooks/WebhooksPage.tsx
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import make_asgi_app
+from prometheus_client import REGISTRY, make_asgi_app
 
+from app.clients.http_client import close_http_client
 from app.config import get_settings
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal
+from app.models.activity import ensure_unique_external_ids
 from app.routers import (
     health_router,
     integrations_router,
@@ -19,18 +24,50 @@ from app.routers import (
 )
 from app.routers.automation import router as automation_router
 from app.routers.webhooks import router as webhooks_router
+from app.services.execution_storage import ExecutionStorageService, run_partition_maintenance
+from app.services.sync_scheduler import get_sync_scheduler
+from app.services.sync_stats import SyncStalenessCollector
 
 settings = get_settings()
 
-# Create database tables
+# Make (source, external_id) unique on tables created before it was, then create database tables
+ensure_unique_external_ids(engine)
 Base.metadata.create_all(bind=engine)
 
+# Partition a rule_executions table created before partitioning, and make sure
+# partitions exist for the coming months
+with SessionLocal() as db:
+    storage = ExecutionStorageService(db)
+    storage.migrate_to_partitioned()
+    storage.ensure_partitions()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Scheduled integration sync runs in-process; disabled by default so only designated replicas poll
+    stop = asyncio.Event()
+    scheduler_task = None
+    if settings.sync_scheduler_enabled:
+        scheduler_task = asyncio.create_task(get_sync_scheduler().run_forever(stop))
+    # Keep partitions ahead of the current month for as long as the service runs
+    maintenance_task = asyncio.create_task(run_partition_maintenance(stop))
+
+    yield
+
+    stop.set()
+    if scheduler_task:
+        await scheduler_task
+    await maintenance_task
+    await close_http_client()
+
+
 app = FastAPI(
     title="MetricsCollector",
     description="Engineering Analytics - Metrics Collection Service",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -43,6 +80,7 @@ app.add_middleware(
 )
 
 # Prometheus metrics endpoint
+REGISTRY.register(SyncStalenessCollector())
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
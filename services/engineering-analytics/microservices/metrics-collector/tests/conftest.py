@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+# ea_shared lives next to the services; the Docker images copy it into /app
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "..", "shared"))
+
+# Tests run against SQLite; set before app.config reads the environment
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/metrics_collector.db")
+
+import pytest
+
+from app.config import get_settings
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """The process settings; attributes set through `monkeypatch.setattr` are restored after the test"""
+    return get_settings()
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables, dropped after the test"""
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
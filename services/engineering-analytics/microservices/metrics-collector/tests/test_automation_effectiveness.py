@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.models.automation import ActionType, AutomationRule, ConditionOperator, RuleExecution, RuleStatus
+from app.models.metrics import EngineeringMetric, MetricType
+from app.services.automation_service import AutomationService
+
+PERIOD_START = datetime(2024, 3, 1)
+PERIOD_END = datetime(2024, 3, 31)
+TRIGGERED_AT = datetime(2024, 3, 10)
+
+
+def commits(employee_id, period_start: datetime, value: float) -> EngineeringMetric:
+    return EngineeringMetric(
+        employee_id=employee_id,
+        metric_type=MetricType.COMMITS,
+        value=value,
+        period_start=period_start,
+        period_end=period_start + timedelta(days=1),
+        period_type="day",
+        source="gitlab",
+    )
+
+
+def test_effectiveness_report_skips_non_uuid_employee_ids(db):
+    rule = AutomationRule(
+        name="Low commit volume",
+        scope_type="employee",
+        metric_type="COMMITS",
+        operator=ConditionOperator.LESS_THAN,
+        threshold_value=3,
+        action_type=ActionType.SEND_NOTIFICATION,
+        status=RuleStatus.ACTIVE,
+        created_by="test",
+    )
+    db.add(rule)
+    db.flush()
+    employee_id = uuid4()
+    # Trigger entity ids are free-form; one that is not a UUID must not break the join
+    for entity_id in (str(employee_id), "emp-test-001"):
+        db.add(RuleExecution(
+            rule_id=rule.rule_id,
+            entity_type="employee",
+            entity_id=entity_id,
+            triggered_at=TRIGGERED_AT,
+            metric_value=2,
+            threshold_value=3,
+            action_executed=ActionType.SEND_NOTIFICATION.value,
+        ))
+    db.add_all([
+        commits(employee_id, TRIGGERED_AT - timedelta(days=3), 2),
+        commits(employee_id, TRIGGERED_AT + timedelta(days=2), 6),
+        commits(uuid4(), TRIGGERED_AT + timedelta(days=2), 50),  # never triggered
+    ])
+    db.commit()
+
+    report = AutomationService(db).generate_effectiveness_report(PERIOD_START, PERIOD_END)
+
+    assert report.total_triggers == 2
+    [improvement] = report.improvements_detected
+    assert improvement["entities"] == 1
+    assert (improvement["average_before"], improvement["average_after"]) == (2.0, 6.0)
+    assert improvement["improved"] is True
@@ -0,0 +1,282 @@
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import re
+
+import httpx
+import pytest
+
+from app.clients.http_client import IntegrationHttpClient
+from app.connectors.base import Watermark
+from app.connectors.github import GitHubConnector
+from app.connectors.gitlab import GitLabConnector
+from app.connectors.jira import JiraConnector
+from app.models.integration import Integration, IntegrationType
+
+T0 = datetime(2024, 1, 1, 15, 0)
+
+
+@pytest.fixture(autouse=True)
+def fast_limits(settings, monkeypatch):
+    monkeypatch.setattr(settings, "http_client_rate_per_second", 1000.0)
+    monkeypatch.setattr(settings, "http_client_burst", 1000.0)
+
+
+def pull(connector_class, integration_type, api_endpoint, handler, watermarks, page_size=2, max_pages=50):
+    """Run one pull against `handler`; returns the result and the requests made"""
+    requests = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    async def run():
+        client = IntegrationHttpClient(transport=httpx.MockTransport(record))
+        integration = Integration(
+            integration_type=integration_type,
+            api_endpoint=api_endpoint,
+            auth_method="bearer",
+            credentials_encrypted="token",
+        )
+        try:
+            connector = connector_class(integration, client, watermarks, page_size=page_size, max_pages=max_pages)
+            return await connector.pull()
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run()), requests
+
+
+class FakeJira:
+    """Search API over `issues` (key -> updated, naive UTC), reading JQL dates in the API user's `time_zone`"""
+
+    def __init__(self, issues, time_zone="UTC"):
+        self.issues = dict(issues)
+        self.time_zone = time_zone
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/rest/api/2/myself":
+            return httpx.Response(200, json={"accountId": "bot", "timeZone": self.time_zone})
+        params = request.url.params
+        match = re.search(r'updated >= "([^"]+)"', params["jql"])
+        since = None
+        if match:
+            local = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M").replace(tzinfo=ZoneInfo(self.time_zone))
+            since = local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+        listed = sorted(
+            (updated, key) for key, updated in self.issues.items() if since is None or updated >= since
+        )
+        start, size = int(params["startAt"]), int(params["maxResults"])
+        return httpx.Response(200, json={
+            "total": len(listed),
+            "issues": [
+                {"key": key, "fields": {
+                    "summary": key,
+                    "updated": f"{updated:%Y-%m-%dT%H:%M:%S}.000+0000",
+                    "status": {"name": "Done", "statusCategory": {"key": "done"}},
+                    "assignee": {"emailAddress": "dev@example.com"},
+                }}
+                for updated, key in listed[start:start + size]
+            ],
+        })
+
+
+def pull_jira(jira, watermarks, **options):
+    return pull(JiraConnector, IntegrationType.JIRA, "https://jira.example.com", jira, watermarks, **options)
+
+
+def test_jira_filters_in_the_api_users_time_zone():
+    jira = FakeJira({"OLD-1": T0 - timedelta(minutes=30), "NEW-1": T0 + timedelta(seconds=30)}, "America/New_York")
+    watermarks = {"issues": Watermark("issues", updated_since=T0)}
+
+    result, requests = pull_jira(jira, watermarks)
+
+    search = [r for r in requests if r.url.path == "/rest/api/2/search"]
+    assert 'updated >= "2024-01-01 10:00"' in search[0].url.params["jql"]
+    assert [a["external_id"] for a in result.activities] == ["NEW-1"]
+    assert watermarks["issues"].updated_since == T0 + timedelta(seconds=30)
+
+
+def test_jira_resumes_from_the_newest_update_read():
+    jira = FakeJira({f"ISSUE-{n}": T0 + timedelta(minutes=n) for n in range(1, 6)})
+    watermarks = {"issues": Watermark("issues", updated_since=T0)}
+
+    first, _ = pull_jira(jira, watermarks, max_pages=1)
+    assert [a["external_id"] for a in first.activities] == ["ISSUE-1", "ISSUE-2"]
+    assert watermarks["issues"].cursor is not None
+
+    # Updated between runs: moves to the end of the listing, shifting every later issue up one slot
+    jira.issues["ISSUE-1"] = T0 + timedelta(minutes=10)
+    second, _ = pull_jira(jira, watermarks)
+
+    assert {a["external_id"] for a in second.activities} == {"ISSUE-1", "ISSUE-2", "ISSUE-3", "ISSUE-4", "ISSUE-5"}
+    assert watermarks["issues"].cursor is None
+    assert watermarks["issues"].updated_since == T0 + timedelta(minutes=10)
+
+
+class FakeGitLab:
+    """Project API with merge requests (iid -> updated_at) and commits (sha -> committed_date)"""
+
+    def __init__(self, merge_requests=None, commits=None):
+        self.merge_requests = dict(merge_requests or {})
+        self.commits = dict(commits or {})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        page, per_page = int(params.get("page", 1)), int(params.get("per_page", 20))
+        if request.url.path.endswith("/merge_requests"):
+            assert (params["order_by"], params["sort"]) == ("updated_at", "asc")
+            since = params.get("updated_after")
+            listed = sorted(
+                (updated, iid) for iid, updated in self.merge_requests.items()
+                if not since or f"{updated.isoformat()}Z" >= since
+            )
+            items = [
+                {"iid": iid, "title": f"MR {iid}", "state": "merged", "updated_at": f"{updated.isoformat()}Z",
+                 "author": {"username": "dev"}}
+                for updated, iid in listed
+            ]
+        else:
+            since = params.get("since")
+            listed = sorted(
+                ((date, sha) for sha, date in self.commits.items() if not since or date.isoformat() >= since),
+                reverse=True,
+            )
+            items = [
+                {"id": sha, "title": sha, "author_email": "dev@example.com", "committed_date": f"{date.isoformat()}Z"}
+                for date, sha in listed
+            ]
+        pages = max(1, -(-len(items) // per_page))
+        return httpx.Response(
+            200, json=items[(page - 1) * per_page:page * per_page], headers={"X-Total-Pages": str(pages)}
+        )
+
+
+def pull_gitlab(gitlab, watermarks, **options):
+    return pull(
+        GitLabConnector, IntegrationType.GITLAB, "https://gitlab.example.com/api/v4/projects/42",
+        gitlab, watermarks, **options,
+    )
+
+
+def test_gitlab_merge_requests_resume_from_the_newest_update_read():
+    gitlab = FakeGitLab(merge_requests={iid: T0 + timedelta(minutes=iid) for iid in range(1, 6)})
+    watermarks = {}
+
+    first, _ = pull_gitlab(gitlab, watermarks, max_pages=1)
+    assert [a["external_id"] for a in first.activities if a["activity_type"].value == "pull_request"] == [
+        "42!1", "42!2",
+    ]
+    assert watermarks["merge_requests"].cursor is not None
+
+    gitlab.merge_requests[1] = T0 + timedelta(minutes=10)
+    second, _ = pull_gitlab(gitlab, watermarks)
+
+    assert {a["external_id"] for a in second.activities} >= {"42!1", "42!3", "42!4", "42!5"}
+    assert watermarks["merge_requests"].cursor is None
+    assert watermarks["merge_requests"].updated_since == T0 + timedelta(minutes=10)
+
+
+def test_gitlab_commits_resume_from_the_page_cursor():
+    gitlab = FakeGitLab(commits={f"c{n}": T0 + timedelta(minutes=n) for n in range(1, 6)})
+    watermarks = {"commits": Watermark("commits", updated_since=T0)}
+
+    first, requests = pull_gitlab(gitlab, watermarks, max_pages=1)
+    assert requests[0].url.params["since"] == T0.isoformat()
+    assert [a["external_id"] for a in first.activities] == ["c5", "c4"]
+    # Newest first: the newest commit is held back until the listing is complete
+    assert (watermarks["commits"].cursor, watermarks["commits"].updated_since) == ("2", T0)
+    assert watermarks["commits"].pending_since == T0 + timedelta(minutes=5)
+
+    second, requests = pull_gitlab(gitlab, watermarks)
+    assert requests[0].url.params["page"] == "2"
+    assert [a["external_id"] for a in second.activities if a["activity_type"].value == "commit"] == ["c3", "c2", "c1"]
+    assert watermarks["commits"].cursor is None
+    assert watermarks["commits"].updated_since == T0 + timedelta(minutes=5)
+
+
+class FakeGitHub:
+    """Repository API with commits (sha -> date) and pull requests (number -> updated_at), newest first"""
+
+    def __init__(self, commits=None, pulls=None):
+        self.commits = dict(commits or {})
+        self.pulls = dict(pulls or {})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        page, per_page = int(params.get("page", 1)), int(params.get("per_page", 30))
+        if request.url.path.endswith("/pulls"):
+            assert (params["sort"], params["direction"]) == ("updated", "desc")
+            etag = f'"{max(self.pulls.values()).isoformat()}"' if self.pulls else '"empty"'
+            if page == 1 and request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            listed = sorted(((updated, number) for number, updated in self.pulls.items()), reverse=True)
+            items = [
+                {"number": number, "title": f"PR {number}", "state": "closed", "merged_at": None,
+                 "updated_at": f"{updated.isoformat()}Z", "user": {"login": "dev"}}
+                for updated, number in listed
+            ]
+            headers = {"ETag": etag} if page == 1 else {}
+        else:
+            since = params.get("since")
+            listed = sorted(
+                ((date, sha) for sha, date in self.commits.items() if not since or f"{date.isoformat()}Z" >= since),
+                reverse=True,
+            )
+            items = [
+                {"sha": sha, "commit": {"message": f"{sha}\n\nbody",
+                                        "author": {"email": "dev@example.com", "date": f"{date.isoformat()}Z"}}}
+                for date, sha in listed
+            ]
+            pages = max(1, -(-len(items) // per_page))
+            headers = {"Link": f'<{request.url.copy_set_param("page", pages)}>; rel="last"'} if pages > 1 else {}
+        return httpx.Response(200, json=items[(page - 1) * per_page:page * per_page], headers=headers)
+
+
+def pull_github(github, watermarks, **options):
+    return pull(
+        GitHubConnector, IntegrationType.GITHUB, "https://api.github.com/repos/acme/web",
+        github, watermarks, **options,
+    )
+
+
+def test_github_commits_fetch_the_delta_and_resume_from_the_page_cursor():
+    github = FakeGitHub(commits={f"c{n}": T0 + timedelta(minutes=n) for n in range(-2, 6)})
+    watermarks = {"commits": Watermark("commits", updated_since=T0)}
+
+    first, requests = pull_github(github, watermarks, max_pages=2)
+    assert requests[0].url.params["since"] == f"{T0.isoformat()}Z"
+    assert [a["external_id"] for a in first.activities if a["activity_type"].value == "commit"] == [
+        "c5", "c4", "c3", "c2",
+    ]
+    assert first.activities[0]["title"] == "c5"
+    assert watermarks["commits"].cursor == "3"
+    assert watermarks["commits"].updated_since == T0
+
+    second, _ = pull_github(github, watermarks, max_pages=2)
+    assert [a["external_id"] for a in second.activities if a["activity_type"].value == "commit"] == ["c1", "c0"]
+    assert watermarks["commits"].cursor is None
+    assert watermarks["commits"].updated_since == T0 + timedelta(minutes=5)
+
+
+def test_github_pull_requests_stop_at_the_watermark_and_revalidate():
+    github = FakeGitHub(pulls={n: T0 + timedelta(minutes=n) for n in range(-3, 4)})
+    watermarks = {"pull_requests": Watermark("pull_requests", updated_since=T0)}
+
+    first, requests = pull_github(github, watermarks)
+    pulls = [r for r in requests if r.url.path.endswith("/pulls")]
+    assert [a["external_id"] for a in first.activities if a["activity_type"].value == "pull_request"] == [
+        "acme/web#3", "acme/web#2", "acme/web#1", "acme/web#0",
+    ]
+    # The page reaching the watermark ends the walk
+    assert [r.url.params["page"] for r in pulls] == ["1", "2", "3"]
+    assert watermarks["pull_requests"].updated_since == T0 + timedelta(minutes=3)
+
+    unchanged, _ = pull_github(github, watermarks)
+    assert unchanged.not_modified == 1 and unchanged.records == 0
+
+    # Updated PRs move to the top of the listing; the newest one already read is included again
+    github.pulls[-3] = T0 + timedelta(minutes=10)
+    updated, _ = pull_github(github, watermarks)
+    assert [a["external_id"] for a in updated.activities] == ["acme/web#-3", "acme/web#3"]
+    assert watermarks["pull_requests"].updated_since == T0 + timedelta(minutes=10)
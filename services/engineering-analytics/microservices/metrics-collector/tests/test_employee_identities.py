@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.clients.http_client import IntegrationHttpClient
+from app.models.activity import ActivitySource, ActivityType, EngineeringActivity, upsert_activities
+from app.models.integration import Integration, IntegrationStatus, IntegrationType, SyncFrequency
+from app.models.webhook import WebhookEventType, WebhookSource
+from app.schemas.metrics import EmployeeIdentityCreate
+from app.schemas.webhook import WebhookConfigCreate
+from app.services.activity_service import ActivityService
+from app.services.sync_scheduler import SyncScheduler
+from app.services.sync_stats import SyncStatsRegistry
+from app.services.webhook_service import WebhookService
+
+EMPLOYEE = uuid4()
+
+
+@pytest.fixture
+def identities(db):
+    return ActivityService(db).set_identities([
+        EmployeeIdentityCreate(employee_id=EMPLOYEE, source=ActivitySource.GITLAB, author_ref="Dev@Example.com"),
+    ])
+
+
+def employees(db):
+    db.expire_all()
+    return {a.external_id: a.employee_id for a in db.query(EngineeringActivity)}
+
+
+def test_synced_commits_are_attributed_to_their_author(db, settings, monkeypatch, identities):
+    monkeypatch.setattr(settings, "sync_jitter_seconds", 0)
+    db.add(Integration(
+        name="gitlab",
+        integration_type=IntegrationType.GITLAB,
+        api_endpoint="https://gitlab.example.com/api/v4/projects/42",
+        auth_method="bearer",
+        sync_frequency=SyncFrequency.DAILY,
+        status=IntegrationStatus.ACTIVE,
+    ))
+    db.commit()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        commits = [
+            {"id": sha, "title": sha, "author_email": email, "committed_date": "2024-01-10T09:00:00Z"}
+            for sha, email in (("a1", "dev@example.com"), ("b2", "other@example.com"))
+        ]
+        body = commits if request.url.path.endswith("/repository/commits") else []
+        return httpx.Response(200, json=body, headers={"X-Total-Pages": "1"})
+
+    async def run():
+        client = IntegrationHttpClient(transport=httpx.MockTransport(handler))
+        try:
+            return await SyncScheduler(client=client, stats=SyncStatsRegistry()).run_once()
+        finally:
+            await client.aclose()
+
+    [outcome] = asyncio.run(run())
+
+    assert outcome.records_stored == 2
+    assert employees(db) == {"a1": EMPLOYEE, "b2": None}
+
+
+def test_webhook_commits_are_attributed_to_their_author(db, identities):
+    service = WebhookService(db)
+    config = service.create_config(WebhookConfigCreate(
+        integration_id=uuid4(), source=WebhookSource.GITLAB, webhook_url="https://collector.example.com/hooks",
+    ))
+    event = service.receive_event(config.config_id, WebhookEventType.PUSH, {
+        "user_email": "dev@example.com",
+        "project_id": 42,
+        "commits": [{"id": "c3", "message": "Fix\n\nbody", "timestamp": "2024-01-10T11:00:00Z",
+                     "author": {"email": "DEV@example.com"}}],
+    }, {})
+
+    service.process_event(event.event_id)
+
+    assert employees(db) == {"c3": EMPLOYEE}
+
+
+def test_identities_attribute_activities_stored_before_them(db):
+    upsert_activities(db, [
+        {"source": source, "activity_type": ActivityType.COMMIT, "external_id": external_id,
+         "occurred_at": datetime(2024, 1, 10), "author_ref": "dev@example.com"}
+        for source, external_id in ((ActivitySource.GITLAB, "a1"), (ActivitySource.GITHUB, "b2"))
+    ])
+    db.commit()
+    service = ActivityService(db)
+
+    assert service.set_identities([
+        EmployeeIdentityCreate(employee_id=EMPLOYEE, source=ActivitySource.GITLAB, author_ref="Dev@Example.com"),
+    ]) == (1, 1)
+    # Identities are per source: the GitHub commit of the same email waits for its own
+    assert employees(db) == {"a1": EMPLOYEE, "b2": None}
+
+    # Matching the author to another employee moves the author's activities
+    other = uuid4()
+    service.set_identities([
+        EmployeeIdentityCreate(employee_id=other, source=ActivitySource.GITLAB, author_ref="dev@example.com"),
+    ])
+    assert employees(db) == {"a1": other, "b2": None}
+    assert [(i.author_ref, i.employee_id) for i in service.list_identities()] == [("dev@example.com", other)]
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.clients.http_client import IntegrationHttpClient, TokenBucket
+
+URL = "https://jira.example.com/rest/api/2/search"
+
+
+@pytest.fixture(autouse=True)
+def fast_limits(settings, monkeypatch):
+    monkeypatch.setattr(settings, "http_client_rate_per_second", 1000.0)
+    monkeypatch.setattr(settings, "http_client_burst", 1000.0)
+    monkeypatch.setattr(settings, "http_client_max_retries", 3)
+    monkeypatch.setattr(settings, "http_client_max_retry_wait_seconds", 5.0)
+
+
+def run(responses, requests=1, concurrent=False):
+    """Send `requests` GETs through a client whose upstream answers from `responses(request_number)`"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        return responses(len(calls))
+
+    async def send():
+        client = IntegrationHttpClient(transport=httpx.MockTransport(handler))
+        try:
+            if concurrent:
+                return await asyncio.gather(*(client.get(URL) for _ in range(requests)))
+            return [await client.get(URL) for _ in range(requests)]
+        finally:
+            await client.aclose()
+
+    return asyncio.run(send()), calls
+
+
+def test_retries_429_after_retry_after():
+    responses, calls = run(
+        lambda n: httpx.Response(429, headers={"Retry-After": "0.2"}) if n == 1 else httpx.Response(200, json={})
+    )
+
+    assert [r.status_code for r in responses] == [200]
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+
+
+def test_retries_exhausted_quota_until_reset():
+    # Reset headers count whole seconds
+    exhausted = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1"}
+    responses, calls = run(
+        lambda n: httpx.Response(403, headers=exhausted) if n == 1 else httpx.Response(200, json={})
+    )
+
+    assert responses[0].status_code == 200
+    assert calls[1] - calls[0] >= 0.95
+
+
+def test_returns_last_response_when_retries_are_exhausted(settings, monkeypatch):
+    monkeypatch.setattr(settings, "http_client_max_retries", 2)
+    responses, calls = run(lambda n: httpx.Response(503, headers={"Retry-After": "0"}))
+
+    assert responses[0].status_code == 503
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors():
+    responses, calls = run(lambda n: httpx.Response(404))
+
+    assert responses[0].status_code == 404
+    assert len(calls) == 1
+
+
+def test_token_bucket_limits_request_rate(settings, monkeypatch):
+    monkeypatch.setattr(settings, "http_client_rate_per_second", 20.0)
+    monkeypatch.setattr(settings, "http_client_burst", 2.0)
+    started = time.monotonic()
+    responses, calls = run(lambda n: httpx.Response(200, json={}), requests=6, concurrent=True)
+
+    # Two requests from the burst, then one every 1/20 s
+    assert len(calls) == 6
+    assert time.monotonic() - started >= 0.19
+    assert calls[-1] - calls[1] >= 0.19
+
+
+def test_reported_quota_pauses_the_host():
+    responses, calls = run(
+        lambda n: httpx.Response(200, headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "1"}) if n == 1
+        else httpx.Response(200),
+        requests=2,
+    )
+
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.95
+
+
+def test_token_bucket_observes_remaining_quota():
+    async def observe():
+        bucket = TokenBucket(rate=1000.0, capacity=10.0)
+        bucket.observe(remaining=3, reset_in=None)
+        assert bucket.tokens == 3
+        bucket.observe(remaining=0, reset_in=0.2)
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(observe()) >= 0.19
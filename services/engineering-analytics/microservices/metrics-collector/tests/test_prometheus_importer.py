@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.clients.http_client import IntegrationHttpClient
+from app.models.metrics import EngineeringMetric, MetricType, ServiceLatency
+from app.services.prometheus_importer import PrometheusImporter
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 1, 12)
+STEP = 600
+
+
+def at(hour: int, minute: int = 0) -> float:
+    return datetime(2024, 1, 1, hour, minute, tzinfo=timezone.utc).timestamp()
+
+
+def series(settings, query: str):
+    """Samples per service for one query; None leaves a timestamp out of the series"""
+    if query == settings.prometheus_uptime_query:
+        return {
+            "api": lambda ts: 0 if at(1) <= ts < at(1, 30) else 1,
+            "web": lambda ts: 1,
+        }
+    if query == settings.prometheus_incident_query:
+        firing = {at(2), at(2, 10), at(5), at(7)}
+        return {"api": lambda ts: 1 if ts in firing else None}
+    if query == settings.prometheus_request_rate_query:
+        return {"api": lambda ts: 10}
+    if query == settings.prometheus_error_rate_query:
+        return {"api": lambda ts: 0.01}
+    quantile = {"0.5": 0.05, "0.95": 0.1, "0.99": 0.2}
+    return {"api": lambda ts: next(v for q, v in quantile.items() if f"({q}," in query)}
+
+
+@pytest.fixture
+def prometheus(settings, monkeypatch):
+    monkeypatch.setattr(settings, "prometheus_import_step_seconds", STEP)
+    monkeypatch.setattr(settings, "prometheus_import_chunk_hours", 6)
+    monkeypatch.setattr(settings, "http_client_rate_per_second", 1000.0)
+    monkeypatch.setattr(settings, "http_client_burst", 1000.0)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        start, end = float(params["start"]), float(params["end"])
+        assert params["step"] == f"{STEP}s"
+        calls.append((params["query"], start, end))
+        # query_range includes both ends, so neighbouring chunks share their edge sample
+        timestamps = [start + offset for offset in range(0, int(end - start) + 1, STEP)]
+        result = []
+        for service, value in series(settings, params["query"]).items():
+            values = [[ts, str(value(ts))] for ts in timestamps if value(ts) is not None]
+            result.append({"metric": {settings.prometheus_service_label: service}, "values": values})
+        return httpx.Response(200, json={"status": "success", "data": {"resultType": "matrix", "result": result}})
+
+    def run(db):
+        async def import_range():
+            client = IntegrationHttpClient(transport=httpx.MockTransport(handler))
+            try:
+                importer = PrometheusImporter(db, base_url="http://prometheus:9090", client=client)
+                return await importer.import_range(START, END, "hour")
+            finally:
+                await client.aclose()
+
+        return asyncio.run(import_range())
+
+    run.calls = calls
+    return run
+
+
+def test_splits_the_range_into_concurrent_chunks(db, prometheus):
+    summary = prometheus(db)
+
+    assert summary.api_calls == 14  # 7 queries x 2 chunks of 6h
+    assert sorted({(start, end) for _, start, end in prometheus.calls}) == [(at(0), at(6)), (at(6), at(12))]
+    assert summary.services == 2
+
+
+def test_downsamples_uptime_and_incidents_per_hour(db, prometheus):
+    summary = prometheus(db)
+
+    uptime = {
+        (row.repository_id, row.period_start.hour): row.value
+        for row in db.query(EngineeringMetric).filter(EngineeringMetric.metric_type == MetricType.SYSTEM_UPTIME)
+    }
+    assert len(uptime) == 24
+    assert uptime[("api", 1)] == pytest.approx(50.0)
+    assert uptime[("api", 2)] == pytest.approx(100.0)
+
+    incidents = {
+        (row.repository_id, row.period_start.hour): row.value
+        for row in db.query(EngineeringMetric).filter(EngineeringMetric.metric_type == MetricType.INCIDENT_FREQUENCY)
+    }
+    # Every observed hour has a row; the 02:00-02:10 alert is one onset
+    assert len(incidents) == 24
+    assert {key for key, count in incidents.items() if count} == {("api", 2), ("api", 5), ("api", 7)}
+    assert incidents[("api", 2)] == 1
+    assert summary.metrics_written == 48
+
+
+def test_writes_hourly_latency_rows(db, prometheus):
+    prometheus(db)
+
+    rows = db.query(ServiceLatency).order_by(ServiceLatency.period_start).all()
+    assert len(rows) == 12
+    assert {row.service_id for row in rows} == {"api"}
+    first = rows[0]
+    assert (first.period_start, first.period_end, first.period_type) == (START, datetime(2024, 1, 1, 1), "hour")
+    assert first.latency_p50_ms == pytest.approx(50.0)
+    assert first.latency_p99_ms == pytest.approx(200.0)
+    assert first.error_rate == pytest.approx(0.01)
+    assert first.request_rate == pytest.approx(10.0)
+    # Six 10-minute samples per hour; the shared chunk edge is counted once
+    assert [row.sample_count for row in rows] == [6] * 12
+
+
+def test_reimport_replaces_earlier_rows(db, prometheus):
+    prometheus(db)
+    prometheus(db)
+
+    assert db.query(EngineeringMetric).count() == 48
+    assert db.query(ServiceLatency).count() == 12
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.automation import ActionType, AutomationRule, ConditionOperator
+from app.models.metrics import EngineeringMetric, MetricType
+from app.schemas.automation import RuleBacktestRequest
+from app.services.rule_backtest_service import RuleBacktestService
+
+START = datetime(2024, 3, 1)
+
+
+@pytest.fixture
+def backtest(db):
+    """Backtest a `>` 10 commits rule over hourly values of one employee"""
+
+    def run(values, cooldown_minutes=0, hysteresis=None):
+        rule = AutomationRule(
+            name="Commit spike",
+            scope_type="employee",
+            metric_type="COMMITS",  # stored upper case by older clients
+            operator=ConditionOperator.GREATER_THAN,
+            threshold_value=10,
+            duration_days=0,
+            cooldown_minutes=cooldown_minutes,
+            hysteresis=hysteresis,
+            action_type=ActionType.SEND_NOTIFICATION,
+            created_by="test",
+        )
+        employee_id = uuid4()
+        db.add(rule)
+        db.add_all([
+            EngineeringMetric(
+                employee_id=employee_id,
+                metric_type=MetricType.COMMITS,
+                value=value,
+                period_start=START + timedelta(hours=hour - 1),
+                period_end=START + timedelta(hours=hour),
+                period_type="hour",
+                source="gitlab",
+            )
+            for hour, value in enumerate(values)
+        ])
+        db.commit()
+        request = RuleBacktestRequest(period_start=START - timedelta(days=1), period_end=START + timedelta(days=1))
+        return RuleBacktestService(db).backtest(rule, request)
+
+    return run
+
+
+def test_every_breach_fires_without_suppression(backtest):
+    response = backtest([12, 13, 14, 9, 15])
+
+    assert (response.trigger_count, response.suppressed_count, response.episode_count) == (4, 0, 2)
+
+
+def test_replays_the_cooldown(backtest):
+    response = backtest([12] * 6, cooldown_minutes=120)
+
+    # Fires at hours 0, 2 and 4; the points in between are inside the cooldown
+    assert [t.triggered_at for t in response.timeline] == [START + timedelta(hours=h) for h in (0, 2, 4)]
+    assert (response.trigger_count, response.suppressed_count) == (3, 3)
+    assert response.entities[0].suppressed_count == 3
+
+
+def test_replays_the_hysteresis_band(backtest):
+    # 9 is back under the threshold but inside the band of 2, so the rule stays disarmed until 7
+    response = backtest([12, 13, 9, 12, 7, 12], hysteresis=2)
+
+    assert [t.triggered_at for t in response.timeline] == [START, START + timedelta(hours=5)]
+    assert (response.trigger_count, response.suppressed_count) == (2, 2)
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.clients.http_client import IntegrationHttpClient
+from app.connectors import sonarqube
+from app.connectors.base import parse_timestamp
+from app.connectors.sonarqube import SonarQubeConnector
+from app.models.integration import Integration, IntegrationType
+
+FIRST_ANALYSIS = datetime(2024, 1, 1)
+
+
+def project(number: int) -> dict:
+    """Project `number`, analysed `number` hours after FIRST_ANALYSIS; every tenth was never analysed"""
+    analysed = FIRST_ANALYSIS + timedelta(hours=number)
+    return {
+        "key": f"project-{number:04d}",
+        "name": f"Project {number}",
+        "lastAnalysisDate": None if number % 10 == 9 else f"{analysed:%Y-%m-%dT%H:%M:%S}+0000",
+    }
+
+
+def measures(key: str) -> list:
+    number = int(key.rsplit("-", 1)[1])
+    values = {"coverage": 80.0, "sqale_debt_ratio": 2.5, "bugs": number % 5, "ncloc": 2000, "complexity": 300,
+              "functions": 60}
+    return [{"component": key, "metric": metric, "value": str(value)} for metric, value in values.items()]
+
+
+@pytest.fixture
+def sonar(settings, monkeypatch):
+    monkeypatch.setattr(settings, "http_client_rate_per_second", 1000.0)
+    monkeypatch.setattr(settings, "http_client_burst", 1000.0)
+    calls = {"projects": [], "measures": [], "in_flight": 0, "max_in_flight": 0}
+
+    def run(projects, page_size=100, watermarks=None):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            params = request.url.params
+            calls["in_flight"] += 1
+            calls["max_in_flight"] = max(calls["max_in_flight"], calls["in_flight"])
+            await asyncio.sleep(0.01)
+            calls["in_flight"] -= 1
+
+            if request.url.path == "/api/measures/search":
+                keys = params["projectKeys"].split(",")
+                calls["measures"].append(keys)
+                return httpx.Response(200, json={"measures": [m for key in keys for m in measures(key)]})
+
+            number, size = int(params["p"]), int(params["ps"])
+            calls["projects"].append(dict(params))
+            if number * size > sonarqube.MAX_RESULTS:
+                return httpx.Response(400, json={"errors": [{"msg": "Can return only the first 10000 results"}]})
+            after, before = (parse_timestamp(params.get(name)) for name in ("analyzedAfter", "analyzedBefore"))
+            listed = [
+                p for p in projects
+                if not (after or before) or (
+                    p["lastAnalysisDate"]
+                    and (not after or parse_timestamp(p["lastAnalysisDate"]) >= after)
+                    and (not before or parse_timestamp(p["lastAnalysisDate"]) < before)
+                )
+            ]
+            page = listed[(number - 1) * size:number * size]
+            return httpx.Response(200, json={"paging": {"pageIndex": number, "pageSize": size, "total": len(listed)},
+                                             "components": page})
+
+        async def pull():
+            client = IntegrationHttpClient(transport=httpx.MockTransport(handler))
+            integration = Integration(
+                integration_type=IntegrationType.SONARQUBE,
+                api_endpoint="https://sonar.example.com",
+                auth_method="bearer",
+                credentials_encrypted="token",
+            )
+            try:
+                connector = SonarQubeConnector(integration, client, watermarks or {}, page_size=page_size)
+                return await connector.pull(), connector.watermarks
+            finally:
+                await client.aclose()
+
+        return asyncio.run(pull())
+
+    run.calls = calls
+    return run
+
+
+def test_fetches_pages_in_parallel_and_batches_measures(sonar):
+    result, watermarks = sonar([project(number) for number in range(250)])
+
+    assert sorted(int(call["p"]) for call in sonar.calls["projects"]) == [1, 2, 3]
+    assert sonar.calls["max_in_flight"] > 1
+    # 225 analysed projects, at most 100 per measures request
+    assert sorted(len(keys) for keys in sonar.calls["measures"]) == [25, 100, 100]
+    assert len(result.quality_snapshots) == 225
+    assert result.api_calls == 6
+    assert watermarks["projects"].updated_since == FIRST_ANALYSIS + timedelta(hours=248)
+    assert watermarks["projects"].cursor is None
+
+
+def test_derives_bug_density_and_complexity_per_function(sonar):
+    result, _ = sonar([project(3), project(9)])
+
+    assert result.quality_snapshots == [{
+        "repository_id": "project-0003",
+        "project_name": "Project 3",
+        "code_coverage": 80.0,
+        "technical_debt_ratio": 2.5,
+        "bug_density": 1.5,  # 3 bugs per 2000 lines
+        "code_complexity": 5.0,  # 300 over 60 functions
+        "lines_of_code": 2000,
+        "analysed_at": FIRST_ANALYSIS + timedelta(hours=3),
+    }]
+
+
+def test_lists_past_max_results_in_date_slices(sonar, monkeypatch):
+    monkeypatch.setattr(sonarqube, "MAX_RESULTS", 40)
+    result, watermarks = sonar([project(number) for number in range(200)], page_size=20)
+
+    assert all(int(call["p"]) * int(call["ps"]) <= 40 for call in sonar.calls["projects"])
+    assert sorted(s["repository_id"] for s in result.quality_snapshots) == [
+        f"project-{number:04d}" for number in range(200) if number % 10 != 9
+    ]
+    assert watermarks["projects"].updated_since == FIRST_ANALYSIS + timedelta(hours=198)
+    assert watermarks["projects"].etag is None
@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.clients.http_client import IntegrationHttpClient
+from app.database import SessionLocal
+from app.models.activity import EngineeringActivity
+from app.models.integration import (
+    Integration, IntegrationStatus, IntegrationType, SyncFrequency, SyncWatermark,
+)
+from app.services.sync_scheduler import SyncInProgressError, SyncScheduler
+from app.services.sync_stats import SyncStatsRegistry
+
+NOW = datetime(2024, 1, 10, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def fast_sync(settings, monkeypatch):
+    monkeypatch.setattr(settings, "http_client_rate_per_second", 1000.0)
+    monkeypatch.setattr(settings, "http_client_burst", 1000.0)
+    monkeypatch.setattr(settings, "sync_jitter_seconds", 0)
+
+
+def integration(db, name, integration_type=IntegrationType.GITLAB, **columns) -> Integration:
+    row = Integration(
+        name=name,
+        integration_type=integration_type,
+        api_endpoint=f"https://{name}.example.com/api/v4/projects/{name}",
+        auth_method="bearer",
+        credentials_encrypted="token",
+        sync_frequency=columns.pop("sync_frequency", SyncFrequency.DAILY),
+        status=columns.pop("status", IntegrationStatus.ACTIVE),
+        **columns,
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+def gitlab(request: httpx.Request) -> httpx.Response:
+    """One commit per project and no merge requests"""
+    if request.url.path.endswith("/repository/commits"):
+        project = request.url.host.split(".", 1)[0]
+        body = [{"id": f"{project}-sha", "title": "Fix", "author_email": "dev@example.com",
+                 "committed_date": "2024-01-10T09:00:00Z"}]
+    else:
+        body = []
+    return httpx.Response(200, json=body, headers={"X-Total-Pages": "1"})
+
+
+def run(scheduler_call, handler):
+    """Run `scheduler_call(scheduler)` on a scheduler whose client answers with `handler`"""
+
+    async def main():
+        client = IntegrationHttpClient(transport=httpx.MockTransport(handler))
+        scheduler = SyncScheduler(client=client, stats=SyncStatsRegistry(history_size=5))
+        try:
+            return scheduler, await scheduler_call(scheduler)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_due_integrations_picks_overdue_never_synced_and_unfinished(db):
+    never = integration(db, "never")
+    integration(db, "overdue", last_sync_at=NOW - timedelta(days=2))
+    integration(db, "hourly", sync_frequency=SyncFrequency.HOURLY, last_sync_at=NOW - timedelta(hours=2))
+    integration(db, "fresh", last_sync_at=NOW - timedelta(hours=1))
+    integration(db, "manual", sync_frequency=SyncFrequency.MANUAL)
+    integration(db, "inactive", status=IntegrationStatus.INACTIVE)
+    unfinished = integration(db, "unfinished", last_sync_at=NOW - timedelta(minutes=5))
+    db.add(SyncWatermark(integration_id=unfinished.integration_id, resource="commits", cursor="3"))
+    db.commit()
+
+    due = SyncScheduler(stats=SyncStatsRegistry()).due_integrations(db, NOW)
+
+    assert due[0].integration_id == never.integration_id
+    assert {i.name for i in due} == {"never", "overdue", "hourly", "unfinished"}
+
+
+def test_run_once_stores_activities_watermarks_and_statuses(db):
+    synced = integration(db, "alpha")
+    failing = integration(db, "broken")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host.startswith("broken"):
+            return httpx.Response(404)
+        return gitlab(request)
+
+    scheduler, outcomes = run(lambda s: s.run_once(NOW), handler)
+
+    by_id = {o.integration_id: o for o in outcomes}
+    assert by_id[synced.integration_id].status == IntegrationStatus.ACTIVE
+    assert by_id[synced.integration_id].records_stored == 1
+    assert by_id[failing.integration_id].status == IntegrationStatus.ERROR
+    assert len(scheduler.stats.recent(synced.integration_id)) == 1
+
+    db.expire_all()
+    assert [a.external_id for a in db.query(EngineeringActivity)] == ["alpha-sha"]
+    mark = db.query(SyncWatermark).filter_by(integration_id=synced.integration_id, resource="commits").one()
+    assert mark.updated_since == datetime(2024, 1, 10, 9, 0)
+    # Statuses of the whole batch are written back together
+    db.refresh(synced)
+    db.refresh(failing)
+    assert (synced.status, synced.error_message) == (IntegrationStatus.ACTIVE, None)
+    assert synced.last_sync_at is not None
+    assert failing.status == IntegrationStatus.ERROR and "404" in failing.error_message
+    assert failing.last_sync_at is not None
+
+    # Both were just synced, so nothing is due on the next tick
+    _, outcomes = run(lambda s: s.run_once(), handler)
+    assert outcomes == []
+
+
+def test_run_once_caps_concurrency_overall_and_per_type(db, settings, monkeypatch):
+    monkeypatch.setattr(settings, "sync_max_concurrency", 2)
+    monkeypatch.setattr(settings, "sync_concurrency_per_type", 1)
+    for n in range(3):
+        integration(db, f"gitlab{n}")
+    for n in range(2):
+        integration(db, f"jira{n}", IntegrationType.JIRA)
+    in_flight, peak = {}, {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        kind = "jira" if host.startswith("jira") else "gitlab"
+        in_flight[host] = kind
+        peak["all"] = max(peak.get("all", 0), len(in_flight))
+        peak[kind] = max(peak.get(kind, 0), list(in_flight.values()).count(kind))
+        await asyncio.sleep(0.01)
+        del in_flight[host]
+        if kind == "jira":
+            if request.url.path.endswith("/myself"):
+                return httpx.Response(200, json={"timeZone": "UTC"})
+            return httpx.Response(200, json={"total": 0, "issues": []})
+        return gitlab(request)
+
+    _, outcomes = run(lambda s: s.run_once(NOW), handler)
+
+    assert [o.status for o in outcomes] == [IntegrationStatus.ACTIVE] * 5
+    assert peak == {"all": 2, "gitlab": 1, "jira": 1}
+
+
+def test_sync_now_refuses_an_integration_already_syncing(db):
+    target = integration(db, "alpha", sync_frequency=SyncFrequency.MANUAL)
+    events = {}
+
+    async def call(scheduler):
+        events.update(started=asyncio.Event(), release=asyncio.Event())
+        first = asyncio.create_task(scheduler.sync_now(target.integration_id))
+        await events["started"].wait()
+        with pytest.raises(SyncInProgressError):
+            await scheduler.sync_now(target.integration_id)
+        events["release"].set()
+        return await first, await scheduler.sync_now(uuid4())
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        events["started"].set()
+        await events["release"].wait()
+        return gitlab(request)
+
+    scheduler, (outcome, unknown) = run(call, handler)
+
+    assert outcome.status == IntegrationStatus.ACTIVE and outcome.records_stored == 1
+    assert unknown is None
+    assert scheduler._running == set()
+    with SessionLocal() as session:
+        assert session.get(Integration, target.integration_id).last_sync_at is not None
@@ -0,0 +1 @@
+# Engineering Analytics - code shared by the MetricsCollector and KPIEngine services
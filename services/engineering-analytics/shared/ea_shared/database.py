@@ -0,0 +1,128 @@
+"""
+Database engine setup and instrumentation shared by the Engineering Analytics services
+
+Both services size their pool from the same DB_* settings and export the same
+ea_db_* Prometheus metrics, so the engine factory, the instrumented pool and
+the metric definitions live here once; each service's app.database wraps
+create_db_engine with its own settings. `settings` is the service's Settings
+object and must carry database_url and the db_* fields.
+"""
+from typing import Any, Optional
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "ea_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "ea_db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after DB_POOL_TIMEOUT_SECONDS",
+)
+DB_POOL_IN_USE = Gauge("ea_db_pool_connections_in_use", "Pooled database connections checked out")
+DB_POOL_IDLE = Gauge("ea_db_pool_connections_idle", "Pooled database connections open and idle")
+DB_POOL_SIZE = Gauge(
+    "ea_db_pool_size",
+    "Connections the pool keeps open; up to DB_MAX_OVERFLOW more are opened on demand",
+)
+DB_QUERY_DURATION = Histogram(
+    "ea_db_query_duration_seconds",
+    "Duration of database statements",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a connection"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def create_db_engine(
+    settings: Any,
+    database_url: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    **overrides,
+) -> Engine:
+    """
+    An engine configured from the DB_* `settings`, with `pool_size` (default:
+    settings.db_pool_size) connections on Postgres; `overrides` replace
+    individual create_engine options
+    """
+    url = make_url(database_url or settings.database_url)
+    options = {"pool_pre_ping": True, "query_cache_size": settings.db_query_cache_size}
+    if url.get_backend_name() == "postgresql":
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size or settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+        if settings.db_statement_timeout_ms:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+        # psycopg 3 prepares statements server-side once they have run this often on a connection
+        if url.get_driver_name() == "psycopg" and settings.db_prepare_threshold is not None:
+            options.setdefault("connect_args", {})["prepare_threshold"] = settings.db_prepare_threshold
+    options.update(overrides)
+    return create_engine(url, **options)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Export the engine's pool usage and statement durations through the DB_* metrics (one engine per process)"""
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        DB_POOL_IN_USE.set_function(pool.checkedout)
+        DB_POOL_IDLE.set_function(pool.checkedin)
+        DB_POOL_SIZE.set_function(pool.size)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _statement_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["statement_started"].pop()
+        operation = (statement.split(None, 1) or [""])[0].upper()
+        DB_QUERY_DURATION.labels(operation if operation in QUERY_OPERATIONS else "OTHER").observe(
+            time.perf_counter() - started
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def _statement_failed(context):
+        if context.connection is not None and context.connection.info.get("statement_started"):
+            context.connection.info["statement_started"].pop()
+
+
+@compiles(UUID, "sqlite")
+def _uuid_sqlite(element, compiler, **kw):
+    # SQLite (local runs, tests, benchmarks) has no UUID type; SQLAlchemy stores the values as 32 hex digits there
+    return "CHAR(32)"
+
+
+def dialect_insert(db: Session):
+    """The session dialect's insert(), which supports ON CONFLICT ... DO UPDATE"""
+    insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(db.get_bind().dialect.name)
+    if insert is None:
+        raise NotImplementedError(f"No upsert for the {db.get_bind().dialect.name} dialect")
+    return insert